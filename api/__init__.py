@@ -8,10 +8,11 @@ Mirrors how cli/main.py assembles module CLIs.
 import hashlib
 import hmac
 import os
+import uuid
 from datetime import timedelta
 from pathlib import Path
 
-from flask import Flask, abort, redirect, render_template, request, session, url_for
+from flask import Flask, abort, g, jsonify, redirect, render_template, request, session, url_for
 
 
 def _get_or_create_secret() -> str:
@@ -105,6 +106,58 @@ def create_app() -> Flask:
             "web_modules": modules_cfg,
         }
 
+    # ── Request instrumentation (query attribution + Server-Timing) ─────
+    from qms.core import profiler
+    from qms.core.config import get_config_value
+
+    if get_config_value("database", "profiling", "request_metrics", default=False):
+        profiler.enable_request_metrics()
+
+    from qms.core.logging import reset_request_id, set_request_id
+
+    @app.before_request
+    def start_request_metrics():
+        # Honour an upstream proxy's ID so logs correlate end to end
+        g.request_id = (request.headers.get("X-Request-ID") or "")[:64] or uuid.uuid4().hex
+        g._request_id_token = set_request_id(g.request_id)
+        g._query_ctx_token = profiler.set_context(request.endpoint or request.path)
+        if profiler.request_metrics_enabled():
+            g._request_metrics_token = profiler.start_request()
+
+    @app.after_request
+    def emit_server_timing(response):
+        if "request_id" in g:
+            response.headers["X-Request-ID"] = g.request_id
+        metrics = profiler.current_request()
+        if metrics is None:
+            return response
+        wall_ms = metrics.wall_ms
+        response.headers.add(
+            "Server-Timing",
+            f'total;dur={wall_ms:.1f}, '
+            f'sql;dur={metrics.sql_ms:.1f};desc="{metrics.statements} statements", '
+            f'db-conn;desc="{metrics.connections} connections"',
+        )
+        if request.endpoint != "static":
+            profiler.request_stats.record(
+                request.endpoint or "<unmatched>", metrics, wall_ms, response.status_code
+            )
+        return response
+
+    @app.teardown_request
+    def end_request_metrics(exc=None):
+        for key, reset in (
+            ("_request_metrics_token", profiler.end_request),
+            ("_query_ctx_token", profiler.reset_context),
+            ("_request_id_token", reset_request_id),
+        ):
+            token = g.pop(key, None)
+            if token is not None:
+                try:
+                    reset(token)
+                except ValueError:
+                    pass  # Token created in a different context
+
     # ── CSRF protection ──────────────────────────────────────────────────
 
     def _generate_csrf_token() -> str:
@@ -252,6 +305,10 @@ def create_app() -> Flask:
     from qms.api.external import bp as external_bp
     app.register_blueprint(external_bp)
 
+    # Keep materialized dashboard counts warm (no-op unless configured)
+    from qms.reporting.dashboard import start_refresher
+    start_refresher()
+
     # Root route — landing page
     @app.route("/")
     def index():
@@ -268,48 +325,28 @@ def create_app() -> Flask:
         elif user.get("modules"):
             accessible = set(user["modules"].keys())
 
+        # Dashboard stats (everyone sees basic stats) — materialized counts.
+        # Read before opening the page's own connection so both checkouts
+        # reuse the same pooled connection instead of nesting a second one.
+        from qms.reporting.dashboard import get_stats as get_dashboard_stats
+
+        keys = ["active_projects", "open_alerts"]
+        if "pipeline" in accessible:
+            keys.append("pending_drawings")
+        if "welding" in accessible:
+            keys.append("active_welders")
+        if "workforce" in accessible or user.get("role") == "admin":
+            keys.append("employees")
+        if "licenses" in accessible:
+            keys += ["expiring_licenses", "license_alerts"]
+        try:
+            stats = get_dashboard_stats(keys)
+        except Exception:
+            stats = {"active_projects": 0, "open_alerts": 0}
+
         with get_db() as conn:
             recent_posts = list_posts(conn, published_only=True, limit=3)
 
-            # Dashboard stats (everyone sees basic stats)
-            stats = {}
-            try:
-                stats["active_projects"] = conn.execute(
-                    "SELECT COUNT(*) FROM projects WHERE stage NOT IN ('Archive', 'Lost Proposal')"
-                ).fetchone()[0]
-                stats["open_alerts"] = conn.execute(
-                    "SELECT COUNT(*) FROM project_flags WHERE resolved = 0"
-                ).fetchone()[0]
-            except Exception:
-                stats["active_projects"] = 0
-                stats["open_alerts"] = 0
-
-            # Module-specific stats
-            try:
-                if "pipeline" in accessible:
-                    stats["pending_drawings"] = conn.execute(
-                        "SELECT COUNT(*) FROM processing_queue WHERE status = 'pending'"
-                    ).fetchone()[0]
-                if "welding" in accessible:
-                    stats["active_welders"] = conn.execute(
-                        "SELECT COUNT(*) FROM weld_welder_registry WHERE status = 'active'"
-                    ).fetchone()[0]
-                if "workforce" in accessible or user.get("role") == "admin":
-                    stats["employees"] = conn.execute(
-                        "SELECT COUNT(*) FROM employees WHERE is_active = 1"
-                    ).fetchone()[0]
-                if "licenses" in accessible:
-                    stats["expiring_licenses"] = conn.execute(
-                        "SELECT COUNT(*) FROM v_expiring_licenses "
-                        "WHERE days_until_expiry BETWEEN 0 AND 90"
-                    ).fetchone()[0]
-                    stats["license_alerts"] = conn.execute(
-                        "SELECT COUNT(*) FROM license_notifications "
-                        "WHERE status = 'active'"
-                    ).fetchone()[0]
-            except Exception:
-                pass
-
             # Activity feed — recent timestamped events
             activity = []
             try:
@@ -379,53 +416,23 @@ def create_app() -> Flask:
         users_list = []
 
         try:
-            with get_db() as conn:
-                # ── Core stats ────────────────────────────────────
-                stats["projects"] = conn.execute("SELECT COUNT(*) FROM projects").fetchone()[0]
-                stats["sheets"] = conn.execute("SELECT COUNT(*) FROM sheets").fetchone()[0]
-                stats["extracted"] = conn.execute(
-                    "SELECT COUNT(*) FROM sheets WHERE extracted_at IS NOT NULL"
-                ).fetchone()[0]
-                stats["employees"] = conn.execute("SELECT COUNT(*) FROM employees").fetchone()[0]
-                stats["welders"] = conn.execute(
-                    "SELECT COUNT(*) FROM weld_welder_registry WHERE status='active'"
-                ).fetchone()[0]
-                stats["wps_count"] = conn.execute("SELECT COUNT(*) FROM weld_wps").fetchone()[0]
-                stats["wpq_count"] = conn.execute("SELECT COUNT(*) FROM weld_wpq").fetchone()[0]
-                stats["tables"] = conn.execute(
-                    "SELECT COUNT(*) FROM sqlite_master WHERE type='table'"
-                ).fetchone()[0]
-                stats["blog_posts"] = conn.execute("SELECT COUNT(*) FROM blog_posts").fetchone()[0]
+            # ── Core stats (materialized counts) ──────────────
+            # Read before the page's own connection (see index())
+            from qms.reporting.dashboard import get_stats as get_dashboard_stats
+
+            cached = get_dashboard_stats([
+                "projects", "sheets", "extracted", "employees_total", "active_welders",
+                "wps_count", "wpq_count", "tables", "blog_posts",
+            ])
+            cached["employees"] = cached.pop("employees_total")
+            cached["welders"] = cached.pop("active_welders")
+            stats.update(cached)
 
+            with get_db() as conn:
                 # ── Recent activity feed ──────────────────────────
-                activity = conn.execute("""
-                    SELECT source, action, detail, created_at FROM (
-                        SELECT 'intake' as source, action,
-                               file_name as detail, created_at
-                        FROM document_intake_log
-                        UNION ALL
-                        SELECT 'extraction' as source,
-                               status as action,
-                               form_type || ': ' || COALESCE(identifier, source_file) as detail,
-                               created_at
-                        FROM weld_extraction_log
-                        UNION ALL
-                        SELECT 'weld-intake' as source, action,
-                               file_name as detail, created_at
-                        FROM weld_intake_log
-                        UNION ALL
-                        SELECT 'qm-intake' as source, action,
-                               file_name as detail, created_at
-                        FROM qm_intake_log
-                        UNION ALL
-                        SELECT 'auth' as source, action,
-                               COALESCE(changed_by, entity_id) as detail,
-                               changed_at as created_at
-                        FROM audit_log
-                    ) combined
-                    ORDER BY created_at DESC
-                    LIMIT 15
-                """).fetchall()
+                from qms.core.activity import get_recent_activity
+
+                activity = get_recent_activity(conn, limit=15)
 
                 # ── Extraction coverage by project ────────────────
                 coverage = conn.execute("""
@@ -488,4 +495,96 @@ def create_app() -> Flask:
             updated_at=datetime.now().strftime("%Y-%m-%d %H:%M"),
         )
 
+    # ── Admin-only dashboard stats cache (JSON) ─────────────────────────
+    @app.route("/admin/dashboard-stats", methods=["GET"])
+    def dashboard_stats_status():
+        user = session.get("user")
+        if not user or user.get("role") != "admin":
+            abort(404)
+
+        from qms.reporting.dashboard import get_stats_age
+
+        try:
+            return jsonify({"stats": get_stats_age()})
+        except Exception as exc:
+            return jsonify({"error": str(exc)}), 500
+
+    @app.route("/admin/dashboard-stats/refresh", methods=["POST"])
+    def dashboard_stats_refresh():
+        user = session.get("user")
+        if not user or user.get("role") != "admin":
+            abort(404)
+
+        from qms.reporting.dashboard import refresh_stats
+
+        keys = (request.get_json(silent=True) or {}).get("keys")
+        try:
+            return jsonify({"refreshed": refresh_stats(keys)})
+        except KeyError as exc:
+            return jsonify({"error": str(exc)}), 400
+
+    # ── Admin-only request timing histograms (JSON) ─────────────────────
+    @app.route("/admin/perf")
+    def request_perf():
+        user = session.get("user")
+        if not user or user.get("role") != "admin":
+            abort(404)
+
+        if request.args.get("reset") == "1":
+            profiler.request_stats.reset()
+
+        endpoints = profiler.request_stats.summary()
+        sort_key = request.args.get("sort", "p95")
+        sorters = {
+            "p95": lambda item: item[1]["wall_ms"]["p95"],
+            "statements": lambda item: item[1]["statements_avg"],
+            "sql": lambda item: item[1]["sql_ms_avg"],
+            "count": lambda item: item[1]["requests_total"],
+        }
+        ordered = sorted(endpoints.items(), key=sorters.get(sort_key, sorters["p95"]), reverse=True)
+
+        from qms.core.db import get_pool_stats
+
+        return jsonify({
+            "enabled": profiler.request_metrics_enabled(),
+            "window": profiler.request_stats.window,
+            "buckets_ms": list(profiler.HISTOGRAM_BUCKETS_MS),
+            "pool": get_pool_stats(),
+            "endpoints": [{"endpoint": name, **data} for name, data in ordered],
+        })
+
+    # ── Admin-only query profiler report (unlisted) ─────────────────────
+    @app.route("/admin/queries")
+    def query_profile():
+        from datetime import datetime
+
+        user = session.get("user")
+        if not user or user.get("role") != "admin":
+            abort(404)
+
+        from qms.core import get_db
+
+        top_n = request.args.get("top", 20, type=int)
+        profiler.flush()
+
+        summary = {"by_total_time": [], "by_calls": [], "by_context": []}
+        slow = []
+        try:
+            with get_db(readonly=True) as conn:
+                summary = profiler.get_summary(top_n=top_n, conn=conn)
+                slow = profiler.get_slow_queries(conn, limit=50)
+        except Exception:
+            pass
+
+        return render_template(
+            "admin/queries.html",
+            enabled=profiler.is_enabled(),
+            threshold_ms=profiler.slow_threshold_ms(),
+            summary=summary,
+            slow=slow,
+            top_n=top_n,
+            current_user=user,
+            updated_at=datetime.now().strftime("%Y-%m-%d %H:%M"),
+        )
+
     return app
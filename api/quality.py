@@ -182,13 +182,13 @@ def api_search():
     bu_ids = _user_bu_ids()
     frag, bu_params = _bu_filter(bu_ids)
 
-    # Try vector search first
+    # Hybrid FTS + vector search (FTS-only while embeddings are down)
     try:
-        from qms.vectordb.search import search_collection
+        from qms.vectordb.hybrid import hybrid_search
 
-        results = search_collection("quality_issues", query, n_results=30)
+        results = hybrid_search("quality_issues", query, limit=30)["results"]
         if results:
-            issue_ids = [r["metadata"]["db_id"] for r in results if "metadata" in r]
+            issue_ids = [r["key"] for r in results]
             if issue_ids:
                 placeholders = ",".join("?" * len(issue_ids))
                 with get_db(readonly=True) as conn:
@@ -203,14 +203,14 @@ def api_search():
                         """,
                         issue_ids + bu_params,
                     ).fetchall()
-                # Preserve vector similarity order
+                # Preserve fused rank order
                 row_map = {r["id"]: dict(r) for r in rows}
                 ordered = [row_map[iid] for iid in issue_ids if iid in row_map]
                 return jsonify(ordered)
     except Exception:
         pass  # Fallback to SQL LIKE
 
-    # SQL LIKE fallback
+    # SQL LIKE fallback (substring matches FTS tokens miss)
     with get_db(readonly=True) as conn:
         like_param = f"%{query}%"
         rows = conn.execute(
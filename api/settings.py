@@ -75,7 +75,7 @@ def api_get_config_section(section):
     if section not in EDITABLE_SECTIONS:
         return jsonify({"error": f"Section '{section}' is not editable"}), 403
 
-    config = get_config(reload=True)
+    config = get_config()
     keys = section.split(".")
     target = config
     for key in keys:
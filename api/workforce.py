@@ -409,7 +409,9 @@ def api_update_employee(employee_id):
         ).fetchone()
         if not row:
             return jsonify({"error": "Employee not found"}), 404
-        updated = update_employee(conn, employee_id, **data)
+        # "commit" is update_employee's transaction flag, not a column
+        fields = {k: v for k, v in data.items() if k != "commit"}
+        updated = update_employee(conn, employee_id, **fields)
     return jsonify({"id": employee_id, "action": "updated", "changed": updated})
 
 
@@ -13,6 +13,8 @@ from datetime import datetime
 
 from werkzeug.security import check_password_hash, generate_password_hash
 
+from qms.core.activity import record_activity
+
 
 # ── Audit Logging ─────────────────────────────────────────────────────────────
 
@@ -24,11 +26,14 @@ def log_auth_event(
     detail: dict | None = None,
 ) -> None:
     """Insert an auth event into the shared audit_log table."""
-    conn.execute(
+    cur = conn.execute(
         """INSERT INTO audit_log (entity_type, entity_id, action, changed_by, new_values)
            VALUES ('user', ?, ?, ?, ?)""",
         (str(entity_id), action, changed_by, json.dumps(detail) if detail else None),
     )
+    record_activity(
+        conn, "auth", action, changed_by or str(entity_id), "audit_log", cur.lastrowid
+    )
     conn.commit()
 
 
@@ -3,6 +3,11 @@ QMS CLI - Main Entry Point
 
 Unified Typer CLI that assembles all module sub-commands.
 
+Module sub-apps are registered lazily: ``qms --help`` lists every group
+from MODULE_REGISTRY, but a module's ``cli.py`` (and its dependencies) is
+only imported when that group is actually invoked, so ``qms version``
+does not pay for openpyxl, cryptography, Flask, etc.
+
 Usage:
     qms version
     qms migrate
@@ -16,14 +21,94 @@ Usage:
     qms report [command]
 """
 
+import importlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
 import typer
+from typer.core import TyperGroup
 
 import qms
 
+# (import path, command name, help text) for each module CLI sub-app
+MODULE_REGISTRY: List[Tuple[str, str, str]] = [
+    ("qms.welding.cli", "welding", "Welding program management"),
+    ("qms.workforce.cli", "workforce", "Employee & workforce management"),
+    ("qms.projects.cli", "projects", "Projects, customers & jobs"),
+    ("qms.quality.cli", "quality", "Quality issues & observations"),
+    ("qms.timetracker.cli", "timetracker", "Time tracking & projections"),
+    ("qms.pipeline.cli", "pipeline", "Drawing extraction & conflict detection"),
+    ("qms.qualitydocs.cli", "docs", "Quality manual & documents"),
+    ("qms.references.cli", "refs", "Reference standards library"),
+    ("qms.engineering.cli", "eng", "Engineering calculations"),
+    ("qms.automation.cli", "automation", "Automation request processing"),
+    ("qms.reporting.cli", "report", "Reports & dashboards"),
+    ("qms.vectordb.cli", "vectordb", "Vector search & embeddings"),
+    ("qms.auth.cli", "auth", "User account management"),
+    ("qms.licenses.cli", "licenses", "License compliance management"),
+    ("qms.tray.cli", "tray", "System tray server control"),
+]
+
+# Command name -> fully built sub-app command, once imported
+_loaded: Dict[str, Any] = {}
+
+
+def _cli_module_exists(module_path: str) -> bool:
+    """Check for ``<module>/cli.py`` on disk without importing the package."""
+    parts = module_path.split(".")[1:]
+    return Path(qms.__file__).parent.joinpath(*parts).with_suffix(".py").is_file()
+
+
+def load_module_command(module_path: str, name: str, help_text: str):
+    """
+    Import a module CLI and build its command exactly as ``add_typer`` would.
+
+    Raises:
+        ImportError: If the module (or one of its dependencies) cannot be imported.
+        AttributeError: If the module has no Typer ``app``.
+    """
+    if name not in _loaded:
+        mod = importlib.import_module(module_path)
+        holder = typer.Typer()
+        holder.add_typer(mod.app, name=name, help=help_text)
+        _loaded[name] = typer.main.get_command(holder).commands[name]
+    return _loaded[name]
+
+
+class _LazySubApp(TyperGroup):
+    """Placeholder for a module sub-app; imports the real one on invocation."""
+
+    def __init__(self, module_path: str, name: str, help_text: str):
+        super().__init__(name=name, help=help_text)
+        self.module_path = module_path
+
+    def resolve(self):
+        try:
+            return load_module_command(self.module_path, self.name, self.help)
+        except (ImportError, AttributeError) as exc:
+            typer.echo(f"qms {self.name} is unavailable: {exc}", err=True)
+            raise typer.Exit(1)
+
+    def make_context(self, info_name: Optional[str], args: List[str], parent=None, **extra):
+        return self.resolve().make_context(info_name, args, parent=parent, **extra)
+
+
+class LazyModuleGroup(TyperGroup):
+    """Root group that lists module sub-apps without importing them."""
+
+    def __init__(self, **attrs: Any):
+        super().__init__(**attrs)
+        for module_path, name, help_text in MODULE_REGISTRY:
+            if name in self.commands or not _cli_module_exists(module_path):
+                continue
+            self.add_command(_loaded.get(name) or _LazySubApp(module_path, name, help_text))
+
+
 app = typer.Typer(
     name="qms",
     help="Quality Management System for MEP division operations.",
     no_args_is_help=True,
+    cls=LazyModuleGroup,
 )
 
 
@@ -80,39 +165,6 @@ def serve(
         waitress_serve(web, host=_host, port=port, threads=threads)
 
 
-def _register_modules():
-    """Register module CLI sub-apps. Silently skips modules missing a cli.py."""
-    module_registry = [
-        ("qms.welding.cli", "welding", "Welding program management"),
-        ("qms.workforce.cli", "workforce", "Employee & workforce management"),
-        ("qms.projects.cli", "projects", "Projects, customers & jobs"),
-        ("qms.quality.cli", "quality", "Quality issues & observations"),
-        ("qms.timetracker.cli", "timetracker", "Time tracking & projections"),
-        ("qms.pipeline.cli", "pipeline", "Drawing extraction & conflict detection"),
-        ("qms.qualitydocs.cli", "docs", "Quality manual & documents"),
-        ("qms.references.cli", "refs", "Reference standards library"),
-        ("qms.engineering.cli", "eng", "Engineering calculations"),
-        ("qms.automation.cli", "automation", "Automation request processing"),
-        ("qms.reporting.cli", "report", "Reports & dashboards"),
-        ("qms.vectordb.cli", "vectordb", "Vector search & embeddings"),
-        ("qms.auth.cli", "auth", "User account management"),
-        ("qms.licenses.cli", "licenses", "License compliance management"),
-        ("qms.tray.cli", "tray", "System tray server control"),
-    ]
-
-    for module_path, name, help_text in module_registry:
-        try:
-            import importlib
-
-            mod = importlib.import_module(module_path)
-            app.add_typer(mod.app, name=name, help=help_text)
-        except (ImportError, AttributeError):
-            pass
-
-
-_register_modules()
-
-
 def main():
     """Entry point for the qms CLI."""
     app()
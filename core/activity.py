@@ -0,0 +1,207 @@
+"""
+Unified activity feed.
+
+Each module keeps its own detailed log table (``document_intake_log``,
+``weld_extraction_log``, ``weld_intake_log``, ``qm_intake_log``,
+``audit_log``). The log writers also append a one-line summary to the shared
+``activity_events`` table, so "recent activity" is a single indexed
+``ORDER BY created_at DESC LIMIT n`` rather than a union over every log's
+full history.
+
+``(source_table, source_id)`` links an event back to its log row and is
+unique, which keeps the backfill idempotent. Retention is bounded by
+``activity.retention_days`` and ``activity.max_events``.
+"""
+
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from qms.core.config import get_config_value
+from qms.core.logging import get_logger
+
+logger = get_logger("qms.core.activity")
+
+_DEFAULT_RETENTION_DAYS = 180
+_DEFAULT_MAX_EVENTS = 50000
+
+# Prune opportunistically after this many events recorded by this process
+_PRUNE_EVERY = 500
+_recorded = 0
+_recorded_lock = threading.Lock()
+
+# Log table -> SELECT producing (source, action, detail, source_id, created_at)
+_BACKFILL_QUERIES: Dict[str, str] = {
+    "document_intake_log": """
+        SELECT 'intake' AS source, action, file_name AS detail,
+               id AS source_id, created_at
+        FROM document_intake_log""",
+    "weld_extraction_log": """
+        SELECT 'extraction' AS source, status AS action,
+               form_type || ': ' || COALESCE(identifier, source_file) AS detail,
+               id AS source_id, created_at
+        FROM weld_extraction_log""",
+    "weld_intake_log": """
+        SELECT 'weld-intake' AS source, action, file_name AS detail,
+               id AS source_id, created_at
+        FROM weld_intake_log""",
+    "qm_intake_log": """
+        SELECT 'qm-intake' AS source, action, file_name AS detail,
+               id AS source_id, created_at
+        FROM qm_intake_log""",
+    "audit_log": """
+        SELECT CASE WHEN entity_type = 'user' THEN 'auth' ELSE 'licenses' END AS source,
+               action, COALESCE(changed_by, entity_id) AS detail,
+               id AS source_id, changed_at AS created_at
+        FROM audit_log""",
+}
+
+
+def _retention() -> Tuple[int, int]:
+    """Return (retention_days, max_events) from config."""
+    return (
+        int(get_config_value("activity", "retention_days", default=_DEFAULT_RETENTION_DAYS)),
+        int(get_config_value("activity", "max_events", default=_DEFAULT_MAX_EVENTS)),
+    )
+
+
+def record_activity(
+    conn: sqlite3.Connection,
+    source: str,
+    action: Optional[str],
+    detail: Optional[str],
+    source_table: Optional[str] = None,
+    source_id: Optional[int] = None,
+) -> None:
+    """
+    Append an event to the activity feed on the caller's connection.
+
+    Runs inside the caller's transaction (no commit). A database that has
+    not been migrated yet is tolerated -- the feed is a convenience, never a
+    reason for the underlying log write to fail.
+
+    Args:
+        conn: Open connection the log row was written on.
+        source: Feed label (``intake``, ``extraction``, ``auth``, ...).
+        action: Short verb or status.
+        detail: One-line description (file name, identifier, user).
+        source_table: Log table the event mirrors.
+        source_id: Row id in *source_table*.
+    """
+    global _recorded
+    try:
+        conn.execute(
+            """INSERT OR IGNORE INTO activity_events
+               (source, action, detail, source_table, source_id)
+               VALUES (?, ?, ?, ?, ?)""",
+            (source, action, detail, source_table, source_id),
+        )
+    except sqlite3.OperationalError as exc:
+        logger.debug("activity_events unavailable: %s", exc)
+        return
+
+    with _recorded_lock:
+        _recorded += 1
+        due = _recorded % _PRUNE_EVERY == 0
+    if due:
+        try:
+            prune_activity(conn)
+        except sqlite3.Error as exc:
+            logger.debug("Activity prune skipped: %s", exc)
+
+
+def get_recent_activity(conn: sqlite3.Connection, limit: int = 15) -> List[sqlite3.Row]:
+    """Return the newest *limit* events (source, action, detail, created_at)."""
+    return conn.execute(
+        """SELECT source, action, detail, created_at
+           FROM activity_events
+           ORDER BY created_at DESC, id DESC
+           LIMIT ?""",
+        (limit,),
+    ).fetchall()
+
+
+def prune_activity(
+    conn: sqlite3.Connection,
+    retention_days: Optional[int] = None,
+    max_events: Optional[int] = None,
+) -> int:
+    """
+    Apply the retention policy (age, then row cap). Does not commit.
+
+    Args:
+        conn: Open connection.
+        retention_days: Keep events newer than this (default:
+            ``activity.retention_days``; 0 disables the age limit).
+        max_events: Keep at most this many newest events (default:
+            ``activity.max_events``; 0 disables the cap).
+
+    Returns:
+        Number of events deleted.
+    """
+    default_days, default_max = _retention()
+    retention_days = default_days if retention_days is None else retention_days
+    max_events = default_max if max_events is None else max_events
+
+    deleted = 0
+    if retention_days > 0:
+        deleted += conn.execute(
+            "DELETE FROM activity_events WHERE created_at < datetime('now', ?)",
+            (f"-{retention_days} days",),
+        ).rowcount
+    if max_events > 0:
+        deleted += conn.execute(
+            """DELETE FROM activity_events WHERE id IN (
+                   SELECT id FROM activity_events
+                   ORDER BY created_at DESC, id DESC
+                   LIMIT -1 OFFSET ?
+               )""",
+            (max_events,),
+        ).rowcount
+    if deleted:
+        logger.info("Pruned %d activity events", deleted)
+    return deleted
+
+
+def backfill_activity(conn: sqlite3.Connection) -> Dict[str, int]:
+    """
+    Copy existing log rows into ``activity_events`` (idempotent), then prune.
+
+    Log tables that do not exist on this database are skipped.
+
+    Returns:
+        Dict mapping log table to the number of events inserted.
+    """
+    existing = {
+        r[0] for r in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table'"
+        ).fetchall()
+    }
+    if "activity_events" not in existing:
+        return {}
+
+    retention_days, max_events = _retention()
+    inserted: Dict[str, int] = {}
+    for table, select in _BACKFILL_QUERIES.items():
+        if table not in existing:
+            continue
+        # Only copy what the retention policy would keep
+        cur = conn.execute(
+            f"""INSERT OR IGNORE INTO activity_events
+                (source, action, detail, source_table, source_id, created_at)
+                SELECT source, action, detail, ?, source_id, created_at
+                FROM ({select})
+                WHERE ? = 0 OR created_at >= datetime('now', ?)
+                ORDER BY created_at DESC
+                LIMIT ?""",
+            (table, retention_days, f"-{retention_days} days", max_events or -1),
+        )
+        inserted[table] = cur.rowcount
+    prune_activity(conn)
+    conn.commit()
+
+    total = sum(inserted.values())
+    if total:
+        logger.info("Backfilled %d activity events", total)
+    return inserted
+
@@ -2,18 +2,135 @@
 Configuration management for QMS.
 
 Loads config.yaml and provides type-safe access to settings.
+
+The parsed file is held in an immutable, versioned ``ConfigSnapshot``.
+``get_config()`` re-stats config.yaml at most every
+``QMS_CONFIG_CHECK_SECONDS`` (default 1s) and swaps in a new snapshot when
+its mtime or size changes, so long-running web workers pick up edits
+without a restart. Derived views (branding, web modules, compiled
+document-type patterns) are computed once per snapshot and reused until
+the version changes.
 """
 
+import os
+import shutil
+import tempfile
+import threading
+import time
 import yaml
+from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
 # Config file location — lives alongside the qms package
 _PACKAGE_DIR = Path(__file__).parent.parent.resolve()
 CONFIG_PATH = _PACKAGE_DIR / "config.yaml"
 
-# Cache for loaded config
-_config_cache: Optional[Dict[str, Any]] = None
+# How often (seconds) get_config() re-checks config.yaml for changes
+_CHECK_INTERVAL = float(os.environ.get("QMS_CONFIG_CHECK_SECONDS", "1"))
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """
+    One parsed version of config.yaml.
+
+    Treat ``data`` as read-only: it is shared by every caller holding this
+    snapshot. Write changes with ``update_config_section()``.
+    """
+
+    version: int
+    data: Dict[str, Any]
+    mtime_ns: int = 0
+    size: int = 0
+    loaded_at: float = field(default_factory=time.time)
+    _derived: Dict[str, Any] = field(default_factory=dict, repr=False, compare=False)
+    _derived_lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def derive(self, key: str, builder: Callable[[Dict[str, Any]], Any]) -> Any:
+        """
+        Return ``builder(data)``, computed once per snapshot and cached under *key*.
+
+        Lets other modules hang their own derived views (e.g. compiled
+        regexes) off the snapshot so they are rebuilt only on reload.
+        """
+        try:
+            return self._derived[key]
+        except KeyError:
+            pass
+        with self._derived_lock:
+            if key not in self._derived:
+                self._derived[key] = builder(self.data)
+            return self._derived[key]
+
+    @cached_property
+    def branding(self) -> Dict[str, Any]:
+        return _build_branding(self.data)
+
+    @cached_property
+    def web_modules(self) -> Dict[str, Dict[str, str]]:
+        return self.data.get("web_modules", _WEB_MODULES_DEFAULTS)
+
+
+# Current snapshot and reload bookkeeping
+_snapshot: Optional[ConfigSnapshot] = None
+_snapshot_lock = threading.RLock()
+_last_check = 0.0
+_version = 0
+
+
+def _stat_config() -> Tuple[int, int]:
+    st = CONFIG_PATH.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def _install(data: Optional[Dict[str, Any]], mtime_ns: int, size: int) -> ConfigSnapshot:
+    """Publish a new snapshot (caller holds _snapshot_lock)."""
+    global _snapshot, _version
+    _version += 1
+    _snapshot = ConfigSnapshot(version=_version, data=data or {}, mtime_ns=mtime_ns, size=size)
+    return _snapshot
+
+
+def _load() -> ConfigSnapshot:
+    if not CONFIG_PATH.exists():
+        raise FileNotFoundError(f"Config file not found: {CONFIG_PATH}")
+    mtime_ns, size = _stat_config()
+    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f)
+    return _install(data, mtime_ns, size)
+
+
+def get_snapshot(reload: bool = False) -> ConfigSnapshot:
+    """
+    Return the current config snapshot, reloading if config.yaml changed.
+
+    Args:
+        reload: Force a reload from disk regardless of mtime.
+    """
+    global _last_check
+    snap = _snapshot
+    now = time.monotonic()
+    if snap is not None and not reload and now - _last_check < _CHECK_INTERVAL:
+        return snap
+
+    with _snapshot_lock:
+        snap = _snapshot
+        if snap is None or reload:
+            _last_check = now
+            return _load()
+        if now - _last_check < _CHECK_INTERVAL:
+            return snap
+        _last_check = now
+        try:
+            changed = _stat_config() != (snap.mtime_ns, snap.size)
+        except OSError:
+            # File briefly missing (editor save-by-rename) -- keep the old snapshot
+            return snap
+        return _load() if changed else snap
 
 
 def get_config(reload: bool = False) -> Dict[str, Any]:
@@ -24,20 +141,14 @@ def get_config(reload: bool = False) -> Dict[str, Any]:
         reload: Force reload even if cached
 
     Returns:
-        Configuration dictionary
+        Configuration dictionary (shared -- do not mutate)
     """
-    global _config_cache
+    return get_snapshot(reload=reload).data
 
-    if _config_cache is not None and not reload:
-        return _config_cache
 
-    if not CONFIG_PATH.exists():
-        raise FileNotFoundError(f"Config file not found: {CONFIG_PATH}")
-
-    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-        _config_cache = yaml.safe_load(f)
-
-    return _config_cache
+def get_config_version() -> int:
+    """Return the version number of the current config snapshot."""
+    return get_snapshot().version
 
 
 def get_config_value(*keys: str, default: Any = None) -> Any:
@@ -100,7 +211,12 @@ def update_config_section(section_path: str, data: dict) -> None:
     Raises:
         KeyError: If the section path doesn't exist in config
     """
-    global _config_cache
+    with _snapshot_lock:
+        _update_config_section(section_path, data)
+
+
+def _update_config_section(section_path: str, data: dict) -> None:
+    global _last_check
 
     # Always reload from disk to avoid overwriting concurrent changes
     with open(CONFIG_PATH, "r", encoding="utf-8") as f:
@@ -129,17 +245,45 @@ def update_config_section(section_path: str, data: dict) -> None:
     else:
         target[last_key] = data
 
-    # Write back to disk
-    with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-        yaml.safe_dump(config, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
-
-    # Invalidate cache so next get_config() reloads from disk
-    _config_cache = None
-
+    # Write to a temp file and rename so readers never see a partial file
+    fd, tmp = tempfile.mkstemp(prefix=".config-", suffix=".yaml", dir=CONFIG_PATH.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            yaml.safe_dump(config, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+        # mkstemp creates 0600; keep the original file's permissions
+        shutil.copymode(CONFIG_PATH, tmp)
+        _replace_file(tmp, CONFIG_PATH)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+    # Publish what was just written as the next snapshot (no re-read)
+    _install(config, *_stat_config())
+    _last_check = time.monotonic()
+
+
+def _replace_file(src: str, dest: Path, attempts: int = 5) -> None:
+    """
+    Atomically move *src* over *dest*.
 
-def get_branding() -> Dict[str, Any]:
-    """Return merged branding config (config.yaml overrides defaults)."""
-    cfg = get_config().get("branding", {})
+    On Windows ``os.replace`` raises PermissionError while another process
+    has *dest* open; retry briefly, then fall back to copying the contents
+    over *dest* in place (not atomic, but the write is not lost).
+    """
+    for attempt in range(attempts):
+        try:
+            os.replace(src, dest)
+            return
+        except PermissionError:
+            if attempt < attempts - 1:
+                time.sleep(0.05 * (2 ** attempt))
+    shutil.copyfile(src, dest)
+    os.unlink(src)
+
+
+def _build_branding(config: Dict[str, Any]) -> Dict[str, Any]:
+    cfg = config.get("branding", {})
     result = {}
     for key, default in _BRANDING_DEFAULTS.items():
         if isinstance(default, dict):
@@ -151,6 +295,11 @@ def get_branding() -> Dict[str, Any]:
     return result
 
 
+def get_branding() -> Dict[str, Any]:
+    """Return merged branding config (config.yaml overrides defaults)."""
+    return get_snapshot().branding
+
+
 _WEB_MODULES_DEFAULTS = {
     "projects": {"label": "Projects", "default_endpoint": "projects.dashboard"},
     "welding": {"label": "Welding", "default_endpoint": "welding.dashboard"},
@@ -161,7 +310,7 @@ _WEB_MODULES_DEFAULTS = {
 
 def get_web_modules() -> Dict[str, Dict[str, str]]:
     """Return the web_modules registry from config.yaml (or defaults)."""
-    return get_config().get("web_modules", _WEB_MODULES_DEFAULTS)
+    return get_snapshot().web_modules
 
 
 class QMSPaths:
@@ -180,8 +329,8 @@ class QMSPaths:
         self._config = None
 
     def _ensure_config(self):
-        if self._config is None:
-            self._config = get_config()
+        # Cheap: follows the current snapshot so path edits apply on reload
+        self._config = get_config()
 
     def _resolve(self, raw: str) -> Path:
         """Resolve a path: if relative, resolve against _PACKAGE_DIR."""
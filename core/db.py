@@ -5,12 +5,28 @@ Provides connection management, query execution, and schema migration.
 Single source of truth for all database operations.
 """
 
+import atexit
+import os
 import sqlite3
+import threading
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Generator
+from itertools import islice
+from typing import Any, Dict, Generator, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
 
-from qms.core.config import QMS_PATHS
+from qms.core import profiler
+from qms.core.config import QMS_PATHS, get_config_value
+
+# Upper bound on pooled connections across all threads (each thread may hold
+# one read-only and one read-write connection per database file).
+_DEFAULT_POOL_SIZE = 32
+
+# sqlite3 compiles each distinct SQL string once per connection and keeps it
+# in an LRU of this size (Python's default is 128).
+_DEFAULT_STMT_CACHE = 256
+
+# Rows per executemany() call in the bulk helpers
+_DEFAULT_BULK_BATCH = 500
 
 
 def get_db_path() -> Path:
@@ -18,34 +34,388 @@ def get_db_path() -> Path:
     return QMS_PATHS.database
 
 
-@contextmanager
-def get_db(readonly: bool = False) -> Generator[sqlite3.Connection, None, None]:
+# ---------------------------------------------------------------------------
+# Performance profiles
+# ---------------------------------------------------------------------------
+
+# Named PRAGMA presets applied to every new connection. Select one with
+# database.performance.preset in config.yaml or QMS_DB_PROFILE for a single
+# process (e.g. ``QMS_DB_PROFILE=bulk_import qms welding import ...``).
+PERFORMANCE_PRESETS: Dict[str, Dict[str, Any]] = {
+    # SQLite defaults plus a busy timeout -- durable, slowest
+    "safe": {
+        "synchronous": "FULL",
+        "busy_timeout": 5000,
+    },
+    # Concurrent web workers + queue/CLI writers; NORMAL is crash-safe in WAL
+    "web": {
+        "synchronous": "NORMAL",
+        "cache_size": -16000,          # ~16 MB page cache
+        "mmap_size": 268435456,        # 256 MB
+        "temp_store": "MEMORY",
+        "busy_timeout": 10000,
+    },
+    # Large single-writer imports; fewer checkpoints, bigger cache
+    "bulk_import": {
+        "synchronous": "NORMAL",
+        "cache_size": -65536,          # ~64 MB page cache
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+        "busy_timeout": 30000,
+        "wal_autocheckpoint": 10000,
+    },
+}
+
+# PRAGMAs a profile may set; anything else in config is rejected
+_PERFORMANCE_PRAGMAS = (
+    "synchronous",
+    "cache_size",
+    "mmap_size",
+    "temp_store",
+    "busy_timeout",
+    "wal_autocheckpoint",
+)
+
+_PRAGMA_KEYWORDS = {
+    "synchronous": ("OFF", "NORMAL", "FULL", "EXTRA"),
+    "temp_store": ("DEFAULT", "FILE", "MEMORY"),
+}
+
+
+def get_performance_profile_name() -> str:
+    """Return the active profile name (QMS_DB_PROFILE env var > config > 'web')."""
+    env = os.environ.get("QMS_DB_PROFILE")
+    if env:
+        return env.strip()
+    return get_config_value("database", "performance", "preset", default="web")
+
+
+def get_performance_pragmas(profile: Optional[str] = None) -> Dict[str, Any]:
     """
-    Context manager for database connections.
+    Resolve the PRAGMAs for a performance profile.
 
-    Enables foreign keys and Row factory automatically.
+    The named preset is applied first, then any ``database.performance.pragmas``
+    overrides from config.yaml.
 
     Args:
-        readonly: Open in read-only mode (useful for queries)
+        profile: Preset name (default: the active profile).
 
-    Yields:
-        sqlite3.Connection with Row factory enabled
+    Returns:
+        Dict mapping PRAGMA name to value, in application order.
+
+    Raises:
+        ValueError: Unknown preset, PRAGMA name, or value.
     """
-    db_path = get_db_path()
+    name = profile or get_performance_profile_name()
+    if name not in PERFORMANCE_PRESETS:
+        raise ValueError(
+            f"Unknown database performance preset: {name} "
+            f"(valid: {', '.join(PERFORMANCE_PRESETS)})"
+        )
+
+    pragmas = dict(PERFORMANCE_PRESETS[name])
+    overrides = get_config_value("database", "performance", "pragmas", default=None) or {}
+    pragmas.update(overrides)
+
+    for key, value in pragmas.items():
+        if key not in _PERFORMANCE_PRAGMAS:
+            raise ValueError(f"Unsupported performance PRAGMA: {key}")
+        if key in _PRAGMA_KEYWORDS:
+            if str(value).upper() not in _PRAGMA_KEYWORDS[key]:
+                raise ValueError(f"Invalid value for PRAGMA {key}: {value}")
+            pragmas[key] = str(value).upper()
+        elif isinstance(value, bool) or not isinstance(value, int):
+            raise ValueError(f"PRAGMA {key} must be an integer, got {value!r}")
+
+    return pragmas
+
+
+def _open_connection(db_path: Path, readonly: bool, shared: bool = False) -> sqlite3.Connection:
+    """
+    Open a new SQLite connection with the standard QMS PRAGMAs applied.
+
+    Args:
+        db_path: Database file to open.
+        readonly: Open in read-only mode.
+        shared: Allow the connection to be closed from another thread
+            (pooled connections are closed by ``close_pool()``).
+    """
+    # Query profiling / request metrics are opt-in; plain connections pay nothing
+    full_profiling = profiler.is_enabled()
+    instrumented = full_profiling or profiler.request_metrics_enabled()
+    factory = profiler.ProfilingConnection if instrumented else sqlite3.Connection
+
+    # Per-connection prepared-statement LRU; pooled connections keep it warm
+    cached = int(get_config_value("database", "statement_cache_size", default=_DEFAULT_STMT_CACHE))
 
     if readonly:
         uri = f"file:{db_path}?mode=ro"
-        conn = sqlite3.connect(uri, uri=True)
+        conn = sqlite3.connect(
+            uri, uri=True, check_same_thread=not shared, factory=factory, cached_statements=cached
+        )
     else:
-        conn = sqlite3.connect(str(db_path))
+        conn = sqlite3.connect(
+            str(db_path), check_same_thread=not shared, factory=factory, cached_statements=cached
+        )
+    if instrumented:
+        conn._qms_db_path = str(db_path)
+        conn._qms_full = full_profiling
 
     try:
         conn.execute("PRAGMA foreign_keys = ON")
         conn.execute("PRAGMA journal_mode = WAL")
+        # Names and values are validated against an allow-list above
+        for name, value in get_performance_pragmas().items():
+            conn.execute(f"PRAGMA {name} = {value}")
         conn.row_factory = sqlite3.Row
+    except Exception:
+        conn.close()
+        raise
+    return conn
+
+
+def _is_healthy(conn: sqlite3.Connection) -> bool:
+    """Return True if *conn* is still open and answering queries."""
+    try:
+        conn.execute("SELECT 1").fetchone()
+        return True
+    except (sqlite3.Error, sqlite3.ProgrammingError):
+        return False
+
+
+# ---------------------------------------------------------------------------
+# Connection pool
+# ---------------------------------------------------------------------------
+
+_PoolKey = Tuple[int, str, bool]
+
+
+class ConnectionPool:
+    """
+    Thread-local cache of open SQLite connections.
+
+    Each thread keeps at most one read-only and one read-write connection per
+    database file. Connections are health-checked when handed out and reset
+    (open transaction rolled back, Row factory and foreign key enforcement
+    restored) when returned, so a pooled connection behaves like a freshly
+    opened one.
+
+    A nested ``get_db()`` on a thread whose pooled connection is already
+    checked out gets a private, unpooled connection -- the inner block must
+    not share (or roll back) the outer block's transaction. When the pool is
+    full, connections belonging to dead threads are evicted; if it is still
+    full, the caller gets an unpooled connection.
+    """
+
+    def __init__(self, max_size: int = _DEFAULT_POOL_SIZE):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._conns: Dict[_PoolKey, sqlite3.Connection] = {}
+        self.stats: Dict[str, int] = {"opened": 0, "reused": 0, "overflow": 0, "discarded": 0}
+
+    def _in_use(self) -> Set[Tuple[str, bool]]:
+        in_use = getattr(self._local, "in_use", None)
+        if in_use is None:
+            in_use = self._local.in_use = set()
+        return in_use
+
+    def acquire(self, db_path: Path, readonly: bool) -> Tuple[sqlite3.Connection, bool]:
+        """
+        Check out a connection for the current thread.
+
+        Returns:
+            Tuple of (connection, pooled). Unpooled connections must be
+            closed by the caller; ``release()`` handles both cases.
+        """
+        key = (str(db_path), readonly)
+        in_use = self._in_use()
+        if key in in_use:
+            return _open_connection(db_path, readonly), False
+
+        pool_key = (threading.get_ident(),) + key
+        with self._lock:
+            conn = self._conns.get(pool_key)
+
+        if conn is not None:
+            if _is_healthy(conn):
+                self.stats["reused"] += 1
+            else:
+                self._discard(pool_key)
+                conn = None
+
+        if conn is None:
+            with self._lock:
+                if len(self._conns) >= self.max_size:
+                    self._prune_dead_threads()
+                if len(self._conns) >= self.max_size:
+                    self.stats["overflow"] += 1
+                    return _open_connection(db_path, readonly), False
+                conn = _open_connection(db_path, readonly, shared=True)
+                self._conns[pool_key] = conn
+                self.stats["opened"] += 1
+
+        in_use.add(key)
+        return conn, True
+
+    def release(self, conn: sqlite3.Connection, db_path: Path, readonly: bool, pooled: bool) -> None:
+        """Return a connection obtained from ``acquire()``."""
+        if not pooled:
+            conn.close()
+            return
+
+        key = (str(db_path), readonly)
+        self._in_use().discard(key)
+        try:
+            # Match close() semantics: uncommitted work is discarded
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = sqlite3.Row
+            # e.g. a migration that turned enforcement off and then raised
+            if not conn.execute("PRAGMA foreign_keys").fetchone()[0]:
+                conn.execute("PRAGMA foreign_keys = ON")
+        except (sqlite3.Error, sqlite3.ProgrammingError):
+            self._discard((threading.get_ident(),) + key)
+
+    def _discard(self, pool_key: _PoolKey) -> None:
+        with self._lock:
+            conn = self._conns.pop(pool_key, None)
+        if conn is not None:
+            self.stats["discarded"] += 1
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def _prune_dead_threads(self) -> None:
+        """Close connections owned by threads that have exited. Caller holds the lock."""
+        alive = {t.ident for t in threading.enumerate()}
+        for pool_key in [k for k in self._conns if k[0] not in alive]:
+            conn = self._conns.pop(pool_key)
+            self.stats["discarded"] += 1
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def size(self) -> int:
+        """Number of connections currently held by the pool."""
+        with self._lock:
+            return len(self._conns)
+
+    def close_all(self) -> None:
+        """Close every pooled connection (checkpoints the WAL on last close)."""
+        with self._lock:
+            conns = list(self._conns.values())
+            self._conns.clear()
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_enabled: Optional[bool] = None
+_pool_lock = threading.Lock()
+
+
+def _pooling_enabled() -> bool:
+    """Resolve pooling: configure_pool() > QMS_DB_POOL env var > config.yaml."""
+    if _pool_enabled is not None:
+        return _pool_enabled
+    env = os.environ.get("QMS_DB_POOL")
+    if env is not None:
+        return env.strip().lower() not in ("0", "false", "no", "off")
+    return bool(get_config_value("database", "pool", "enabled", default=True))
+
+
+def _get_pool() -> Optional[ConnectionPool]:
+    """Return the process-wide pool, or None when pooling is disabled."""
+    global _pool
+    if not _pooling_enabled():
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                max_size = get_config_value(
+                    "database", "pool", "max_connections", default=_DEFAULT_POOL_SIZE
+                )
+                _pool = ConnectionPool(max_size=int(max_size))
+    return _pool
+
+
+def configure_pool(enabled: Optional[bool] = None, max_size: Optional[int] = None) -> None:
+    """
+    Override pool settings at runtime (e.g. disable pooling in tests).
+
+    Any existing pooled connections are closed.
+
+    Args:
+        enabled: True/False to force pooling on/off, None to follow config.
+        max_size: New pool size (None keeps the configured value).
+    """
+    global _pool, _pool_enabled
+    close_pool()
+    _pool_enabled = enabled
+    if max_size is not None:
+        with _pool_lock:
+            _pool = ConnectionPool(max_size=max_size)
+
+
+def close_pool() -> None:
+    """Close all pooled connections and drop the pool."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close_all()
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Return pool counters (opened, reused, overflow, discarded, size)."""
+    pool = _pool
+    if pool is None or not _pooling_enabled():
+        return {"enabled": _pooling_enabled(), "size": 0}
+    return {"enabled": True, "size": pool.size(), "max_size": pool.max_size, **pool.stats}
+
+
+atexit.register(close_pool)
+
+
+@contextmanager
+def get_db(readonly: bool = False) -> Generator[sqlite3.Connection, None, None]:
+    """
+    Context manager for database connections.
+
+    Enables foreign keys and Row factory automatically. Connections are
+    served from a per-thread pool unless pooling is disabled (see
+    ``configure_pool()``); uncommitted changes are rolled back on exit
+    either way.
+
+    Args:
+        readonly: Open in read-only mode (useful for queries)
+
+    Yields:
+        sqlite3.Connection with Row factory enabled
+    """
+    db_path = get_db_path()
+    pool = _get_pool()
+    profiler.note_connection()
+
+    if pool is None:
+        conn = _open_connection(db_path, readonly)
+        try:
+            yield conn
+        finally:
+            conn.close()
+        return
+
+    conn, pooled = pool.acquire(db_path, readonly)
+    try:
         yield conn
     finally:
-        conn.close()
+        pool.release(conn, db_path, readonly, pooled)
 
 
 def execute_query(query: str, params: tuple = (), readonly: bool = True) -> list:
@@ -65,6 +435,295 @@ def execute_query(query: str, params: tuple = (), readonly: bool = True) -> list
         return cursor.fetchall()
 
 
+# ---------------------------------------------------------------------------
+# Bulk writes
+# ---------------------------------------------------------------------------
+
+_ON_CONFLICT = {None: "INSERT", "abort": "INSERT", "ignore": "INSERT OR IGNORE",
+                "replace": "INSERT OR REPLACE"}
+
+
+def table_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    """
+    Return the column names of *table* from ``PRAGMA table_info``.
+
+    Raises:
+        ValueError: If the table does not exist.
+    """
+    cols = [r[1] for r in conn.execute("SELECT * FROM pragma_table_info(?)", (table,))]
+    if not cols:
+        raise ValueError(f"Unknown table: {table}")
+    return cols
+
+
+def _validate_columns(conn: sqlite3.Connection, table: str, columns: Sequence[str]) -> None:
+    known = set(table_columns(conn, table))
+    unknown = [c for c in columns if c not in known]
+    if unknown:
+        raise ValueError(f"Unknown column(s) for {table}: {', '.join(unknown)}")
+
+
+def _bulk_batch_size(batch_size: Optional[int]) -> int:
+    if batch_size is None:
+        batch_size = int(get_config_value("database", "bulk", "batch_size", default=_DEFAULT_BULK_BATCH))
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+    return batch_size
+
+
+def executemany_chunked(
+    conn: sqlite3.Connection,
+    sql: str,
+    params: Iterable[Sequence[Any]],
+    batch_size: Optional[int] = None,
+    commit: bool = True,
+) -> int:
+    """
+    Run *sql* for every parameter set, ``batch_size`` rows per ``executemany``.
+
+    All chunks run in one transaction. If the caller already has a
+    transaction open it is left open for the caller to commit; otherwise the
+    batch is committed (``commit=True``) or rolled back on error.
+
+    Args:
+        conn: Open read-write connection.
+        sql: Parameterised DML statement.
+        params: Iterable of parameter tuples (or dicts for named placeholders);
+            consumed lazily, so generators stream without materialising.
+        batch_size: Rows per chunk (default: ``database.bulk.batch_size``).
+        commit: Commit when this call opened the transaction.
+
+    Returns:
+        Total rows affected.
+    """
+    size = _bulk_batch_size(batch_size)
+    owns_txn = not conn.in_transaction
+    it = iter(params)
+    total = 0
+    try:
+        while True:
+            chunk = list(islice(it, size))
+            if not chunk:
+                break
+            cur = conn.executemany(sql, chunk)
+            total += max(cur.rowcount, 0)
+        if owns_txn and commit:
+            conn.commit()
+    except BaseException:
+        if owns_txn:
+            conn.rollback()
+        raise
+    return total
+
+
+def _row_tuples(rows: Iterable[Any], columns: Sequence[str]) -> Generator[tuple, None, None]:
+    for i, row in enumerate(rows):
+        if isinstance(row, Mapping):
+            try:
+                yield tuple(row[c] for c in columns)
+            except KeyError as exc:
+                raise ValueError(f"Row {i} is missing column {exc.args[0]!r}") from None
+        else:
+            if len(row) != len(columns):
+                raise ValueError(f"Row {i} has {len(row)} values, expected {len(columns)}")
+            yield tuple(row)
+
+
+def _resolve_bulk_columns(rows: Iterable[Any], columns: Optional[Sequence[str]]):
+    """Return (columns, rows) -- peeking at the first dict row when columns is None."""
+    it = iter(rows)
+    if columns is not None:
+        return list(columns), it
+    first = next(it, None)
+    if first is None:
+        return [], iter(())
+    if not isinstance(first, Mapping):
+        raise ValueError("columns is required when rows are sequences")
+
+    def _chain():
+        yield first
+        yield from it
+
+    return list(first.keys()), _chain()
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+@contextmanager
+def _bulk_conn(conn: Optional[sqlite3.Connection]) -> Generator[sqlite3.Connection, None, None]:
+    if conn is not None:
+        yield conn
+    else:
+        with get_db() as own:
+            yield own
+
+
+def bulk_insert(
+    table: str,
+    rows: Iterable[Any],
+    *,
+    columns: Optional[Sequence[str]] = None,
+    on_conflict: Optional[str] = None,
+    conn: Optional[sqlite3.Connection] = None,
+    batch_size: Optional[int] = None,
+    commit: bool = True,
+) -> int:
+    """
+    Insert many rows with chunked ``executemany`` in a single transaction.
+
+    Args:
+        table: Target table.
+        rows: Dicts keyed by column (columns taken from the first row), or
+            sequences matching *columns*.
+        columns: Column order; required when rows are sequences.
+        on_conflict: ``None``/``"abort"`` (plain INSERT), ``"ignore"`` or
+            ``"replace"``.
+        conn: Connection to use (default: a new ``get_db()`` connection).
+        batch_size: Rows per ``executemany`` (default: ``database.bulk.batch_size``).
+        commit: Commit when this call opened the transaction.
+
+    Returns:
+        Number of rows inserted (ignored conflicts are not counted).
+
+    Raises:
+        ValueError: Unknown table/column, bad *on_conflict*, or ragged rows.
+    """
+    if on_conflict not in _ON_CONFLICT:
+        raise ValueError(f"Unsupported on_conflict: {on_conflict!r}")
+    cols, row_iter = _resolve_bulk_columns(rows, columns)
+    if not cols:
+        return 0
+
+    with _bulk_conn(conn) as c:
+        _validate_columns(c, table, cols)
+        sql = (
+            f"{_ON_CONFLICT[on_conflict]} INTO {_quote(table)} "
+            f"({', '.join(_quote(col) for col in cols)}) "
+            f"VALUES ({', '.join('?' * len(cols))})"
+        )
+        return executemany_chunked(c, sql, _row_tuples(row_iter, cols), batch_size, commit)
+
+
+def bulk_upsert(
+    table: str,
+    rows: Iterable[Any],
+    key_columns: Sequence[str],
+    *,
+    update_columns: Optional[Sequence[str]] = None,
+    columns: Optional[Sequence[str]] = None,
+    conn: Optional[sqlite3.Connection] = None,
+    batch_size: Optional[int] = None,
+    commit: bool = True,
+) -> int:
+    """
+    Insert rows, updating existing ones that collide on *key_columns*.
+
+    Uses ``INSERT ... ON CONFLICT(key_columns) DO UPDATE``, so *key_columns*
+    must match a PRIMARY KEY or UNIQUE index on *table*.
+
+    Args:
+        table: Target table.
+        rows: Dicts keyed by column, or sequences matching *columns*.
+        key_columns: Conflict target columns.
+        update_columns: Columns overwritten on conflict (default: every
+            non-key column supplied). Empty means ``DO NOTHING``.
+        columns: Column order; required when rows are sequences.
+        conn: Connection to use (default: a new ``get_db()`` connection).
+        batch_size: Rows per ``executemany`` (default: ``database.bulk.batch_size``).
+        commit: Commit when this call opened the transaction.
+
+    Returns:
+        Number of rows inserted or updated.
+    """
+    cols, row_iter = _resolve_bulk_columns(rows, columns)
+    if not cols:
+        return 0
+    missing = [k for k in key_columns if k not in cols]
+    if missing:
+        raise ValueError(f"Key column(s) not in rows: {', '.join(missing)}")
+    if update_columns is None:
+        update_columns = [c for c in cols if c not in key_columns]
+
+    with _bulk_conn(conn) as c:
+        _validate_columns(c, table, list(cols) + list(update_columns))
+        if update_columns:
+            action = "DO UPDATE SET " + ", ".join(
+                f"{_quote(col)} = excluded.{_quote(col)}" for col in update_columns
+            )
+        else:
+            action = "DO NOTHING"
+        sql = (
+            f"INSERT INTO {_quote(table)} ({', '.join(_quote(col) for col in cols)}) "
+            f"VALUES ({', '.join('?' * len(cols))}) "
+            f"ON CONFLICT({', '.join(_quote(k) for k in key_columns)}) {action}"
+        )
+        return executemany_chunked(c, sql, _row_tuples(row_iter, cols), batch_size, commit)
+
+
+_SYNCHRONOUS_NAMES = {0: "OFF", 1: "NORMAL", 2: "FULL", 3: "EXTRA"}
+_TEMP_STORE_NAMES = {0: "DEFAULT", 1: "FILE", 2: "MEMORY"}
+
+
+def get_db_status(checkpoint: str = "PASSIVE") -> Dict[str, Any]:
+    """
+    Report effective connection PRAGMAs and WAL checkpoint state.
+
+    Opens a connection the same way ``get_db()`` does, so the values reflect
+    the active performance profile and config overrides.
+
+    Args:
+        checkpoint: WAL checkpoint mode to run while sampling: ``PASSIVE``
+            (never blocks, default) or ``TRUNCATE`` (also resets the WAL file).
+
+    Returns:
+        Dict with 'path', 'profile', 'pragmas', 'wal', 'size_mb', and 'pool' keys.
+    """
+    mode = checkpoint.upper()
+    if mode not in ("PASSIVE", "TRUNCATE"):
+        raise ValueError(f"Unsupported checkpoint mode: {checkpoint}")
+
+    db_path = get_db_path()
+    status: Dict[str, Any] = {
+        "path": str(db_path),
+        "profile": get_performance_profile_name(),
+        "pragmas": {},
+        "wal": {},
+    }
+
+    with get_db() as conn:
+        for name in ("journal_mode", "foreign_keys", "page_size") + _PERFORMANCE_PRAGMAS:
+            status["pragmas"][name] = conn.execute(f"PRAGMA {name}").fetchone()[0]
+        status["pragmas"]["synchronous"] = _SYNCHRONOUS_NAMES.get(
+            status["pragmas"]["synchronous"], status["pragmas"]["synchronous"]
+        )
+        status["pragmas"]["temp_store"] = _TEMP_STORE_NAMES.get(
+            status["pragmas"]["temp_store"], status["pragmas"]["temp_store"]
+        )
+
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        busy, log_frames, checkpointed = conn.execute(
+            f"PRAGMA wal_checkpoint({mode})"
+        ).fetchone()
+
+    page_size = status["pragmas"]["page_size"]
+    status["size_mb"] = round(page_count * page_size / 1024 / 1024, 2)
+    status["freelist_pages"] = freelist
+
+    wal_path = Path(f"{db_path}-wal")
+    status["wal"] = {
+        "mode": mode,
+        "busy": bool(busy),
+        "log_frames": log_frames,
+        "checkpointed_frames": checkpointed,
+        "file_mb": round(wal_path.stat().st_size / 1024 / 1024, 2) if wal_path.exists() else 0.0,
+    }
+    status["pool"] = get_pool_stats()
+    return status
+
+
 # Schema dependency order — foreign keys flow downhill through this list.
 SCHEMA_ORDER = [
     "auth",
@@ -186,3 +845,20 @@ def migrate_all():
         logger.info("Equipment hierarchy migration applied")
     except Exception as exc:
         logger.warning("Equipment hierarchy migration failed (non-fatal): %s", exc)
+
+    # Quality issue full-text index for rows created before the FTS table
+    try:
+        from qms.quality.db import backfill_issue_fts
+        with get_db() as fts_conn:
+            backfill_issue_fts(fts_conn)
+    except Exception as exc:
+        logger.warning("Quality issue FTS backfill failed (non-fatal): %s", exc)
+
+    # Activity feed backfill from the per-module log tables (idempotent)
+    try:
+        from qms.core.activity import backfill_activity
+        with get_db() as act_conn:
+            backfill_activity(act_conn)
+        logger.info("Activity feed backfill applied")
+    except Exception as exc:
+        logger.warning("Activity feed backfill failed (non-fatal): %s", exc)
@@ -2,22 +2,225 @@
 Logging configuration for QMS.
 
 Provides consistent log formatting across all modules.
+
+Behaviour is driven by the ``logging`` section of config.yaml:
+
+- ``mode: sync`` (default) writes each record to stdout on the calling
+  thread. ``mode: queue`` hands records to a ``QueueHandler`` and a single
+  background ``QueueListener`` does the stdout/file I/O, so batch jobs and
+  Waitress workers never block on a slow console.
+- ``json_file`` adds a JSON-lines sink with size-based rotation
+  (``max_bytes`` / ``backup_count``).
+- ``levels`` maps logger-name prefixes to levels (longest prefix wins).
+
+Every record carries a ``request_id`` attribute (``"-"`` outside a web
+request); the Flask app sets it per request via ``set_request_id()``.
 """
 
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
 import sys
-from typing import Dict
+import threading
+from contextvars import ContextVar, Token
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
 _loggers: Dict[str, logging.Logger] = {}
+_requested_levels: Dict[str, Optional[int]] = {}
+
+_TEXT_FORMAT = "%(asctime)s [%(name)s] %(levelname)s: %(message)s"
+_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_DEFAULTS: Dict[str, Any] = {
+    "mode": "sync",
+    "level": "INFO",
+    "json_file": "",
+    "max_bytes": 10 * 1024 * 1024,
+    "backup_count": 5,
+    "levels": {},
+}
+
+# ---------------------------------------------------------------------------
+# Request-ID correlation
+# ---------------------------------------------------------------------------
+
+_request_id: ContextVar[Optional[str]] = ContextVar("qms_request_id", default=None)
+
+
+def set_request_id(request_id: Optional[str]) -> Token:
+    """Tag log records from the current context with *request_id*."""
+    return _request_id.set(request_id)
+
+
+def reset_request_id(token: Token) -> None:
+    """Restore the request ID that was active before ``set_request_id``."""
+    _request_id.reset(token)
+
+
+def get_request_id() -> Optional[str]:
+    """Return the request ID for the current context, if any."""
+    return _request_id.get()
+
+
+class _RequestIdFilter(logging.Filter):
+    """Stamp ``record.request_id`` on the emitting thread (before queueing)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = _request_id.get() or "-"
+        return True
+
+
+_request_filter = _RequestIdFilter()
+
+
+# ---------------------------------------------------------------------------
+# Formatters / handlers
+# ---------------------------------------------------------------------------
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, message, request_id, exc."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+            "thread": record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps the traceback separate from the message."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
 
 
-def get_logger(name: str, level: int = logging.INFO) -> logging.Logger:
+def _text_handler() -> logging.Handler:
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter(_TEXT_FORMAT, datefmt=_DATE_FORMAT))
+    return handler
+
+
+def _json_handler(settings: Dict[str, Any]) -> Optional[logging.Handler]:
+    raw = settings.get("json_file")
+    if not raw:
+        return None
+    path = Path(raw)
+    if not path.is_absolute():
+        path = Path(__file__).parent.parent / path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handler = logging.handlers.RotatingFileHandler(
+        path,
+        maxBytes=int(settings.get("max_bytes", _DEFAULTS["max_bytes"])),
+        backupCount=int(settings.get("backup_count", _DEFAULTS["backup_count"])),
+        encoding="utf-8",
+    )
+    handler.setFormatter(JsonFormatter())
+    return handler
+
+
+# ---------------------------------------------------------------------------
+# Pipeline state
+# ---------------------------------------------------------------------------
+
+_state_lock = threading.RLock()
+_settings: Optional[Dict[str, Any]] = None
+_shared_handlers: List[logging.Handler] = []  # attached to every qms logger
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _load_settings() -> Dict[str, Any]:
+    settings = dict(_DEFAULTS)
+    try:
+        from qms.core.config import get_config_value
+
+        settings.update(get_config_value("logging", default={}) or {})
+    except Exception:
+        pass  # Config unavailable -- plain stdout logging
+    return settings
+
+
+def _ensure_pipeline() -> Dict[str, Any]:
+    """Build the shared handlers/listener once, from config."""
+    global _settings, _listener
+    if _settings is not None:
+        return _settings
+    with _state_lock:
+        if _settings is not None:
+            return _settings
+        settings = _load_settings()
+        json_handler = _json_handler(settings)
+
+        if settings.get("mode") == "queue":
+            sinks = [_text_handler()]
+            if json_handler:
+                sinks.append(json_handler)
+            q: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+            queue_handler = _QueueHandler(q)
+            queue_handler.addFilter(_request_filter)
+            _shared_handlers.append(queue_handler)
+            _listener = logging.handlers.QueueListener(q, *sinks, respect_handler_level=True)
+            _listener.start()
+            atexit.register(shutdown_logging)
+        elif json_handler:
+            json_handler.addFilter(_request_filter)
+            _shared_handlers.append(json_handler)
+
+        _settings = settings
+        return settings
+
+
+def _to_level(value: Any) -> int:
+    if isinstance(value, int):
+        return value
+    level = logging.getLevelName(str(value).upper())
+    return level if isinstance(level, int) else logging.INFO
+
+
+def _resolve_level(name: str, level: Optional[int], settings: Dict[str, Any]) -> int:
+    """Per-module override (longest matching prefix), else *level*, else config default."""
+    overrides = settings.get("levels") or {}
+    best = None
+    for prefix in overrides:
+        if (name == prefix or name.startswith(prefix + ".")) and (
+            best is None or len(prefix) > len(best)
+        ):
+            best = prefix
+    if best is not None:
+        return _to_level(overrides[best])
+    if level is not None:
+        return level
+    return _to_level(settings.get("level", "INFO"))
+
+
+def get_logger(name: str, level: Optional[int] = None) -> logging.Logger:
     """
     Get a configured logger for a module.
 
     Args:
         name: Logger name (e.g., 'qms.welding', 'qms.workforce')
-        level: Logging level (default: INFO)
+        level: Logging level (default: ``logging.level`` from config, INFO).
+            A matching ``logging.levels`` entry in config takes precedence.
 
     Returns:
         Configured logger
@@ -25,19 +228,50 @@ def get_logger(name: str, level: int = logging.INFO) -> logging.Logger:
     if name in _loggers:
         return _loggers[name]
 
+    settings = _ensure_pipeline()
     logger = logging.getLogger(name)
-    logger.setLevel(level)
+    _requested_levels[name] = level
+    logger.setLevel(_resolve_level(name, level, settings))
 
     if not logger.handlers:
-        handler = logging.StreamHandler(sys.stdout)
-        handler.setLevel(level)
-
-        formatter = logging.Formatter(
-            "%(asctime)s [%(name)s] %(levelname)s: %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
+        if settings.get("mode") != "queue":
+            handler = _text_handler()
+            handler.addFilter(_request_filter)
+            logger.addHandler(handler)
+        for handler in _shared_handlers:
+            logger.addHandler(handler)
 
     _loggers[name] = logger
     return logger
+
+
+def configure_logging(reload: bool = False) -> None:
+    """
+    (Re)apply the ``logging`` config section.
+
+    With *reload*, re-reads config and re-applies per-module levels to every
+    logger already handed out (mode/sink changes need a restart).
+    """
+    global _settings
+    if not reload:
+        _ensure_pipeline()
+        return
+    with _state_lock:
+        fresh = _load_settings()
+        if _settings is not None:
+            for key in ("mode", "json_file", "max_bytes", "backup_count"):
+                fresh[key] = _settings.get(key, fresh[key])
+        _settings = fresh
+        for name, logger in _loggers.items():
+            logger.setLevel(_resolve_level(name, _requested_levels.get(name), fresh))
+
+
+def shutdown_logging() -> None:
+    """Drain the queue and stop the background listener (queue mode)."""
+    global _listener
+    with _state_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+        for handler in _shared_handlers:
+            handler.flush()
@@ -0,0 +1,198 @@
+"""
+Content-addressed cache of model responses.
+
+Extraction re-runs on unchanged drawings and forms send byte-identical
+requests; the gateway answers those from here instead of the API. Entries
+are keyed by ``(backend:model ID, prompt hash, document hash)``: the prompt hash
+covers the text blocks, system prompt and token limit, the document hash
+the attached PDF/image data. Entries older than ``model_gateway.cache.ttl_days``
+are ignored and purged.
+
+Disable with ``model_gateway.cache.enabled: false``, ``QMS_MODEL_CACHE=0``,
+or per run with ``set_enabled(False)`` (the extraction CLIs' ``--no-cache``).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from qms.core.config import QMS_PATHS, get_config_value
+from qms.core.logging import get_logger
+
+logger = get_logger("qms.core.model_cache")
+
+_DEFAULT_TTL_DAYS = 30.0
+
+_enabled: Optional[bool] = None
+
+
+def is_enabled() -> bool:
+    """Resolve caching: set_enabled() > QMS_MODEL_CACHE env var > config.yaml."""
+    if _enabled is not None:
+        return _enabled
+    env = os.environ.get("QMS_MODEL_CACHE")
+    if env is not None:
+        return env.strip().lower() in ("1", "true", "yes", "on")
+    return bool(get_config_value("model_gateway", "cache", "enabled", default=True))
+
+
+def set_enabled(enabled: Optional[bool]) -> None:
+    """Force the response cache on/off at runtime (None follows config)."""
+    global _enabled
+    _enabled = enabled
+
+
+def request_key(request, backend: str = "anthropic") -> Tuple[str, str, str]:
+    """
+    Cache key for a gateway ``ModelRequest`` sent to *backend*.
+
+    Returns:
+        Tuple of ("backend:model_id", prompt_hash, document_hash);
+        document_hash is empty for text-only requests.
+    """
+    blocks = [request.content] if isinstance(request.content, str) else request.content
+    texts = []
+    documents = hashlib.sha256()
+    has_documents = False
+    for block in blocks:
+        if isinstance(block, str):
+            texts.append(block)
+        elif block.get("type") == "text":
+            texts.append(block.get("text", ""))
+        else:
+            source = block.get("source", {})
+            documents.update(str(source.get("media_type", "")).encode("utf-8"))
+            documents.update(str(source.get("data", "")).encode("utf-8"))
+            has_documents = True
+    prompt = json.dumps(
+        {"system": request.system, "max_tokens": request.max_tokens, "text": texts},
+        sort_keys=True,
+    )
+    return (
+        f"{backend}:{request.model_id}",
+        hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+        documents.hexdigest() if has_documents else "",
+    )
+
+
+class ResponseCache:
+    """
+    SQLite store of model responses with a time-to-live.
+
+    One connection is shared by all threads and serialised with a lock.
+    """
+
+    def __init__(self, path: Path, ttl_seconds: float):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS model_responses (
+                model TEXT NOT NULL,
+                prompt_hash TEXT NOT NULL,
+                document_hash TEXT NOT NULL,
+                response TEXT NOT NULL,
+                input_tokens INTEGER NOT NULL DEFAULT 0,
+                output_tokens INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (model, prompt_hash, document_hash)
+            ) WITHOUT ROWID
+        """)
+        self._conn.commit()
+        self.purge_expired()
+
+    def _cutoff(self) -> float:
+        return time.time() - self.ttl_seconds if self.ttl_seconds > 0 else 0.0
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[Dict[str, Any]]:
+        """Return ``{response, input_tokens, output_tokens}`` for a live entry, else None."""
+        with self._lock:
+            row = self._conn.execute(
+                """SELECT response, input_tokens, output_tokens FROM model_responses
+                   WHERE model = ? AND prompt_hash = ? AND document_hash = ?
+                     AND created_at >= ?""",
+                (*key, self._cutoff()),
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return {"response": row[0], "input_tokens": row[1], "output_tokens": row[2]}
+
+    def put(self, key: Tuple[str, str, str], response: str,
+            input_tokens: int = 0, output_tokens: int = 0) -> None:
+        with self._lock:
+            self._conn.execute(
+                """INSERT OR REPLACE INTO model_responses
+                   (model, prompt_hash, document_hash, response,
+                    input_tokens, output_tokens, created_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (*key, response, input_tokens, output_tokens, time.time()),
+            )
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """Delete entries older than the TTL. Returns the number removed."""
+        if self.ttl_seconds <= 0:
+            return 0
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM model_responses WHERE created_at < ?", (self._cutoff(),)
+            ).rowcount
+            self._conn.commit()
+        if removed:
+            logger.info("Purged %d expired model responses", removed)
+        return removed
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        with self._lock:
+            self._conn.execute("DELETE FROM model_responses")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Return entry count and this process's hits/misses."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM model_responses").fetchone()[0]
+        return {"entries": entries, "hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the shared cache, or ``None`` when caching is disabled."""
+    global _cache
+    if not is_enabled():
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                raw = get_config_value("model_gateway", "cache", "path", default="")
+                if raw:
+                    path = Path(raw)
+                    if not path.is_absolute():
+                        path = Path(__file__).parent.parent / path
+                else:
+                    path = QMS_PATHS.database.parent / "model_cache.db"
+                ttl_days = float(get_config_value(
+                    "model_gateway", "cache", "ttl_days", default=_DEFAULT_TTL_DAYS
+                ))
+                _cache = ResponseCache(path, ttl_days * 86400)
+    return _cache
@@ -0,0 +1,503 @@
+"""
+Shared gateway for AI model calls.
+
+Every extractor (drawings, welding forms, SOP classification, mobile capture)
+sends its Claude requests through ``call()`` / ``acall()`` instead of building
+its own ``anthropic.Anthropic()`` client. The gateway provides:
+
+    - One process-wide client (and HTTP connection pool) per backend
+    - Per-model concurrency limits and token-bucket rate limiting
+    - Exponential backoff on 429 (rate limited) and 529 (overloaded)
+    - Per-model latency and token metrics (``get_metrics()``)
+    - Opt-in response cache for repeatable requests (``call(..., cache=True)``,
+      see ``qms.core.model_cache``)
+
+Backends are pluggable: ``anthropic`` (default) or ``stub``, a local backend
+that returns canned text for tests and offline runs. Select with
+``model_gateway.backend`` in config.yaml, ``QMS_MODEL_BACKEND``, or
+``set_backend()`` / ``use_backend()``.
+
+Usage:
+    from qms.core import model_gateway
+
+    text = model_gateway.call(prompt, "sonnet").text
+    text = model_gateway.call(model_gateway.pdf_content(pdf_b64, prompt), "opus").text
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from qms.core import model_cache
+from qms.core.config import get_config_value
+from qms.core.logging import get_logger
+
+logger = get_logger("qms.core.model_gateway")
+
+# Model name -> API model ID
+MODEL_MAP = {
+    "haiku": "claude-haiku-4-5-20251001",
+    "sonnet": "claude-sonnet-4-5-20250929",
+    "opus": "claude-opus-4-6",
+}
+
+# HTTP statuses that are retried with backoff (rate limited, overloaded)
+RETRY_STATUSES = frozenset({429, 529})
+
+# Defaults (overridable under ``model_gateway`` in config.yaml; the limit keys
+# also per model under ``model_gateway.models.<name>``)
+_DEFAULTS: Dict[str, Any] = {
+    "backend": "anthropic",
+    "max_concurrency": 8,
+    "requests_per_minute": 0,
+    "burst": 1,
+    "max_retries": 5,
+    "backoff_base": 1.0,
+    "backoff_max": 60.0,
+    "timeout": 600.0,
+}
+
+Content = Union[str, List[Dict[str, Any]]]
+
+
+def _setting(key: str, model: Optional[str] = None) -> Any:
+    if model is not None:
+        value = get_config_value("model_gateway", "models", model, key, default=None)
+        if value is not None:
+            return value
+    return get_config_value("model_gateway", key, default=_DEFAULTS[key])
+
+
+# ---------------------------------------------------------------------------
+# Requests, responses and content helpers
+# ---------------------------------------------------------------------------
+
+@dataclass
+class ModelRequest:
+    """A single-turn request as seen by a backend."""
+    model: str
+    model_id: str
+    content: Content
+    max_tokens: int
+    system: Optional[str] = None
+
+
+@dataclass
+class ModelResponse:
+    """Model output plus call metrics."""
+    text: str
+    model: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    latency_ms: int = 0
+    attempts: int = 1
+    cached: bool = False
+
+
+def pdf_content(pdf_base64: str, prompt: str) -> List[Dict[str, Any]]:
+    """Message content for a base64 PDF document followed by a text prompt."""
+    return [
+        {
+            "type": "document",
+            "source": {
+                "type": "base64",
+                "media_type": "application/pdf",
+                "data": pdf_base64,
+            },
+        },
+        {"type": "text", "text": prompt},
+    ]
+
+
+def image_block(image_base64: str, media_type: str) -> Dict[str, Any]:
+    """Content block for a base64 image."""
+    return {
+        "type": "image",
+        "source": {
+            "type": "base64",
+            "media_type": media_type,
+            "data": image_base64,
+        },
+    }
+
+
+def image_content(image_base64: str, media_type: str, prompt: str) -> List[Dict[str, Any]]:
+    """Message content for a base64 image followed by a text prompt."""
+    return [image_block(image_base64, media_type), {"type": "text", "text": prompt}]
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+class AnthropicBackend:
+    """Anthropic Messages API through one shared, lazily created client."""
+
+    name = "anthropic"
+
+    def __init__(self) -> None:
+        self._client = None
+        self._lock = threading.Lock()
+
+    def _get_client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    try:
+                        import anthropic
+                    except ImportError:
+                        raise ImportError(
+                            "anthropic SDK is required for model calls. "
+                            "Install with: pip install anthropic>=0.25.0"
+                        )
+                    # Retries are handled by the gateway so limits and metrics see them
+                    self._client = anthropic.Anthropic(
+                        max_retries=0, timeout=float(_setting("timeout"))
+                    )
+        return self._client
+
+    def create(self, request: ModelRequest) -> ModelResponse:
+        kwargs: Dict[str, Any] = {}
+        if request.system:
+            kwargs["system"] = request.system
+        response = self._get_client().messages.create(
+            model=request.model_id,
+            max_tokens=request.max_tokens,
+            messages=[{"role": "user", "content": request.content}],
+            **kwargs,
+        )
+        usage = getattr(response, "usage", None)
+        return ModelResponse(
+            text=response.content[0].text,
+            model=request.model,
+            input_tokens=int(getattr(usage, "input_tokens", 0) or 0),
+            output_tokens=int(getattr(usage, "output_tokens", 0) or 0),
+        )
+
+
+class StubBackend:
+    """
+    Local backend for tests and offline runs; never touches the network.
+
+    *responder* is the text to return, an exception to raise, or a callable
+    taking the ``ModelRequest`` and returning either. Every request is kept
+    in ``requests``.
+    """
+
+    name = "stub"
+
+    def __init__(self, responder: Union[str, Exception, Callable[[ModelRequest], Any]] = "{}"):
+        self.responder = responder
+        self.requests: List[ModelRequest] = []
+        self._lock = threading.Lock()
+
+    def create(self, request: ModelRequest) -> ModelResponse:
+        with self._lock:
+            self.requests.append(request)
+        reply = self.responder(request) if callable(self.responder) else self.responder
+        if isinstance(reply, Exception):
+            raise reply
+        text = str(reply)
+        prompt_chars = len(request.content) if isinstance(request.content, str) else sum(
+            len(block.get("text", "")) for block in request.content
+        )
+        # ~4 characters per token, as the embedding batcher estimates
+        return ModelResponse(
+            text=text,
+            model=request.model,
+            input_tokens=prompt_chars // 4,
+            output_tokens=len(text) // 4,
+        )
+
+
+_BACKENDS: Dict[str, Callable[[], Any]] = {
+    "anthropic": AnthropicBackend,
+    "stub": StubBackend,
+}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """The active backend: set_backend() > QMS_MODEL_BACKEND > config.yaml."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                name = os.environ.get("QMS_MODEL_BACKEND") or _setting("backend")
+                if name not in _BACKENDS:
+                    raise ValueError(f"Unknown model backend: {name!r}")
+                _backend = _BACKENDS[name]()
+    return _backend
+
+
+def set_backend(backend) -> None:
+    """Install *backend* process-wide (None re-resolves from config on next call)."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+
+@contextmanager
+def use_backend(backend) -> Iterator[Any]:
+    """Temporarily route all model calls to *backend*."""
+    global _backend
+    with _backend_lock:
+        previous = _backend
+        _backend = backend
+    try:
+        yield backend
+    finally:
+        with _backend_lock:
+            _backend = previous
+
+
+# ---------------------------------------------------------------------------
+# Limits
+# ---------------------------------------------------------------------------
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter shared across threads.
+
+    Refills at *per_minute* tokens per minute up to *burst*; ``acquire()``
+    blocks until a token is available. *per_minute* of 0 (or less) disables
+    limiting.
+    """
+
+    def __init__(self, per_minute: float, burst: int = 1):
+        self.rate = per_minute / 60.0 if per_minute and per_minute > 0 else 0.0
+        self.capacity = float(max(1, burst))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if not self.rate:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+@dataclass
+class _ModelLimits:
+    bucket: TokenBucket
+    slots: threading.BoundedSemaphore
+
+
+_limits: Dict[str, _ModelLimits] = {}
+_limits_lock = threading.Lock()
+
+
+def _get_limits(model: str) -> _ModelLimits:
+    limits = _limits.get(model)
+    if limits is None:
+        with _limits_lock:
+            limits = _limits.get(model)
+            if limits is None:
+                limits = _ModelLimits(
+                    bucket=TokenBucket(
+                        float(_setting("requests_per_minute", model)),
+                        int(_setting("burst", model)),
+                    ),
+                    slots=threading.BoundedSemaphore(max(1, int(_setting("max_concurrency", model)))),
+                )
+                _limits[model] = limits
+    return limits
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _ModelStats:
+    calls: int = 0
+    errors: int = 0
+    retries: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    total_ms: int = 0
+    max_ms: int = 0
+    cache_hits: int = 0
+
+
+_stats: Dict[str, _ModelStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _record(model: str, response: Optional[ModelResponse], latency_ms: int, retries: int) -> None:
+    with _stats_lock:
+        stats = _stats.setdefault(model, _ModelStats())
+        if response is not None and response.cached:
+            stats.cache_hits += 1
+            return
+        stats.calls += 1
+        stats.retries += retries
+        stats.total_ms += latency_ms
+        stats.max_ms = max(stats.max_ms, latency_ms)
+        if response is None:
+            stats.errors += 1
+        else:
+            stats.input_tokens += response.input_tokens
+            stats.output_tokens += response.output_tokens
+
+
+def get_metrics() -> Dict[str, Dict[str, Any]]:
+    """Per-model API calls, cache hits, retries, errors, token totals and latency."""
+    with _stats_lock:
+        return {
+            model: {
+                "calls": s.calls,
+                "errors": s.errors,
+                "retries": s.retries,
+                "input_tokens": s.input_tokens,
+                "output_tokens": s.output_tokens,
+                "avg_ms": round(s.total_ms / s.calls, 1) if s.calls else 0.0,
+                "max_ms": s.max_ms,
+                "cache_hits": s.cache_hits,
+            }
+            for model, s in _stats.items()
+        }
+
+
+def reset() -> None:
+    """Clear metrics and limits (limits are rebuilt from config on next call)."""
+    with _stats_lock:
+        _stats.clear()
+    with _limits_lock:
+        _limits.clear()
+
+
+# ---------------------------------------------------------------------------
+# Calls
+# ---------------------------------------------------------------------------
+
+def _retry_delay(exc: Exception, attempt: int) -> Optional[float]:
+    """Seconds to wait before retrying *exc*, or None if it is not retryable."""
+    if getattr(exc, "status_code", None) not in RETRY_STATUSES:
+        return None
+    delay = min(float(_setting("backoff_max")), float(_setting("backoff_base")) * (2 ** attempt))
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        delay = max(delay, float(headers.get("retry-after", 0)))
+    except (TypeError, ValueError):
+        pass
+    return delay * random.uniform(1.0, 1.25)
+
+
+def call(
+    content: Content,
+    model: str = "sonnet",
+    max_tokens: int = 8192,
+    system: Optional[str] = None,
+    cache: bool = False,
+) -> ModelResponse:
+    """
+    Send a single-turn request and return the response.
+
+    Args:
+        content: Prompt text, or a list of content blocks (see pdf_content()).
+        model: Model name ('haiku', 'sonnet', 'opus') or a full model ID.
+        max_tokens: Output token limit.
+        system: Optional system prompt.
+        cache: Serve an identical earlier request from the response cache
+            (and store this one) unless caching is disabled.
+
+    Returns:
+        ModelResponse with the text, token usage and latency.
+
+    Raises:
+        The backend's exception once retries are exhausted or for
+        non-retryable errors.
+    """
+    request = ModelRequest(
+        model=model,
+        model_id=MODEL_MAP.get(model, model),
+        content=content,
+        max_tokens=max_tokens,
+        system=system,
+    )
+    backend = get_backend()
+    start = time.perf_counter()
+
+    response_cache = model_cache.get_response_cache() if cache else None
+    if response_cache is not None:
+        key = model_cache.request_key(request, backend.name)
+        hit = response_cache.get(key)
+        if hit is not None:
+            response = ModelResponse(
+                text=hit["response"],
+                model=model,
+                input_tokens=hit["input_tokens"],
+                output_tokens=hit["output_tokens"],
+                latency_ms=int((time.perf_counter() - start) * 1000),
+                attempts=0,
+                cached=True,
+            )
+            _record(model, response, response.latency_ms, 0)
+            logger.debug("Model %s: served from response cache", model)
+            return response
+
+    limits = _get_limits(model)
+    max_retries = int(_setting("max_retries"))
+    attempt = 0
+    with limits.slots:
+        while True:
+            limits.bucket.acquire()
+            try:
+                response = backend.create(request)
+                break
+            except Exception as exc:
+                delay = _retry_delay(exc, attempt) if attempt < max_retries else None
+                if delay is None:
+                    _record(model, None, int((time.perf_counter() - start) * 1000), attempt)
+                    raise
+                attempt += 1
+                logger.warning(
+                    "Model %s returned %s; retry %d/%d in %.1fs",
+                    model, getattr(exc, "status_code", "?"), attempt, max_retries, delay
+                )
+                time.sleep(delay)
+
+    response.latency_ms = int((time.perf_counter() - start) * 1000)
+    response.attempts = attempt + 1
+    _record(model, response, response.latency_ms, attempt)
+    if response_cache is not None:
+        response_cache.put(key, response.text, response.input_tokens, response.output_tokens)
+    logger.debug(
+        "Model %s: %dms, %d in / %d out tokens, %d attempt(s)",
+        model, response.latency_ms, response.input_tokens, response.output_tokens, response.attempts
+    )
+    return response
+
+
+async def acall(
+    content: Content,
+    model: str = "sonnet",
+    max_tokens: int = 8192,
+    system: Optional[str] = None,
+    cache: bool = False,
+) -> ModelResponse:
+    """
+    Async variant of call().
+
+    Runs on a worker thread against the same pooled client, so sync and
+    async callers share one set of concurrency limits, rate buckets and
+    metrics.
+    """
+    return await asyncio.to_thread(call, content, model, max_tokens, system, cache)
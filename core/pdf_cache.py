@@ -0,0 +1,409 @@
+"""
+Per-PDF text extraction cache.
+
+Each PDF is parsed with PyMuPDF once: every page's plain text and its text
+spans (text + bounding box) are stored in ``pdf_text_cache.db`` keyed by the
+file's MD5, the same ``file_hash`` the project scanner records on ``sheets``.
+Spans are stored column-wise per page: span strings as zlib-compressed JSON,
+coordinates as float32 arrays. Consumers (drawing/welding text extraction,
+the text-layer preprocessor, schedule validation) read pages through
+``load_pdf()`` instead of re-opening the file.
+
+Recently loaded documents are also kept in memory, so several passes over
+the same PDF in one run cost a single lookup.
+
+Each document also records the size and mtime of the file it was parsed
+from. A caller-supplied hash is only trusted while the file still matches
+them; otherwise (a PDF replaced in place before the scanner re-ran) the
+file is re-hashed and looked up by its real content.
+
+Worker processes forked by the extraction pool do not reuse the parent's
+SQLite connection; the shared cache is dropped in the child after a fork.
+
+Disable with ``pdf_cache.enabled: false``, ``QMS_PDF_CACHE=0`` or
+``set_enabled(False)``; ``load_pdf()`` then parses on every call.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from qms.core.config import QMS_PATHS, get_config_value
+from qms.core.logging import get_logger
+
+logger = get_logger("qms.core.pdf_cache")
+
+# Bump when the stored page layout changes; older rows are re-parsed
+_FORMAT = 2
+
+# Parsed documents kept in memory per process
+_MEMORY_DOCS = 16
+
+_enabled: Optional[bool] = None
+
+
+def is_enabled() -> bool:
+    """Resolve caching: set_enabled() > QMS_PDF_CACHE env var > config.yaml."""
+    if _enabled is not None:
+        return _enabled
+    env = os.environ.get("QMS_PDF_CACHE")
+    if env is not None:
+        return env.strip().lower() in ("1", "true", "yes", "on")
+    return bool(get_config_value("pdf_cache", "enabled", default=True))
+
+
+def set_enabled(enabled: Optional[bool]) -> None:
+    """Force the PDF cache on/off at runtime (None follows config)."""
+    global _enabled
+    _enabled = enabled
+
+
+def file_hash(path) -> str:
+    """MD5 hex digest of a file (matches ``sheets.file_hash``)."""
+    md5_hash = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            md5_hash.update(chunk)
+    return md5_hash.hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Parsed document model
+# ---------------------------------------------------------------------------
+
+@dataclass
+class PdfPage:
+    """One page: size, plain text and its text spans stored column-wise."""
+    width: float
+    height: float
+    text: str
+    span_text: List[str] = field(default_factory=list)
+    x0: array = field(default_factory=lambda: array("f"))
+    y0: array = field(default_factory=lambda: array("f"))
+    x1: array = field(default_factory=lambda: array("f"))
+    y1: array = field(default_factory=lambda: array("f"))
+
+    def spans(self) -> Iterator[Dict]:
+        """Yield ``{"text", "x0", "y0", "x1", "y1"}`` per span (coordinates to 0.1 pt)."""
+        for i, text in enumerate(self.span_text):
+            yield {
+                "text": text,
+                "x0": round(self.x0[i], 1),
+                "y0": round(self.y0[i], 1),
+                "x1": round(self.x1[i], 1),
+                "y1": round(self.y1[i], 1),
+            }
+
+
+@dataclass
+class PdfText:
+    """All pages of one PDF, plus the size/mtime of the file last seen with it."""
+    file_hash: str
+    pages: List[PdfPage]
+    file_size: int = -1
+    file_mtime_ns: int = -1
+
+    def matches(self, stat: os.stat_result) -> bool:
+        return (self.file_size, self.file_mtime_ns) == (stat.st_size, stat.st_mtime_ns)
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pages)
+
+    def plain_text(self) -> str:
+        """Non-empty pages as ``--- PAGE n ---`` sections, as extract_pdf_text returns."""
+        return "\n\n".join(
+            f"--- PAGE {n} ---\n{page.text}"
+            for n, page in enumerate(self.pages, 1)
+            if page.text.strip()
+        )
+
+
+def parse_pdf(path, digest: str) -> PdfText:
+    """Open *path* once and read every page's text and spans."""
+    try:
+        import fitz  # PyMuPDF
+    except ImportError:
+        raise ImportError(
+            "PyMuPDF is required for PDF extraction. "
+            "Install with: pip install PyMuPDF>=1.23.0"
+        )
+
+    pages: List[PdfPage] = []
+    with fitz.open(str(path)) as doc:
+        for page in doc:
+            parsed = PdfPage(
+                width=round(page.rect.width, 1),
+                height=round(page.rect.height, 1),
+                text=page.get_text("text"),
+            )
+            for block in page.get_text("dict").get("blocks", []):
+                if block.get("type") != 0:
+                    continue
+                for line in block.get("lines", []):
+                    for span in line.get("spans", []):
+                        text = span.get("text", "").strip()
+                        if not text:
+                            continue
+                        bbox = span.get("bbox", (0, 0, 0, 0))
+                        parsed.span_text.append(text)
+                        parsed.x0.append(round(bbox[0], 1))
+                        parsed.y0.append(round(bbox[1], 1))
+                        parsed.x1.append(round(bbox[2], 1))
+                        parsed.y1.append(round(bbox[3], 1))
+            pages.append(parsed)
+    return PdfText(file_hash=digest, pages=pages)
+
+
+# ---------------------------------------------------------------------------
+# Disk store
+# ---------------------------------------------------------------------------
+
+class PdfTextCache:
+    """
+    SQLite store of parsed PDF pages.
+
+    One connection per process, shared by its threads behind a lock; the
+    database is in WAL mode so extraction worker processes can share it.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS pdf_documents (
+                file_hash TEXT PRIMARY KEY,
+                format INTEGER NOT NULL,
+                page_count INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                file_size INTEGER NOT NULL DEFAULT -1,
+                file_mtime_ns INTEGER NOT NULL DEFAULT -1
+            );
+            CREATE TABLE IF NOT EXISTS pdf_pages (
+                file_hash TEXT NOT NULL,
+                page_num INTEGER NOT NULL,
+                width REAL NOT NULL,
+                height REAL NOT NULL,
+                text BLOB NOT NULL,
+                span_text BLOB NOT NULL,
+                x0 BLOB NOT NULL,
+                y0 BLOB NOT NULL,
+                x1 BLOB NOT NULL,
+                y1 BLOB NOT NULL,
+                PRIMARY KEY (file_hash, page_num)
+            ) WITHOUT ROWID;
+        """)
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(pdf_documents)")}
+        for column in ("file_size", "file_mtime_ns"):
+            if column not in existing:
+                self._conn.execute(
+                    f"ALTER TABLE pdf_documents ADD COLUMN {column} INTEGER NOT NULL DEFAULT -1"
+                )
+        self._conn.commit()
+
+    def get(self, digest: str) -> Optional[PdfText]:
+        """Return the cached document for *digest*, or None."""
+        with self._lock:
+            doc = self._conn.execute(
+                """SELECT page_count, file_size, file_mtime_ns FROM pdf_documents
+                   WHERE file_hash = ? AND format = ?""",
+                (digest, _FORMAT),
+            ).fetchone()
+            rows = [] if doc is None else self._conn.execute(
+                """SELECT width, height, text, span_text, x0, y0, x1, y1
+                   FROM pdf_pages WHERE file_hash = ? ORDER BY page_num""",
+                (digest,),
+            ).fetchall()
+        if doc is None or len(rows) != doc[0]:
+            self.misses += 1
+            return None
+        self.hits += 1
+        pages = []
+        for width, height, text, span_text, *coords in rows:
+            columns = []
+            for blob in coords:
+                column = array("f")
+                column.frombytes(blob)
+                columns.append(column)
+            pages.append(PdfPage(
+                width=width,
+                height=height,
+                text=zlib.decompress(text).decode("utf-8"),
+                span_text=json.loads(zlib.decompress(span_text)),
+                x0=columns[0], y0=columns[1], x1=columns[2], y1=columns[3],
+            ))
+        return PdfText(file_hash=digest, pages=pages, file_size=doc[1], file_mtime_ns=doc[2])
+
+    def put(self, pdf: PdfText) -> None:
+        rows = [
+            (
+                pdf.file_hash, n, page.width, page.height,
+                zlib.compress(page.text.encode("utf-8")),
+                zlib.compress(json.dumps(page.span_text, ensure_ascii=False).encode("utf-8")),
+                page.x0.tobytes(), page.y0.tobytes(), page.x1.tobytes(), page.y1.tobytes(),
+            )
+            for n, page in enumerate(pdf.pages)
+        ]
+        with self._lock:
+            self._conn.execute("DELETE FROM pdf_pages WHERE file_hash = ?", (pdf.file_hash,))
+            self._conn.executemany(
+                """INSERT INTO pdf_pages
+                   (file_hash, page_num, width, height, text, span_text, x0, y0, x1, y1)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                rows,
+            )
+            self._conn.execute(
+                """INSERT OR REPLACE INTO pdf_documents
+                   (file_hash, format, page_count, created_at, file_size, file_mtime_ns)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (
+                    pdf.file_hash, _FORMAT, pdf.page_count, time.time(),
+                    pdf.file_size, pdf.file_mtime_ns,
+                ),
+            )
+            self._conn.commit()
+
+    def set_file_stat(self, pdf: PdfText) -> None:
+        """Record the size/mtime last seen for *pdf*'s file."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE pdf_documents SET file_size = ?, file_mtime_ns = ? WHERE file_hash = ?",
+                (pdf.file_size, pdf.file_mtime_ns, pdf.file_hash),
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove every cached document."""
+        with self._lock:
+            self._conn.execute("DELETE FROM pdf_pages")
+            self._conn.execute("DELETE FROM pdf_documents")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Return document count and this process's hits/misses."""
+        with self._lock:
+            documents = self._conn.execute("SELECT COUNT(*) FROM pdf_documents").fetchone()[0]
+        return {"documents": documents, "hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[PdfTextCache] = None
+_cache_lock = threading.Lock()
+
+_memory: "OrderedDict[str, PdfText]" = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+def _after_fork() -> None:
+    """In a forked child: forget the parent's connection and (possibly held) locks."""
+    global _cache, _cache_lock, _memory_lock
+    _cache = None
+    _cache_lock = threading.Lock()
+    _memory_lock = threading.Lock()
+    _memory.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def get_pdf_cache() -> Optional[PdfTextCache]:
+    """Return the shared cache, or ``None`` when caching is disabled."""
+    global _cache
+    if not is_enabled():
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                raw = get_config_value("pdf_cache", "path", default="")
+                if raw:
+                    path = Path(raw)
+                    if not path.is_absolute():
+                        path = Path(__file__).parent.parent / path
+                else:
+                    path = QMS_PATHS.database.parent / "pdf_text_cache.db"
+                _cache = PdfTextCache(path)
+    return _cache
+
+
+def _remember(pdf: PdfText) -> None:
+    with _memory_lock:
+        _memory[pdf.file_hash] = pdf
+        _memory.move_to_end(pdf.file_hash)
+        while len(_memory) > _MEMORY_DOCS:
+            _memory.popitem(last=False)
+
+
+def load_pdf(path, digest: Optional[str] = None) -> PdfText:
+    """
+    Return the text of every page of *path*, parsing it only on a cache miss.
+
+    Args:
+        path: PDF file.
+        digest: The file's MD5 when already known (``sheets.file_hash``);
+            computed from the file otherwise.
+
+    Raises:
+        FileNotFoundError: If *path* does not exist.
+        ImportError: If PyMuPDF is needed and not installed.
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"PDF not found: {path}")
+
+    cache = get_pdf_cache()
+    if cache is None:
+        return parse_pdf(path, digest or "")
+
+    stat = path.stat()
+    if digest:
+        pdf = _lookup(cache, digest)
+        if pdf is not None and pdf.matches(stat):
+            return pdf
+        # File changed since this hash was recorded (or first seen here): verify
+    digest = file_hash(path)
+
+    pdf = _lookup(cache, digest)
+    if pdf is None:
+        pdf = parse_pdf(path, digest)
+        pdf.file_size, pdf.file_mtime_ns = stat.st_size, stat.st_mtime_ns
+        cache.put(pdf)
+        logger.debug("Cached text of %d pages from %s", pdf.page_count, path.name)
+    elif not pdf.matches(stat):
+        pdf.file_size, pdf.file_mtime_ns = stat.st_size, stat.st_mtime_ns
+        cache.set_file_stat(pdf)
+    _remember(pdf)
+    return pdf
+
+
+def _lookup(cache: PdfTextCache, digest: str) -> Optional[PdfText]:
+    with _memory_lock:
+        pdf = _memory.get(digest)
+        if pdf is not None:
+            _memory.move_to_end(digest)
+            return pdf
+    return cache.get(digest)
+
+
+def reset() -> None:
+    """Drop the in-memory documents (the disk cache is kept)."""
+    with _memory_lock:
+        _memory.clear()
@@ -0,0 +1,683 @@
+"""
+Query profiling for the QMS data layer.
+
+Opt-in instrumentation for connections handed out by ``get_db()``. When
+enabled, every statement is timed (execute + fetch), its SQL normalized
+(literals replaced with ``?``), and attributed to the calling module and the
+current context label (HTTP endpoint or CLI command).
+
+Aggregates are flushed to ``query_stats`` and statements slower than the
+threshold to ``slow_query_log`` by a background writer thread with its own
+connection, so profiling never writes inside the caller's transaction.
+
+Enable with ``database.profiling.enabled`` in config.yaml or
+``QMS_QUERY_PROFILING=1``.
+
+Separately, the web app can turn on per-request metrics (connections
+opened, statement count, SQL time) via ``enable_request_metrics()``; these
+feed Server-Timing headers and the rolling per-endpoint histograms behind
+``/admin/perf``. They wrap every cursor, so they are also opt-in
+(``database.profiling.request_metrics``).
+"""
+
+import atexit
+import math
+import os
+import queue
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from qms.core.config import get_config_value
+
+_DEFAULT_SLOW_MS = 100.0
+_DEFAULT_FLUSH_SECONDS = 30.0
+_MAX_SQL_LENGTH = 2000
+
+# Current context label (Flask endpoint, CLI command); "-" when unset
+_context: ContextVar[str] = ContextVar("qms_query_context", default="-")
+
+_enabled: Optional[bool] = None
+
+
+# ---------------------------------------------------------------------------
+# Settings
+# ---------------------------------------------------------------------------
+
+def is_enabled() -> bool:
+    """Resolve profiling: set_enabled() > QMS_QUERY_PROFILING env var > config.yaml."""
+    if _enabled is not None:
+        return _enabled
+    env = os.environ.get("QMS_QUERY_PROFILING")
+    if env is not None:
+        return env.strip().lower() in ("1", "true", "yes", "on")
+    return bool(get_config_value("database", "profiling", "enabled", default=False))
+
+
+def set_enabled(enabled: Optional[bool]) -> None:
+    """
+    Force profiling on/off at runtime (None follows config).
+
+    Only connections opened afterwards are instrumented; pooled connections
+    opened earlier stay plain until recycled.
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def slow_threshold_ms() -> float:
+    return float(get_config_value("database", "profiling", "slow_query_ms", default=_DEFAULT_SLOW_MS))
+
+
+def set_context(label: str):
+    """Set the context label for queries on this thread/task. Returns a reset token."""
+    return _context.set(label)
+
+
+def reset_context(token) -> None:
+    _context.reset(token)
+
+
+_process_label: Optional[str] = None
+
+
+def _default_context() -> str:
+    """Label for queries outside any request: the CLI sub-command, if any."""
+    global _process_label
+    if _process_label is None:
+        label = "-"
+        if sys.argv and os.path.basename(sys.argv[0]).split(".")[0] in ("qms", "__main__"):
+            words = [a for a in sys.argv[1:3] if not a.startswith("-")]
+            if words:
+                label = "cli:" + " ".join(words)
+        _process_label = label
+    return _process_label
+
+
+def get_context() -> str:
+    ctx = _context.get()
+    return _default_context() if ctx == "-" else ctx
+
+
+# ---------------------------------------------------------------------------
+# Per-request metrics
+# ---------------------------------------------------------------------------
+
+_DEFAULT_REQUEST_WINDOW = 500
+
+# Upper bounds (ms) of the wall-time histogram buckets; the last is open-ended
+HISTOGRAM_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class RequestMetrics:
+    """Database work attributed to one HTTP request."""
+
+    __slots__ = ("start", "connections", "statements", "sql_seconds")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.connections = 0
+        self.statements = 0
+        self.sql_seconds = 0.0
+
+    @property
+    def wall_ms(self) -> float:
+        return (time.perf_counter() - self.start) * 1000.0
+
+    @property
+    def sql_ms(self) -> float:
+        return self.sql_seconds * 1000.0
+
+
+_request_metrics: ContextVar[Optional[RequestMetrics]] = ContextVar(
+    "qms_request_metrics", default=None
+)
+_request_metrics_on = False
+
+
+def enable_request_metrics(enabled: bool = True) -> None:
+    """
+    Instrument connections opened from now on for per-request metrics.
+
+    Called by the Flask app factory (subject to
+    ``database.profiling.request_metrics``); CLI processes never enable it.
+    """
+    global _request_metrics_on
+    _request_metrics_on = enabled
+
+
+def request_metrics_enabled() -> bool:
+    return _request_metrics_on
+
+
+def start_request():
+    """Begin collecting metrics for the current request. Returns a reset token."""
+    return _request_metrics.set(RequestMetrics())
+
+
+def current_request() -> Optional[RequestMetrics]:
+    return _request_metrics.get()
+
+
+def end_request(token) -> None:
+    _request_metrics.reset(token)
+
+
+def note_connection() -> None:
+    """Count a get_db() checkout against the current request, if any."""
+    metrics = _request_metrics.get()
+    if metrics is not None:
+        metrics.connections += 1
+
+
+class _EndpointWindow:
+    """Rolling window of the most recent request samples for one endpoint."""
+
+    __slots__ = ("samples", "count")
+
+    def __init__(self, size: int):
+        # (wall_ms, sql_ms, statements, connections, status)
+        self.samples: Deque[Tuple[float, float, int, int, int]] = deque(maxlen=size)
+        self.count = 0
+
+
+class RequestStats:
+    """Thread-safe per-endpoint rolling histograms of request timings."""
+
+    def __init__(self, window: Optional[int] = None):
+        self._window = window
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, _EndpointWindow] = {}
+
+    @property
+    def window(self) -> int:
+        if self._window is None:
+            self._window = int(get_config_value(
+                "database", "profiling", "request_window", default=_DEFAULT_REQUEST_WINDOW
+            ))
+        return self._window
+
+    def record(self, endpoint: str, metrics: RequestMetrics, wall_ms: float, status: int) -> None:
+        window = self.window
+        with self._lock:
+            ep = self._endpoints.get(endpoint)
+            if ep is None:
+                ep = self._endpoints[endpoint] = _EndpointWindow(window)
+            ep.samples.append(
+                (wall_ms, metrics.sql_ms, metrics.statements, metrics.connections, status)
+            )
+            ep.count += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-endpoint percentiles, averages, and wall-time histogram."""
+        with self._lock:
+            snapshot = {name: (list(ep.samples), ep.count) for name, ep in self._endpoints.items()}
+
+        result: Dict[str, Dict[str, Any]] = {}
+        for name, (samples, count) in snapshot.items():
+            if not samples:
+                continue
+            n = len(samples)
+            walls = sorted(s[0] for s in samples)
+            stmts = [s[2] for s in samples]
+            buckets = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+            for wall in walls:
+                for i, bound in enumerate(HISTOGRAM_BUCKETS_MS):
+                    if wall <= bound:
+                        buckets[i] += 1
+                        break
+                else:
+                    buckets[-1] += 1
+            labels = [f"<={b}ms" for b in HISTOGRAM_BUCKETS_MS] + [f">{HISTOGRAM_BUCKETS_MS[-1]}ms"]
+            result[name] = {
+                "requests_total": count,
+                "window": n,
+                "wall_ms": {
+                    "p50": round(_percentile(walls, 50), 2),
+                    "p95": round(_percentile(walls, 95), 2),
+                    "p99": round(_percentile(walls, 99), 2),
+                    "max": round(walls[-1], 2),
+                },
+                "sql_ms_avg": round(sum(s[1] for s in samples) / n, 2),
+                "sql_share": round(sum(s[1] for s in samples) / max(sum(walls), 1e-9), 3),
+                "statements_avg": round(sum(stmts) / n, 2),
+                "statements_max": max(stmts),
+                "connections_avg": round(sum(s[3] for s in samples) / n, 2),
+                "errors": sum(1 for s in samples if s[4] >= 500),
+                "histogram": dict(zip(labels, buckets)),
+            }
+        return result
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already-sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+request_stats = RequestStats()
+
+
+# ---------------------------------------------------------------------------
+# SQL normalization
+# ---------------------------------------------------------------------------
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Collapse a statement to its shape so identical queries aggregate together.
+
+    String and numeric literals become ``?``, ``IN (?, ?, ?)`` lists collapse
+    to ``(?...)``, and whitespace is squeezed.
+
+    Example:
+        >>> normalize_sql("SELECT * FROM t WHERE id IN (1, 2, 3) AND n = 'x'")
+        'SELECT * FROM t WHERE id IN (?...) AND n = ?'
+    """
+    text = _STRING_RE.sub("?", sql)
+    text = _NUMBER_RE.sub("?", text)
+    text = _IN_LIST_RE.sub("(?...)", text)
+    text = _WS_RE.sub(" ", text).strip()
+    return text[:_MAX_SQL_LENGTH]
+
+
+# Frames from these modules are skipped when attributing a query to a caller
+_SKIP_MODULES = ("qms.core.profiler", "qms.core.db", "contextlib", "sqlite3")
+
+
+def _find_caller() -> str:
+    """Return 'module:function' of the first frame outside the data layer."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if not module.startswith(_SKIP_MODULES):
+            return f"{module}:{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+# ---------------------------------------------------------------------------
+# Collector
+# ---------------------------------------------------------------------------
+
+_StatKey = Tuple[str, str]  # (normalized sql, context)
+
+
+class _Collector:
+    """Process-wide aggregates plus a background writer for persistence."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals: Dict[_StatKey, Dict[str, Any]] = {}
+        # Unflushed deltas and slow statements, grouped by database file
+        self._pending: Dict[str, Dict[_StatKey, Dict[str, Any]]] = {}
+        self._slow: "queue.Queue[Tuple[str, tuple]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+
+    def record(
+        self, sql: str, elapsed_ms: float, rows: int, caller: str, db_path: Optional[str]
+    ) -> None:
+        normalized = normalize_sql(sql)
+        key = (normalized, get_context())
+        buckets = [self._totals]
+        with self._lock:
+            if db_path:
+                buckets.append(self._pending.setdefault(db_path, {}))
+            for bucket in buckets:
+                entry = bucket.get(key)
+                if entry is None:
+                    entry = bucket[key] = {
+                        "calls": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0, "caller": caller,
+                    }
+                entry["calls"] += 1
+                entry["total_ms"] += elapsed_ms
+                entry["rows"] += rows
+                entry["caller"] = caller
+                if elapsed_ms > entry["max_ms"]:
+                    entry["max_ms"] = elapsed_ms
+
+        if db_path and elapsed_ms >= slow_threshold_ms():
+            self._slow.put((db_path, (
+                round(elapsed_ms, 3), rows, normalized, sql[:_MAX_SQL_LENGTH],
+                caller, key[1],
+            )))
+            self._wake.set()
+        self._ensure_writer()
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None:
+            return
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._run, name="qms-query-profiler", daemon=True
+                )
+                self._writer.start()
+
+    def _run(self) -> None:
+        interval = float(get_config_value(
+            "database", "profiling", "flush_seconds", default=_DEFAULT_FLUSH_SECONDS
+        ))
+        while True:
+            self._wake.wait(timeout=interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        """Persist pending aggregates and slow statements (no-op if nothing to write)."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        slow: Dict[str, List[tuple]] = {}
+        while True:
+            try:
+                db_path, entry = self._slow.get_nowait()
+            except queue.Empty:
+                break
+            slow.setdefault(db_path, []).append(entry)
+
+        for db_path in set(pending) | set(slow):
+            self._write(db_path, pending.get(db_path, {}), slow.get(db_path, []))
+
+    @staticmethod
+    def _write(db_path: str, stats: Dict[_StatKey, Dict[str, Any]], slow: List[tuple]) -> None:
+        try:
+            # Plain connection: never profiled, never pooled
+            conn = sqlite3.connect(db_path, timeout=30)
+            try:
+                if slow:
+                    conn.executemany(
+                        """INSERT INTO slow_query_log
+                           (duration_ms, rows_returned, normalized_sql, sql_text, caller, context)
+                           VALUES (?, ?, ?, ?, ?, ?)""",
+                        slow,
+                    )
+                if stats:
+                    conn.executemany(
+                        """INSERT INTO query_stats
+                               (normalized_sql, context, calls, total_ms, max_ms, rows_returned,
+                                last_caller)
+                           VALUES (?, ?, ?, ?, ?, ?, ?)
+                           ON CONFLICT(normalized_sql, context) DO UPDATE SET
+                               calls = calls + excluded.calls,
+                               total_ms = total_ms + excluded.total_ms,
+                               max_ms = MAX(max_ms, excluded.max_ms),
+                               rows_returned = rows_returned + excluded.rows_returned,
+                               last_caller = excluded.last_caller,
+                               last_seen = CURRENT_TIMESTAMP""",
+                        [
+                            (sql, ctx, e["calls"], e["total_ms"], e["max_ms"], e["rows"], e["caller"])
+                            for (sql, ctx), e in stats.items()
+                        ],
+                    )
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            # Tables missing (run `qms migrate`) or DB busy -- drop this batch
+            pass
+
+    def snapshot(self) -> Dict[_StatKey, Dict[str, Any]]:
+        with self._lock:
+            return {k: dict(v) for k, v in self._totals.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._totals.clear()
+            self._pending.clear()
+
+
+_collector = _Collector()
+atexit.register(_collector.flush)
+
+
+def flush() -> None:
+    """Write buffered profiling data to the database now."""
+    _collector.flush()
+
+
+def reset() -> None:
+    """Clear in-memory aggregates (persisted data is untouched)."""
+    _collector.reset()
+
+
+# ---------------------------------------------------------------------------
+# Instrumented connection / cursor
+# ---------------------------------------------------------------------------
+
+class ProfilingCursor(sqlite3.Cursor):
+    """Cursor that times execute + fetch and counts returned rows."""
+
+    _qms_sql: Optional[str] = None
+    _qms_caller: str = "unknown"
+    _qms_elapsed: float = 0.0
+    _qms_rows: int = 0
+
+    def _qms_begin(self, sql: str) -> None:
+        self._qms_finish()
+        self._qms_sql = sql
+        if getattr(self.connection, "_qms_full", True):
+            self._qms_caller = _find_caller()
+        self._qms_elapsed = 0.0
+        self._qms_rows = 0
+
+    def _qms_finish(self) -> None:
+        if self._qms_sql is None:
+            return
+        sql, self._qms_sql = self._qms_sql, None
+
+        metrics = _request_metrics.get()
+        if metrics is not None:
+            metrics.statements += 1
+            metrics.sql_seconds += self._qms_elapsed
+
+        # Request-metrics-only connections skip normalization and aggregation
+        if getattr(self.connection, "_qms_full", True):
+            db_path = getattr(self.connection, "_qms_db_path", None)
+            _collector.record(
+                sql, self._qms_elapsed * 1000.0, self._qms_rows, self._qms_caller, db_path
+            )
+
+    def _qms_after_execute(self) -> None:
+        # Statements that return no rows are complete after execute()
+        if self.description is None:
+            self._qms_rows = max(self.rowcount, 0)
+            self._qms_finish()
+
+    def execute(self, sql, parameters=()):
+        self._qms_begin(sql)
+        start = time.perf_counter()
+        try:
+            super().execute(sql, parameters)
+        finally:
+            self._qms_elapsed += time.perf_counter() - start
+        self._qms_after_execute()
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._qms_begin(sql)
+        start = time.perf_counter()
+        try:
+            super().executemany(sql, seq_of_parameters)
+        finally:
+            self._qms_elapsed += time.perf_counter() - start
+        self._qms_after_execute()
+        return self
+
+    def executescript(self, sql_script):
+        self._qms_begin(sql_script)
+        start = time.perf_counter()
+        try:
+            super().executescript(sql_script)
+        finally:
+            self._qms_elapsed += time.perf_counter() - start
+        self._qms_finish()
+        return self
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._qms_elapsed += time.perf_counter() - start
+        if row is None:
+            self._qms_finish()
+        else:
+            self._qms_rows += 1
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._qms_elapsed += time.perf_counter() - start
+        self._qms_rows += len(rows)
+        if not rows:
+            self._qms_finish()
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._qms_elapsed += time.perf_counter() - start
+        self._qms_rows += len(rows)
+        self._qms_finish()
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._qms_elapsed += time.perf_counter() - start
+            self._qms_finish()
+            raise
+        self._qms_elapsed += time.perf_counter() - start
+        self._qms_rows += 1
+        return row
+
+    def close(self):
+        self._qms_finish()
+        super().close()
+
+    def __del__(self):
+        # Partially-consumed cursors still count once they are dropped
+        try:
+            self._qms_finish()
+        except Exception:
+            pass
+
+
+class ProfilingConnection(sqlite3.Connection):
+    """
+    Connection whose cursors are ProfilingCursor instances.
+
+    ``_qms_full`` is False for connections opened only for request metrics:
+    their statements are counted and timed but not logged.
+    """
+
+    _qms_db_path: Optional[str] = None
+    _qms_full: bool = True
+
+    def cursor(self, factory=ProfilingCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def get_summary(
+    top_n: int = 10,
+    conn: Optional[sqlite3.Connection] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Summarize profiled queries.
+
+    Reads the persisted ``query_stats`` table when *conn* is given (CLI,
+    cross-process view); otherwise summarizes this process's in-memory
+    aggregates (web server since start).
+
+    Returns:
+        Dict with 'by_total_time', 'by_calls' (per normalized statement) and
+        'by_context' (per endpoint / CLI command) lists.
+    """
+    if conn is not None:
+        rows = [
+            ((r["normalized_sql"], r["context"]), {
+                "calls": r["calls"], "total_ms": r["total_ms"], "max_ms": r["max_ms"],
+                "rows": r["rows_returned"], "caller": r["last_caller"],
+            })
+            for r in conn.execute(
+                "SELECT normalized_sql, context, calls, total_ms, max_ms, rows_returned, "
+                "last_caller FROM query_stats"
+            ).fetchall()
+        ]
+    else:
+        rows = list(_collector.snapshot().items())
+
+    by_sql: Dict[str, Dict[str, Any]] = {}
+    by_context: Dict[str, Dict[str, Any]] = {}
+    for (sql, ctx), e in rows:
+        s = by_sql.setdefault(sql, {
+            "sql": sql, "calls": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0, "caller": e["caller"],
+        })
+        s["calls"] += e["calls"]
+        s["total_ms"] += e["total_ms"]
+        s["rows"] += e["rows"]
+        s["max_ms"] = max(s["max_ms"], e["max_ms"])
+
+        c = by_context.setdefault(ctx, {"context": ctx, "calls": 0, "total_ms": 0.0, "statements": 0})
+        c["calls"] += e["calls"]
+        c["total_ms"] += e["total_ms"]
+        c["statements"] += 1
+
+    for s in by_sql.values():
+        s["avg_ms"] = s["total_ms"] / s["calls"] if s["calls"] else 0.0
+        s["total_ms"] = round(s["total_ms"], 3)
+        s["max_ms"] = round(s["max_ms"], 3)
+        s["avg_ms"] = round(s["avg_ms"], 3)
+    for c in by_context.values():
+        c["total_ms"] = round(c["total_ms"], 3)
+
+    statements = list(by_sql.values())
+    return {
+        "by_total_time": sorted(statements, key=lambda s: s["total_ms"], reverse=True)[:top_n],
+        "by_calls": sorted(statements, key=lambda s: s["calls"], reverse=True)[:top_n],
+        "by_context": sorted(
+            by_context.values(), key=lambda c: c["total_ms"], reverse=True
+        )[:top_n],
+    }
+
+
+def get_slow_queries(conn: sqlite3.Connection, limit: int = 50) -> List[Dict[str, Any]]:
+    """Return the most recent entries from ``slow_query_log``."""
+    return [
+        dict(r) for r in conn.execute(
+            "SELECT * FROM slow_query_log ORDER BY created_at DESC, id DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+    ]
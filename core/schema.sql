@@ -43,3 +43,54 @@ CREATE TABLE IF NOT EXISTS notes (
 );
 
 CREATE INDEX IF NOT EXISTS idx_notes_entity ON notes(entity_type, entity_id);
+
+-- Query profiler aggregates (qms.core.profiler; populated only when profiling is enabled)
+CREATE TABLE IF NOT EXISTS query_stats (
+    normalized_sql TEXT NOT NULL,
+    context TEXT NOT NULL DEFAULT '-',
+    calls INTEGER NOT NULL DEFAULT 0,
+    total_ms REAL NOT NULL DEFAULT 0,
+    max_ms REAL NOT NULL DEFAULT 0,
+    rows_returned INTEGER NOT NULL DEFAULT 0,
+    last_caller TEXT,
+    first_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (normalized_sql, context)
+);
+
+-- Statements slower than database.profiling.slow_query_ms
+CREATE TABLE IF NOT EXISTS slow_query_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    duration_ms REAL NOT NULL,
+    rows_returned INTEGER,
+    normalized_sql TEXT NOT NULL,
+    sql_text TEXT,
+    caller TEXT,
+    context TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_slow_query_log_created ON slow_query_log(created_at);
+
+-- Materialized dashboard counts (qms.reporting.dashboard); refreshed_at is epoch seconds
+CREATE TABLE IF NOT EXISTS dashboard_stats (
+    stat_key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL DEFAULT 0,
+    refreshed_at REAL NOT NULL
+);
+
+-- Unified, append-only activity feed (qms.core.activity). Written alongside
+-- the per-module log tables so the dashboard feed is an indexed LIMIT query.
+CREATE TABLE IF NOT EXISTS activity_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    action TEXT,
+    detail TEXT,
+    source_table TEXT,
+    source_id INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_activity_events_created ON activity_events(created_at DESC, id DESC);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_activity_events_source
+    ON activity_events(source_table, source_id);
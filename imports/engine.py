@@ -13,6 +13,7 @@ import uuid
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
+from qms.core.db import bulk_insert
 from qms.imports.specs import ActionItem, ActionPlan, ColumnDef, ImportSpec
 
 # ---------------------------------------------------------------------------
@@ -362,17 +363,12 @@ def generate_action_plan(
 
 def save_action_plan(conn: sqlite3.Connection, plan: ActionPlan):
     """Persist all action items to import_actions table."""
-    for item in plan.items:
-        row = item.to_db_row(plan.session_id)
-        conn.execute(
-            """INSERT INTO import_actions
-               (session_id, row_index, action_type, record_data, existing_data,
-                match_method, changes, reason, approved, executed, execution_error)
-               VALUES (:session_id, :row_index, :action_type, :record_data,
-                       :existing_data, :match_method, :changes, :reason,
-                       :approved, :executed, :execution_error)""",
-            row,
-        )
+    bulk_insert(
+        "import_actions",
+        (item.to_db_row(plan.session_id) for item in plan.items),
+        conn=conn,
+        commit=False,
+    )
     conn.commit()
 
 
@@ -17,6 +17,8 @@ from typing import Any, Dict, List, Optional
 
 from cryptography.fernet import Fernet, InvalidToken
 
+from qms.core.activity import record_activity
+
 
 def generate_uuid() -> str:
     return str(uuid.uuid4())
@@ -32,7 +34,7 @@ def _audit(
     changed_by: str = "system",
 ) -> None:
     """Insert an audit_log row for a license module mutation."""
-    conn.execute(
+    cur = conn.execute(
         """INSERT INTO audit_log (entity_type, entity_id, action, changed_by, old_values, new_values)
            VALUES (?, ?, ?, ?, ?, ?)""",
         (
@@ -44,6 +46,9 @@ def _audit(
             json.dumps(new_values) if new_values else None,
         ),
     )
+    record_activity(
+        conn, "licenses", action, changed_by or entity_id, "audit_log", cur.lastrowid
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -618,7 +618,7 @@ def extract_civil_drawing(sheet_id: int, file_path: str, dry_run: bool = False)
     # Get sheet info
     with get_db(readonly=True) as conn:
         row = conn.execute(
-            "SELECT drawing_number, file_name FROM sheets WHERE id = ?",
+            "SELECT drawing_number, file_name, file_hash FROM sheets WHERE id = ?",
             (sheet_id,)
         ).fetchone()
         if not row:
@@ -626,6 +626,7 @@ def extract_civil_drawing(sheet_id: int, file_path: str, dry_run: bool = False)
 
         drawing_number = row["drawing_number"]
         file_name = row["file_name"]
+        file_hash = row["file_hash"]
 
     logger.info("Extracting civil drawing: %s (sheet %d)", drawing_number, sheet_id)
 
@@ -637,7 +638,7 @@ def extract_civil_drawing(sheet_id: int, file_path: str, dry_run: bool = False)
             "error": f"File not found: {file_path}",
         }
 
-    text = extract_pdf_text(pdf_path)
+    text = extract_pdf_text(pdf_path, file_hash)
     if not text.strip():
         return {
             "status": "failed",
@@ -22,7 +22,8 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 from qms.core import get_db, get_config, get_logger
-from qms.core.config import QMS_PATHS
+from qms.core.config import QMS_PATHS, get_snapshot
+from qms.core.activity import record_activity
 
 logger = get_logger(__name__)
 
@@ -77,10 +78,15 @@ def compile_patterns(
     Pre-compile all regex patterns from document_types config.
 
     Returns list of (doc_type, pattern_str, compiled_re, destination_template, handler)
-    in config insertion order (first match wins).
+    in config insertion order (first match wins). With no *doc_types*, the
+    result is cached on the current config snapshot and only recompiled
+    after config.yaml changes.
     """
     if doc_types is None:
-        doc_types = load_document_types()
+        return get_snapshot().derive(
+            "document_type_patterns",
+            lambda cfg: compile_patterns(cfg.get("document_types", {})),
+        )
 
     compiled: List[CompiledPattern] = []
     for doc_type, spec in doc_types.items():
@@ -487,13 +493,14 @@ def _log_actions(actions: List[ProcessAction]) -> None:
     """Write process actions to document_intake_log table."""
     try:
         with get_db() as conn:
-            conn.executemany(
-                """
-                INSERT INTO document_intake_log
-                    (file_name, source_path, destination_path, document_type, handler, action, notes)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                [
+            # Row-at-a-time so each activity event can reference its log id
+            for a in actions:
+                cur = conn.execute(
+                    """
+                    INSERT INTO document_intake_log
+                        (file_name, source_path, destination_path, document_type, handler, action, notes)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
                     (
                         a.filename,
                         a.source,
@@ -502,10 +509,11 @@ def _log_actions(actions: List[ProcessAction]) -> None:
                         a.handler,
                         a.action,
                         a.notes,
-                    )
-                    for a in actions
-                ],
-            )
+                    ),
+                )
+                record_activity(
+                    conn, "intake", a.action, a.filename, "document_intake_log", cur.lastrowid
+                )
             conn.commit()
     except Exception as exc:
         logger.error("Failed to log intake actions: %s", exc)
@@ -684,10 +684,14 @@ def extract_electrical(
     project: Optional[str] = typer.Option(None, "--project", "-p", help="Project number to extract"),
     model: str = typer.Option("sonnet", "--model", "-m", help="AI model (sonnet, opus)"),
     dry_run: bool = typer.Option(False, "--dry-run", help="Preview without saving to database"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Call the model even for unchanged drawings"),
 ):
     """Extract data from electrical drawings using AI vision."""
     from qms.pipeline.electrical_extractor import extract_batch
-    from qms.core import get_db
+    from qms.core import get_db, model_cache
+
+    if no_cache:
+        model_cache.set_enabled(False)
 
     # Determine which sheets to process
     ids = []
@@ -10,14 +10,14 @@ Extracts structured data from electrical power plan drawings including:
 - Conduit routing and wire sizing
 """
 
-import base64
 import json
 import time
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from qms.core import get_db, get_logger
+from qms.core import get_db, get_logger, model_gateway
+from qms.pipeline.vision_input import build_vision_content
 
 logger = get_logger(__name__)
 
@@ -42,66 +42,6 @@ class ExtractionResult:
     extraction_model: str = "sonnet"
 
 
-def _encode_pdf_for_vision(pdf_path: Path) -> str:
-    """Convert PDF to base64 for Claude vision API."""
-    with open(pdf_path, "rb") as f:
-        return base64.standard_b64encode(f.read()).decode("utf-8")
-
-
-def _call_claude_vision(pdf_base64: str, prompt: str, model: str = "sonnet") -> str:
-    """
-    Call Claude vision API with PDF document.
-
-    Args:
-        pdf_base64: Base64-encoded PDF
-        prompt: Extraction prompt
-        model: Model name (sonnet, opus)
-
-    Returns:
-        Model response text
-    """
-    try:
-        import anthropic
-    except ImportError:
-        raise ImportError(
-            "anthropic SDK required. Install with: pip install anthropic>=0.25.0"
-        )
-
-    model_map = {
-        "haiku": "claude-haiku-4-5-20251001",
-        "sonnet": "claude-sonnet-4-5-20250929",
-        "opus": "claude-opus-4-6",
-    }
-    model_id = model_map.get(model, model)
-
-    client = anthropic.Anthropic()
-    response = client.messages.create(
-        model=model_id,
-        max_tokens=16000,
-        messages=[
-            {
-                "role": "user",
-                "content": [
-                    {
-                        "type": "document",
-                        "source": {
-                            "type": "base64",
-                            "media_type": "application/pdf",
-                            "data": pdf_base64,
-                        },
-                    },
-                    {
-                        "type": "text",
-                        "text": prompt,
-                    },
-                ],
-            }
-        ],
-    )
-
-    return response.content[0].text
-
-
 def _build_extraction_prompt(drawing_number: str, drawing_type: str) -> str:
     """Build extraction prompt for electrical drawings."""
     return f"""Extract all structured data from this electrical power plan drawing: {drawing_number}
@@ -247,6 +187,7 @@ def extract_electrical_drawing(
     drawing_number: str,
     model: str = "sonnet",
     dry_run: bool = False,
+    file_hash: Optional[str] = None,
 ) -> ExtractionResult:
     """
     Extract data from an electrical drawing PDF.
@@ -257,6 +198,7 @@ def extract_electrical_drawing(
         drawing_number: Drawing number for logging
         model: AI model to use (sonnet, opus)
         dry_run: If True, don't write to database
+        file_hash: The PDF's MD5 if known (sheets.file_hash)
 
     Returns:
         ExtractionResult with extracted data
@@ -281,12 +223,10 @@ def extract_electrical_drawing(
 
         logger.info("Extracting %s (%s) using %s...", drawing_number, drawing_type, model)
 
-        # Encode PDF
-        pdf_base64 = _encode_pdf_for_vision(pdf_path)
-
-        # Build prompt and call Claude
+        # Build prompt and call Claude on the relevant pages
         prompt = _build_extraction_prompt(drawing_number, drawing_type)
-        response = _call_claude_vision(pdf_base64, prompt, model)
+        content = build_vision_content(pdf_path, prompt, file_hash=file_hash)
+        response = model_gateway.call(content, model, max_tokens=16000, cache=True).text
 
         # Parse response
         data = _parse_extraction_response(response)
@@ -551,7 +491,7 @@ def extract_batch(sheet_ids: List[int], model: str = "sonnet", dry_run: bool = F
     with get_db(readonly=True) as conn:
         for i, sheet_id in enumerate(sheet_ids, 1):
             row = conn.execute(
-                "SELECT drawing_number, file_path FROM sheets WHERE id = ?",
+                "SELECT drawing_number, file_path, file_hash FROM sheets WHERE id = ?",
                 (sheet_id,),
             ).fetchone()
 
@@ -568,7 +508,8 @@ def extract_batch(sheet_ids: List[int], model: str = "sonnet", dry_run: bool = F
 
             logger.info("[%d/%d] Processing %s...", i, len(sheet_ids), drawing_number)
             result = extract_electrical_drawing(
-                sheet_id, file_path, drawing_number, model, dry_run
+                sheet_id, file_path, drawing_number, model, dry_run,
+                file_hash=row["file_hash"],
             )
             results.append(result)
 
@@ -12,12 +12,17 @@ Uses AI models (Sonnet/Opus) to read drawings and extract data per the
 """
 
 import json
+import queue
 import re
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from qms.core import get_db, get_logger
+from qms.core import get_config_value, get_db, get_logger, model_gateway
+from qms.core.pdf_cache import load_pdf
 
 logger = get_logger("qms.pipeline.extractor")
 
@@ -40,37 +45,22 @@ class ExtractionResult:
     processing_time_ms: int = 0
 
 
-def extract_pdf_text(pdf_path: Path) -> str:
+def extract_pdf_text(pdf_path: Path, file_hash: Optional[str] = None) -> str:
     """
-    Extract text content from a PDF file using PyMuPDF.
+    Extract text content from a PDF file using PyMuPDF (via the PDF text cache).
 
     Args:
         pdf_path: Path to PDF file.
+        file_hash: The file's MD5 if known (``sheets.file_hash``); saves
+            re-hashing the PDF before the cache lookup.
 
     Returns:
         Extracted text as a single string.
     """
-    try:
-        import fitz  # PyMuPDF
-    except ImportError:
-        raise ImportError(
-            "PyMuPDF is required for PDF extraction. "
-            "Install with: pip install PyMuPDF>=1.23.0"
-        )
-
     pdf_path = Path(pdf_path)
-    if not pdf_path.exists():
-        raise FileNotFoundError(f"PDF not found: {pdf_path}")
-
-    pages: List[str] = []
-    with fitz.open(str(pdf_path)) as doc:
-        for page_num, page in enumerate(doc):
-            text = page.get_text("text")
-            if text.strip():
-                pages.append(f"--- PAGE {page_num + 1} ---\n{text}")
-
-    full_text = "\n\n".join(pages)
-    logger.info("Extracted %d pages, %d chars from %s", len(pages), len(full_text), pdf_path.name)
+    pdf = load_pdf(pdf_path, file_hash)
+    full_text = pdf.plain_text()
+    logger.info("Extracted %d pages, %d chars from %s", pdf.page_count, len(full_text), pdf_path.name)
     return full_text
 
 
@@ -328,7 +318,8 @@ Return as structured JSON with equipment, lines, and instruments arrays.
 
 def call_model(prompt: str, model: str = "sonnet") -> str:
     """
-    Call an AI model with the given prompt.
+    Call an AI model with the given prompt (via the shared model gateway;
+    identical prompts are answered from the response cache).
 
     Args:
         prompt: Extraction prompt.
@@ -337,29 +328,7 @@ def call_model(prompt: str, model: str = "sonnet") -> str:
     Returns:
         Model response as text.
     """
-    try:
-        import anthropic
-    except ImportError:
-        raise ImportError(
-            "anthropic SDK is required for extraction. "
-            "Install with: pip install anthropic>=0.25.0"
-        )
-
-    model_map = {
-        "haiku": "claude-haiku-4-5-20251001",
-        "sonnet": "claude-sonnet-4-5-20250929",
-        "opus": "claude-opus-4-6",
-    }
-    model_id = model_map.get(model, model)
-
-    client = anthropic.Anthropic()
-    response = client.messages.create(
-        model=model_id,
-        max_tokens=8192,
-        messages=[{"role": "user", "content": prompt}],
-    )
-
-    return response.content[0].text
+    return model_gateway.call(prompt, model, max_tokens=8192, cache=True).text
 
 
 def parse_extraction_response(response: str) -> Dict[str, Any]:
@@ -515,6 +484,104 @@ def store_extraction(conn, sheet_id: int, data: Dict[str, Any]) -> Dict[str, int
     return counts
 
 
+# ---------------------------------------------------------------------------
+# Per-sheet stages (shared by the serial and concurrent paths)
+# ---------------------------------------------------------------------------
+
+def _prepare_extraction(result: ExtractionResult, text: str, file_name: str) -> Optional[tuple[str, str]]:
+    """
+    Classify the drawing, pick a model and build the prompt.
+
+    Sets ``drawing_type``/``model_used`` on *result*; marks it failed and
+    returns None when the PDF had no text.
+
+    Returns:
+        Tuple of (prompt, complexity).
+    """
+    if not text.strip():
+        result.status = "failed"
+        result.errors.append("No text extracted from PDF")
+        return None
+
+    drawing_type, complexity = classify_drawing(text, file_name)
+    result.drawing_type = drawing_type
+
+    model = select_model(drawing_type, complexity)
+    result.model_used = model
+
+    logger.info(
+        "Sheet %d: %s (type=%s, complexity=%s, model=%s)",
+        result.sheet_id, result.drawing_number, drawing_type, complexity, model
+    )
+    return build_extraction_prompt(text, drawing_type), complexity
+
+
+def _run_extraction(result: ExtractionResult, prompt: str) -> Dict[str, Any]:
+    """Call the model, parse its response and score it onto *result*."""
+    response = call_model(prompt, result.model_used)
+    data = parse_extraction_response(response)
+
+    # Calculate confidence and flags
+    all_items = (
+        data.get("lines", []) +
+        data.get("equipment", []) +
+        data.get("instruments", []) +
+        data.get("welds", [])
+    )
+    confidence, flagged = calculate_confidence(
+        all_items,
+        {
+            "lines": len(data.get("lines", [])),
+            "equipment": len(data.get("equipment", [])),
+            "instruments": len(data.get("instruments", [])),
+            "welds": len(data.get("welds", [])),
+        }
+    )
+    result.confidence = confidence
+    result.flagged_items = flagged
+    return data
+
+
+def _store_result(
+    result: ExtractionResult, data: Dict[str, Any], complexity: str, dry_run: bool
+) -> None:
+    """Write extracted items and the sheet update (unless *dry_run*); set counts and status."""
+    if not dry_run:
+        with get_db() as conn:
+            counts = store_extraction(conn, result.sheet_id, data)
+
+            # Update sheet record
+            conn.execute("""
+                UPDATE sheets
+                SET extracted_at = CURRENT_TIMESTAMP,
+                    quality_score = ?,
+                    complexity = ?,
+                    extraction_model = ?
+                WHERE id = ?
+            """, (result.confidence, complexity, result.model_used, result.sheet_id))
+
+            conn.commit()
+            logger.info(
+                "Stored: %d lines, %d equipment, %d instruments, %d welds",
+                counts["lines"], counts["equipment"], counts["instruments"], counts["welds"]
+            )
+    else:
+        counts = {key: len(data.get(key, [])) for key in ("lines", "equipment", "instruments", "welds")}
+        logger.info("[DRY RUN] Would store: %s", counts)
+
+    result.lines_extracted = counts["lines"]
+    result.equipment_extracted = counts["equipment"]
+    result.instruments_extracted = counts["instruments"]
+    result.welds_extracted = counts["welds"]
+    result.status = "success" if not result.flagged_items else "partial"
+
+
+def _fail(result: ExtractionResult, exc: Exception) -> None:
+    result.status = "failed"
+    result.errors.append(str(exc))
+    logger.error("Extraction error for sheet %d: %s", result.sheet_id, exc, exc_info=True)
+
+
 def extract_drawing(sheet_id: int, file_path: str, dry_run: bool = False) -> ExtractionResult:
     """
     Extract data from a single drawing.
@@ -527,20 +594,19 @@ def extract_drawing(sheet_id: int, file_path: str, dry_run: bool = False) -> Ext
     Returns:
         ExtractionResult with outcome.
     """
-    import time
     start_time = time.time()
 
     # Get sheet info from database
     with get_db(readonly=True) as conn:
         row = conn.execute(
-            "SELECT drawing_number, file_path FROM sheets WHERE id = ?",
+            "SELECT drawing_number, file_path, file_hash FROM sheets WHERE id = ?",
             (sheet_id,)
         ).fetchone()
         if not row:
             raise ValueError(f"Sheet ID {sheet_id} not found")
 
         drawing_number = row["drawing_number"]
-        db_file_path = row["file_path"]
+        file_hash = row["file_hash"]
 
     result = ExtractionResult(
         sheet_id=sheet_id,
@@ -557,131 +623,201 @@ def extract_drawing(sheet_id: int, file_path: str, dry_run: bool = False) -> Ext
             result.errors.append(f"File not found: {file_path}")
             return result
 
-        text = extract_pdf_text(pdf_path)
-        if not text.strip():
-            result.status = "failed"
-            result.errors.append("No text extracted from PDF")
-            return result
+        text = extract_pdf_text(pdf_path, file_hash)
+        prepared = _prepare_extraction(result, text, pdf_path.name)
+        if prepared is not None:
+            prompt, complexity = prepared
+            data = _run_extraction(result, prompt)
+            _store_result(result, data, complexity, dry_run)
+
+    except Exception as e:
+        _fail(result, e)
 
-        # Classify drawing
-        drawing_type, complexity = classify_drawing(text, pdf_path.name)
-        result.drawing_type = drawing_type
+    result.processing_time_ms = int((time.time() - start_time) * 1000)
+    return result
 
-        # Select model
-        model = select_model(drawing_type, complexity)
-        result.model_used = model
 
-        logger.info(
-            "Sheet %d: %s (type=%s, complexity=%s, model=%s)",
-            sheet_id, drawing_number, drawing_type, complexity, model
-        )
+# ---------------------------------------------------------------------------
+# Batch extraction
+# ---------------------------------------------------------------------------
 
-        # Build prompt and extract
-        prompt = build_extraction_prompt(text, drawing_type)
-        response = call_model(prompt, model)
-        data = parse_extraction_response(response)
-
-        # Calculate confidence and flags
-        all_items = (
-            data.get("lines", []) +
-            data.get("equipment", []) +
-            data.get("instruments", []) +
-            data.get("welds", [])
-        )
-        confidence, flagged = calculate_confidence(
-            all_items,
-            {
-                "lines": len(data.get("lines", [])),
-                "equipment": len(data.get("equipment", [])),
-                "instruments": len(data.get("instruments", [])),
-                "welds": len(data.get("welds", [])),
-            }
-        )
-        result.confidence = confidence
-        result.flagged_items = flagged
-
-        # Store in database
-        if not dry_run:
-            with get_db() as conn:
-                counts = store_extraction(conn, sheet_id, data)
-                result.lines_extracted = counts["lines"]
-                result.equipment_extracted = counts["equipment"]
-                result.instruments_extracted = counts["instruments"]
-                result.welds_extracted = counts["welds"]
-
-                # Update sheet record
-                conn.execute("""
-                    UPDATE sheets
-                    SET extracted_at = CURRENT_TIMESTAMP,
-                        quality_score = ?,
-                        complexity = ?,
-                        extraction_model = ?
-                    WHERE id = ?
-                """, (confidence, complexity, model, sheet_id))
-
-                conn.commit()
-                logger.info(
-                    "Stored: %d lines, %d equipment, %d instruments, %d welds",
-                    counts["lines"], counts["equipment"], counts["instruments"], counts["welds"]
-                )
-        else:
-            result.lines_extracted = len(data.get("lines", []))
-            result.equipment_extracted = len(data.get("equipment", []))
-            result.instruments_extracted = len(data.get("instruments", []))
-            result.welds_extracted = len(data.get("welds", []))
-            logger.info("[DRY RUN] Would store: %s", counts)
+def _make_pdf_executor(workers: int) -> Executor:
+    """CPU pool for PDF text extraction (processes: PyMuPDF holds the GIL)."""
+    return ProcessPoolExecutor(max_workers=workers)
 
-        result.status = "success" if not flagged else "partial"
 
-    except Exception as e:
-        result.status = "failed"
-        result.errors.append(str(e))
-        logger.error("Extraction error for sheet %d: %s", sheet_id, e, exc_info=True)
+def _concurrency_setting(key: str, default: Any) -> Any:
+    return get_config_value("extraction", "concurrency", key, default=default)
 
-    result.processing_time_ms = int((time.time() - start_time) * 1000)
-    return result
+
+def _log_batch_summary(results: List[ExtractionResult]) -> None:
+    success = sum(1 for r in results if r.status == "success")
+    partial = sum(1 for r in results if r.status == "partial")
+    failed = sum(1 for r in results if r.status == "failed")
+
+    logger.info(
+        "Batch complete: %d success, %d partial, %d failed (of %d total)",
+        success, partial, failed, len(results)
+    )
 
 
-def extract_batch(sheet_ids: List[int], dry_run: bool = False) -> List[ExtractionResult]:
+def extract_batch(
+    sheet_ids: List[int],
+    dry_run: bool = False,
+    max_workers: Optional[int] = None,
+    requests_per_minute: Optional[float] = None,
+) -> List[ExtractionResult]:
     """
     Extract data from multiple drawings.
 
+    With more than one worker, sheets are pipelined: PDF text is extracted
+    ahead on a process pool (``extraction.concurrency.pdf_workers``), up to
+    *max_workers* model calls run at once on a thread pool (spaced by
+    *requests_per_minute*), and a single writer thread commits each
+    ``store_extraction`` in turn. Results are the same as the serial path,
+    in input order.
+
     Args:
         sheet_ids: List of sheet IDs to process.
         dry_run: If True, don't write to database.
+        max_workers: Concurrent model calls (default
+            ``extraction.concurrency.max_workers``; 1 = serial).
+        requests_per_minute: Model call rate limit (default
+            ``extraction.concurrency.requests_per_minute``; 0 = unlimited).
 
     Returns:
         List of ExtractionResult for each sheet.
     """
-    results = []
+    if max_workers is None:
+        max_workers = int(_concurrency_setting("max_workers", 4))
+    if requests_per_minute is None:
+        requests_per_minute = float(_concurrency_setting("requests_per_minute", 0))
 
     # Get file paths for all sheets
     with get_db(readonly=True) as conn:
         rows = conn.execute(
-            f"SELECT id, file_path FROM sheets WHERE id IN ({','.join('?' * len(sheet_ids))})",
+            f"""SELECT id, file_path, drawing_number, file_hash FROM sheets
+                WHERE id IN ({','.join('?' * len(sheet_ids))})""",
             sheet_ids
         ).fetchall()
 
-    sheet_paths = {row["id"]: row["file_path"] for row in rows}
-
-    for i, sheet_id in enumerate(sheet_ids, 1):
-        file_path = sheet_paths.get(sheet_id)
-        if not file_path:
+    sheets = {
+        row["id"]: (row["file_path"], row["drawing_number"], row["file_hash"]) for row in rows
+    }
+    todo = []
+    for sheet_id in sheet_ids:
+        if sheets.get(sheet_id, (None,))[0]:
+            todo.append(sheet_id)
+        else:
             logger.warning("Sheet %d not found in database", sheet_id)
-            continue
 
-        logger.info("[%d/%d] Processing sheet %d...", i, len(sheet_ids), sheet_id)
-        result = extract_drawing(sheet_id, file_path, dry_run=dry_run)
-        results.append(result)
+    if max_workers <= 1 or len(todo) <= 1:
+        results = []
+        for i, sheet_id in enumerate(todo, 1):
+            logger.info("[%d/%d] Processing sheet %d...", i, len(todo), sheet_id)
+            results.append(extract_drawing(sheet_id, sheets[sheet_id][0], dry_run=dry_run))
+    else:
+        results = _extract_concurrent(
+            todo, sheets, dry_run, max_workers, model_gateway.TokenBucket(requests_per_minute)
+        )
 
-    # Summary
-    success = sum(1 for r in results if r.status == "success")
-    partial = sum(1 for r in results if r.status == "partial")
-    failed = sum(1 for r in results if r.status == "failed")
+    _log_batch_summary(results)
+    return results
 
-    logger.info(
-        "Batch complete: %d success, %d partial, %d failed (of %d total)",
-        success, partial, failed, len(results)
-    )
+
+def _extract_concurrent(
+    sheet_ids: List[int],
+    sheets: Dict[int, tuple],
+    dry_run: bool,
+    max_workers: int,
+    limiter: model_gateway.TokenBucket,
+) -> List[ExtractionResult]:
+    """
+    Pipelined batch: PDF pool -> model thread pool -> single writer thread.
+
+    Results are kept per input position, so a sheet listed twice is
+    processed twice, as on the serial path. At most ``2 * max_workers``
+    sheets are submitted ahead of the model stage, bounding how much
+    extracted text is held in memory.
+    """
+    results = [
+        ExtractionResult(
+            sheet_id=sheet_id,
+            drawing_number=sheets[sheet_id][1],
+            drawing_type="Unknown",
+            model_used="sonnet",
+        )
+        for sheet_id in sheet_ids
+    ]
+    started: Dict[int, float] = {}
+    writes: "queue.Queue[Optional[tuple]]" = queue.Queue()
+    ahead = threading.BoundedSemaphore(2 * max_workers)
+    done_count = [0]
+    count_lock = threading.Lock()
+
+    def _finish(pos: int) -> None:
+        result = results[pos]
+        result.processing_time_ms = int((time.time() - started[pos]) * 1000)
+        with count_lock:
+            done_count[0] += 1
+            logger.info(
+                "[%d/%d] Sheet %d: %s", done_count[0], len(sheet_ids), result.sheet_id, result.status
+            )
+
+    def _writer() -> None:
+        while True:
+            job = writes.get()
+            if job is None:
+                return
+            pos, data, complexity = job
+            try:
+                _store_result(results[pos], data, complexity, dry_run)
+            except Exception as e:
+                _fail(results[pos], e)
+            _finish(pos)
+
+    def _model_stage(pos: int, text_future: Future) -> None:
+        result = results[pos]
+        started[pos] = time.time()
+        try:
+            pdf_path = Path(sheets[result.sheet_id][0])
+            prepared = _prepare_extraction(result, text_future.result(), pdf_path.name)
+            if prepared is not None:
+                prompt, complexity = prepared
+                limiter.acquire()
+                data = _run_extraction(result, prompt)
+                writes.put((pos, data, complexity))
+                return
+        except Exception as e:
+            _fail(result, e)
+        finally:
+            ahead.release()
+        _finish(pos)
+
+    writer = threading.Thread(target=_writer, name="extract-writer", daemon=True)
+    writer.start()
+    pdf_workers = max(1, int(_concurrency_setting("pdf_workers", 2)))
+    try:
+        with _make_pdf_executor(pdf_workers) as pdf_pool, \
+                ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="extract") as model_pool:
+            futures = []
+            for pos, sheet_id in enumerate(sheet_ids):
+                pdf_path = Path(sheets[sheet_id][0])
+                if not pdf_path.exists():
+                    started[pos] = time.time()
+                    results[pos].status = "failed"
+                    results[pos].errors.append(f"File not found: {sheets[sheet_id][0]}")
+                    _finish(pos)
+                    continue
+                # PDF text is extracted ahead while model calls are in flight,
+                # but only a bounded number of sheets ahead
+                ahead.acquire()
+                text_future = pdf_pool.submit(extract_pdf_text, pdf_path, sheets[sheet_id][2])
+                futures.append(model_pool.submit(_model_stage, pos, text_future))
+            for future in futures:
+                future.result()
+    finally:
+        writes.put(None)
+        writer.join()
 
     return results
@@ -301,16 +301,16 @@ def build_floor_plan_prompt(
             format_text_layer_for_prompt,
         )
 
-        file_path = None
+        file_path = file_hash = None
         with get_db(readonly=True) as conn:
             row = conn.execute(
-                "SELECT file_path FROM sheets WHERE id = ?", (sheet_id,)
+                "SELECT file_path, file_hash FROM sheets WHERE id = ?", (sheet_id,)
             ).fetchone()
             if row:
-                file_path = row["file_path"]
+                file_path, file_hash = row["file_path"], row["file_hash"]
 
         if file_path:
-            text_data = extract_text_layer(file_path)
+            text_data = extract_text_layer(file_path, file_hash=file_hash)
             if text_data["text_blocks"]:
                 text_layer_section = (
                     "\n\n" + format_text_layer_for_prompt(text_data)
@@ -917,6 +917,7 @@ def _import_employees(
                 phone=record.phone if record.phone else None,
                 job_id=job_id,
                 notes=record.designation if record.designation else None,
+                commit=False,
             )
 
             if job_changed:
@@ -972,6 +973,7 @@ def _import_employees(
                 status='active',
                 notes=record.designation if record.designation else None,
                 created_by='SIS-IMPORT',
+                commit=False,
             )
 
             stats['employees_created'] = stats.get('employees_created', 0) + 1
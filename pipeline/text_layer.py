@@ -9,9 +9,10 @@ Part of v0.4 Equipment-Centric Platform (Phases 27-02a, 27-03).
 """
 
 import re
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from qms.core import get_db, get_logger
+from qms.core.pdf_cache import load_pdf
 
 logger = get_logger("qms.pipeline.text_layer")
 
@@ -34,14 +35,16 @@ def _is_equipment_tag(text: str) -> bool:
     return False
 
 
-def extract_text_layer(file_path: str, page_num: int = 0) -> dict:
+def extract_text_layer(file_path: str, page_num: int = 0, file_hash: Optional[str] = None) -> dict:
     """Extract all text with bounding boxes from a PDF page.
 
-    Uses PyMuPDF (fitz) to get embedded text from CAD-generated PDFs.
+    Uses PyMuPDF (fitz) to get embedded text from CAD-generated PDFs; pages
+    come from the PDF text cache, so each file is parsed once.
 
     Args:
         file_path: Path to the PDF file.
         page_num: Page number (0-indexed). Defaults to first page.
+        file_hash: The file's MD5 if known (``sheets.file_hash``).
 
     Returns:
         {
@@ -55,13 +58,10 @@ def extract_text_layer(file_path: str, page_num: int = 0) -> dict:
             "equipment_tags": ["RAHU-1", "RCU-4", ...],
         }
     """
-    import fitz
-
-    doc = fitz.open(file_path)
-    page_count = doc.page_count
+    pdf = load_pdf(file_path, file_hash)
+    page_count = pdf.page_count
 
     if page_num >= page_count:
-        doc.close()
         return {
             "page_count": page_count,
             "page_width": 0,
@@ -70,40 +70,14 @@ def extract_text_layer(file_path: str, page_num: int = 0) -> dict:
             "equipment_tags": [],
         }
 
-    page = doc[page_num]
-    page_width = round(page.rect.width, 1)
-    page_height = round(page.rect.height, 1)
-    data = page.get_text("dict")
-
-    text_blocks = []
-    equipment_tags = set()
-
-    for block in data.get("blocks", []):
-        if block.get("type") != 0:
-            continue
-        for line in block.get("lines", []):
-            for span in line.get("spans", []):
-                text = span.get("text", "").strip()
-                if not text:
-                    continue
-                bbox = span.get("bbox", (0, 0, 0, 0))
-                text_blocks.append({
-                    "text": text,
-                    "x0": round(bbox[0], 1),
-                    "y0": round(bbox[1], 1),
-                    "x1": round(bbox[2], 1),
-                    "y1": round(bbox[3], 1),
-                })
-
-                if _is_equipment_tag(text):
-                    equipment_tags.add(text.strip().upper())
-
-    doc.close()
+    page = pdf.pages[page_num]
+    text_blocks = list(page.spans())
+    equipment_tags = {b["text"].upper() for b in text_blocks if _is_equipment_tag(b["text"])}
 
     return {
         "page_count": page_count,
-        "page_width": page_width,
-        "page_height": page_height,
+        "page_width": page.width,
+        "page_height": page.height,
         "text_blocks": text_blocks,
         "equipment_tags": sorted(equipment_tags),
     }
@@ -179,49 +153,23 @@ def format_text_layer_for_prompt(text_data: dict, max_lines: int = 200) -> str:
     return header + "\n".join(lines) + instruction
 
 
-def extract_all_pages_tags(file_path: str) -> set:
+def extract_all_pages_tags(file_path: str, file_hash: Optional[str] = None) -> set:
     """Extract equipment tags from ALL pages of a PDF."""
-    import fitz
-
     tags = set()
     try:
-        doc = fitz.open(file_path)
-        for page_num in range(doc.page_count):
-            page = doc[page_num]
-            data = page.get_text("dict")
-            for block in data.get("blocks", []):
-                if block.get("type") != 0:
-                    continue
-                for line in block.get("lines", []):
-                    for span in line.get("spans", []):
-                        text = span.get("text", "").strip()
-                        if text and _is_equipment_tag(text):
-                            tags.add(text.upper())
-        doc.close()
+        for page in load_pdf(file_path, file_hash).pages:
+            tags.update(text.upper() for text in page.span_text if _is_equipment_tag(text))
     except Exception as e:
         logger.warning("Failed to extract tags from %s: %s", file_path, e)
     return tags
 
 
-def _extract_all_text_strings(file_path: str) -> set:
+def _extract_all_text_strings(file_path: str, file_hash: Optional[str] = None) -> set:
     """Extract ALL non-empty text strings from all pages of a PDF (uppercase)."""
-    import fitz
-
     texts = set()
     try:
-        doc = fitz.open(file_path)
-        for page_num in range(doc.page_count):
-            page = doc[page_num]
-            data = page.get_text("dict")
-            for block in data.get("blocks", []):
-                if block.get("type") != 0:
-                    continue
-                for line in block.get("lines", []):
-                    for span in line.get("spans", []):
-                        text = span.get("text", "").strip()
-                        if text:
-                            texts.add(text.upper())
-        doc.close()
+        for page in load_pdf(file_path, file_hash).pages:
+            texts.update(text.upper() for text in page.span_text)
     except Exception as e:
         logger.warning("Failed to extract text from %s: %s", file_path, e)
     return texts
@@ -273,7 +221,7 @@ def validate_schedule_against_text_layer(project_id: int) -> dict:
     """
     with get_db(readonly=True) as conn:
         sheets = conn.execute(
-            """SELECT DISTINCT se.sheet_id, s.drawing_number, s.file_path
+            """SELECT DISTINCT se.sheet_id, s.drawing_number, s.file_path, s.file_hash
                FROM schedule_extractions se
                JOIN sheets s ON s.id = se.sheet_id
                WHERE se.project_id = ?
@@ -296,6 +244,7 @@ def validate_schedule_against_text_layer(project_id: int) -> dict:
             sheet_id = sheet["sheet_id"]
             drawing = sheet["drawing_number"]
             file_path = sheet["file_path"]
+            file_hash = sheet["file_hash"]
 
             # Get Docling tags
             docling_rows = conn.execute(
@@ -305,7 +254,7 @@ def validate_schedule_against_text_layer(project_id: int) -> dict:
             docling_tags = {row["tag"].upper() for row in docling_rows}
 
             # Get ALL text strings from the PDF (not just regex-matched tags)
-            all_text = _extract_all_text_strings(file_path)
+            all_text = _extract_all_text_strings(file_path, file_hash)
 
             if not all_text:
                 results["no_text_sheets"].append(drawing)
@@ -331,7 +280,7 @@ def validate_schedule_against_text_layer(project_id: int) -> dict:
                     d_only.add(tag)
 
             # Also find equipment tags in text that Docling missed
-            equip_tags = extract_all_pages_tags(file_path)
+            equip_tags = extract_all_pages_tags(file_path, file_hash)
             t_only = equip_tags - docling_tags
 
             results["sheets_checked"] += 1
@@ -0,0 +1,265 @@
+"""Vision input builder — page-subset content for the drawing extractors.
+
+Instead of base64-encoding the whole PDF (30-50 MB architectural sheets cost
+~2.3x their size in RAM per request), the vision extractors send only the
+relevant pages:
+
+- Pages with embedded text are preferred (blank cover/back pages are skipped);
+  scanned PDFs fall back to the leading pages. At most ``max_pages`` are sent.
+- The chosen pages are copied into a new PDF with PyMuPDF and sent as a
+  ``document`` block, so the model still gets the text layer and the vector
+  line work at full resolution.
+- Only if that subset is still larger than ``max_document_mb`` (huge scanned
+  sheets) are the pages rasterized instead: rendered at ``dpi``, scaled down so
+  the long edge stays within ``max_edge_px`` and re-encoded (smaller of
+  PNG/JPEG, then at a lower scale) until each fits ``max_image_mb``. The pages'
+  text from the PDF text cache is added to the prompt.
+- Encoded subsets and pages are cached in memory per file hash and the
+  settings that shaped them, up to ``cache_mb``, so re-runs and retries reuse
+  the same payload.
+
+Settings live under ``extraction.vision`` in config.yaml.
+"""
+
+import base64
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from qms.core import get_config_value, get_logger
+from qms.core.model_gateway import image_block, pdf_content
+from qms.core.pdf_cache import PdfText, file_hash as pdf_file_hash, load_pdf
+
+logger = get_logger("qms.pipeline.vision_input")
+
+_DEFAULTS: Dict[str, Any] = {
+    "max_pages": 4,
+    "max_document_mb": 24,
+    "dpi": 150,
+    "max_edge_px": 1568,
+    "max_image_mb": 3.75,
+    "cache_mb": 256,
+}
+
+# Each retry renders at this fraction of the previous scale
+_SHRINK = 0.75
+
+
+def _vision_setting(key: str) -> Any:
+    return get_config_value("extraction", "vision", key, default=_DEFAULTS[key])
+
+
+# ---------------------------------------------------------------------------
+# Encoded payload cache
+# ---------------------------------------------------------------------------
+
+# ("pdf", file hash, pages) or ("page", file hash, page, dpi, max edge, max MB)
+_PageKey = Tuple[Any, ...]
+
+_pages: "OrderedDict[_PageKey, Tuple[str, str]]" = OrderedDict()
+_pages_bytes = 0
+_pages_lock = threading.Lock()
+
+
+def _cache_get(key: _PageKey) -> Optional[Tuple[str, str]]:
+    with _pages_lock:
+        entry = _pages.get(key)
+        if entry is not None:
+            _pages.move_to_end(key)
+        return entry
+
+
+def _cache_put(key: _PageKey, entry: Tuple[str, str]) -> None:
+    global _pages_bytes
+    limit = int(float(_vision_setting("cache_mb")) * 1024 * 1024)
+    with _pages_lock:
+        if key in _pages:
+            return
+        _pages[key] = entry
+        _pages_bytes += len(entry[1])
+        while _pages_bytes > limit and _pages:
+            _, (_, data) = _pages.popitem(last=False)
+            _pages_bytes -= len(data)
+
+
+def clear_cache() -> None:
+    """Drop all cached page subsets and images."""
+    global _pages_bytes
+    with _pages_lock:
+        _pages.clear()
+        _pages_bytes = 0
+
+
+# ---------------------------------------------------------------------------
+# Page selection and rendering
+# ---------------------------------------------------------------------------
+
+def select_pages(pdf_path: Path, pdf: PdfText, max_pages: int) -> List[int]:
+    """Pick the pages worth sending: text-bearing pages first, else the leading pages."""
+    with_text = [n for n, page in enumerate(pdf.pages) if page.span_text]
+    chosen = with_text or list(range(pdf.page_count))
+    if len(chosen) > max_pages:
+        logger.info(
+            "%s: sending %d of %d candidate pages", pdf_path.name, max_pages, len(chosen)
+        )
+    return chosen[:max_pages]
+
+
+def _open_pdf(pdf_path: Path, file_hash: Optional[str]) -> Tuple[PdfText, str]:
+    """Check PyMuPDF and the file; return the (cached) text of *pdf_path* and its hash."""
+    try:
+        import fitz  # noqa: F401  PyMuPDF
+    except ImportError:
+        raise ImportError(
+            "PyMuPDF is required for vision extraction. "
+            "Install with: pip install PyMuPDF>=1.23.0"
+        )
+    if not pdf_path.exists():
+        raise FileNotFoundError(f"PDF not found: {pdf_path}")
+    pdf = load_pdf(pdf_path, file_hash)
+    # Uncached loads carry no verified hash; the payload cache still needs one
+    return pdf, pdf.file_hash or pdf_file_hash(pdf_path)
+
+
+def encode_subset(
+    pdf_path: Path,
+    pages: Optional[Sequence[int]] = None,
+    file_hash: Optional[str] = None,
+) -> Optional[str]:
+    """
+    Copy pages of *pdf_path* into a new PDF and base64-encode it.
+
+    Args:
+        pdf_path: PDF file.
+        pages: 0-indexed pages to send (default: select_pages()).
+        file_hash: The file's MD5 if known (``sheets.file_hash``).
+
+    Returns:
+        The base64 PDF, or ``None`` if it exceeds ``max_document_mb``.
+    """
+    import fitz
+
+    pdf_path = Path(pdf_path)
+    pdf, digest = _open_pdf(pdf_path, file_hash)
+    if pages is None:
+        pages = select_pages(pdf_path, pdf, int(_vision_setting("max_pages")))
+    key = ("pdf", digest, tuple(pages))
+    entry = _cache_get(key)
+    if entry is None:
+        with fitz.open(str(pdf_path)) as src, fitz.open() as subset:
+            for n in pages:
+                subset.insert_pdf(src, from_page=n, to_page=n)
+            data = subset.tobytes(garbage=3, deflate=True)
+        max_bytes = float(_vision_setting("max_document_mb")) * 1024 * 1024
+        if len(data) > max_bytes:
+            logger.info(
+                "%s: %d-page subset is %.1f MB, sending page images",
+                pdf_path.name, len(pages), len(data) / 1024 / 1024,
+            )
+            return None
+        entry = ("application/pdf", base64.standard_b64encode(data).decode("ascii"))
+        _cache_put(key, entry)
+    return entry[1]
+
+
+def _render_page(page, dpi: int, max_edge: int, max_image_mb: float) -> Tuple[str, bytes]:
+    """Rasterize *page* within the edge and size caps; return (media_type, image bytes)."""
+    import fitz
+
+    max_bytes = int(max_image_mb * 1024 * 1024)
+
+    long_side = max(page.rect.width, page.rect.height) or 1.0
+    scale = min(dpi / 72.0, max_edge / long_side)
+    media_type, data = "image/png", b""
+    for _ in range(8):
+        pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale), alpha=False)
+        data = pix.tobytes("png")
+        media_type = "image/png"
+        if len(data) > max_bytes:
+            # Line work compresses best as PNG, shaded/scanned sheets as JPEG
+            jpeg = pix.tobytes("jpg", jpg_quality=85)
+            if len(jpeg) < len(data):
+                media_type, data = "image/jpeg", jpeg
+        pix = None  # release the raster before the next attempt
+        if len(data) <= max_bytes:
+            break
+        scale *= _SHRINK
+    return media_type, data
+
+
+def encode_pages(
+    pdf_path: Path,
+    pages: Optional[Sequence[int]] = None,
+    dpi: Optional[int] = None,
+    file_hash: Optional[str] = None,
+) -> List[Tuple[str, str]]:
+    """
+    Render pages of *pdf_path* to base64 images (the fallback for oversized subsets).
+
+    Args:
+        pdf_path: PDF file.
+        pages: 0-indexed pages to send (default: select_pages()).
+        dpi: Render resolution (default ``extraction.vision.dpi``).
+        file_hash: The file's MD5 if known (``sheets.file_hash``).
+
+    Returns:
+        List of (media_type, base64 data), one per page.
+    """
+    import fitz
+
+    pdf_path = Path(pdf_path)
+    pdf, digest = _open_pdf(pdf_path, file_hash)
+    dpi = int(dpi or _vision_setting("dpi"))
+    max_edge = int(_vision_setting("max_edge_px"))
+    max_image_mb = float(_vision_setting("max_image_mb"))
+    if pages is None:
+        pages = select_pages(pdf_path, pdf, int(_vision_setting("max_pages")))
+
+    keys = [("page", digest, n, dpi, max_edge, max_image_mb) for n in pages]
+    encoded: List[Optional[Tuple[str, str]]] = [_cache_get(key) for key in keys]
+    missing = [i for i, entry in enumerate(encoded) if entry is None]
+    if missing:
+        with fitz.open(str(pdf_path)) as doc:
+            for i in missing:
+                media_type, data = _render_page(doc[pages[i]], dpi, max_edge, max_image_mb)
+                entry = (media_type, base64.standard_b64encode(data).decode("ascii"))
+                _cache_put(keys[i], entry)
+                encoded[i] = entry
+    return encoded  # type: ignore[return-value]
+
+
+def build_vision_content(
+    pdf_path: Path,
+    prompt: str,
+    pages: Optional[Sequence[int]] = None,
+    dpi: Optional[int] = None,
+    file_hash: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Message content for a vision extraction: the page-subset PDF, then *prompt*.
+
+    Falls back to one image block per page, then the pages' text and *prompt*,
+    when the subset exceeds ``max_document_mb``. See encode_pages() for the
+    arguments.
+    """
+    pdf_path = Path(pdf_path)
+    pdf, digest = _open_pdf(pdf_path, file_hash)
+    if pages is None:
+        pages = select_pages(pdf_path, pdf, int(_vision_setting("max_pages")))
+    if not pages:
+        raise ValueError(f"No pages to send from {pdf_path.name}")
+
+    subset = encode_subset(pdf_path, pages=pages, file_hash=digest)
+    if subset is not None:
+        return pdf_content(subset, prompt)
+
+    encoded = encode_pages(pdf_path, pages=pages, dpi=dpi, file_hash=digest)
+    content = [image_block(data, media_type) for media_type, data in encoded]
+    text = "\n\n".join(
+        f"--- PAGE {n + 1} ---\n{pdf.pages[n].text}" for n in pages if pdf.pages[n].text.strip()
+    )
+    if text:
+        content.append({"type": "text", "text": f"Text layer of these pages:\n\n{text}"})
+    content.append({"type": "text", "text": prompt})
+    return content
@@ -88,3 +88,45 @@ def log_issue_change(
            VALUES (?, ?, ?, ?, ?)""",
         (issue_id, field, old_value, new_value, changed_by),
     )
+
+
+def backfill_issue_fts(conn: sqlite3.Connection) -> int:
+    """
+    Index quality issues that predate ``quality_issues_fts`` (idempotent).
+
+    Returns:
+        Number of issues added to the full-text index.
+    """
+    cur = conn.execute(
+        """INSERT INTO quality_issues_fts (rowid, title, description, location)
+           SELECT qi.id, qi.title, qi.description, qi.location
+           FROM quality_issues qi
+           WHERE qi.id NOT IN (SELECT rowid FROM quality_issues_fts)"""
+    )
+    conn.commit()
+    if cur.rowcount:
+        logger.info("Backfilled %d issues into quality_issues_fts", cur.rowcount)
+    return cur.rowcount
+
+
+def search_issues_fts(
+    conn: sqlite3.Connection, match: str, limit: int = 30
+) -> List[Dict[str, Any]]:
+    """
+    BM25-ranked full-text search over issue title, description and location.
+
+    Args:
+        conn: Active database connection.
+        match: FTS5 match expression.
+        limit: Maximum results to return.
+
+    Returns:
+        List of dicts with ``id``, ``title`` and ``rank`` (best first).
+    """
+    rows = conn.execute(
+        """SELECT rowid AS id, title, bm25(quality_issues_fts) AS rank
+           FROM quality_issues_fts WHERE quality_issues_fts MATCH ?
+           ORDER BY rank LIMIT ?""",
+        (match, limit),
+    ).fetchall()
+    return [dict(r) for r in rows]
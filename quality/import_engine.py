@@ -22,6 +22,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 from qms.core import get_logger
+from qms.core.db import bulk_insert
 from qms.quality.db import normalize_status, normalize_trade, normalize_type
 
 logger = get_logger("qms.quality.import")
@@ -263,6 +264,16 @@ def import_quality_csv(
 
     now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
+    # One query for every already-imported source_id instead of one per row
+    existing_ids: Dict[str, int] = {
+        r["source_id"]: r["id"]
+        for r in conn.execute(
+            "SELECT id, source_id FROM quality_issues WHERE source = ? AND source_id IS NOT NULL",
+            (source,),
+        )
+    }
+    attachment_rows: List[Tuple[Any, ...]] = []
+
     # ------------------------------------------------------------------
     # 2. Process rows
     # ------------------------------------------------------------------
@@ -294,15 +305,8 @@ def import_quality_csv(
 
         if dry_run:
             # Check what would happen
-            if fields.get("source_id"):
-                existing = conn.execute(
-                    "SELECT id FROM quality_issues WHERE source = ? AND source_id = ?",
-                    (source, fields["source_id"]),
-                ).fetchone()
-                if existing:
-                    result["issues_updated"] += 1
-                else:
-                    result["issues_created"] += 1
+            if fields.get("source_id") and fields["source_id"] in existing_ids:
+                result["issues_updated"] += 1
             else:
                 result["issues_created"] += 1
             continue
@@ -311,25 +315,22 @@ def import_quality_csv(
         # 3. Dedup check and upsert
         # ----------------------------------------------------------
         try:
-            if fields.get("source_id"):
-                existing = conn.execute(
-                    "SELECT id FROM quality_issues WHERE source = ? AND source_id = ?",
-                    (source, fields["source_id"]),
-                ).fetchone()
-
-                if existing:
-                    _update_issue(conn, existing["id"], fields)
-                    result["issues_updated"] += 1
-                    continue
+            source_id = fields.get("source_id")
+            if source_id and source_id in existing_ids:
+                _update_issue(conn, existing_ids[source_id], fields)
+                result["issues_updated"] += 1
+                continue
 
             issue_id = _insert_issue(conn, fields)
             result["issues_created"] += 1
+            if source_id:
+                existing_ids[source_id] = issue_id
 
-            # Record attachment URLs if present
+            # Record attachment URLs if present (written in one batch below)
             if fields.get("attachments"):
-                result["attachments_recorded"] += _insert_attachments(
-                    conn, issue_id, fields["attachments"]
-                )
+                rows = _attachment_rows(issue_id, fields["attachments"])
+                attachment_rows.extend(rows)
+                result["attachments_recorded"] += len(rows)
 
         except Exception as e:
             logger.error("Error importing row %d: %s", row_idx, e)
@@ -340,6 +341,13 @@ def import_quality_csv(
             })
 
     if not dry_run:
+        bulk_insert(
+            "quality_issue_attachments",
+            attachment_rows,
+            columns=_ATTACHMENT_COLUMNS,
+            conn=conn,
+            commit=False,
+        )
         conn.commit()
 
     total = result["issues_created"] + result["issues_updated"] + result["issues_skipped"]
@@ -561,24 +569,15 @@ def _filename_from_url(url: str, index: int) -> str:
     return f"attachment_{index}.jpg"
 
 
-def _insert_attachments(
-    conn: sqlite3.Connection, issue_id: int, raw_urls: str
-) -> int:
-    """Insert attachment records from a semicolon-separated URL string.
+_ATTACHMENT_COLUMNS = ("issue_id", "filename", "filepath", "file_type", "source_url")
 
-    Returns the number of attachments inserted.
-    """
-    count = 0
+
+def _attachment_rows(issue_id: int, raw_urls: str) -> List[Tuple[Any, ...]]:
+    """Build quality_issue_attachments rows from a semicolon-separated URL string."""
+    rows = []
     for i, url in enumerate(raw_urls.split(";"), start=1):
         url = url.strip()
         if not url:
             continue
-        filename = _filename_from_url(url, i)
-        conn.execute(
-            """INSERT INTO quality_issue_attachments
-               (issue_id, filename, filepath, file_type, source_url)
-               VALUES (?, ?, '', 'image', ?)""",
-            (issue_id, filename, url),
-        )
-        count += 1
-    return count
+        rows.append((issue_id, _filename_from_url(url, i), "", "image", url))
+    return rows
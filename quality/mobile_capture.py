@@ -25,14 +25,9 @@ import sqlite3
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from qms.core import get_config_value, get_db, get_logger
+from qms.core import get_config_value, get_db, get_logger, model_gateway
 from qms.quality.db import normalize_trade, normalize_type
 
-try:
-    import anthropic
-except ImportError:
-    anthropic = None  # type: ignore[assignment]
-
 try:
     import openai as openai_sdk
 except ImportError:
@@ -53,13 +48,6 @@ _MEDIA_TYPES = {
     ".heic": "image/webp",  # Claude accepts HEIC as webp
 }
 
-# Model name → API model ID
-_MODEL_MAP = {
-    "haiku": "claude-haiku-4-5-20251001",
-    "sonnet": "claude-sonnet-4-5-20250929",
-    "opus": "claude-opus-4-6",
-}
-
 # Structured prompt for photo analysis
 _ANALYSIS_PROMPT = """Analyze this construction site photo and extract a quality observation.
 
@@ -137,40 +125,16 @@ def analyze_photo(image_path: Path, model: str = "sonnet") -> Dict[str, Any]:
     Returns dict with quality_issues-compatible fields, or a dict
     with 'error' key on failure.
     """
-    if anthropic is None:
-        return {"error": "anthropic SDK not installed. pip install anthropic>=0.25.0"}
-
     # Read and encode image
     image_data = base64.standard_b64encode(image_path.read_bytes()).decode("utf-8")
     media_type = _MEDIA_TYPES.get(image_path.suffix.lower(), "image/jpeg")
-    model_id = _MODEL_MAP.get(model, model)
 
     try:
-        client = anthropic.Anthropic()
-        response = client.messages.create(
-            model=model_id,
+        raw_text = model_gateway.call(
+            model_gateway.image_content(image_data, media_type, _ANALYSIS_PROMPT),
+            model,
             max_tokens=1024,
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "image",
-                            "source": {
-                                "type": "base64",
-                                "media_type": media_type,
-                                "data": image_data,
-                            },
-                        },
-                        {
-                            "type": "text",
-                            "text": _ANALYSIS_PROMPT,
-                        },
-                    ],
-                }
-            ],
-        )
-        raw_text = response.content[0].text
+        ).text
     except Exception as e:
         logger.error("Claude API error for %s: %s", image_path.name, e)
         return {"error": str(e)}
@@ -270,20 +234,10 @@ def analyze_transcript(text: str, model: str = "sonnet") -> Dict[str, Any]:
     Returns dict with quality_issues-compatible fields, or a dict
     with 'error' key on failure.
     """
-    if anthropic is None:
-        return {"error": "anthropic SDK not installed. pip install anthropic>=0.25.0"}
-
-    model_id = _MODEL_MAP.get(model, model)
     prompt = _TRANSCRIPT_PROMPT.format(transcript=text)
 
     try:
-        client = anthropic.Anthropic()
-        response = client.messages.create(
-            model=model_id,
-            max_tokens=1024,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        raw_text = response.content[0].text
+        raw_text = model_gateway.call(prompt, model, max_tokens=1024).text
     except Exception as e:
         logger.error("Claude API error for transcript analysis: %s", e)
         return {"error": str(e)}
@@ -75,6 +75,36 @@ CREATE INDEX IF NOT EXISTS idx_qi_severity ON quality_issues(severity);
 CREATE UNIQUE INDEX IF NOT EXISTS idx_qi_source_dedup ON quality_issues(source, source_id)
     WHERE source_id IS NOT NULL;
 
+-- Full-text search over issue text (rowid = quality_issues.id), kept in
+-- sync by triggers; rows that predate the table are backfilled on migrate
+CREATE VIRTUAL TABLE IF NOT EXISTS quality_issues_fts USING fts5(
+    title,
+    description,
+    location,
+    tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_qi_fts_insert
+AFTER INSERT ON quality_issues
+BEGIN
+    INSERT INTO quality_issues_fts (rowid, title, description, location)
+    VALUES (NEW.id, NEW.title, NEW.description, NEW.location);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_qi_fts_update
+AFTER UPDATE OF title, description, location ON quality_issues
+BEGIN
+    DELETE FROM quality_issues_fts WHERE rowid = OLD.id;
+    INSERT INTO quality_issues_fts (rowid, title, description, location)
+    VALUES (NEW.id, NEW.title, NEW.description, NEW.location);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_qi_fts_delete
+AFTER DELETE ON quality_issues
+BEGIN
+    DELETE FROM quality_issues_fts WHERE rowid = OLD.id;
+END;
+
 -- Quality issue attachments (photos, documents, voice notes)
 CREATE TABLE IF NOT EXISTS quality_issue_attachments (
     id INTEGER PRIMARY KEY,
@@ -16,7 +16,7 @@ import re
 from datetime import datetime
 from pathlib import Path
 
-from qms.core import QMS_PATHS
+from qms.core import QMS_PATHS, model_gateway
 from qms.qualitydocs.db import (
     get_intake,
     list_categories,
@@ -27,12 +27,6 @@ from qms.qualitydocs.db import (
 
 logger = logging.getLogger(__name__)
 
-_MODEL_MAP = {
-    "haiku": "claude-haiku-4-5-20251001",
-    "sonnet": "claude-sonnet-4-5-20250929",
-    "opus": "claude-opus-4-6",
-}
-
 
 def _build_classification_prompt(categories, programs):
     """Build the system prompt with category and program definitions."""
@@ -148,42 +142,9 @@ def classify_sop(intake_id, model="sonnet"):
         prompt_text = _build_classification_prompt(categories, programs)
 
         # Call Claude API
-        try:
-            import anthropic
-        except ImportError:
-            raise ImportError(
-                "anthropic SDK is required for SOP classification. "
-                "Install with: pip install anthropic>=0.25.0"
-            )
-
-        model_id = _MODEL_MAP.get(model, model)
-        client = anthropic.Anthropic()
-
-        response = client.messages.create(
-            model=model_id,
-            max_tokens=4096,
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "document",
-                            "source": {
-                                "type": "base64",
-                                "media_type": "application/pdf",
-                                "data": pdf_b64,
-                            },
-                        },
-                        {
-                            "type": "text",
-                            "text": prompt_text,
-                        },
-                    ],
-                }
-            ],
-        )
-
-        response_text = response.content[0].text
+        response_text = model_gateway.call(
+            model_gateway.pdf_content(pdf_b64, prompt_text), model, max_tokens=4096
+        ).text
         classification = _parse_json_response(response_text)
 
         # Resolve category code → category_id
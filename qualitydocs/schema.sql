@@ -196,6 +196,17 @@ CREATE TABLE IF NOT EXISTS qm_intake_log (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- qm_intake_log is written outside this package; mirror it into the shared
+-- activity feed (core activity_events) at the database level.
+CREATE TRIGGER IF NOT EXISTS trg_qm_intake_log_activity
+AFTER INSERT ON qm_intake_log
+BEGIN
+    INSERT OR IGNORE INTO activity_events
+        (source, action, detail, source_table, source_id, created_at)
+    VALUES ('qm-intake', NEW.action, NEW.file_name, 'qm_intake_log', NEW.id,
+            COALESCE(NEW.created_at, CURRENT_TIMESTAMP));
+END;
+
 -- =============================================================================
 -- M3 Quality Programs & M4 SOPs (v0.3)
 -- =============================================================================
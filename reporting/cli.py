@@ -6,19 +6,116 @@ app = typer.Typer(no_args_is_help=True)
 
 
 @app.command()
-def system():
+def system(
+    refresh: bool = typer.Option(False, "--refresh", help="Recount instead of using cached stats"),
+):
     """Show system-wide quality dashboard."""
+    from qms.reporting.dashboard import get_stats
+
+    stats = get_stats(
+        ["status_active_projects", "status_active_employees", "current_sheets", "open_conflicts"],
+        max_age=0 if refresh else None,
+    )
+
+    typer.echo("QMS System Dashboard")
+    typer.echo("=" * 30)
+    typer.echo(f"  Active projects:    {stats['status_active_projects']}")
+    typer.echo(f"  Active employees:   {stats['status_active_employees']}")
+    typer.echo(f"  Current sheets:     {stats['current_sheets']}")
+    typer.echo(f"  Open conflicts:     {stats['open_conflicts']}")
+
+
+@app.command()
+def db(
+    truncate: bool = typer.Option(
+        False, "--truncate", help="Run a TRUNCATE checkpoint (resets the WAL file)"
+    ),
+):
+    """Show effective SQLite PRAGMAs and WAL checkpoint state."""
+    from qms.core.db import get_db_status
+
+    status = get_db_status(checkpoint="TRUNCATE" if truncate else "PASSIVE")
+    wal = status["wal"]
+
+    typer.echo("QMS Database Status")
+    typer.echo("=" * 30)
+    typer.echo(f"  Path:               {status['path']}")
+    typer.echo(f"  Size:               {status['size_mb']} MB "
+               f"({status['freelist_pages']} free pages)")
+    typer.echo(f"  Profile:            {status['profile']}")
+    typer.echo()
+    typer.echo("  PRAGMAs:")
+    for name, value in status["pragmas"].items():
+        typer.echo(f"    {name:<20}{value}")
+    typer.echo()
+    typer.echo(f"  WAL checkpoint ({wal['mode']}):")
+    typer.echo(f"    WAL file:         {wal['file_mb']} MB")
+    typer.echo(f"    Frames in log:    {wal['log_frames']}")
+    typer.echo(f"    Checkpointed:     {wal['checkpointed_frames']}")
+    typer.echo(f"    Blocked:          {'yes' if wal['busy'] else 'no'}")
+
+    pool = status["pool"]
+    typer.echo()
+    if pool.get("enabled"):
+        typer.echo(f"  Connection pool:    {pool['size']}/{pool.get('max_size', '?')} open")
+    else:
+        typer.echo("  Connection pool:    disabled")
+
+
+@app.command()
+def queries(
+    top: int = typer.Option(10, "--top", "-n", help="Rows per ranking"),
+    slow: int = typer.Option(10, "--slow", help="Recent slow queries to list (0 = none)"),
+    reset: bool = typer.Option(False, "--reset", help="Clear collected stats and slow log"),
+):
+    """Show profiled SQL: top statements by time and calls, and per endpoint."""
     from qms.core import get_db
+    from qms.core.profiler import get_slow_queries, get_summary, is_enabled
+
+    if reset:
+        with get_db() as conn:
+            conn.execute("DELETE FROM query_stats")
+            conn.execute("DELETE FROM slow_query_log")
+            conn.commit()
+        typer.echo("Query stats and slow query log cleared.")
+        return
 
     with get_db(readonly=True) as conn:
-        projects = conn.execute("SELECT COUNT(*) as n FROM projects WHERE status='active'").fetchone()
-        employees = conn.execute("SELECT COUNT(*) as n FROM employees WHERE status='active'").fetchone()
-        sheets = conn.execute("SELECT COUNT(*) as n FROM sheets WHERE is_current=1").fetchone()
-        conflicts = conn.execute("SELECT COUNT(*) as n FROM conflicts WHERE resolved=0").fetchone()
+        summary = get_summary(top_n=top, conn=conn)
+        slow_rows = get_slow_queries(conn, limit=slow) if slow else []
 
-    typer.echo("QMS System Dashboard")
+    typer.echo("QMS Query Profile")
     typer.echo("=" * 30)
-    typer.echo(f"  Active projects:    {projects['n']}")
-    typer.echo(f"  Active employees:   {employees['n']}")
-    typer.echo(f"  Current sheets:     {sheets['n']}")
-    typer.echo(f"  Open conflicts:     {conflicts['n']}")
+    if not is_enabled():
+        typer.echo("  Profiling is off (database.profiling.enabled / QMS_QUERY_PROFILING=1)")
+    if not summary["by_total_time"]:
+        typer.echo("  No profiled queries recorded.")
+        return
+
+    def _sql(text: str, width: int = 90) -> str:
+        return text if len(text) <= width else text[: width - 3] + "..."
+
+    typer.echo()
+    typer.echo(f"  Top {top} by total time:")
+    for s in summary["by_total_time"]:
+        typer.echo(f"    {s['total_ms']:>10.1f} ms  {s['calls']:>7}x  avg {s['avg_ms']:>7.2f}  "
+                   f"{_sql(s['sql'])}")
+        typer.echo(f"{'':>34}{s['caller']}")
+
+    typer.echo()
+    typer.echo(f"  Top {top} by call count:")
+    for s in summary["by_calls"]:
+        typer.echo(f"    {s['calls']:>7}x  {s['total_ms']:>10.1f} ms  {_sql(s['sql'])}")
+
+    typer.echo()
+    typer.echo("  By endpoint / command:")
+    for c in summary["by_context"]:
+        typer.echo(f"    {c['total_ms']:>10.1f} ms  {c['calls']:>7} stmts  "
+                   f"{c['statements']:>4} distinct  {c['context']}")
+
+    if slow_rows:
+        typer.echo()
+        typer.echo("  Recent slow queries:")
+        for r in slow_rows:
+            typer.echo(f"    {r['created_at']}  {r['duration_ms']:>8.1f} ms  "
+                       f"{r['context'] or '-'}  {_sql(r['normalized_sql'], 70)}")
@@ -0,0 +1,206 @@
+"""
+Materialized dashboard statistics.
+
+The landing page, admin system map, and ``qms report system`` show a dozen
+``COUNT(*)`` figures. Instead of recomputing them on every page load, each
+figure is cached in the ``dashboard_stats`` table and recomputed only when
+older than the configured staleness bound (``dashboard.max_age_seconds``).
+An optional background refresher keeps the cache warm so page loads never
+pay for a recount; ``refresh_stats()`` forces a recount on demand.
+"""
+
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from qms.core import get_config_value, get_db, get_logger
+
+logger = get_logger("qms.reporting.dashboard")
+
+_DEFAULT_MAX_AGE = 60
+
+# Stat key -> COUNT query. A query that fails (missing table/view on a
+# partially-migrated DB) stores 0 rather than breaking the dashboard.
+STAT_QUERIES: Dict[str, str] = {
+    # Landing page
+    "active_projects": "SELECT COUNT(*) FROM projects WHERE stage NOT IN ('Archive', 'Lost Proposal')",
+    "open_alerts": "SELECT COUNT(*) FROM project_flags WHERE resolved = 0",
+    "pending_drawings": "SELECT COUNT(*) FROM processing_queue WHERE status = 'pending'",
+    "active_welders": "SELECT COUNT(*) FROM weld_welder_registry WHERE status = 'active'",
+    "employees": "SELECT COUNT(*) FROM employees WHERE is_active = 1",
+    "expiring_licenses": (
+        "SELECT COUNT(*) FROM v_expiring_licenses WHERE days_until_expiry BETWEEN 0 AND 90"
+    ),
+    "license_alerts": "SELECT COUNT(*) FROM license_notifications WHERE status = 'active'",
+    # Admin system map
+    "projects": "SELECT COUNT(*) FROM projects",
+    "sheets": "SELECT COUNT(*) FROM sheets",
+    "extracted": "SELECT COUNT(*) FROM sheets WHERE extracted_at IS NOT NULL",
+    "employees_total": "SELECT COUNT(*) FROM employees",
+    "wps_count": "SELECT COUNT(*) FROM weld_wps",
+    "wpq_count": "SELECT COUNT(*) FROM weld_wpq",
+    "tables": "SELECT COUNT(*) FROM sqlite_master WHERE type='table'",
+    "blog_posts": "SELECT COUNT(*) FROM blog_posts",
+    # CLI system report
+    "status_active_projects": "SELECT COUNT(*) FROM projects WHERE status = 'active'",
+    "status_active_employees": "SELECT COUNT(*) FROM employees WHERE status = 'active'",
+    "current_sheets": "SELECT COUNT(*) FROM sheets WHERE is_current = 1",
+    "open_conflicts": "SELECT COUNT(*) FROM conflicts WHERE resolved = 0",
+}
+
+
+def _max_age() -> int:
+    return int(get_config_value("dashboard", "max_age_seconds", default=_DEFAULT_MAX_AGE))
+
+
+def _compute(conn, keys: Iterable[str]) -> Dict[str, int]:
+    values: Dict[str, int] = {}
+    for key in keys:
+        try:
+            values[key] = conn.execute(STAT_QUERIES[key]).fetchone()[0]
+        except Exception as exc:
+            logger.debug("Dashboard stat %s unavailable: %s", key, exc)
+            values[key] = 0
+    return values
+
+
+def _store(conn, values: Dict[str, int]) -> None:
+    now = time.time()
+    conn.executemany(
+        """INSERT INTO dashboard_stats (stat_key, value, refreshed_at)
+           VALUES (?, ?, ?)
+           ON CONFLICT(stat_key) DO UPDATE SET
+               value = excluded.value, refreshed_at = excluded.refreshed_at""",
+        [(key, value, now) for key, value in values.items()],
+    )
+    conn.commit()
+
+
+def refresh_stats(keys: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """
+    Recount and store dashboard stats now, regardless of age.
+
+    Args:
+        keys: Stat keys to refresh (default: all).
+
+    Returns:
+        Dict of freshly computed values.
+    """
+    keys = list(keys) if keys is not None else list(STAT_QUERIES)
+    unknown = [k for k in keys if k not in STAT_QUERIES]
+    if unknown:
+        raise KeyError(f"Unknown dashboard stat(s): {', '.join(unknown)}")
+
+    with get_db() as conn:
+        values = _compute(conn, keys)
+        _store(conn, values)
+    logger.debug("Refreshed %d dashboard stats", len(values))
+    return values
+
+
+def get_stats(
+    keys: Optional[Iterable[str]] = None,
+    max_age: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Read dashboard stats, recounting only entries older than *max_age*.
+
+    Args:
+        keys: Stat keys to return (default: all).
+        max_age: Staleness bound in seconds (default: ``dashboard.max_age_seconds``).
+            0 forces a recount.
+
+    Returns:
+        Dict mapping stat key to count.
+    """
+    keys = list(keys) if keys is not None else list(STAT_QUERIES)
+    max_age = _max_age() if max_age is None else max_age
+    cutoff = time.time() - max_age
+
+    with get_db() as conn:
+        cached: Dict[str, int] = {}
+        try:
+            placeholders = ",".join("?" * len(keys))
+            for row in conn.execute(
+                f"SELECT stat_key, value FROM dashboard_stats "
+                f"WHERE stat_key IN ({placeholders}) AND refreshed_at > ?",
+                (*keys, cutoff),
+            ).fetchall():
+                cached[row["stat_key"]] = row["value"]
+        except Exception as exc:
+            # Cache table not migrated yet -- fall back to live counts
+            logger.debug("dashboard_stats unavailable: %s", exc)
+            return _compute(conn, keys)
+
+        stale = [k for k in keys if k not in cached]
+        if stale:
+            fresh = _compute(conn, stale)
+            try:
+                _store(conn, fresh)
+            except Exception as exc:
+                logger.debug("Could not store dashboard stats: %s", exc)
+            cached.update(fresh)
+
+    return {k: cached[k] for k in keys}
+
+
+def get_stats_age() -> List[Dict[str, object]]:
+    """Return each cached stat with its refresh time (for the forced-refresh API)."""
+    with get_db(readonly=True) as conn:
+        rows = conn.execute(
+            "SELECT stat_key, value, refreshed_at FROM dashboard_stats ORDER BY stat_key"
+        ).fetchall()
+    now = time.time()
+    return [
+        {
+            "key": r["stat_key"],
+            "value": r["value"],
+            "refreshed_at": datetime.fromtimestamp(r["refreshed_at"], timezone.utc).isoformat(),
+            "age_seconds": round(now - r["refreshed_at"], 1),
+        }
+        for r in rows
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Background refresher
+# ---------------------------------------------------------------------------
+
+_refresher: Optional[threading.Thread] = None
+_refresher_lock = threading.Lock()
+
+
+def start_refresher(interval: Optional[int] = None) -> bool:
+    """
+    Start a daemon thread that refreshes all stats every *interval* seconds.
+
+    Args:
+        interval: Seconds between refreshes (default:
+            ``dashboard.refresh_interval_seconds``; 0 disables).
+
+    Returns:
+        True if a refresher is running after the call.
+    """
+    global _refresher
+    if interval is None:
+        interval = int(get_config_value("dashboard", "refresh_interval_seconds", default=0))
+    if interval <= 0:
+        return False
+
+    with _refresher_lock:
+        if _refresher is not None and _refresher.is_alive():
+            return True
+
+        def _loop():
+            while True:
+                try:
+                    refresh_stats()
+                except Exception as exc:
+                    logger.warning("Dashboard stats refresh failed: %s", exc)
+                time.sleep(interval)
+
+        _refresher = threading.Thread(target=_loop, name="qms-dashboard-stats", daemon=True)
+        _refresher.start()
+        logger.info("Dashboard stats refresher started (every %ds)", interval)
+    return True
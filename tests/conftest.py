@@ -5,6 +5,7 @@ Provides an in-memory database with all schemas, mock config, CLI runner,
 and seed data fixtures for isolated testing.
 """
 
+import os
 import sqlite3
 import pytest
 from pathlib import Path
@@ -13,6 +14,13 @@ from contextlib import contextmanager
 
 from qms.core.db import SCHEMA_ORDER
 
+# Tests get fresh connections per get_db(); pool tests opt back in explicitly.
+os.environ.setdefault("QMS_DB_POOL", "0")
+# Model calls never leave the process; tests install their own StubBackend replies.
+os.environ.setdefault("QMS_MODEL_BACKEND", "stub")
+os.environ.setdefault("QMS_MODEL_CACHE", "0")
+os.environ.setdefault("QMS_PDF_CACHE", "0")
+
 
 @pytest.fixture
 def memory_db():
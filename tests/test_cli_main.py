@@ -1,5 +1,9 @@
 """Tests for the top-level CLI assembly."""
 
+import os
+import subprocess
+import sys
+
 from qms.cli.main import app
 
 
@@ -18,3 +22,59 @@ def test_version_output(cli_runner):
 def test_unknown_command(cli_runner):
     result = cli_runner.invoke(app, ["nonexistent"])
     assert result.exit_code != 0
+
+
+def test_module_groups_listed_in_help(cli_runner):
+    result = cli_runner.invoke(app, ["--help"])
+    assert result.exit_code == 0
+    for name in ("welding", "pipeline", "eng", "licenses", "report"):
+        assert name in result.output
+
+
+def test_module_group_loads_on_invoke(cli_runner):
+    result = cli_runner.invoke(app, ["eng", "--help"])
+    assert result.exit_code == 0
+    assert "Engineering calculations" in result.output
+
+
+# ---------------------------------------------------------------------------
+# Startup benchmark
+# ---------------------------------------------------------------------------
+
+# Cumulative import time budget for `qms version` (override for slow machines)
+STARTUP_BUDGET_MS = float(os.environ.get("QMS_STARTUP_BUDGET_MS", "150"))
+
+
+def _importtime(*argv):
+    """Run `python -X importtime -m qms <argv>`; return {module: cumulative_us} for top-level imports."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "qms", *argv],
+        capture_output=True, text=True, env=env, timeout=60,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    imports = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not name.startswith("  "):  # nested imports are indented
+            imports[name.strip()] = int(cumulative)
+    return imports, proc.stderr
+
+
+def test_version_cold_start_skips_module_clis():
+    _, log = _importtime("version")
+    imported = {line.split("|")[-1].strip() for line in log.splitlines() if "|" in line}
+    for module in ("qms.welding", "qms.pipeline", "qms.engineering", "qms.licenses",
+                   "openpyxl", "cryptography", "flask"):
+        assert module not in imported, f"`qms version` imported {module}"
+
+
+def test_version_cold_start_budget():
+    imports, _ = _importtime("version")
+    total_ms = sum(imports.values()) / 1000
+    assert total_ms < STARTUP_BUDGET_MS, (
+        f"`qms version` import time {total_ms:.0f} ms exceeds {STARTUP_BUDGET_MS:.0f} ms budget; "
+        f"slowest: {sorted(imports.items(), key=lambda kv: -kv[1])[:5]}"
+    )
@@ -0,0 +1,88 @@
+"""Tests for the unified activity feed."""
+
+from qms.auth.db import log_auth_event
+from qms.core import activity
+from qms.welding.intake import log_intake
+
+
+def _events(conn):
+    return conn.execute(
+        "SELECT source, action, detail, source_table, source_id FROM activity_events ORDER BY id"
+    ).fetchall()
+
+
+def test_writers_record_events(memory_db):
+    log_intake(memory_db, "wps-1.pdf", "/in", "/out", "wps", "WPS-1", None, "created")
+    log_auth_event(memory_db, "login", 7, changed_by="ada@example.com")
+
+    rows = _events(memory_db)
+    assert [(r["source"], r["action"], r["detail"]) for r in rows] == [
+        ("weld-intake", "created", "wps-1.pdf"),
+        ("auth", "login", "ada@example.com"),
+    ]
+    assert rows[0]["source_table"] == "weld_intake_log"
+    assert rows[0]["source_id"] is not None
+
+
+def test_qm_intake_trigger(memory_db):
+    memory_db.execute(
+        "INSERT INTO qm_intake_log (file_name, action) VALUES ('manual.pdf', 'imported')"
+    )
+    rows = _events(memory_db)
+    assert rows[0]["source"] == "qm-intake"
+    assert rows[0]["detail"] == "manual.pdf"
+
+
+def test_backfill_is_idempotent(memory_db):
+    memory_db.execute(
+        "INSERT INTO document_intake_log (file_name, action, created_at) "
+        "VALUES ('a.pdf', 'routed', datetime('now', '-1 day'))"
+    )
+    memory_db.execute(
+        "INSERT INTO audit_log (entity_type, entity_id, action, changed_by, changed_at) "
+        "VALUES ('license', 'L1', 'update', 'system', datetime('now', '-2 days'))"
+    )
+
+    first = activity.backfill_activity(memory_db)
+    assert first["document_intake_log"] == 1
+    assert first["audit_log"] == 1
+    second = activity.backfill_activity(memory_db)
+    assert sum(second.values()) == 0
+
+    feed = activity.get_recent_activity(memory_db)
+    assert [r["source"] for r in feed] == ["intake", "licenses"]
+
+
+def test_backfill_skips_expired_rows(memory_db):
+    memory_db.execute(
+        "INSERT INTO weld_intake_log (file_name, action, created_at) "
+        "VALUES ('old.pdf', 'created', datetime('now', '-400 days'))"
+    )
+    activity.backfill_activity(memory_db)
+    assert _events(memory_db) == []
+
+
+def test_prune_by_age_and_cap(memory_db):
+    for i in range(5):
+        memory_db.execute(
+            "INSERT INTO activity_events (source, action, detail, created_at) "
+            "VALUES ('intake', 'routed', ?, datetime('now', ?))",
+            (f"f{i}.pdf", f"-{i} days"),
+        )
+    memory_db.execute(
+        "INSERT INTO activity_events (source, action, created_at) "
+        "VALUES ('intake', 'routed', datetime('now', '-90 days'))"
+    )
+
+    assert activity.prune_activity(memory_db, retention_days=30, max_events=0) == 1
+    assert activity.prune_activity(memory_db, retention_days=0, max_events=3) == 2
+    details = [r["detail"] for r in activity.get_recent_activity(memory_db)]
+    assert details == ["f0.pdf", "f1.pdf", "f2.pdf"]
+
+
+def test_record_activity_tolerates_missing_table():
+    import sqlite3
+
+    conn = sqlite3.connect(":memory:")
+    activity.record_activity(conn, "intake", "routed", "x.pdf")
+    conn.close()
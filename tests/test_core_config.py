@@ -1,7 +1,11 @@
 """Tests for config loading and QMS_PATHS path resolution."""
 
+import os
 from pathlib import Path
 
+import pytest
+
+from qms.core import config as config_mod
 from qms.core.config import get_config, get_config_value, QMS_PATHS, _PACKAGE_DIR
 
 
@@ -64,3 +68,84 @@ def test_database_path_is_relative_in_config():
     assert raw is not None
     assert not raw.startswith("C:"), "Database path should be relative"
     assert not raw.startswith("D:"), "Database path should be relative"
+
+
+# ---------------------------------------------------------------------------
+# Versioned snapshots / hot reload
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def tmp_config(tmp_path, monkeypatch):
+    """Point the config module at a scratch config.yaml with reload checks on every call."""
+    path = tmp_path / "config.yaml"
+    path.write_text("branding:\n  app_name: Alpha\nsection:\n  key: 1\n", encoding="utf-8")
+    monkeypatch.setattr(config_mod, "CONFIG_PATH", path)
+    monkeypatch.setattr(config_mod, "_CHECK_INTERVAL", 0.0)
+    monkeypatch.setattr(config_mod, "_snapshot", None)
+    return path
+
+
+def _touch_forward(path):
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_snapshot_reloads_on_file_change(tmp_config):
+    snap = config_mod.get_snapshot()
+    assert config_mod.get_snapshot() is snap
+    assert snap.branding["app_name"] == "Alpha"
+
+    tmp_config.write_text("branding:\n  app_name: Beta\nsection:\n  key: 1\n", encoding="utf-8")
+    _touch_forward(tmp_config)
+
+    new = config_mod.get_snapshot()
+    assert new.version > snap.version
+    assert config_mod.get_branding()["app_name"] == "Beta"
+    # Old snapshot is untouched
+    assert snap.branding["app_name"] == "Alpha"
+
+
+def test_derived_views_cached_per_snapshot(tmp_config):
+    calls = []
+
+    def build(cfg):
+        calls.append(1)
+        return cfg["section"]["key"]
+
+    snap = config_mod.get_snapshot()
+    assert snap.derive("k", build) == 1
+    assert snap.derive("k", build) == 1
+    assert len(calls) == 1
+    assert config_mod.get_branding() is config_mod.get_branding()
+
+
+def test_update_config_section_publishes_snapshot(tmp_config):
+    before = config_mod.get_config_version()
+    config_mod.update_config_section("section", {"key": 2})
+    assert config_mod.get_config_version() > before
+    assert config_mod.get_config_value("section", "key") == 2
+    assert "key: 2" in tmp_config.read_text(encoding="utf-8")
+    assert [p.name for p in tmp_config.parent.iterdir()] == ["config.yaml"]
+
+
+def test_missing_file_keeps_last_snapshot(tmp_config):
+    snap = config_mod.get_snapshot()
+    tmp_config.unlink()
+    assert config_mod.get_snapshot() is snap
+
+
+def test_update_config_section_keeps_file_mode(tmp_config):
+    os.chmod(tmp_config, 0o644)
+    config_mod.update_config_section("section", {"key": 3})
+    assert tmp_config.stat().st_mode & 0o777 == 0o644
+
+
+def test_update_config_section_falls_back_when_replace_is_denied(tmp_config, monkeypatch):
+    def locked(src, dst):
+        raise PermissionError("file in use")
+
+    monkeypatch.setattr(config_mod.os, "replace", locked)
+    monkeypatch.setattr(config_mod.time, "sleep", lambda s: None)
+    config_mod.update_config_section("section", {"key": 4})
+    assert "key: 4" in tmp_config.read_text(encoding="utf-8")
+    assert [p.name for p in tmp_config.parent.iterdir()] == ["config.yaml"]
@@ -1,5 +1,12 @@
 """Tests for database connection management and query execution."""
 
+import sqlite3
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from qms.core import db as core_db
 from qms.core.db import SCHEMA_ORDER, execute_query
 
 
@@ -30,3 +37,219 @@ def test_schema_order_starts_with_auth():
 
 def test_schema_order_blog_last():
     assert SCHEMA_ORDER[-1] == "blog"
+
+
+# ---------------------------------------------------------------------------
+# Connection pool
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def pooled_db(tmp_path):
+    """Point get_db at a temp file with pooling forced on."""
+    db_file = tmp_path / "pool.db"
+    with patch("qms.core.db.get_db_path", return_value=db_file):
+        core_db.configure_pool(enabled=True, max_size=4)
+        with core_db.get_db() as conn:
+            conn.execute("CREATE TABLE t (v INTEGER)")
+            conn.commit()
+        yield db_file
+        core_db.configure_pool(enabled=None)
+
+
+def test_pool_reuses_connection_on_same_thread(pooled_db):
+    with core_db.get_db() as c1:
+        pass
+    with core_db.get_db() as c2:
+        pass
+    assert c1 is c2
+
+
+def test_pool_separates_readonly_and_readwrite(pooled_db):
+    with core_db.get_db() as rw:
+        pass
+    with core_db.get_db(readonly=True) as ro:
+        pass
+    assert rw is not ro
+
+
+def test_pool_nested_get_db_gets_private_connection(pooled_db):
+    with core_db.get_db() as outer:
+        with core_db.get_db() as inner:
+            assert inner is not outer
+
+
+def test_pool_rolls_back_uncommitted_work(pooled_db):
+    with core_db.get_db() as conn:
+        conn.execute("INSERT INTO t VALUES (1)")
+    with core_db.get_db() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+
+
+def test_pool_restores_foreign_keys(pooled_db):
+    with pytest.raises(RuntimeError):
+        with core_db.get_db() as conn:
+            conn.execute("PRAGMA foreign_keys = OFF")
+            raise RuntimeError("migration failed")
+    with core_db.get_db() as again:
+        assert again is conn
+        assert again.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+
+def test_pool_replaces_closed_connection(pooled_db):
+    with core_db.get_db() as c1:
+        c1.close()
+    with core_db.get_db() as c2:
+        assert c2 is not c1
+        assert c2.execute("SELECT 1").fetchone()[0] == 1
+
+
+def test_pool_per_thread_connections(pooled_db):
+    seen = []
+
+    def worker():
+        with core_db.get_db() as conn:
+            seen.append(conn)
+
+    with core_db.get_db() as main_conn:
+        pass
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+    assert seen and seen[0] is not main_conn
+
+
+def test_pool_overflow_when_full(pooled_db):
+    core_db.configure_pool(enabled=True, max_size=1)
+    with core_db.get_db():
+        pass
+    with core_db.get_db(readonly=True):
+        pass
+    stats = core_db.get_pool_stats()
+    assert stats["size"] == 1
+    assert stats["overflow"] == 1
+
+
+def test_pool_disabled_opens_fresh_connections(pooled_db):
+    core_db.configure_pool(enabled=False)
+    with core_db.get_db() as c1:
+        pass
+    with core_db.get_db() as c2:
+        pass
+    assert c1 is not c2
+    assert core_db.get_pool_stats()["enabled"] is False
+
+
+# ---------------------------------------------------------------------------
+# Performance profiles
+# ---------------------------------------------------------------------------
+
+def test_performance_pragmas_applied_on_connect(tmp_path, monkeypatch):
+    monkeypatch.setenv("QMS_DB_PROFILE", "bulk_import")
+    with patch("qms.core.db.get_db_path", return_value=tmp_path / "perf.db"):
+        with core_db.get_db() as conn:
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 30000
+
+
+def test_performance_pragmas_unknown_preset():
+    with pytest.raises(ValueError, match="Unknown database performance preset"):
+        core_db.get_performance_pragmas("turbo")
+
+
+def test_performance_pragmas_rejects_unknown_override(monkeypatch):
+    monkeypatch.setattr(
+        core_db, "get_config_value",
+        lambda *keys, default=None: {"journal_mode": "DELETE"} if keys[-1] == "pragmas" else default,
+    )
+    with pytest.raises(ValueError, match="Unsupported performance PRAGMA"):
+        core_db.get_performance_pragmas("web")
+
+
+def test_performance_pragmas_normalizes_keywords(monkeypatch):
+    monkeypatch.setattr(
+        core_db, "get_config_value",
+        lambda *keys, default=None: {"synchronous": "full"} if keys[-1] == "pragmas" else default,
+    )
+    assert core_db.get_performance_pragmas("web")["synchronous"] == "FULL"
+
+
+def test_get_db_status_reports_pragmas_and_wal(tmp_path):
+    with patch("qms.core.db.get_db_path", return_value=tmp_path / "status.db"):
+        status = core_db.get_db_status()
+    assert status["pragmas"]["journal_mode"] == "wal"
+    assert status["pragmas"]["foreign_keys"] == 1
+    assert status["pragmas"]["synchronous"] in ("NORMAL", "FULL")
+    assert status["wal"]["mode"] == "PASSIVE"
+    assert "log_frames" in status["wal"]
+
+
+# ---------------------------------------------------------------------------
+# Bulk helpers
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def bulk_conn():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, code TEXT UNIQUE, qty INTEGER, note TEXT)")
+    yield conn
+    conn.close()
+
+
+def test_bulk_insert_dicts_in_chunks(bulk_conn):
+    rows = ({"code": f"C{i}", "qty": i} for i in range(1250))
+    assert core_db.bulk_insert("items", rows, conn=bulk_conn, batch_size=100) == 1250
+    assert not bulk_conn.in_transaction
+    assert bulk_conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 1250
+
+
+def test_bulk_insert_sequences_and_ignore(bulk_conn):
+    core_db.bulk_insert("items", [("A", 1)], columns=("code", "qty"), conn=bulk_conn)
+    n = core_db.bulk_insert(
+        "items", [("A", 9), ("B", 2)], columns=("code", "qty"),
+        on_conflict="ignore", conn=bulk_conn,
+    )
+    assert n == 1
+    assert bulk_conn.execute("SELECT qty FROM items WHERE code = 'A'").fetchone()[0] == 1
+
+
+def test_bulk_insert_validates_columns(bulk_conn):
+    with pytest.raises(ValueError, match="Unknown column"):
+        core_db.bulk_insert("items", [{"code": "A", "bogus": 1}], conn=bulk_conn)
+    with pytest.raises(ValueError, match="Unknown table"):
+        core_db.bulk_insert("nope", [{"code": "A"}], conn=bulk_conn)
+    with pytest.raises(ValueError, match="missing column"):
+        core_db.bulk_insert("items", [{"code": "A"}, {"qty": 1}], conn=bulk_conn)
+    with pytest.raises(ValueError, match="on_conflict"):
+        core_db.bulk_insert("items", [{"code": "A"}], on_conflict="merge", conn=bulk_conn)
+
+
+def test_bulk_insert_rolls_back_on_error(bulk_conn):
+    rows = [{"code": "A", "qty": 1}, {"code": "B", "qty": 2}, {"code": "A", "qty": 3}]
+    with pytest.raises(sqlite3.IntegrityError):
+        core_db.bulk_insert("items", rows, conn=bulk_conn, batch_size=2)
+    assert bulk_conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+
+
+def test_bulk_insert_joins_caller_transaction(bulk_conn):
+    bulk_conn.execute("INSERT INTO items (code) VALUES ('X')")
+    core_db.bulk_insert("items", [{"code": "Y"}], conn=bulk_conn)
+    assert bulk_conn.in_transaction
+    bulk_conn.rollback()
+    assert bulk_conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+
+
+def test_bulk_upsert_updates_existing(bulk_conn):
+    core_db.bulk_insert("items", [{"code": "A", "qty": 1, "note": "keep"}], conn=bulk_conn)
+    core_db.bulk_upsert(
+        "items", [{"code": "A", "qty": 5}, {"code": "B", "qty": 2}], ["code"], conn=bulk_conn
+    )
+    rows = {r["code"]: (r["qty"], r["note"]) for r in bulk_conn.execute("SELECT * FROM items")}
+    assert rows == {"A": (5, "keep"), "B": (2, None)}
+
+
+def test_bulk_upsert_requires_key_in_rows(bulk_conn):
+    with pytest.raises(ValueError, match="Key column"):
+        core_db.bulk_upsert("items", [{"qty": 1}], ["code"], conn=bulk_conn)
@@ -1,7 +1,12 @@
 """Tests for logging configuration."""
 
+import json
 import logging
+import logging.handlers
 
+import pytest
+
+from qms.core import logging as qlog
 from qms.core.logging import get_logger
 
 
@@ -25,3 +30,74 @@ def test_get_logger_format_includes_name():
     logger = get_logger("test.format")
     fmt = logger.handlers[0].formatter._fmt
     assert "%(name)s" in fmt
+
+
+# ---------------------------------------------------------------------------
+# Configurable pipeline (queue mode, JSON sink, per-module levels)
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def log_settings(monkeypatch):
+    """Rebuild the logging pipeline from the given settings dict."""
+    monkeypatch.setattr(qlog, "_settings", None)
+    monkeypatch.setattr(qlog, "_shared_handlers", [])
+    monkeypatch.setattr(qlog, "_listener", None)
+    monkeypatch.setattr(qlog, "_loggers", {})
+
+    def _apply(**overrides):
+        settings = dict(qlog._DEFAULTS, **overrides)
+        monkeypatch.setattr(qlog, "_load_settings", lambda: dict(settings))
+
+    yield _apply
+    qlog.shutdown_logging()
+
+
+def _cleanup(logger):
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+
+
+def test_per_module_level_override(log_settings):
+    log_settings(levels={"test.lvl": "DEBUG", "test.lvl.quiet": "ERROR"})
+    assert qlog.get_logger("test.lvl.mod").level == logging.DEBUG
+    assert qlog.get_logger("test.lvl.quiet.sub").level == logging.ERROR
+    assert qlog.get_logger("test.other").level == logging.INFO
+    for name in ("test.lvl.mod", "test.lvl.quiet.sub", "test.other"):
+        _cleanup(logging.getLogger(name))
+
+
+def test_queue_mode_writes_json_with_request_id(log_settings, tmp_path):
+    sink = tmp_path / "qms.jsonl"
+    log_settings(mode="queue", json_file=str(sink))
+    logger = qlog.get_logger("test.queue")
+    assert isinstance(logger.handlers[0], logging.handlers.QueueHandler)
+
+    token = qlog.set_request_id("req-123")
+    try:
+        logger.info("hello %s", "world")
+    finally:
+        qlog.reset_request_id(token)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("failed")
+    qlog.shutdown_logging()
+
+    lines = [json.loads(line) for line in sink.read_text(encoding="utf-8").splitlines()]
+    assert lines[0]["message"] == "hello world"
+    assert lines[0]["request_id"] == "req-123"
+    assert lines[0]["logger"] == "test.queue"
+    assert lines[1]["request_id"] == "-"
+    assert "ValueError: boom" in lines[1]["exc"]
+    _cleanup(logger)
+
+
+def test_json_sink_rotates(log_settings, tmp_path):
+    sink = tmp_path / "qms.jsonl"
+    log_settings(json_file=str(sink), max_bytes=200, backup_count=2)
+    logger = qlog.get_logger("test.rotate")
+    for i in range(20):
+        logger.warning("line %d", i)
+    assert (tmp_path / "qms.jsonl.1").exists()
+    assert not (tmp_path / "qms.jsonl.3").exists()
+    _cleanup(logger)
@@ -0,0 +1,89 @@
+"""Tests for the content-addressed model response cache."""
+
+import time
+
+import pytest
+
+from qms.core import model_cache, model_gateway
+
+
+@pytest.fixture
+def response_cache(tmp_path, monkeypatch):
+    """A fresh cache installed as the shared one, with caching forced on."""
+    cache = model_cache.ResponseCache(tmp_path / "model_cache.db", ttl_seconds=3600)
+    monkeypatch.setattr(model_cache, "_cache", cache)
+    model_cache.set_enabled(True)
+    model_gateway.reset()
+    yield cache
+    model_cache.set_enabled(None)
+    model_gateway.reset()
+    cache.close()
+
+
+def _request(content, model="sonnet", max_tokens=8192):
+    return model_gateway.ModelRequest(
+        model=model, model_id=model_gateway.MODEL_MAP.get(model, model),
+        content=content, max_tokens=max_tokens,
+    )
+
+
+def test_key_separates_prompt_document_and_model():
+    base = model_cache.request_key(_request(model_gateway.pdf_content("QUJD", "Extract")))
+    assert base[0] == "anthropic:" + model_gateway.MODEL_MAP["sonnet"]
+    assert base[2]
+    assert model_cache.request_key(_request(model_gateway.pdf_content("QUJD", "Extract"))) == base
+
+    other_pdf = model_cache.request_key(_request(model_gateway.pdf_content("WFla", "Extract")))
+    other_prompt = model_cache.request_key(_request(model_gateway.pdf_content("QUJD", "Extract v2")))
+    other_model = model_cache.request_key(_request(model_gateway.pdf_content("QUJD", "Extract"), "opus"))
+    assert other_pdf[1] == base[1] and other_pdf[2] != base[2]
+    assert other_prompt[1] != base[1] and other_prompt[2] == base[2]
+    assert other_model[0] != base[0]
+    assert model_cache.request_key(_request("text only"))[2] == ""
+
+
+def test_gateway_serves_repeat_requests_from_cache(response_cache):
+    stub = model_gateway.StubBackend('{"lines": []}')
+    with model_gateway.use_backend(stub):
+        first = model_gateway.call("prompt", "sonnet", cache=True)
+        second = model_gateway.call("prompt", "sonnet", cache=True)
+        model_gateway.call("prompt", "sonnet")  # not opted in
+
+    assert len(stub.requests) == 2
+    assert not first.cached
+    assert second.cached and second.text == first.text
+    assert second.input_tokens == first.input_tokens
+    metrics = model_gateway.get_metrics()["sonnet"]
+    assert metrics["calls"] == 2
+    assert metrics["cache_hits"] == 1
+
+
+def test_failed_calls_are_not_cached(response_cache):
+    with model_gateway.use_backend(model_gateway.StubBackend(ValueError("bad request"))):
+        with pytest.raises(ValueError):
+            model_gateway.call("prompt", cache=True)
+    assert response_cache.stats()["entries"] == 0
+
+
+def test_disabled_cache_is_bypassed(response_cache):
+    model_cache.set_enabled(False)
+    stub = model_gateway.StubBackend("ok")
+    with model_gateway.use_backend(stub):
+        model_gateway.call("prompt", cache=True)
+        model_gateway.call("prompt", cache=True)
+    assert len(stub.requests) == 2
+    assert response_cache.stats()["entries"] == 0
+
+
+def test_expired_entries_are_ignored_and_purged(tmp_path):
+    cache = model_cache.ResponseCache(tmp_path / "ttl.db", ttl_seconds=60)
+    key = ("anthropic:m", "p", "")
+    cache.put(key, "old")
+    cache._conn.execute("UPDATE model_responses SET created_at = ?", (time.time() - 120,))
+    cache._conn.commit()
+
+    assert cache.get(key) is None
+    assert cache.purge_expired() == 1
+    cache.put(key, "new")
+    assert cache.get(key)["response"] == "new"
+    cache.close()
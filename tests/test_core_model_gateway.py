@@ -0,0 +1,154 @@
+"""Tests for the shared model gateway (stub backend; no network)."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from qms.core import model_gateway
+from qms.core.config import get_config
+from qms.pipeline import extractor
+
+
+class _APIError(Exception):
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = type("R", (), {"headers": {"retry-after": retry_after} if retry_after else {}})()
+
+
+@pytest.fixture
+def gateway(monkeypatch):
+    """Fast backoff, configurable settings, fresh metrics and limits."""
+    settings = {"backoff_base": 0.001, "backoff_max": 0.01, "max_retries": 2}
+
+    def _config(*keys, default=None):
+        if keys[:2] == ("model_gateway", "models"):
+            return settings.get((keys[2], keys[3]), default)
+        return settings.get(keys[-1], default)
+
+    monkeypatch.setattr(model_gateway, "get_config_value", _config)
+    model_gateway.reset()
+    yield settings
+    model_gateway.reset()
+
+
+def test_call_maps_model_and_records_metrics(gateway):
+    stub = model_gateway.StubBackend("x" * 40)
+    with model_gateway.use_backend(stub):
+        response = model_gateway.call("p" * 400, "sonnet", max_tokens=100)
+
+    assert response.text == "x" * 40
+    assert response.attempts == 1
+    assert stub.requests[0].model_id == model_gateway.MODEL_MAP["sonnet"]
+    assert stub.requests[0].max_tokens == 100
+    metrics = model_gateway.get_metrics()["sonnet"]
+    assert metrics["calls"] == 1
+    assert metrics["errors"] == 0
+    assert metrics["input_tokens"] == 100
+    assert metrics["output_tokens"] == 10
+
+
+def test_retries_rate_limited_and_overloaded(gateway):
+    failures = [_APIError(429), _APIError(529)]
+
+    def _reply(request):
+        return failures.pop(0) if failures else "ok"
+
+    with model_gateway.use_backend(model_gateway.StubBackend(_reply)):
+        response = model_gateway.call("prompt", "haiku")
+
+    assert response.text == "ok"
+    assert response.attempts == 3
+    assert model_gateway.get_metrics()["haiku"]["retries"] == 2
+
+
+def test_gives_up_after_max_retries(gateway):
+    with model_gateway.use_backend(model_gateway.StubBackend(_APIError(429))) as stub:
+        with pytest.raises(_APIError):
+            model_gateway.call("prompt", "haiku")
+    assert len(stub.requests) == 3
+    assert model_gateway.get_metrics()["haiku"]["errors"] == 1
+
+
+def test_other_errors_are_not_retried(gateway):
+    with model_gateway.use_backend(model_gateway.StubBackend(_APIError(400))) as stub:
+        with pytest.raises(_APIError):
+            model_gateway.call("prompt")
+    assert len(stub.requests) == 1
+
+
+def test_retry_after_header_sets_minimum_delay(gateway):
+    assert model_gateway._retry_delay(_APIError(429, retry_after="2"), 0) >= 2.0
+    assert model_gateway._retry_delay(_APIError(500), 0) is None
+
+
+def test_per_model_concurrency_limit(gateway):
+    gateway[("opus", "max_concurrency")] = 2
+    state = {"active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def _reply(request):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.03)
+        with lock:
+            state["active"] -= 1
+        return "ok"
+
+    with model_gateway.use_backend(model_gateway.StubBackend(_reply)):
+        threads = [threading.Thread(target=model_gateway.call, args=("p", "opus")) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    assert state["peak"] == 2
+    assert model_gateway.get_metrics()["opus"]["calls"] == 6
+
+
+def test_token_bucket_spaces_calls():
+    bucket = model_gateway.TokenBucket(per_minute=1200)  # one call per 50ms
+    start = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.1
+
+    unlimited = model_gateway.TokenBucket(0)
+    start = time.monotonic()
+    for _ in range(100):
+        unlimited.acquire()
+    assert time.monotonic() - start < 0.05
+
+
+def test_acall_shares_backend(gateway):
+    with model_gateway.use_backend(model_gateway.StubBackend("async")):
+        responses = asyncio.run(_gather(3))
+    assert [r.text for r in responses] == ["async"] * 3
+    assert model_gateway.get_metrics()["sonnet"]["calls"] == 3
+
+
+async def _gather(n):
+    return await asyncio.gather(*(model_gateway.acall("p") for _ in range(n)))
+
+
+def test_extractor_routes_through_gateway(gateway):
+    with model_gateway.use_backend(model_gateway.StubBackend('{"lines": []}')) as stub:
+        assert extractor.call_model("prompt", "opus") == '{"lines": []}'
+    assert stub.requests[0].model_id == model_gateway.MODEL_MAP["opus"]
+    assert stub.requests[0].max_tokens == 8192
+
+
+def test_pdf_content_blocks():
+    blocks = model_gateway.pdf_content("QUJD", "Extract")
+    assert blocks[0]["source"] == {"type": "base64", "media_type": "application/pdf", "data": "QUJD"}
+    assert blocks[1] == {"type": "text", "text": "Extract"}
+
+
+def test_shipped_config_caps_opus_concurrency():
+    # Guards against config.yaml sections swallowing model_gateway.models
+    get_config(reload=True)
+    assert model_gateway._setting("max_concurrency", "opus") == 4
+    assert model_gateway._setting("max_concurrency", "sonnet") == 8
@@ -0,0 +1,118 @@
+"""Tests for the per-PDF text extraction cache."""
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from qms.core import pdf_cache
+from qms.pipeline import text_layer
+from qms.pipeline.extractor import extract_pdf_text
+
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    path = tmp_path / "M-101.pdf"
+    doc = fitz.open()
+    page = doc.new_page(width=612, height=792)
+    page.insert_text((72, 72), "RAHU-1")
+    page.insert_text((72, 144), "Supply fan schedule")
+    page = doc.new_page(width=612, height=792)
+    page.insert_text((300, 400), "RCU-4")
+    doc.new_page()  # blank page
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """A fresh disk cache installed as the shared one, with caching forced on."""
+    store = pdf_cache.PdfTextCache(tmp_path / "pdf_text_cache.db")
+    monkeypatch.setattr(pdf_cache, "_cache", store)
+    pdf_cache.set_enabled(True)
+    pdf_cache.reset()
+    yield store
+    pdf_cache.set_enabled(None)
+    pdf_cache.reset()
+    store.close()
+
+
+def _uncached(fn, *args):
+    pdf_cache.set_enabled(False)
+    try:
+        return fn(*args)
+    finally:
+        pdf_cache.set_enabled(True)
+
+
+def test_parses_each_pdf_once(sample_pdf, cache, monkeypatch):
+    parses = []
+    real_parse = pdf_cache.parse_pdf
+    monkeypatch.setattr(
+        pdf_cache, "parse_pdf", lambda path, digest: parses.append(path) or real_parse(path, digest)
+    )
+
+    first = pdf_cache.load_pdf(sample_pdf)
+    assert pdf_cache.load_pdf(sample_pdf) is first  # in-memory
+    pdf_cache.reset()
+    from_disk = pdf_cache.load_pdf(sample_pdf, first.file_hash)
+
+    assert len(parses) == 1
+    assert cache.stats() == {"documents": 1, "hits": 1, "misses": 1}
+    assert from_disk.file_hash == pdf_cache.file_hash(sample_pdf)
+    assert from_disk.page_count == 3
+    assert [list(p.spans()) for p in from_disk.pages] == [list(p.spans()) for p in first.pages]
+    assert from_disk.plain_text() == first.plain_text()
+
+
+def test_consumers_match_direct_parsing(sample_pdf, cache):
+    path = str(sample_pdf)
+    for fn, args in [
+        (text_layer.extract_text_layer, (path,)),
+        (text_layer.extract_text_layer, (path, 1)),
+        (text_layer.extract_text_layer, (path, 5)),
+        (text_layer.extract_all_pages_tags, (path,)),
+        (text_layer._extract_all_text_strings, (path,)),
+        (extract_pdf_text, (sample_pdf,)),
+    ]:
+        assert fn(*args) == _uncached(fn, *args)
+
+    layer = text_layer.extract_text_layer(path)
+    assert layer["equipment_tags"] == ["RAHU-1"]
+    assert layer["page_width"] == 612.0
+    assert text_layer.extract_all_pages_tags(path) == {"RAHU-1", "RCU-4"}
+    assert "--- PAGE 3 ---" not in extract_pdf_text(sample_pdf)
+
+
+def test_missing_file_raises(tmp_path, cache):
+    with pytest.raises(FileNotFoundError):
+        pdf_cache.load_pdf(tmp_path / "missing.pdf")
+    assert text_layer.extract_all_pages_tags(str(tmp_path / "missing.pdf")) == set()
+
+
+def test_file_replaced_in_place_is_reparsed(sample_pdf, cache):
+    stale = pdf_cache.load_pdf(sample_pdf)
+    doc = fitz.open()
+    doc.new_page(width=612, height=792).insert_text((72, 72), "AHU-9")
+    doc.save(str(sample_pdf))
+    doc.close()
+
+    # Caller still holds the hash recorded before the file changed
+    fresh = pdf_cache.load_pdf(sample_pdf, stale.file_hash)
+    assert fresh.file_hash == pdf_cache.file_hash(sample_pdf) != stale.file_hash
+    assert "AHU-9" in fresh.plain_text()
+    pdf_cache.reset()
+    assert pdf_cache.load_pdf(sample_pdf, stale.file_hash).plain_text() == fresh.plain_text()
+
+
+def test_forked_child_reopens_cache(tmp_path, cache, monkeypatch):
+    monkeypatch.setattr(
+        pdf_cache, "get_config_value", lambda *keys, default=None: str(tmp_path / "child.db")
+    )
+    assert pdf_cache.get_pdf_cache() is cache
+    pdf_cache._after_fork()
+    reopened = pdf_cache.get_pdf_cache()
+    try:
+        assert reopened is not cache
+    finally:
+        reopened.close()
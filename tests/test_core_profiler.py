@@ -0,0 +1,140 @@
+"""Tests for the opt-in SQL query profiler."""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from qms.core import profiler
+
+
+@pytest.fixture
+def profiled_conn(tmp_path):
+    """A ProfilingConnection on a temp DB with the core schema applied."""
+    db_file = tmp_path / "profile.db"
+    schema = (Path(__file__).parent.parent / "core" / "schema.sql").read_text(encoding="utf-8")
+    conn = sqlite3.connect(str(db_file), factory=profiler.ProfilingConnection)
+    conn._qms_db_path = str(db_file)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(schema)
+    conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.executemany("INSERT INTO t (name) VALUES (?)", [("a",), ("b",), ("c",)])
+    conn.commit()
+    profiler.reset()
+    yield conn
+    conn.close()
+    profiler.reset()
+
+
+def test_normalize_sql_replaces_literals():
+    sql = "SELECT *  FROM t\n WHERE id IN (1, 2, 3) AND name = 'O''Brien' AND x > 4.5"
+    assert profiler.normalize_sql(sql) == (
+        "SELECT * FROM t WHERE id IN (?...) AND name = ? AND x > ?"
+    )
+
+
+def test_normalize_sql_keeps_identifiers_with_digits():
+    assert profiler.normalize_sql("SELECT col1 FROM t2") == "SELECT col1 FROM t2"
+
+
+def test_profiling_counts_rows_from_fetchall(profiled_conn):
+    profiled_conn.execute("SELECT * FROM t WHERE id > 0").fetchall()
+    summary = profiler.get_summary()
+    top = summary["by_total_time"][0]
+    assert top["sql"] == "SELECT * FROM t WHERE id > ?"
+    assert top["calls"] == 1
+    assert top["rows"] == 3
+    assert top["caller"].startswith("tests.test_core_profiler") or "test_core_profiler" in top["caller"]
+
+
+def test_profiling_counts_rows_from_iteration(profiled_conn):
+    rows = [r["name"] for r in profiled_conn.execute("SELECT name FROM t")]
+    assert rows == ["a", "b", "c"]
+    entry = next(s for s in profiler.get_summary()["by_calls"] if s["sql"] == "SELECT name FROM t")
+    assert entry["rows"] == 3
+
+
+def test_profiling_groups_by_context(profiled_conn):
+    token = profiler.set_context("quality.dashboard")
+    try:
+        profiled_conn.execute("SELECT 1").fetchone()
+        profiled_conn.execute("SELECT 1").fetchone()
+    finally:
+        profiler.reset_context(token)
+    contexts = {c["context"]: c for c in profiler.get_summary()["by_context"]}
+    assert contexts["quality.dashboard"]["calls"] == 2
+
+
+def test_flush_persists_stats_and_slow_queries(profiled_conn, monkeypatch):
+    monkeypatch.setattr(profiler, "slow_threshold_ms", lambda: 0.0)
+    profiled_conn.execute("SELECT * FROM t").fetchall()
+    profiler.flush()
+
+    plain = sqlite3.connect(profiled_conn._qms_db_path)
+    plain.row_factory = sqlite3.Row
+    try:
+        summary = profiler.get_summary(conn=plain)
+        assert any(s["sql"] == "SELECT * FROM t" for s in summary["by_total_time"])
+        slow = profiler.get_slow_queries(plain)
+        assert any(r["normalized_sql"] == "SELECT * FROM t" for r in slow)
+    finally:
+        plain.close()
+
+
+def test_get_db_uses_profiling_connection_when_enabled(tmp_path):
+    from unittest.mock import patch
+    from qms.core.db import get_db
+
+    profiler.set_enabled(True)
+    try:
+        with patch("qms.core.db.get_db_path", return_value=tmp_path / "p.db"):
+            with get_db() as conn:
+                assert isinstance(conn, profiler.ProfilingConnection)
+    finally:
+        profiler.set_enabled(None)
+        profiler.reset()
+
+
+# ---------------------------------------------------------------------------
+# Per-request metrics
+# ---------------------------------------------------------------------------
+
+def test_request_metrics_count_statements_and_time(profiled_conn):
+    profiled_conn._qms_full = False
+    token = profiler.start_request()
+    try:
+        profiler.note_connection()
+        profiled_conn.execute("SELECT * FROM t").fetchall()
+        profiled_conn.execute("UPDATE t SET name = 'z' WHERE id = 1")
+        metrics = profiler.current_request()
+        assert metrics.connections == 1
+        assert metrics.statements == 2
+        assert metrics.sql_ms >= 0.0
+    finally:
+        profiler.end_request(token)
+    assert profiler.current_request() is None
+    # Metrics-only connections do not feed the query profiler aggregates
+    assert profiler.get_summary()["by_total_time"] == []
+
+
+def test_request_stats_summary_histogram():
+    stats = profiler.RequestStats(window=3)
+    metrics = profiler.RequestMetrics()
+    metrics.statements = 4
+    for wall in (3.0, 40.0, 8000.0, 20.0):
+        stats.record("licenses.licenses_page", metrics, wall, 200)
+
+    summary = stats.summary()["licenses.licenses_page"]
+    assert summary["requests_total"] == 4
+    assert summary["window"] == 3  # oldest sample rolled off
+    assert summary["statements_max"] == 4
+    assert summary["wall_ms"]["max"] == 8000.0
+    assert summary["histogram"]["<=25ms"] == 1
+    assert summary["histogram"][">5000ms"] == 1
+
+
+def test_percentile_nearest_rank():
+    values = [1.0, 2.0, 3.0, 4.0]
+    assert profiler._percentile(values, 50) == 2.0
+    assert profiler._percentile(values, 95) == 4.0
+    assert profiler._percentile([], 50) == 0.0
@@ -13,6 +13,7 @@ import pytest
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+from qms.core.model_gateway import StubBackend, use_backend
 from qms.quality.mobile_capture import (
     scan_capture_folder,
     analyze_photo,
@@ -60,11 +61,8 @@ def mock_analysis():
 
 @pytest.fixture
 def mock_claude_response(mock_analysis):
-    """Mock anthropic API response object."""
-    response = MagicMock()
-    response.content = [MagicMock()]
-    response.content[0].text = json.dumps(mock_analysis)
-    return response
+    """Canned Claude reply text for the stub model backend."""
+    return json.dumps(mock_analysis)
 
 
 # ---------------------------------------------------------------------------
@@ -127,11 +125,7 @@ class TestScanCaptureFolder:
 class TestAnalyzePhoto:
     def test_parses_response(self, capture_folder, mock_claude_response):
         """Mocked Claude response is parsed into correct dict."""
-        mock_client = MagicMock()
-        mock_client.return_value.messages.create.return_value = mock_claude_response
-
-        with patch("qms.quality.mobile_capture.anthropic") as mock_anthropic:
-            mock_anthropic.Anthropic.return_value.messages.create.return_value = mock_claude_response
+        with use_backend(StubBackend(mock_claude_response)):
             result = analyze_photo(capture_folder / "photo1.jpg")
 
         assert result["title"] == "Damaged pipe insulation in mechanical room"
@@ -142,9 +136,7 @@ class TestAnalyzePhoto:
 
     def test_normalizes_trade(self, capture_folder):
         """Trade names are normalized through normalize_trade()."""
-        response = MagicMock()
-        response.content = [MagicMock()]
-        response.content[0].text = json.dumps({
+        response = json.dumps({
             "title": "Test issue",
             "type": "observation",
             "trade": "Mech",  # Should normalize to "Mechanical"
@@ -153,16 +145,14 @@ class TestAnalyzePhoto:
             "description": "Test",
         })
 
-        with patch("qms.quality.mobile_capture.anthropic") as mock_anthropic:
-            mock_anthropic.Anthropic.return_value.messages.create.return_value = response
+        with use_backend(StubBackend(response)):
             result = analyze_photo(capture_folder / "photo1.jpg")
 
         assert result["trade"] == "Mechanical"
 
     def test_handles_api_error(self, capture_folder):
         """API exceptions return error dict instead of raising."""
-        with patch("qms.quality.mobile_capture.anthropic") as mock_anthropic:
-            mock_anthropic.Anthropic.return_value.messages.create.side_effect = Exception("API rate limit")
+        with use_backend(StubBackend(Exception("API rate limit"))):
             result = analyze_photo(capture_folder / "photo1.jpg")
 
         assert "error" in result
@@ -170,21 +160,16 @@ class TestAnalyzePhoto:
 
     def test_handles_invalid_json(self, capture_folder):
         """Non-JSON response returns error dict."""
-        response = MagicMock()
-        response.content = [MagicMock()]
-        response.content[0].text = "I cannot analyze this image."
+        response = "I cannot analyze this image."
 
-        with patch("qms.quality.mobile_capture.anthropic") as mock_anthropic:
-            mock_anthropic.Anthropic.return_value.messages.create.return_value = response
+        with use_backend(StubBackend(response)):
             result = analyze_photo(capture_folder / "photo1.jpg")
 
         assert "error" in result
 
     def test_validates_severity(self, capture_folder):
         """Invalid severity values are defaulted to 'medium'."""
-        response = MagicMock()
-        response.content = [MagicMock()]
-        response.content[0].text = json.dumps({
+        response = json.dumps({
             "title": "Test",
             "type": "observation",
             "trade": "General",
@@ -193,8 +178,7 @@ class TestAnalyzePhoto:
             "description": "Test desc",
         })
 
-        with patch("qms.quality.mobile_capture.anthropic") as mock_anthropic:
-            mock_anthropic.Anthropic.return_value.messages.create.return_value = response
+        with use_backend(StubBackend(response)):
             result = analyze_photo(capture_folder / "photo1.jpg")
 
         assert result["severity"] == "medium"
@@ -295,11 +279,10 @@ class TestProcessCaptures:
 
     def test_dry_run(self, capture_folder, mock_claude_response, memory_db):
         """Dry run analyzes but does not insert records."""
-        with patch("qms.quality.mobile_capture.anthropic") as mock_anthropic, \
+        with use_backend(StubBackend(mock_claude_response)), \
              patch("qms.quality.mobile_capture.openai_sdk") as mock_openai, \
              patch("qms.quality.mobile_capture.get_config_value", return_value=None), \
              self._patch_get_db(memory_db):
-            mock_anthropic.Anthropic.return_value.messages.create.return_value = mock_claude_response
             mock_openai.OpenAI.return_value.audio.transcriptions.create.return_value = self._mock_whisper_response()
             result = process_captures(
                 folder=capture_folder, project_id=None, dry_run=True
@@ -323,11 +306,10 @@ class TestProcessCaptures:
                 return str(attachment_dir)
             return default
 
-        with patch("qms.quality.mobile_capture.anthropic") as mock_anthropic, \
+        with use_backend(StubBackend(mock_claude_response)), \
              patch("qms.quality.mobile_capture.openai_sdk") as mock_openai, \
              patch("qms.quality.mobile_capture.get_config_value", side_effect=_config_side_effect), \
              self._patch_get_db(memory_db):
-            mock_anthropic.Anthropic.return_value.messages.create.return_value = mock_claude_response
             mock_openai.OpenAI.return_value.audio.transcriptions.create.return_value = self._mock_whisper_response()
             result = process_captures(
                 folder=capture_folder, project_id=None, dry_run=False
@@ -352,11 +334,10 @@ class TestProcessCaptures:
                 return str(attachment_dir)
             return default
 
-        with patch("qms.quality.mobile_capture.anthropic") as mock_anthropic, \
+        with use_backend(StubBackend(mock_claude_response)), \
              patch("qms.quality.mobile_capture.openai_sdk") as mock_openai, \
              patch("qms.quality.mobile_capture.get_config_value", side_effect=_config_side_effect), \
              self._patch_get_db(memory_db):
-            mock_anthropic.Anthropic.return_value.messages.create.return_value = mock_claude_response
             mock_openai.OpenAI.return_value.audio.transcriptions.create.return_value = self._mock_whisper_response()
             # First run
             result1 = process_captures(folder=capture_folder, project_id=None, dry_run=False)
@@ -417,12 +398,9 @@ class TestAnalyzeTranscript:
             "description": "Pipe insulation torn during hanger install",
             "recommended_action": "Replace insulation section",
         })
-        response = MagicMock()
-        response.content = [MagicMock()]
-        response.content[0].text = analysis_json
+        response = analysis_json
 
-        with patch("qms.quality.mobile_capture.anthropic") as mock_anthropic:
-            mock_anthropic.Anthropic.return_value.messages.create.return_value = response
+        with use_backend(StubBackend(response)):
             result = analyze_transcript("The insulation is damaged in room B.")
 
         assert result["title"] == "Damaged insulation on chilled water line"
@@ -441,22 +419,18 @@ class TestAnalyzeTranscript:
             "description": "Test",
             "recommended_action": "None needed",
         })
-        response = MagicMock()
-        response.content = [MagicMock()]
-        response.content[0].text = analysis_json
+        response = analysis_json
 
         original_text = "Walking the third floor, I see some water damage near column C4."
 
-        with patch("qms.quality.mobile_capture.anthropic") as mock_anthropic:
-            mock_anthropic.Anthropic.return_value.messages.create.return_value = response
+        with use_backend(StubBackend(response)):
             result = analyze_transcript(original_text)
 
         assert result["transcript"] == original_text
 
     def test_handles_api_error(self):
         """API error returns error dict."""
-        with patch("qms.quality.mobile_capture.anthropic") as mock_anthropic:
-            mock_anthropic.Anthropic.return_value.messages.create.side_effect = Exception("API timeout")
+        with use_backend(StubBackend(Exception("API timeout"))):
             result = analyze_transcript("Some voice note text")
 
         assert "error" in result
@@ -0,0 +1,160 @@
+"""Tests for serial and concurrent batch drawing extraction (model calls patched out)."""
+
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict
+from pathlib import Path
+
+import pytest
+
+from qms.core.db import SCHEMA_ORDER
+from qms.pipeline import extractor
+
+
+@pytest.fixture
+def sheet_db(tmp_path, monkeypatch):
+    """File-backed database (the writer thread needs its own connection)."""
+    db_path = tmp_path / "quality.db"
+    conn = sqlite3.connect(db_path)
+    schema_dir = Path(__file__).parent.parent
+    for module in SCHEMA_ORDER:
+        schema_file = schema_dir / module / "schema.sql"
+        if schema_file.exists():
+            conn.executescript(schema_file.read_text(encoding="utf-8"))
+    conn.execute("INSERT INTO projects (id, number, name, status) VALUES (1, '07645', 'Test', 'active')")
+    for i in range(1, 7):
+        path = tmp_path / f"P-10{i}.pdf"
+        if i != 4:  # sheet 4's file is missing
+            path.write_text(f"P&ID PIPING INSTRUMENT sheet {i}", encoding="utf-8")
+        conn.execute(
+            "INSERT INTO sheets (id, project_id, drawing_number, file_path, revision) "
+            "VALUES (?, 1, ?, ?, 'A')",
+            (i, f"P-10{i}", str(path)),
+        )
+    conn.commit()
+    conn.close()
+
+    @contextmanager
+    def _get_db(readonly=False):
+        c = sqlite3.connect(db_path, timeout=30)
+        c.row_factory = sqlite3.Row
+        try:
+            yield c
+        finally:
+            c.close()
+
+    monkeypatch.setattr(extractor, "get_db", _get_db)
+    monkeypatch.setattr(extractor, "get_config_value", lambda *k, default=None: default)
+    monkeypatch.setattr(extractor, "_make_pdf_executor", lambda n: ThreadPoolExecutor(n))
+    monkeypatch.setattr(
+        extractor, "extract_pdf_text", lambda p, digest=None: Path(p).read_text(encoding="utf-8")
+    )
+    return _get_db
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    state = {"active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def _call(prompt, model="sonnet"):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.05)
+        with lock:
+            state["active"] -= 1
+        sheet = prompt.split("sheet ")[1].split()[0]
+        if sheet == "5":
+            raise RuntimeError("model overloaded")
+        confidence = 0.5 if sheet == "3" else 0.9
+        return json.dumps({"lines": [{"line_number": f"L-{sheet}", "confidence": confidence}]})
+
+    monkeypatch.setattr(extractor, "call_model", _call)
+    return state
+
+
+def _comparable(results):
+    return [{k: v for k, v in asdict(r).items() if k != "processing_time_ms"} for r in results]
+
+
+def test_concurrent_matches_serial(sheet_db, fake_model):
+    ids = [6, 1, 2, 99, 3, 4, 5]
+    serial = extractor.extract_batch(ids, dry_run=True, max_workers=1)
+    concurrent = extractor.extract_batch(ids, dry_run=True, max_workers=4)
+
+    assert _comparable(concurrent) == _comparable(serial)
+    assert [r.sheet_id for r in concurrent] == [6, 1, 2, 3, 4, 5]
+    assert [r.status for r in concurrent] == [
+        "success", "success", "success", "partial", "failed", "failed",
+    ]
+    assert concurrent[0].lines_extracted == 1
+    assert fake_model["peak"] > 1
+
+
+def test_concurrent_writes_through_single_writer(sheet_db, fake_model):
+    results = extractor.extract_batch([1, 2, 3], max_workers=3)
+    assert [r.lines_extracted for r in results] == [1, 1, 1]
+    with sheet_db() as conn:
+        lines = conn.execute("SELECT sheet_id FROM lines ORDER BY sheet_id").fetchall()
+        extracted = conn.execute(
+            "SELECT COUNT(*) FROM sheets WHERE extracted_at IS NOT NULL"
+        ).fetchone()[0]
+    assert [r["sheet_id"] for r in lines] == [1, 2, 3]
+    assert extracted == 3
+
+
+def test_max_workers_bounds_model_calls(sheet_db, fake_model):
+    extractor.extract_batch([1, 2, 3, 6], dry_run=True, max_workers=2)
+    assert fake_model["peak"] <= 2
+
+
+
+def test_duplicate_sheet_ids_get_separate_results(sheet_db, fake_model):
+    serial = extractor.extract_batch([1, 2, 1], dry_run=True, max_workers=1)
+    concurrent = extractor.extract_batch([1, 2, 1], dry_run=True, max_workers=3)
+
+    assert _comparable(concurrent) == _comparable(serial)
+    assert concurrent[0] is not concurrent[2]
+    assert [r.lines_extracted for r in concurrent] == [1, 1, 1]
+
+
+def test_pdf_stage_runs_bounded_ahead(sheet_db, fake_model, monkeypatch):
+    state = {"ahead": 0, "peak": 0}
+    lock = threading.Lock()
+    read = extractor.extract_pdf_text
+    prepare = extractor._prepare_extraction
+
+    def _read(path, digest=None):
+        with lock:
+            state["ahead"] += 1
+            state["peak"] = max(state["peak"], state["ahead"])
+        return read(path, digest)
+
+    def _prepare(result, text, name):
+        with lock:
+            state["ahead"] -= 1
+        return prepare(result, text, name)
+
+    monkeypatch.setattr(extractor, "extract_pdf_text", _read)
+    monkeypatch.setattr(extractor, "_prepare_extraction", _prepare)
+    extractor.extract_batch([1, 2, 3, 6] * 4, dry_run=True, max_workers=2)
+    assert state["peak"] <= 4
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_stored_file_hash_is_passed_to_text_cache(sheet_db, fake_model, monkeypatch, workers):
+    with sheet_db() as conn:
+        conn.execute("UPDATE sheets SET file_hash = 'md5-' || id")
+        conn.commit()
+    seen = []
+    read = extractor.extract_pdf_text
+    monkeypatch.setattr(
+        extractor, "extract_pdf_text", lambda path, digest=None: seen.append(digest) or read(path)
+    )
+    extractor.extract_batch([1, 2, 3], dry_run=True, max_workers=workers)
+    assert sorted(seen) == ["md5-1", "md5-2", "md5-3"]
@@ -0,0 +1,116 @@
+"""Tests for the page-subset vision input builder."""
+
+import base64
+import json
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from qms.core import model_gateway
+from qms.pipeline import vision_input
+from qms.pipeline.electrical_extractor import extract_electrical_drawing
+
+
+@pytest.fixture
+def drawing_pdf(tmp_path):
+    """Cover page (blank), two text pages on a 36x24in sheet, blank back page."""
+    path = tmp_path / "E-101.pdf"
+    doc = fitz.open()
+    doc.new_page(width=2592, height=1728)
+    for label in ("PANEL LP-1", "PANEL LP-2"):
+        page = doc.new_page(width=2592, height=1728)
+        page.insert_text((200, 200), label, fontsize=48)
+        page.draw_rect(fitz.Rect(100, 100, 2400, 1600), color=(0, 0, 0), width=4)
+    doc.new_page(width=2592, height=1728)
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    values = {}
+
+    def _config(*keys, default=None):
+        return values.get(keys[-1], default) if keys[:2] == ("extraction", "vision") else default
+
+    monkeypatch.setattr(vision_input, "get_config_value", _config)
+    vision_input.clear_cache()
+    yield values
+    vision_input.clear_cache()
+
+
+def _image_size(data):
+    pix = fitz.Pixmap(base64.b64decode(data))
+    return pix.width, pix.height
+
+
+def test_sends_text_pages_as_pdf_subset(drawing_pdf, settings):
+    content = vision_input.build_vision_content(drawing_pdf, "Extract panels")
+
+    assert [block["type"] for block in content] == ["document", "text"]
+    assert content[-1]["text"] == "Extract panels"
+    with fitz.open("pdf", base64.b64decode(content[0]["source"]["data"])) as subset:
+        assert subset.page_count == 2
+        assert "PANEL LP-1" in subset[0].get_text()
+        assert subset[1].rect.width == 2592  # full page, not a downscaled raster
+
+
+def test_oversized_subset_falls_back_to_images_with_text(drawing_pdf, settings):
+    settings["max_document_mb"] = 0.0001
+    content = vision_input.build_vision_content(drawing_pdf, "Extract panels")
+
+    assert [block["type"] for block in content] == ["image", "image", "text", "text"]
+    width, height = _image_size(content[0]["source"]["data"])
+    assert max(width, height) <= 1568
+    assert "PANEL LP-1" in content[2]["text"] and "PANEL LP-2" in content[2]["text"]
+    assert content[-1]["text"] == "Extract panels"
+
+
+def test_page_limit_and_explicit_pages(drawing_pdf, settings):
+    settings["max_pages"] = 1
+    assert len(vision_input.encode_pages(drawing_pdf)) == 1
+    assert len(vision_input.encode_pages(drawing_pdf, pages=[0, 3])) == 2
+
+
+def test_size_cap_shrinks_oversized_pages(drawing_pdf, settings):
+    (_, full), = vision_input.encode_pages(drawing_pdf, pages=[1], dpi=72)
+    vision_input.clear_cache()
+    settings["max_image_mb"] = 0.01
+    (_, capped), = vision_input.encode_pages(drawing_pdf, pages=[1], dpi=72)
+
+    assert len(base64.b64decode(full)) > 0.01 * 1024 * 1024
+    assert len(base64.b64decode(capped)) <= 0.01 * 1024 * 1024
+    assert _image_size(capped)[0] < _image_size(full)[0]
+
+
+def test_encoded_pages_are_cached(drawing_pdf, settings, monkeypatch):
+    renders = []
+    real_render = vision_input._render_page
+    monkeypatch.setattr(
+        vision_input,
+        "_render_page",
+        lambda page, dpi, *caps: renders.append((dpi, *caps)) or real_render(page, dpi, *caps),
+    )
+    first = vision_input.encode_pages(drawing_pdf)
+    second = vision_input.encode_pages(drawing_pdf)
+    vision_input.encode_pages(drawing_pdf, dpi=72)
+    settings["max_edge_px"] = 800
+    vision_input.encode_pages(drawing_pdf, pages=[1])
+
+    assert renders == [
+        (150, 1568, 3.75), (150, 1568, 3.75), (72, 1568, 3.75), (72, 1568, 3.75), (150, 800, 3.75),
+    ]
+    assert second[0][1] is first[0][1]
+    assert vision_input.encode_subset(drawing_pdf) is vision_input.encode_subset(drawing_pdf)
+
+
+def test_extractor_sends_page_subset(drawing_pdf, settings):
+    stub = model_gateway.StubBackend(json.dumps({"panels": [{"tag": "LP-1"}], "confidence": 0.9}))
+    with model_gateway.use_backend(stub):
+        result = extract_electrical_drawing(1, drawing_pdf, "E-101", dry_run=True)
+
+    assert result.status == "success"
+    blocks = stub.requests[0].content
+    assert [b["type"] for b in blocks] == ["document", "text"]
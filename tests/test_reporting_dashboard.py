@@ -0,0 +1,80 @@
+"""Tests for materialized dashboard statistics."""
+
+import time
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import pytest
+
+from qms.reporting import dashboard
+
+
+@pytest.fixture
+def dash_db(memory_db):
+    """Route the dashboard module's get_db to the in-memory database."""
+
+    @contextmanager
+    def _get_db(readonly=False):
+        yield memory_db
+
+    with patch("qms.reporting.dashboard.get_db", _get_db):
+        yield memory_db
+
+
+def _add_project(conn, pid, stage="Course of Construction"):
+    conn.execute(
+        "INSERT INTO projects (id, number, name, status, stage) VALUES (?, ?, ?, 'active', ?)",
+        (pid, f"0{pid:04d}", f"Project {pid}", stage),
+    )
+    conn.commit()
+
+
+def test_get_stats_computes_and_caches(dash_db):
+    _add_project(dash_db, 1)
+    stats = dashboard.get_stats(["projects"])
+    assert stats == {"projects": 1}
+    row = dash_db.execute(
+        "SELECT value FROM dashboard_stats WHERE stat_key = 'projects'"
+    ).fetchone()
+    assert row["value"] == 1
+
+
+def test_get_stats_serves_cached_within_max_age(dash_db):
+    _add_project(dash_db, 1)
+    dashboard.get_stats(["projects"], max_age=300)
+    _add_project(dash_db, 2)
+    assert dashboard.get_stats(["projects"], max_age=300)["projects"] == 1
+
+
+def test_get_stats_recounts_when_stale(dash_db):
+    _add_project(dash_db, 1)
+    dashboard.get_stats(["projects"])
+    dash_db.execute(
+        "UPDATE dashboard_stats SET refreshed_at = ? WHERE stat_key = 'projects'",
+        (time.time() - 3600,),
+    )
+    _add_project(dash_db, 2)
+    assert dashboard.get_stats(["projects"], max_age=60)["projects"] == 2
+
+
+def test_refresh_stats_forces_recount(dash_db):
+    _add_project(dash_db, 1)
+    dashboard.get_stats(["projects"], max_age=300)
+    _add_project(dash_db, 2)
+    assert dashboard.refresh_stats(["projects"]) == {"projects": 2}
+    assert dashboard.get_stats(["projects"], max_age=300)["projects"] == 2
+
+
+def test_refresh_stats_rejects_unknown_key(dash_db):
+    with pytest.raises(KeyError):
+        dashboard.refresh_stats(["nope"])
+
+
+def test_all_stat_queries_run_against_schema(dash_db):
+    stats = dashboard.refresh_stats()
+    assert set(stats) == set(dashboard.STAT_QUERIES)
+    assert stats["tables"] > 100
+
+
+def test_start_refresher_disabled_by_default():
+    assert dashboard.start_refresher(interval=0) is False
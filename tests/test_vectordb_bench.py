@@ -0,0 +1,115 @@
+"""Tests for LM Studio batch planning, split-and-retry, and the benchmark stub."""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+from types import SimpleNamespace
+
+import pytest
+
+from qms.vectordb.bench import StubEmbeddingServer, sample_documents
+from qms.vectordb.search import LMStudioEmbeddings, estimate_tokens, plan_batches
+
+
+class OversizedError(Exception):
+    status_code = 413
+
+
+class FakeClient:
+    """Stands in for ``openai.OpenAI``: rejects batches over *max_tokens*."""
+
+    def __init__(self, max_tokens=10_000):
+        self.max_tokens = max_tokens
+        self.batches = []
+        self.threads = set()
+        self.embeddings = SimpleNamespace(create=self._create)
+
+    def _create(self, model, input):
+        self.batches.append(list(input))
+        self.threads.add(threading.get_ident())
+        if sum(estimate_tokens(t) for t in input) > self.max_tokens:
+            raise OversizedError("too large")
+        data = [SimpleNamespace(index=i, embedding=[float(len(t))]) for i, t in enumerate(input)]
+        return SimpleNamespace(data=list(reversed(data)))
+
+    def close(self):
+        pass
+
+
+def _embedder(client, batch_size=4, max_batch_tokens=100, max_in_flight=3):
+    embed_fn = LMStudioEmbeddings.__new__(LMStudioEmbeddings)
+    embed_fn.client = client
+    embed_fn.model = "m"
+    embed_fn.batch_size = batch_size
+    embed_fn.max_batch_tokens = max_batch_tokens
+    embed_fn.max_in_flight = max_in_flight
+    embed_fn._executor = None
+    return embed_fn
+
+
+def test_plan_batches_respects_items_and_tokens():
+    texts = ["x" * 40, "x" * 40, "x" * 40, "x" * 4, "x" * 400, "x"]
+    # tokens: 10, 10, 10, 1, 100, 1
+    assert plan_batches(texts, max_items=2, max_tokens=1000) == [[0, 1], [2, 3], [4, 5]]
+    assert plan_batches(texts, max_items=10, max_tokens=25) == [[0, 1], [2, 3], [4], [5]]
+    assert plan_batches([], max_items=4, max_tokens=10) == []
+
+
+def test_embed_preserves_order_across_concurrent_batches():
+    client = FakeClient()
+    texts = [f"text {'y' * i}" for i in range(20)]
+    embed_fn = _embedder(client, batch_size=3)
+    vectors = embed_fn._embed(texts)
+    embed_fn.close()
+    assert vectors == [[float(len(t))] for t in texts]
+    assert len(client.batches) == 7
+
+
+def test_oversized_batch_is_split_and_retried():
+    client = FakeClient(max_tokens=20)
+    texts = ["z" * 40] * 4  # 10 tokens each; the server accepts two at a time
+    embed_fn = _embedder(client, batch_size=4, max_batch_tokens=1000, max_in_flight=1)
+    assert embed_fn._embed(texts) == [[40.0]] * 4
+    assert [len(b) for b in client.batches] == [4, 2, 2]
+
+
+def test_single_oversized_text_raises():
+    embed_fn = _embedder(FakeClient(max_tokens=5), max_in_flight=1)
+    with pytest.raises(OversizedError):
+        embed_fn._embed(["w" * 100])
+
+
+def test_stub_server_embeds_and_rejects():
+    with StubEmbeddingServer(dims=8, request_overhead=0, per_token=0, max_tokens=50) as stub:
+        def _post(texts):
+            req = urllib.request.Request(
+                f"{stub.base_url}/embeddings",
+                data=json.dumps({"model": "stub", "input": texts}).encode(),
+                headers={"Content-Type": "application/json"},
+            )
+            with urllib.request.urlopen(req, timeout=5) as resp:
+                return json.loads(resp.read())
+
+        body = _post(["a", "b"])
+        assert [d["index"] for d in body["data"]] == [0, 1]
+        assert len(body["data"][0]["embedding"]) == 8
+        with pytest.raises(urllib.error.HTTPError) as err:
+            _post(["q" * 400])
+        assert err.value.code == 413
+        assert stub.rejected == 1
+
+
+def test_sample_documents_deterministic():
+    docs = sample_documents(10, mean_chars=200)
+    assert docs == sample_documents(10, mean_chars=200)
+    assert min(map(len, docs)) < 200 < max(map(len, docs))
+
+
+def test_benchmark_against_stub():
+    pytest.importorskip("openai")
+    from qms.vectordb.bench import benchmark_embeddings
+
+    results = benchmark_embeddings([4, 16], docs=32, mean_chars=100, max_in_flight=2)
+    assert [r["batch_size"] for r in results] == [4, 16]
+    assert all(r["docs"] == 32 and r["docs_per_sec"] > 0 for r in results)
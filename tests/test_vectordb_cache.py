@@ -0,0 +1,94 @@
+"""Tests for the persistent embedding cache."""
+
+from unittest.mock import patch
+
+import pytest
+
+from qms.vectordb import cache as cache_mod
+from qms.vectordb.cache import EmbeddingCache, cached_embed
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = EmbeddingCache(tmp_path / "embed_cache.db", max_bytes=1024 * 1024)
+    yield c
+    c.close()
+
+
+class FakeEmbedder:
+    provider = "local"
+    cache_model = "tiny"
+    dimensions = 2
+
+    def __init__(self):
+        self.calls = []
+
+    def compute(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t)), 0.5] for t in texts]
+
+
+def test_roundtrip_is_keyed_by_model_and_dims(cache):
+    cache.put_many("local", "tiny", 2, ["a", "bb"], [[1.0, 2.0], [3.0, 4.0]])
+
+    assert cache.get_many("local", "tiny", 2, ["bb", "x", "a"]) == {
+        0: [3.0, 4.0],
+        2: [1.0, 2.0],
+    }
+    assert cache.get_many("local", "other", 2, ["a"]) == {}
+    assert cache.get_many("local", "tiny", 3, ["a"]) == {}
+    assert cache.stats()["hits"] == 2
+
+
+def test_persists_across_instances(tmp_path):
+    first = EmbeddingCache(tmp_path / "c.db", max_bytes=1 << 20)
+    first.put_many("lm_studio", "m", 2, ["q"], [[0.25, 0.75]])
+    first.close()
+
+    second = EmbeddingCache(tmp_path / "c.db", max_bytes=1 << 20)
+    assert second.get_many("lm_studio", "m", 2, ["q"]) == {0: [0.25, 0.75]}
+    assert second.stats()["bytes"] == 8
+    second.close()
+
+
+def test_lru_eviction_respects_cap(tmp_path):
+    # Each 2-float vector is 8 bytes; cap at 3 entries
+    c = EmbeddingCache(tmp_path / "c.db", max_bytes=24)
+    c.put_many("local", "m", 2, ["a", "b", "c"], [[1, 1], [2, 2], [3, 3]])
+    c.get_many("local", "m", 2, ["a"])  # refresh "a"
+    c.put_many("local", "m", 2, ["d"], [[4, 4]])
+
+    stats = c.stats()
+    assert stats["bytes"] <= 24
+    assert set(c.get_many("local", "m", 2, ["a", "d"])) == {0, 1}
+    assert c.get_many("local", "m", 2, ["b"]) == {}
+    c.close()
+
+
+def test_rewriting_a_key_does_not_inflate_size(tmp_path):
+    c = EmbeddingCache(tmp_path / "c.db", max_bytes=24)
+    c.put_many("local", "m", 2, ["a", "b"], [[1, 1], [2, 2]])
+    for _ in range(3):
+        c.put_many("local", "m", 2, ["a"], [[5, 5]])
+
+    assert c.stats()["bytes"] == 16
+    assert set(c.get_many("local", "m", 2, ["a", "b"])) == {0, 1}
+    c.close()
+
+
+def test_cached_embed_only_computes_misses(cache):
+    fn = FakeEmbedder()
+    with patch.object(cache_mod, "get_embedding_cache", lambda: cache):
+        first = cached_embed(fn, ["one", "three"], fn.compute)
+        second = cached_embed(fn, ["three", "four", "one"], fn.compute)
+
+    assert fn.calls == [["one", "three"], ["four"]]
+    assert second == [first[1], [4.0, 0.5], first[0]]
+
+
+def test_cached_embed_disabled(cache):
+    fn = FakeEmbedder()
+    with patch.object(cache_mod, "get_embedding_cache", lambda: None):
+        cached_embed(fn, ["x"], fn.compute)
+        cached_embed(fn, ["x"], fn.compute)
+    assert fn.calls == [["x"], ["x"]]
@@ -0,0 +1,184 @@
+"""Tests for the embedding queue worker pool (embedding calls patched out)."""
+
+import threading
+import time
+
+import pytest
+
+from qms.vectordb import embedder
+
+
+@pytest.fixture
+def queue_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedder, "QUEUE_DB_PATH", tmp_path / "embed_queue.db")
+    monkeypatch.setattr(embedder, "_initialised_path", None)
+    monkeypatch.setattr(
+        embedder, "get_config_value",
+        lambda *keys, default=None: default,
+    )
+    return tmp_path
+
+
+def _status(item_id):
+    conn = embedder._get_queue_conn()
+    try:
+        return dict(conn.execute("SELECT * FROM embed_queue WHERE id = ?", (item_id,)).fetchone())
+    finally:
+        conn.close()
+
+
+def test_claim_is_exclusive_and_priority_ordered(queue_db):
+    low = embedder.add_to_queue("collection", "a", priority=8)
+    high = embedder.add_to_queue("collection", "b", priority=1)
+    mid = embedder.add_to_queue("collection", "c", priority=5)
+
+    first = embedder.claim_items("w1", 2)
+    second = embedder.claim_items("w2", 5)
+
+    assert [i["id"] for i in first] == [high, mid]
+    assert [i["id"] for i in second] == [low]
+    assert embedder.claim_items("w3", 5) == []
+    assert _status(high)["lease_owner"] == "w1"
+
+
+def test_expired_lease_is_reclaimed(queue_db):
+    item = embedder.add_to_queue("collection", "a")
+    embedder.claim_items("dead", 1, lease_seconds=0.01)
+    time.sleep(0.05)
+    reclaimed = embedder.claim_items("alive", 1)
+    assert [i["id"] for i in reclaimed] == [item]
+    assert reclaimed[0]["lease_owner"] == "alive"
+
+
+def test_failure_backs_off_then_fails(queue_db):
+    item = embedder.add_to_queue("collection", "a")
+    embedder.claim_items("w", 1)
+
+    assert embedder.fail_item(item, "boom", max_retries=2) == "pending"
+    row = _status(item)
+    assert row["retry_count"] == 1
+    assert row["next_attempt_at"] == pytest.approx(time.time() + 30, abs=5)
+    assert embedder.claim_items("w", 1) == []  # still backing off
+
+    assert embedder.fail_item(item, "boom again", max_retries=2) == "failed"
+    assert _status(item)["status"] == "failed"
+
+
+def test_pool_drains_queue_concurrently(queue_db, monkeypatch):
+    seen = []
+    threads = set()
+    lock = threading.Lock()
+
+    def _process(item):
+        with lock:
+            seen.append(item["target"])
+            threads.add(threading.get_ident())
+        time.sleep(0.02)
+        if item["target"] == "bad":
+            raise RuntimeError("embed failed")
+        return True
+
+    monkeypatch.setattr(embedder, "_process_item", _process)
+    for name in ["a", "b", "c", "d", "bad"]:
+        embedder.add_to_queue("collection", name)
+
+    stats = embedder.run_worker_pool(workers=3, batch_size=1, max_retries=3)
+
+    assert sorted(seen) == ["a", "b", "bad", "c", "d"]
+    assert stats == {"processed": 4, "failed": 1, "skipped": 0}
+    assert len(threads) > 1
+    assert embedder.get_queue_stats()["pending"] == 1  # "bad" waits out its backoff
+
+
+def test_pool_respects_max_items(queue_db, monkeypatch):
+    monkeypatch.setattr(embedder, "_process_item", lambda item: True)
+    for name in "abcde":
+        embedder.add_to_queue("collection", name)
+    stats = embedder.run_worker_pool(workers=2, batch_size=2, max_items=3)
+    assert stats["processed"] == 3
+    assert embedder.get_queue_stats()["pending"] == 2
+
+
+def test_file_items_embed_as_one_batch(queue_db, tmp_path, monkeypatch):
+    from qms.vectordb import search
+
+    calls = []
+    monkeypatch.setattr(
+        search, "add_documents_to_collection",
+        lambda name, docs, metas, ids: calls.append((name, ids)),
+    )
+    for stem in ("one", "two"):
+        path = tmp_path / f"{stem}.txt"
+        path.write_text(f"{stem} " + "weld inspection record " * 5, encoding="utf-8")
+        embedder.add_to_queue("file", str(path), "documents")
+
+    stats = embedder.run_worker_pool(workers=1, batch_size=10)
+
+    assert stats["processed"] == 2
+    assert calls == [("documents", ["file_one_0", "file_two_0"])]
+
+
+def test_idle_worker_wakes_on_new_item(queue_db, monkeypatch):
+    done = threading.Event()
+    monkeypatch.setattr(embedder, "_process_item", lambda item: done.set() or True)
+    stop = threading.Event()
+    pool = threading.Thread(
+        target=embedder.run_worker_pool,
+        kwargs={"workers": 1, "drain": False, "idle_timeout": 30, "stop_event": stop},
+    )
+    pool.start()
+    try:
+        time.sleep(0.1)
+        embedder.add_to_queue("collection", "late")
+        assert done.wait(timeout=5)
+    finally:
+        stop.set()
+        pool.join(timeout=5)
+    assert not pool.is_alive()
+
+
+def test_settle_requires_the_current_lease(queue_db):
+    item = embedder.add_to_queue("collection", "a")
+    embedder.claim_items("slow", 1, lease_seconds=0.01)
+    time.sleep(0.05)
+    embedder.claim_items("fresh", 1)
+
+    assert not embedder.complete_item(item, worker_id="slow")
+    assert embedder.fail_item(item, "late", worker_id="slow") == "lost"
+    assert _status(item)["lease_owner"] == "fresh"
+    assert embedder.renew_leases("slow", [item]) == 0
+    assert embedder.renew_leases("fresh", [item], lease_seconds=600) == 1
+    assert _status(item)["lease_expires"] == pytest.approx(time.time() + 600, abs=5)
+    assert embedder.complete_item(item, worker_id="fresh")
+
+
+def test_heartbeat_keeps_long_items_leased(queue_db, monkeypatch):
+    defaults = dict(embedder._QUEUE_DEFAULTS, lease_seconds=0.15)
+    monkeypatch.setattr(embedder, "_queue_setting", defaults.__getitem__)
+    item = embedder.add_to_queue("collection", "a")
+    claimed = embedder.claim_items("w", 1)
+
+    def _slow(item):
+        time.sleep(0.4)
+        assert embedder.claim_items("thief", 1) == []
+        return True
+
+    monkeypatch.setattr(embedder, "_process_item", _slow)
+    assert embedder._process_claimed(claimed, 3, "w")["processed"] == 1
+    assert _status(item)["status"] == "completed"
+
+
+def test_one_collection_task_per_target(queue_db):
+    first = embedder.add_to_queue("collection", "drawings")
+    again = embedder.add_to_queue("collection", "drawings")
+    other = embedder.add_to_queue("collection", "specifications")
+    everything = embedder.add_to_queue("collection", "all")
+
+    assert [i["id"] for i in embedder.claim_items("w1", 5)] == [first, other]
+    assert embedder.claim_items("w2", 5) == []
+
+    embedder.complete_item(first, worker_id="w1")
+    assert [i["id"] for i in embedder.claim_items("w2", 5)] == [again]
+    embedder.complete_item(again)
+    embedder.complete_item(other)
+    assert [i["id"] for i in embedder.claim_items("w3", 5)] == [everything]
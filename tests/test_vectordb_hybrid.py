@@ -0,0 +1,103 @@
+"""Tests for hybrid FTS5 + vector search and the quality issue FTS index."""
+
+import time
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import pytest
+
+from qms.quality.db import backfill_issue_fts, search_issues_fts
+from qms.vectordb import hybrid, search
+
+
+@pytest.fixture
+def issues(memory_db):
+    for i, (title, desc) in enumerate([
+        ("Cracked weld at column base", "Visual inspection found crack"),
+        ("Missing firestop", "Penetration not sealed"),
+        ("Weld undercut on beam", None),
+    ], start=1):
+        memory_db.execute(
+            "INSERT INTO quality_issues (id, type, title, description) VALUES (?, 'ncr', ?, ?)",
+            (i, title, desc),
+        )
+
+    @contextmanager
+    def _get_db(readonly=False):
+        yield memory_db
+
+    with patch.object(hybrid, "get_db", _get_db):
+        yield memory_db
+
+
+def _keys(out):
+    return [r["key"] for r in out["results"]]
+
+
+def test_fts_triggers_track_issue_edits(issues):
+    assert [r["id"] for r in search_issues_fts(issues, '"weld"')] in ([1, 3], [3, 1])
+    issues.execute("UPDATE quality_issues SET title = 'Seal gap' WHERE id = 3")
+    issues.execute("DELETE FROM quality_issues WHERE id = 1")
+    assert search_issues_fts(issues, '"weld"') == []
+    assert [r["id"] for r in search_issues_fts(issues, '"gap"')] == [3]
+
+
+def test_backfill_is_idempotent(issues):
+    issues.execute("DELETE FROM quality_issues_fts")
+    assert backfill_issue_fts(issues) == 3
+    assert backfill_issue_fts(issues) == 0
+
+
+def test_rrf_fuses_rankings():
+    fused = hybrid.reciprocal_rank_fusion(
+        {
+            "fts": [(1, {}), (2, {}), (1, {})],
+            "vector": [(2, {"document": "b"}), (3, {})],
+        },
+        rrf_k=60,
+    )
+    assert [e["key"] for e in fused] == [2, 1, 3]
+    assert fused[0]["ranks"] == {"fts": 2, "vector": 1}
+    assert fused[0]["score"] == pytest.approx(1 / 62 + 1 / 61)
+
+
+def test_hybrid_combines_fts_and_vector(issues):
+    vector = [(3, {"document": "Weld undercut on beam"}), (2, {"document": "Missing firestop"})]
+    with patch.object(search, "embedding_available", lambda: True), \
+         patch.object(hybrid, "_vector_hits", lambda *a: vector):
+        out = hybrid.hybrid_search("quality_issues", "weld crack", limit=5)
+    assert out["mode"] == "hybrid"
+    assert _keys(out)[0] == 3
+    assert set(_keys(out)) == {1, 2, 3}
+
+
+def test_degrades_to_fts_without_calling_vector(issues):
+    def _boom(*args):
+        raise AssertionError("vector search should be skipped")
+
+    with patch.object(search, "embedding_available", lambda: False), \
+         patch.object(hybrid, "_vector_hits", _boom):
+        out = hybrid.hybrid_search("quality_issues", "firestop", limit=5)
+    assert out == {"mode": "fts", "results": out["results"]}
+    assert _keys(out) == [2]
+
+
+def test_slow_vector_search_times_out_and_trips_breaker(issues, monkeypatch):
+    def _slow(*args):
+        time.sleep(0.5)
+        return []
+
+    monkeypatch.setattr(search, "HAS_CHROMADB", True)
+    monkeypatch.setattr(search, "_embedding_down_until", 0.0)
+    monkeypatch.setattr(hybrid, "_DEFAULT_VECTOR_TIMEOUT", 0.05)
+    with patch.object(hybrid, "get_config_value", lambda *k, default=None: default), \
+         patch.object(search, "get_config_value", lambda *k, default=None: default), \
+         patch.object(hybrid, "_vector_hits", _slow):
+        out = hybrid.hybrid_search("quality_issues", "weld", limit=5)
+    assert out["mode"] == "fts"
+    assert not search.embedding_available()
+
+
+def test_fts_match_expression_quotes_terms():
+    assert hybrid.fts_match_expression('weld "crack" OR-') == '"weld" OR "crack" OR "OR"'
+    assert hybrid.fts_match_expression("  -- ") is None
@@ -0,0 +1,161 @@
+"""Tests for the vectordb indexer's incremental sync (no chromadb needed)."""
+
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import pytest
+
+from qms.vectordb import indexer
+
+
+class FakeCollection:
+    """Minimal stand-in for a ChromaDB collection that records round trips."""
+
+    name = "quality_issues"
+
+    def __init__(self, ids=()):
+        self.docs = {i: "" for i in ids}
+        self.metas = {i: {} for i in ids}
+        self.get_calls = 0
+        self.embedded = []
+
+    def count(self):
+        return len(self.docs)
+
+    def get(self, ids=None, include=None, limit=None, offset=0):
+        self.get_calls += 1
+        keys = sorted(self.docs) if ids is None else [i for i in ids if i in self.docs]
+        if limit is not None:
+            keys = keys[offset : offset + limit]
+        result = {"ids": keys}
+        if include and "metadatas" in include:
+            result["metadatas"] = [self.metas[k] for k in keys]
+        return result
+
+    def add(self, documents, metadatas, ids):
+        self.upsert(documents, metadatas, ids)
+
+    def upsert(self, documents, metadatas, ids):
+        self.docs.update(zip(ids, documents))
+        self.metas.update(zip(ids, metadatas))
+        self.embedded.extend(ids)
+
+    def delete(self, ids):
+        for i in ids:
+            self.docs.pop(i, None)
+            self.metas.pop(i, None)
+
+
+@pytest.fixture
+def run_indexer(memory_db):
+    @contextmanager
+    def _get_db(readonly=False):
+        yield memory_db
+
+    def _run(collection, **kwargs):
+        with patch.object(indexer, "get_db", _get_db), \
+             patch.object(indexer, "_require_vector_store", lambda: None), \
+             patch.object(indexer, "_get_collection", lambda name: collection):
+            return indexer.index_quality_issues(**kwargs)
+
+    return _run
+
+
+def _issues(conn, *ids):
+    for i in ids:
+        conn.execute(
+            "INSERT INTO quality_issues (id, type, title) VALUES (?, 'observation', ?)",
+            (i, f"Issue {i}"),
+        )
+
+
+def test_existing_ids_pages(monkeypatch):
+    monkeypatch.setattr(indexer, "_ID_PAGE_SIZE", 2)
+    collection = FakeCollection(f"qi_{i}" for i in range(5))
+    assert indexer._existing_ids(collection) == {f"qi_{i}" for i in range(5)}
+    assert collection.get_calls == 3
+
+
+def test_incremental_adds_only_new_and_drops_stale(memory_db, run_indexer):
+    _issues(memory_db, 1, 2, 3)
+    collection = FakeCollection(["qi_1", "qi_2", "qi_99", "other_1"])
+
+    assert run_indexer(collection) == 1
+    # qi_99 no longer has a source row; other_1 is not this indexer's to remove
+    assert set(collection.docs) == {"qi_1", "qi_2", "qi_3", "other_1"}
+    assert collection.get_calls == 1
+
+
+def test_incremental_reembeds_only_changed(memory_db, run_indexer):
+    _issues(memory_db, 1, 2)
+    collection = FakeCollection()
+    assert run_indexer(collection) == 2
+    assert all(m["content_hash"] for m in collection.metas.values())
+
+    memory_db.execute("UPDATE quality_issues SET description = 'cracked' WHERE id = 2")
+    memory_db.execute("DELETE FROM quality_issues WHERE id = 1")
+    _issues(memory_db, 3)
+    collection.embedded.clear()
+
+    # Plain runs only look at IDs, so the edit to qi_2 is missed
+    assert run_indexer(collection) == 1
+    assert collection.embedded == ["qi_3"]
+
+    collection.embedded.clear()
+    assert run_indexer(collection, incremental=True) == 1
+    assert collection.embedded == ["qi_2"]
+    assert "cracked" in collection.docs["qi_2"]
+    assert set(collection.docs) == {"qi_2", "qi_3"}
+
+
+def test_emptied_source_table_drops_embeddings(memory_db, run_indexer):
+    collection = FakeCollection(["qi_1", "qi_2", "other_1"])
+    assert run_indexer(collection) == 0
+    assert set(collection.docs) == {"other_1"}
+
+
+def test_rebuild_skips_diff(memory_db, run_indexer):
+    _issues(memory_db, 1, 2)
+    collection = FakeCollection(["qi_1", "qi_stale"])
+    assert run_indexer(collection, rebuild=True) == 2
+    assert collection.get_calls == 1  # only the clear
+    assert set(collection.docs) == {"qi_1", "qi_2"}
+
+
+def test_clear_deletes_page_by_page(monkeypatch):
+    monkeypatch.setattr(indexer, "_ID_PAGE_SIZE", 2)
+    collection = FakeCollection(f"qi_{i}" for i in range(5))
+    indexer._clear_collection(collection)
+    assert collection.count() == 0
+    assert collection.get_calls == 3
+
+
+def test_sync_streams_in_batches_with_progress(monkeypatch):
+    monkeypatch.setattr(indexer, "_BATCH_SIZE", 2)
+    pulled = []
+
+    def _documents():
+        for i in range(5):
+            pulled.append(i)
+            yield f"qi_{i}", f"doc {i}", {"db_id": i}
+
+    collection = FakeCollection(["qi_0"])
+    seen = []
+
+    def _progress(name, read, embedded):
+        # Rows are pulled from the source one batch at a time
+        seen.append((name, read, embedded, len(pulled)))
+
+    assert indexer._sync_documents(collection, _documents(), ("qi_",), progress=_progress) == 4
+    assert seen == [
+        ("quality_issues", 2, 1, 2),
+        ("quality_issues", 4, 3, 4),
+        ("quality_issues", 5, 4, 5),
+    ]
+
+
+def test_index_reports_progress(memory_db, run_indexer):
+    _issues(memory_db, 1, 2, 3)
+    calls = []
+    assert run_indexer(FakeCollection(), progress=lambda *a: calls.append(a)) == 3
+    assert calls == [("quality_issues", 3, 3)]
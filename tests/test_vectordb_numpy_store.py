@@ -0,0 +1,152 @@
+"""Tests for the in-process numpy vector store backend."""
+
+from unittest.mock import patch
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from qms.vectordb import numpy_store, search  # noqa: E402
+from qms.vectordb.numpy_store import NumpyCollection, matches_where  # noqa: E402
+
+_AXES = {"weld": 0, "pipe": 1, "paint": 2}
+
+
+def fake_embed(texts):
+    """Bag-of-keywords vectors: one axis per known word, plus a bias axis."""
+    out = []
+    for text in texts:
+        vec = [0.0] * 4
+        for word in text.lower().split():
+            if word in _AXES:
+                vec[_AXES[word]] += 1.0
+        vec[3] = 0.1
+        out.append(vec)
+    return out
+
+
+@pytest.fixture
+def collection(tmp_path):
+    col = NumpyCollection("docs", tmp_path / "docs", fake_embed, {"description": "t"})
+    col.add(
+        ids=["a", "b", "c"],
+        documents=["weld weld inspection", "pipe support", "paint pipe"],
+        metadatas=[{"kind": "qm", "n": 1}, {"kind": "spec", "n": 2}, {"kind": "spec", "n": 3}],
+    )
+    yield col
+    col.close()
+
+
+def test_query_ranks_by_cosine(collection):
+    raw = collection.query(query_texts=["weld"], n_results=2)
+    assert raw["ids"][0][0] == "a"
+    cosine = 2.01 / (np.sqrt(1.01) * np.sqrt(4.01))
+    assert raw["distances"][0][0] == pytest.approx(1 - cosine, abs=1e-5)
+    assert raw["distances"][0][0] < raw["distances"][0][1]
+    assert raw["documents"][0][0] == "weld weld inspection"
+
+
+def test_where_prefilter(collection):
+    raw = collection.query(query_texts=["weld"], n_results=5, where={"kind": "spec"})
+    assert set(raw["ids"][0]) == {"b", "c"}
+    raw = collection.query(
+        query_texts=["pipe"], n_results=5,
+        where={"$and": [{"kind": {"$eq": "spec"}}, {"n": {"$gt": 2}}]},
+    )
+    assert raw["ids"] == [["c"]]
+
+
+def test_add_ignores_existing_upsert_replaces(collection):
+    collection.add(ids=["a"], documents=["paint"], metadatas=[{}])
+    assert collection.get(ids=["a"])["documents"] == ["weld weld inspection"]
+    collection.upsert(ids=["a"], documents=["paint paint"], metadatas=[{"kind": "x"}])
+    assert collection.get(ids=["a"])["metadatas"] == [{"kind": "x"}]
+    assert collection.query(query_texts=["paint"], n_results=1)["ids"] == [["a"]]
+    assert collection.count() == 3
+
+
+def test_delete_and_paged_get(collection):
+    assert collection.get(include=[], limit=2, offset=1)["ids"] == ["b", "c"]
+    collection.delete(ids=["b"])
+    assert collection.count() == 2
+    assert collection.get()["ids"] == ["a", "c"]
+    assert "b" not in collection.query(query_texts=["pipe"], n_results=3)["ids"][0]
+    collection.delete(ids=["a", "c"])
+    assert collection.query(query_texts=["pipe"], n_results=3)["ids"] == [[]]
+
+
+def test_persists_across_reopen(tmp_path, collection):
+    collection.close()
+    reopened = NumpyCollection("docs", tmp_path / "docs", fake_embed)
+    assert reopened.count() == 3
+    assert reopened.metadata == {"description": "t"}
+    assert reopened.query(query_texts=["weld"], n_results=1)["ids"] == [["a"]]
+    reopened.close()
+
+
+def test_two_handles_share_writes(tmp_path, monkeypatch):
+    # Separate handles on one directory, as the web server and indexer hold
+    monkeypatch.setattr(numpy_store, "_INITIAL_CAPACITY", 2)
+    first = NumpyCollection("docs", tmp_path / "docs", fake_embed)
+    second = NumpyCollection("docs", tmp_path / "docs", fake_embed)
+
+    first.add(ids=["x"], documents=["weld"])
+    second.add(ids=["y"], documents=["pipe"])
+    second.add(ids=["x"], documents=["paint"])  # already added by the other handle
+    for i in range(3):
+        second.add(ids=[f"z{i}"], documents=["paint"])  # grows the vector file
+
+    assert first.count() == 5
+    assert first.query(query_texts=["pipe"], n_results=1)["ids"] == [["y"]]
+    assert second.get(ids=["x"])["documents"] == ["weld"]
+
+    first.delete(ids=["y"])
+    assert "y" not in second.get()["ids"]
+    first.close()
+    second.close()
+
+    fresh = NumpyCollection("docs", tmp_path / "docs", fake_embed)
+    assert sorted(fresh.get()["ids"]) == ["x", "z0", "z1", "z2"]
+    assert fresh.query(query_texts=["weld"], n_results=1)["ids"] == [["x"]]
+    fresh.close()
+
+
+def test_grows_past_initial_capacity(tmp_path, monkeypatch):
+    monkeypatch.setattr(numpy_store, "_INITIAL_CAPACITY", 2)
+    col = NumpyCollection("big", tmp_path / "big", fake_embed)
+    for i in range(5):
+        col.add(ids=[f"d{i}"], documents=["pipe" if i == 3 else "paint"])
+    assert col.query(query_texts=["pipe"], n_results=1)["ids"] == [["d3"]]
+    col.close()
+
+
+def test_matches_where_operators():
+    meta = {"kind": "spec", "n": 2}
+    assert matches_where(meta, {"n": {"$in": [1, 2]}})
+    assert not matches_where(meta, {"n": {"$nin": [2]}})
+    assert matches_where(meta, {"$or": [{"kind": "qm"}, {"n": {"$lte": 2}}]})
+    with pytest.raises(ValueError):
+        matches_where(meta, {"n": {"$regex": "x"}})
+
+
+def test_search_module_uses_numpy_backend(tmp_path):
+    class _Fn:
+        def __call__(self, texts):
+            return fake_embed(texts)
+
+    def _config(*keys, default=None):
+        return "numpy" if keys == ("vectordb", "backend") else default
+
+    numpy_store.reset_collections()
+    with patch.object(search, "get_config_value", _config), \
+         patch.object(numpy_store, "store_root", lambda: tmp_path), \
+         patch.object(search, "get_embedding_function", lambda: _Fn()):
+        col = search.get_chromadb_collection("qm_content", description="QM")
+        col.add(ids=["x"], documents=["weld"], metadatas=[{"db_id": 1}])
+        results = search.search_collection("qm_content", "weld", n_results=3)
+        listed = search.list_collections()
+    numpy_store.reset_collections()
+
+    assert [r["id"] for r in results] == ["x"]
+    assert results[0]["metadata"] == {"db_id": 1}
+    assert listed == [{"name": "qm_content", "count": 1, "metadata": {"description": "QM"}}]
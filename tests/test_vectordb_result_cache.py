@@ -0,0 +1,104 @@
+"""Tests for the search result cache and collection version invalidation."""
+
+import pytest
+
+from qms.vectordb import result_cache, search
+from qms.vectordb.result_cache import CollectionVersions, SearchResultCache, make_key
+
+
+class FakeCollection:
+    def __init__(self):
+        self.queries = 0
+        self.docs = {}
+
+    def query(self, query_texts=None, query_embeddings=None, n_results=5, where=None, include=None):
+        self.queries += 1
+        ids = sorted(self.docs)[:n_results]
+        return {
+            "ids": [ids],
+            "documents": [[self.docs[i] for i in ids]],
+            "metadatas": [[{} for _ in ids]],
+            "distances": [[0.1 for _ in ids]],
+        }
+
+    def add(self, documents, metadatas, ids):
+        self.docs.update(zip(ids, documents))
+
+    def count(self):
+        return len(self.docs)
+
+
+@pytest.fixture
+def cached_search(tmp_path, monkeypatch):
+    collection = FakeCollection()
+    collection.add(["weld inspection"], None, ["a"])
+    monkeypatch.setattr(result_cache, "_versions", CollectionVersions(tmp_path / "versions.db"))
+    monkeypatch.setattr(result_cache, "_cache", SearchResultCache(max_entries=8, ttl_seconds=60))
+    monkeypatch.setattr(search, "_require_vector_store", lambda: None)
+    monkeypatch.setattr(search, "get_chromadb_collection", lambda name, **kw: collection)
+    return collection
+
+
+def test_lru_ttl_and_version():
+    cache = SearchResultCache(max_entries=2, ttl_seconds=60)
+    k1, k2, k3 = (make_key("c", q, 5, None, None) for q in ("a", "b", "c"))
+    cache.put(k1, 1, [{"id": "x"}])
+    cache.put(k2, 1, [])
+    assert cache.get(k1, 1) == [{"id": "x"}]
+    cache.put(k3, 1, [])  # evicts k2, the least recently used
+    assert cache.get(k2, 1) is None
+    assert cache.get(k1, 2) is None  # collection written since
+    assert cache.stats()["invalidations"] == 1
+
+    cache.ttl_seconds = 0
+    assert cache.get(k3, 1) is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 3
+
+
+def test_key_canonicalises_where():
+    assert make_key("c", "q", 5, {"a": 1, "b": 2}, None) == make_key("c", "q", 5, {"b": 2, "a": 1}, None)
+    assert make_key("c", "q", 5, None, None) != make_key("c", "q", 6, None, None)
+
+
+def test_versions_persist_and_bump(tmp_path):
+    versions = CollectionVersions(tmp_path / "v.db")
+    assert versions.get("qm_content") == 0
+    assert versions.bump("qm_content") == 1
+    assert versions.bump("qm_content") == 2
+    versions.close()
+    assert CollectionVersions(tmp_path / "v.db").get("qm_content") == 2
+
+
+def test_search_collection_cached_until_write(cached_search):
+    first = search.search_collection("qm_content", "weld", n_results=3)
+    again = search.search_collection("qm_content", "weld", n_results=3)
+    assert first == again and cached_search.queries == 1
+
+    search.search_collection("qm_content", "weld", n_results=3, where={"module": 1})
+    assert cached_search.queries == 2  # different filter, different entry
+
+    search.add_documents_to_collection("qm_content", ["pipe support"], None, ["b"])
+    refreshed = search.search_collection("qm_content", "weld", n_results=3)
+    assert cached_search.queries == 3
+    assert [r["id"] for r in refreshed] == ["a", "b"]
+
+
+def test_mutating_results_does_not_poison_cache(cached_search):
+    search.search_collection("qm_content", "weld")[0]["id"] = "changed"
+    assert search.search_collection("qm_content", "weld")[0]["id"] == "a"
+
+
+def test_multi_search_skips_embedding_when_all_cached(cached_search, monkeypatch):
+    calls = []
+    monkeypatch.setattr(search, "embed_query", lambda q: calls.append(q) or [0.0])
+    search.search_multiple_collections("weld", collections=["qm_content", "drawings"])
+    search.search_multiple_collections("weld", collections=["qm_content", "drawings"])
+    assert calls == ["weld"]
+
+
+def test_stats_report_hits_and_misses(cached_search, monkeypatch):
+    monkeypatch.setattr(search, "list_collections", lambda: [])
+    search.search_collection("qm_content", "weld")
+    search.search_collection("qm_content", "weld")
+    stats = search.get_stats()["result_cache"]
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
@@ -0,0 +1,75 @@
+"""Tests for multi-collection vector search (chromadb calls patched out)."""
+
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from qms.vectordb import search
+
+
+def _hits(*distances):
+    return [{"id": f"d{d}", "document": "", "distance": d} for d in distances]
+
+
+@pytest.fixture
+def fake_backend():
+    calls = {"embed": 0, "threads": set(), "embeddings": []}
+
+    def _embed(query):
+        calls["embed"] += 1
+        return [0.1, 0.2]
+
+    def _search(name, query, n_results=5, where=None, include=None, query_embedding=None):
+        calls["threads"].add(threading.get_ident())
+        calls["embeddings"].append(query_embedding)
+        if name == "broken":
+            raise RuntimeError("collection missing")
+        return {"qm_content": _hits(0.2, 0.9), "drawings": _hits(0.4, 0.5)}[name][:n_results]
+
+    with patch.object(search, "_require_chromadb", lambda: None), \
+         patch.object(search, "embed_query", _embed), \
+         patch.object(search, "search_collection", _search):
+        yield calls
+
+
+def test_query_embedded_once(fake_backend):
+    results = search.search_multiple_collections(
+        "weld", collections=["qm_content", "drawings", "broken"]
+    )
+    assert fake_backend["embed"] == 1
+    assert fake_backend["embeddings"] == [[0.1, 0.2]] * 3
+    assert [r["distance"] for r in results["drawings"]] == [0.4, 0.5]
+    assert results["broken"] == []
+
+
+def test_embedding_failure_returns_empty(fake_backend):
+    def _down(query):
+        raise ConnectionError("LM Studio down")
+
+    with patch.object(search, "embed_query", _down):
+        results = search.search_multiple_collections("weld", collections=["qm_content"])
+    assert results == {"qm_content": []}
+
+
+def test_merge_results_ranks_and_normalises():
+    merged = search.merge_results(
+        {"qm_content": _hits(0.2, 0.9), "drawings": _hits(0.4, 0.5)}, top_k=3
+    )
+    assert [(r["collection"], r["distance"]) for r in merged] == [
+        ("qm_content", 0.2), ("drawings", 0.4), ("drawings", 0.5),
+    ]
+    assert merged[0]["normalized_distance"] == 0.0
+    assert merged[1]["normalized_distance"] == pytest.approx(2 / 7)
+
+
+def test_merge_results_per_collection_quota():
+    merged = search.merge_results(
+        {"a": _hits(0.1, 0.2, 0.3), "b": _hits(0.8)}, top_k=3, per_collection=2
+    )
+    assert [r["collection"] for r in merged] == ["a", "a", "b"]
+
+
+def test_search_merged(fake_backend):
+    merged = search.search_merged("weld", collections=["qm_content", "drawings"], top_k=2)
+    assert [r["distance"] for r in merged] == [0.2, 0.4]
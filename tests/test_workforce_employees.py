@@ -75,6 +75,16 @@ class TestUpdateEmployee:
         result = update_employee(memory_db, emp_id, hacker_field="bad")
         assert result is False
 
+    def test_commit_false_leaves_transaction_open(self, memory_db):
+        emp_id = create_employee(memory_db, "Smith", "Jane")
+        update_employee(memory_db, emp_id, commit=False, position="Foreman")
+        assert memory_db.in_transaction
+        memory_db.rollback()
+        row = memory_db.execute(
+            "SELECT position FROM employees WHERE id=?", (emp_id,)
+        ).fetchone()
+        assert row["position"] != "Foreman"
+
 
 class TestTerminateEmployee:
     def test_terminates(self, memory_db):
@@ -20,6 +20,7 @@ from qms.vectordb.embedder import (
     sync_queue,
     update_item_status,
 )
+from qms.vectordb.hybrid import hybrid_search
 from qms.vectordb.indexer import (
     index_all,
     index_drawings,
@@ -29,9 +30,12 @@ from qms.vectordb.indexer import (
     index_specifications,
 )
 from qms.vectordb.search import (
+    embed_query,
     get_stats,
     list_collections,
+    merge_results,
     search_collection,
+    search_merged,
     search_multiple_collections,
     test_connection,
 )
@@ -46,6 +50,8 @@ __all__ = [
     "sync_check",
     "sync_queue",
     "update_item_status",
+    # hybrid
+    "hybrid_search",
     # indexer
     "index_all",
     "index_drawings",
@@ -54,9 +60,12 @@ __all__ = [
     "index_ref_clauses",
     "index_specifications",
     # search
+    "embed_query",
     "get_stats",
     "list_collections",
+    "merge_results",
     "search_collection",
+    "search_merged",
     "search_multiple_collections",
     "test_connection",
 ]
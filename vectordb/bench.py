@@ -0,0 +1,228 @@
+"""
+VectorDB Embedding Benchmark
+
+Measures LM Studio embedding throughput (docs/sec) per batch size so
+``embeddings.batch_size`` / ``max_batch_tokens`` / ``max_in_flight`` can be
+tuned for a given GPU box.
+
+By default the benchmark runs against ``StubEmbeddingServer``, a local
+OpenAI-compatible ``/v1/embeddings`` endpoint that simulates a GPU (one
+request computes at a time, cost = fixed overhead + per-token time) and
+rejects requests over a token limit with HTTP 413. Pass *base_url* to
+benchmark a real server instead.
+"""
+
+import hashlib
+import json
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence
+
+from qms.core import get_config_value, get_logger
+
+logger = get_logger("qms.vectordb.bench")
+
+_WORDS = (
+    "weld inspection pipe support flange bolt torque gasket hydrotest "
+    "drawing revision clause procedure calibration nonconformance"
+).split()
+
+
+def _stub_vector(text: str, dims: int) -> List[float]:
+    seed = hashlib.sha256(text.encode("utf-8")).digest()
+    raw = [seed[i % len(seed)] - 127.5 for i in range(dims)]
+    norm = math.sqrt(sum(v * v for v in raw)) or 1.0
+    return [v / norm for v in raw]
+
+
+class StubEmbeddingServer:
+    """
+    Local OpenAI-compatible embedding server for benchmarks and tests.
+
+    Args:
+        dims: Vector dimensions returned.
+        request_overhead: Seconds of fixed cost per request.
+        per_token: Seconds of compute per estimated token.
+        max_tokens: Requests above this many estimated tokens get HTTP 413.
+    """
+
+    def __init__(
+        self,
+        dims: int = 768,
+        request_overhead: float = 0.005,
+        per_token: float = 0.00002,
+        max_tokens: int = 16384,
+    ):
+        self.dims = dims
+        self.request_overhead = request_overhead
+        self.per_token = per_token
+        self.max_tokens = max_tokens
+        self.requests = 0
+        self.rejected = 0
+        self._gpu = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def _send(self, status: int, body: Dict[str, Any]) -> None:
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self) -> None:
+                if self.path.rstrip("/").endswith("/models"):
+                    self._send(200, {"object": "list", "data": [{"id": "stub", "object": "model"}]})
+                else:
+                    self._send(404, {"error": {"message": "not found"}})
+
+            def do_POST(self) -> None:
+                from qms.vectordb.search import estimate_tokens
+
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                texts = body.get("input") or []
+                if isinstance(texts, str):
+                    texts = [texts]
+                tokens = sum(estimate_tokens(t) for t in texts)
+                stub.requests += 1
+                if tokens > stub.max_tokens:
+                    stub.rejected += 1
+                    self._send(413, {"error": {"message": f"input too large: {tokens} tokens"}})
+                    return
+                time.sleep(stub.request_overhead)
+                with stub._gpu:
+                    time.sleep(tokens * stub.per_token)
+                data = [
+                    {"object": "embedding", "index": i, "embedding": _stub_vector(t, stub.dims)}
+                    for i, t in enumerate(texts)
+                ]
+                self._send(200, {
+                    "object": "list",
+                    "model": body.get("model", "stub"),
+                    "data": data,
+                    "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+                })
+
+        return Handler
+
+    def start(self) -> "StubEmbeddingServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubEmbeddingServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+def sample_documents(count: int, mean_chars: int = 800) -> List[str]:
+    """Deterministic synthetic documents with lengths from 0.25x to 1.75x *mean_chars*."""
+    docs = []
+    for i in range(count):
+        target = int(mean_chars * (0.25 + 1.5 * ((i * 37) % 100) / 100))
+        words = []
+        size = 0
+        j = i
+        while size < target:
+            word = _WORDS[j % len(_WORDS)]
+            words.append(word)
+            size += len(word) + 1
+            j += 7
+        docs.append(f"doc {i}: " + " ".join(words))
+    return docs
+
+
+def benchmark_embeddings(
+    batch_sizes: Sequence[int],
+    docs: int = 512,
+    mean_chars: int = 800,
+    max_in_flight: Optional[int] = None,
+    max_batch_tokens: Optional[int] = None,
+    base_url: Optional[str] = None,
+    model: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Time ``LMStudioEmbeddings`` over the same documents at each batch size.
+
+    The embedding cache is bypassed. Without *base_url* a
+    ``StubEmbeddingServer`` is started for the duration of the run.
+
+    Returns:
+        One dict per batch size: ``batch_size``, ``docs``, ``seconds``,
+        ``docs_per_sec``.
+    """
+    from qms.vectordb.search import (
+        LMStudioEmbeddings,
+        _DEFAULT_MAX_BATCH_TOKENS,
+        _DEFAULT_MAX_IN_FLIGHT,
+    )
+
+    texts = sample_documents(docs, mean_chars)
+    in_flight = max_in_flight or get_config_value(
+        "embeddings", "max_in_flight", default=_DEFAULT_MAX_IN_FLIGHT
+    )
+    token_budget = max_batch_tokens or get_config_value(
+        "embeddings", "max_batch_tokens", default=_DEFAULT_MAX_BATCH_TOKENS
+    )
+
+    stub = None
+    if base_url is None:
+        stub = StubEmbeddingServer().start()
+        base_url = stub.base_url
+        model = model or "stub"
+    model = model or get_config_value(
+        "embeddings", "model", default="text-embedding-nomic-embed-text-v1.5@q8_0"
+    )
+
+    results = []
+    try:
+        for size in batch_sizes:
+            embed_fn = LMStudioEmbeddings(
+                base_url=base_url,
+                model=model,
+                batch_size=size,
+                max_batch_tokens=token_budget,
+                max_in_flight=in_flight,
+            )
+            embed_fn._embed(texts[: min(len(texts), size)])  # warm up connections
+            start = time.perf_counter()
+            vectors = embed_fn._embed(texts)
+            seconds = time.perf_counter() - start
+            embed_fn.close()
+            if len(vectors) != len(texts):
+                raise RuntimeError(f"Expected {len(texts)} vectors, got {len(vectors)}")
+            results.append({
+                "batch_size": size,
+                "docs": len(texts),
+                "seconds": round(seconds, 3),
+                "docs_per_sec": round(len(texts) / seconds, 1) if seconds else 0.0,
+            })
+            logger.info("batch_size=%d: %.1f docs/sec", size, results[-1]["docs_per_sec"])
+    finally:
+        if stub is not None:
+            stub.stop()
+    return results
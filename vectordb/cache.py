@@ -0,0 +1,248 @@
+"""
+VectorDB Embedding Cache
+
+Disk-backed cache of embedding vectors so rebuilds, re-indexes across
+collections and repeated search queries skip the model entirely.
+
+Entries are keyed by ``(provider, model, dimensions, sha256(text))`` and
+stored as float32 blobs in ``embed_cache.db`` next to ``embed_queue.db``.
+Hits refresh ``last_used``; once the stored vectors exceed
+``embeddings.cache.max_mb`` the least recently used entries are evicted.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from qms.core import get_config_value, get_logger, QMS_PATHS
+
+logger = get_logger("qms.vectordb.cache")
+
+_DEFAULT_MAX_MB = 512
+
+# Evict down to this fraction of the cap so eviction is not run on every put
+_LOW_WATER = 0.9
+
+
+def text_hash(text: str) -> str:
+    """SHA-256 hex digest of *text* (the cache key component)."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    LRU-bounded SQLite store of embedding vectors.
+
+    One connection is shared by all threads and serialised with a lock;
+    lookups and writes are single statements per batch.
+    """
+
+    def __init__(self, path: Path, max_bytes: int):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                provider TEXT NOT NULL,
+                model TEXT NOT NULL,
+                dims INTEGER NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (provider, model, dims, text_hash)
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embedding_cache_lru ON embedding_cache(last_used)"
+        )
+        self._conn.commit()
+        self._bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(length(vector)), 0) FROM embedding_cache"
+        ).fetchone()[0]
+
+    def get_many(
+        self, provider: str, model: str, dims: int, texts: Sequence[str]
+    ) -> Dict[int, List[float]]:
+        """
+        Look up *texts*; return ``{index: vector}`` for the hits.
+
+        Hits have their ``last_used`` refreshed.
+        """
+        hashes = [text_hash(t) for t in texts]
+        found: Dict[str, List[float]] = {}
+        unique = list(dict.fromkeys(hashes))
+        with self._lock:
+            # Stay well under SQLITE_MAX_VARIABLE_NUMBER
+            for i in range(0, len(unique), 500):
+                chunk = unique[i : i + 500]
+                marks = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"""SELECT text_hash, vector FROM embedding_cache
+                        WHERE provider = ? AND model = ? AND dims = ?
+                          AND text_hash IN ({marks})""",
+                    (provider, model, dims, *chunk),
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = array("f", blob).tolist()
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    """UPDATE embedding_cache SET last_used = ?
+                       WHERE provider = ? AND model = ? AND dims = ? AND text_hash = ?""",
+                    [(now, provider, model, dims, key) for key in found],
+                )
+                self._conn.commit()
+
+            result = {i: found[h] for i, h in enumerate(hashes) if h in found}
+            self.hits += len(result)
+            self.misses += len(texts) - len(result)
+        return result
+
+    def put_many(
+        self,
+        provider: str,
+        model: str,
+        dims: int,
+        texts: Sequence[str],
+        vectors: Sequence[Sequence[float]],
+    ) -> None:
+        """Store *vectors* for *texts*, then evict if over the size cap."""
+        now = time.time()
+        blobs = {text_hash(t): array("f", v).tobytes() for t, v in zip(texts, vectors)}
+        rows = [(provider, model, dims, key, blob, now) for key, blob in blobs.items()]
+        with self._lock:
+            # Replaced rows free their old blob; count only the difference
+            replaced = 0
+            keys = list(blobs)
+            for i in range(0, len(keys), 500):
+                chunk = keys[i : i + 500]
+                marks = ",".join("?" * len(chunk))
+                replaced += self._conn.execute(
+                    f"""SELECT COALESCE(SUM(length(vector)), 0) FROM embedding_cache
+                        WHERE provider = ? AND model = ? AND dims = ?
+                          AND text_hash IN ({marks})""",
+                    (provider, model, dims, *chunk),
+                ).fetchone()[0]
+            self._conn.executemany(
+                """INSERT OR REPLACE INTO embedding_cache
+                   (provider, model, dims, text_hash, vector, last_used)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                rows,
+            )
+            self._conn.commit()
+            self._bytes += sum(len(r[4]) for r in rows) - replaced
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until under the low-water mark."""
+        target = int(self.max_bytes * _LOW_WATER)
+        removed = 0
+        while self._bytes > target:
+            victims = self._conn.execute(
+                """SELECT provider, model, dims, text_hash, length(vector)
+                   FROM embedding_cache ORDER BY last_used LIMIT 500"""
+            ).fetchall()
+            if not victims:
+                break
+            doomed = []
+            for victim in victims:
+                if self._bytes <= target:
+                    break
+                doomed.append(victim[:4])
+                self._bytes -= victim[4]
+            self._conn.executemany(
+                """DELETE FROM embedding_cache
+                   WHERE provider = ? AND model = ? AND dims = ? AND text_hash = ?""",
+                doomed,
+            )
+            removed += len(doomed)
+        self._conn.commit()
+        logger.info("Evicted %d cached embeddings (%d bytes kept)", removed, self._bytes)
+
+    def clear(self) -> None:
+        """Remove every cached vector."""
+        with self._lock:
+            self._conn.execute("DELETE FROM embedding_cache")
+            self._conn.commit()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return entry count, stored bytes, cap, and this process's hits/misses."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+            return {
+                "entries": entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[EmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """
+    Return the shared cache, or ``None`` when ``embeddings.cache.enabled``
+    is false.
+    """
+    global _cache
+    if not get_config_value("embeddings", "cache", "enabled", default=True):
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                raw = get_config_value("embeddings", "cache", "path", default="")
+                if raw:
+                    path = Path(raw)
+                    if not path.is_absolute():
+                        path = Path(__file__).parent.parent / path
+                else:
+                    path = QMS_PATHS.vector_database / "embed_cache.db"
+                max_mb = get_config_value("embeddings", "cache", "max_mb", default=_DEFAULT_MAX_MB)
+                _cache = EmbeddingCache(path, int(float(max_mb) * 1024 * 1024))
+    return _cache
+
+
+def cached_embed(embed_fn, texts: List[str], compute) -> List[List[float]]:
+    """
+    Embed *texts* through the shared cache.
+
+    Args:
+        embed_fn: Embedding function exposing ``provider``, ``cache_model``
+            and ``dimensions``.
+        texts: Documents to embed.
+        compute: Callable that embeds a list of texts with the model.
+
+    Returns:
+        One vector per text, in order.
+    """
+    cache = get_embedding_cache()
+    if cache is None or not texts:
+        return compute(texts)
+
+    key = (embed_fn.provider, embed_fn.cache_model, embed_fn.dimensions)
+    found = cache.get_many(*key, texts)
+    missing = [i for i in range(len(texts)) if i not in found]
+    if missing:
+        fresh = compute([texts[i] for i in missing])
+        cache.put_many(*key, [texts[i] for i in missing], fresh)
+        found.update(zip(missing, fresh))
+    return [found[i] for i in range(len(texts))]
@@ -10,36 +10,52 @@ app = typer.Typer(no_args_is_help=True)
 def index(
     target: Optional[str] = typer.Argument(
         None,
-        help="What to index: all, qm, refs, specs, drawings (default: all)",
+        help="What to index: all, qm, refs, specs, drawings, issues (default: all)",
     ),
     rebuild: bool = typer.Option(False, "--rebuild", help="Delete existing and rebuild"),
+    incremental: bool = typer.Option(
+        False, "--incremental", help="Re-embed changed rows and drop deleted ones"
+    ),
 ):
     """Build or rebuild vector search index from quality.db content."""
     from qms.vectordb.indexer import (
         index_all,
         index_drawings,
         index_qm_content,
+        index_quality_issues,
         index_ref_clauses,
         index_specifications,
     )
 
     target = (target or "all").lower()
+    current = {"name": None}
+
+    def _progress(name: str, read: int, embedded: int) -> None:
+        if current["name"] not in (None, name):
+            typer.echo()
+        current["name"] = name
+        typer.echo(f"\r  {name}: {read} rows read, {embedded} embedded", nl=False)
+
+    opts = {"rebuild": rebuild, "incremental": incremental, "progress": _progress}
 
     dispatch = {
-        "all": lambda: index_all(rebuild=rebuild),
-        "qm": lambda: {"qm_content": index_qm_content(rebuild=rebuild)},
-        "refs": lambda: {"ref_clauses": index_ref_clauses(rebuild=rebuild)},
-        "specs": lambda: {"specifications": index_specifications(rebuild=rebuild)},
-        "drawings": lambda: {"drawings": index_drawings(rebuild=rebuild)},
+        "all": lambda: index_all(**opts),
+        "qm": lambda: {"qm_content": index_qm_content(**opts)},
+        "refs": lambda: {"ref_clauses": index_ref_clauses(**opts)},
+        "specs": lambda: {"specifications": index_specifications(**opts)},
+        "drawings": lambda: {"drawings": index_drawings(**opts)},
+        "issues": lambda: {"quality_issues": index_quality_issues(**opts)},
     }
 
     fn = dispatch.get(target)
     if fn is None:
         typer.echo(f"Unknown target: {target}")
-        typer.echo("Valid targets: all, qm, refs, specs, drawings")
+        typer.echo("Valid targets: all, qm, refs, specs, drawings, issues")
         raise typer.Exit(1)
 
     results = fn()
+    if current["name"] is not None:
+        typer.echo()
 
     typer.echo()
     typer.echo("Index Results")
@@ -56,9 +72,34 @@ def search(
         None, "--collection", "-c", help="Collection to search (default: all)"
     ),
     n: int = typer.Option(5, "--results", "-n", help="Number of results"),
+    merged: bool = typer.Option(
+        False, "--merged", help="One ranked list across all collections"
+    ),
+    per_collection: Optional[int] = typer.Option(
+        None, "--per-collection", help="With --merged: max results from any one collection"
+    ),
 ):
     """Semantic search across indexed content."""
-    if collection:
+    if merged and not collection:
+        from qms.vectordb.search import search_merged
+
+        results = search_merged(query, top_k=n, per_collection=per_collection)
+
+        typer.echo(f"\nSearching all collections for: {query}")
+        typer.echo("=" * 60)
+
+        if not results:
+            typer.echo("\nNo results found in any collection.")
+            return
+
+        for i, r in enumerate(results, 1):
+            doc = r.get("document", "")
+            preview = doc[:120] + "..." if len(doc) > 120 else doc
+            typer.echo(
+                f"  {i}. [{r['collection']}] (d={r['distance']:.4f}, "
+                f"norm={r['normalized_distance']:.2f}) {preview}"
+            )
+    elif collection:
         from qms.vectordb.search import search_collection
 
         results = search_collection(collection, query, n_results=n)
@@ -109,11 +150,15 @@ def search(
 @app.command()
 def status():
     """Show vector database status (collection sizes, path)."""
-    from qms.vectordb.search import get_stats, test_connection, HAS_CHROMADB
+    from qms.vectordb.search import backend_available, get_backend, get_stats, test_connection
 
-    if not HAS_CHROMADB:
-        typer.echo("ChromaDB is not installed.")
-        typer.echo("Install: pip install chromadb")
+    if not backend_available():
+        if get_backend() == "chromadb":
+            typer.echo("ChromaDB is not installed.")
+            typer.echo("Install: pip install chromadb")
+        else:
+            typer.echo("NumPy is not installed (numpy vector store).")
+            typer.echo("Install: pip install numpy")
         return
 
     # Test embedding connectivity
@@ -130,6 +175,7 @@ def status():
 
     try:
         stats = get_stats()
+        typer.echo(f"  Backend:     {stats['backend']}")
         typer.echo(f"  DB path:     {stats['path']}")
         typer.echo(f"  Collections: {stats['collections']}")
         typer.echo(f"  Total docs:  {stats['total_documents']}")
@@ -160,20 +206,64 @@ def status():
         pass
 
 
+@app.command()
+def bench(
+    batch_sizes: str = typer.Option("8,16,32,64,128", "--batch-sizes", help="Comma-separated batch sizes"),
+    docs: int = typer.Option(512, "--docs", help="Documents per run"),
+    mean_chars: int = typer.Option(800, "--chars", help="Mean document length in characters"),
+    in_flight: Optional[int] = typer.Option(
+        None, "--in-flight", help="Concurrent requests (default: embeddings.max_in_flight)"
+    ),
+    max_tokens: Optional[int] = typer.Option(
+        None, "--max-tokens", help="Token budget per request (default: embeddings.max_batch_tokens)"
+    ),
+    url: Optional[str] = typer.Option(
+        None, "--url", help="Benchmark this LM Studio server instead of the local stub"
+    ),
+):
+    """Benchmark LM Studio embedding throughput (docs/sec) per batch size."""
+    from qms.vectordb.bench import benchmark_embeddings
+
+    sizes = [int(s) for s in batch_sizes.split(",") if s.strip()]
+    typer.echo(f"Target: {url or 'local stub server'}  ({docs} docs, ~{mean_chars} chars each)")
+    results = benchmark_embeddings(
+        sizes,
+        docs=docs,
+        mean_chars=mean_chars,
+        max_in_flight=in_flight,
+        max_batch_tokens=max_tokens,
+        base_url=url,
+    )
+    typer.echo()
+    typer.echo(f"  {'Batch':>6}  {'Seconds':>8}  {'Docs/sec':>9}")
+    for row in results:
+        typer.echo(f"  {row['batch_size']:>6}  {row['seconds']:>8.3f}  {row['docs_per_sec']:>9.1f}")
+    best = max(results, key=lambda r: r["docs_per_sec"], default=None)
+    if best:
+        typer.echo(f"\nFastest: batch_size={best['batch_size']}")
+
+
 @app.command()
 def queue(
     action: str = typer.Argument(
-        ..., help="Queue action: add, process, sync, clear"
+        ..., help="Queue action: add, process, watch, sync, clear"
     ),
     target: Optional[str] = typer.Option(None, "--target", "-t", help="File path or collection name"),
     collection: Optional[str] = typer.Option(None, "--collection", "-c", help="Target collection"),
     reindex: bool = typer.Option(False, "--reindex", help="Queue a collection reindex"),
+    incremental: bool = typer.Option(
+        False, "--incremental", help="With --reindex: re-embed changed rows only"
+    ),
     priority: int = typer.Option(5, "--priority", help="Priority 1-10 (lower = higher)"),
     dry_run: bool = typer.Option(False, "--dry-run", help="Preview without changes"),
     max_items: int = typer.Option(50, "--max", help="Max items to process"),
+    workers: Optional[int] = typer.Option(
+        None, "--workers", "-w", help="Worker threads (default: embeddings.queue.workers)"
+    ),
+    interval: int = typer.Option(60, "--interval", help="Watch: max idle seconds between checks"),
     days: int = typer.Option(7, "--days", help="Clear items older than N days"),
 ):
-    """Manage the embedding queue (add, process, sync, clear)."""
+    """Manage the embedding queue (add, process, watch, sync, clear)."""
     from qms.vectordb.embedder import (
         add_to_queue,
         clear_completed,
@@ -181,6 +271,7 @@ def queue(
         process_queue,
         sync_check,
         sync_queue,
+        watch_queue,
     )
     from pathlib import Path
 
@@ -189,8 +280,13 @@ def queue(
     if action == "add":
         if reindex:
             coll = collection or target or "all"
-            add_to_queue("collection", coll, priority=priority)
-            typer.echo(f"Queued reindex for: {coll}")
+            add_to_queue(
+                "collection", coll,
+                metadata={"incremental": True} if incremental else None,
+                priority=priority,
+            )
+            mode = "incremental reindex" if incremental else "reindex"
+            typer.echo(f"Queued {mode} for: {coll}")
         elif target:
             add_to_queue("file", target, collection, priority=priority)
             typer.echo(f"Queued file: {target}")
@@ -198,12 +294,16 @@ def queue(
             typer.echo("Specify --target (file) or --reindex (collection)")
 
     elif action == "process":
-        stats = process_queue(max_items=max_items)
+        stats = process_queue(max_items=max_items, workers=workers)
         typer.echo()
         typer.echo(f"Processed: {stats['processed']}")
         typer.echo(f"Failed:    {stats['failed']}")
         typer.echo(f"Skipped:   {stats['skipped']}")
 
+    elif action == "watch":
+        typer.echo("Watching embedding queue (Ctrl+C to stop)...")
+        watch_queue(interval=interval, workers=workers)
+
     elif action == "sync":
         report = sync_check()
 
@@ -263,4 +363,4 @@ def queue(
                 typer.echo(f"    [{item['status']}] {item['task_type']}: {item['target']}")
     else:
         typer.echo(f"Unknown action: {action}")
-        typer.echo("Valid actions: add, process, sync, clear, status")
+        typer.echo("Valid actions: add, process, watch, sync, clear, status")
@@ -8,23 +8,57 @@ database for pending, processing, completed, and failed jobs.
 Supports:
     - Adding files and collections to the embedding queue
     - Batch processing of pending queue items
+    - A worker pool: N workers claim batches under a lease (renewed while
+      the batch runs), retry with exponential backoff, and wake when new
+      work is queued; one collection task runs per target at a time
     - Queue statistics and housekeeping
     - Sync checks to find unembedded content in quality.db
 """
 
 import json
+import os
 import sqlite3
+import threading
 import time
+import uuid
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from qms.core import get_config, get_db, get_logger, QMS_PATHS
+from qms.core import get_config_value, get_db, get_logger, QMS_PATHS
 
 logger = get_logger("qms.vectordb.embedder")
 
 # Queue database lives alongside ChromaDB storage
 QUEUE_DB_PATH = QMS_PATHS.vector_database / "embed_queue.db"
 
+# Worker pool defaults (overridable under ``embeddings.queue`` in config.yaml)
+_QUEUE_DEFAULTS: Dict[str, Any] = {
+    "workers": 4,
+    "batch_size": 16,
+    "lease_seconds": 900,
+    "backoff_base": 30,
+    "backoff_max": 3600,
+    "max_retries": 3,
+}
+
+# Columns added after the original schema (name -> DDL)
+_QUEUE_COLUMNS = {
+    "lease_owner": "TEXT",
+    "lease_expires": "REAL",
+    "next_attempt_at": "REAL",
+}
+
+_initialised_path: Optional[Path] = None
+
+# Set by add_to_queue so in-process workers wake immediately; workers in other
+# processes notice commits through PRAGMA data_version
+_wake = threading.Event()
+
+
+def _queue_setting(key: str) -> Any:
+    return get_config_value("embeddings", "queue", key, default=_QUEUE_DEFAULTS[key])
+
 
 # ---------------------------------------------------------------------------
 # Queue database management
@@ -32,11 +66,15 @@ QUEUE_DB_PATH = QMS_PATHS.vector_database / "embed_queue.db"
 
 def _init_queue_db() -> None:
     """Create the queue database tables if they do not exist."""
+    global _initialised_path
     db_path = QUEUE_DB_PATH
+    if _initialised_path == db_path and db_path.exists():
+        return
     db_path.parent.mkdir(parents=True, exist_ok=True)
 
-    conn = sqlite3.connect(str(db_path))
+    conn = sqlite3.connect(str(db_path), timeout=30)
     try:
+        conn.execute("PRAGMA journal_mode=WAL")
         conn.execute("""
             CREATE TABLE IF NOT EXISTS embed_queue (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -56,15 +94,24 @@ def _init_queue_db() -> None:
             CREATE INDEX IF NOT EXISTS idx_queue_status
             ON embed_queue(status)
         """)
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(embed_queue)")}
+        for column, ddl in _QUEUE_COLUMNS.items():
+            if column not in existing:
+                conn.execute(f"ALTER TABLE embed_queue ADD COLUMN {column} {ddl}")
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_queue_claim
+            ON embed_queue(status, priority, created_at)
+        """)
         conn.commit()
     finally:
         conn.close()
+    _initialised_path = db_path
 
 
 def _get_queue_conn() -> sqlite3.Connection:
     """Get a connection to the queue database (auto-initialises)."""
     _init_queue_db()
-    conn = sqlite3.connect(str(QUEUE_DB_PATH))
+    conn = sqlite3.connect(str(QUEUE_DB_PATH), timeout=30)
     conn.row_factory = sqlite3.Row
     return conn
 
@@ -108,6 +155,7 @@ def add_to_queue(
         )
         item_id = cursor.lastrowid
         conn.commit()
+        _wake.set()
         logger.info("Added to queue: %s - %s (ID: %d)", task_type, target, item_id)
         return item_id
     finally:
@@ -172,17 +220,214 @@ def update_item_status(
         conn.close()
 
 
-def _increment_retry(item_id: int) -> None:
-    """Increment retry count and reset item to pending."""
+def claim_items(
+    worker_id: str,
+    limit: int,
+    lease_seconds: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Atomically claim up to *limit* pending items for *worker_id*.
+
+    Items are taken in ``priority`` order (lower first), then age; items
+    waiting out a retry backoff are skipped. Leases that expired (a worker
+    died mid-item) are returned to the pending pool first. A collection
+    task is not claimed while another task for the same collection (or
+    ``all``) is processing.
+
+    Args:
+        worker_id: Identifier recorded as the lease owner.
+        limit: Maximum number of items to claim.
+        lease_seconds: Lease length (default ``embeddings.queue.lease_seconds``).
+
+    Returns:
+        Claimed queue item dicts (status ``processing``).
+    """
+    lease = float(lease_seconds or _queue_setting("lease_seconds"))
+    now = time.time()
     conn = _get_queue_conn()
     try:
+        conn.execute("BEGIN IMMEDIATE")
         conn.execute(
             """UPDATE embed_queue
-               SET retry_count = retry_count + 1, status = 'pending'
-               WHERE id = ?""",
-            (item_id,),
+               SET status = 'pending', lease_owner = NULL, lease_expires = NULL
+               WHERE status = 'processing' AND lease_expires IS NOT NULL
+                 AND lease_expires < ?""",
+            (now,),
+        )
+        busy = {
+            row["target"] for row in conn.execute(
+                """SELECT target FROM embed_queue
+                   WHERE status = 'processing' AND task_type = 'collection'"""
+            )
+        }
+        ids: List[int] = []
+        cursor = conn.execute(
+            """SELECT id, task_type, target FROM embed_queue
+               WHERE status = 'pending'
+                 AND (next_attempt_at IS NULL OR next_attempt_at <= ?)
+               ORDER BY priority ASC, created_at ASC, id ASC""",
+            (now,),
+        )
+        for row in cursor:
+            if row["task_type"] == "collection":
+                if _collection_busy(row["target"], busy):
+                    continue
+                busy.add(row["target"])
+            ids.append(row["id"])
+            if len(ids) >= limit:
+                break
+        cursor.close()
+        if not ids:
+            conn.commit()
+            return []
+        marks = ",".join("?" * len(ids))
+        conn.execute(
+            f"""UPDATE embed_queue
+                SET status = 'processing', lease_owner = ?, lease_expires = ?
+                WHERE id IN ({marks})""",
+            (worker_id, now + lease, *ids),
+        )
+        rows = conn.execute(
+            f"SELECT * FROM embed_queue WHERE id IN ({marks}) ORDER BY priority, created_at, id",
+            ids,
+        ).fetchall()
+        conn.commit()
+        return [dict(row) for row in rows]
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def _collection_busy(target: str, busy: set) -> bool:
+    """Whether a collection task for *target* conflicts with one in *busy*."""
+    return target in busy or "all" in busy or (target == "all" and bool(busy))
+
+
+def renew_leases(
+    worker_id: str, item_ids: List[int], lease_seconds: Optional[float] = None
+) -> int:
+    """
+    Extend *worker_id*'s leases on *item_ids*.
+
+    Returns:
+        Number of items the worker still holds.
+    """
+    if not item_ids:
+        return 0
+    lease = float(lease_seconds or _queue_setting("lease_seconds"))
+    marks = ",".join("?" * len(item_ids))
+    conn = _get_queue_conn()
+    try:
+        cursor = conn.execute(
+            f"""UPDATE embed_queue SET lease_expires = ?
+                WHERE status = 'processing' AND lease_owner = ? AND id IN ({marks})""",
+            (time.time() + lease, worker_id, *item_ids),
+        )
+        conn.commit()
+        return cursor.rowcount
+    finally:
+        conn.close()
+
+
+@contextmanager
+def _lease_heartbeat(worker_id: str, item_ids: List[int]):
+    """Renew the leases on *item_ids* every third of the lease while the block runs."""
+    lease = float(_queue_setting("lease_seconds"))
+    done = threading.Event()
+
+    def _beat() -> None:
+        while not done.wait(lease / 3):
+            try:
+                renew_leases(worker_id, item_ids, lease)
+            except Exception as exc:
+                logger.warning("Lease renewal for %s failed: %s", worker_id, exc)
+
+    thread = threading.Thread(target=_beat, name=f"lease-{worker_id}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        done.set()
+        thread.join()
+
+
+def _owner_clause(worker_id: Optional[str]) -> Tuple[str, Tuple[Any, ...]]:
+    if worker_id is None:
+        return "", ()
+    return " AND lease_owner = ?", (worker_id,)
+
+
+def complete_item(item_id: int, worker_id: Optional[str] = None) -> bool:
+    """
+    Mark a claimed item completed and release its lease.
+
+    With *worker_id*, only settles the item if that worker still holds
+    its lease (an expired lease may have been reclaimed by another worker).
+
+    Returns:
+        True if the item was updated.
+    """
+    owner_sql, owner_args = _owner_clause(worker_id)
+    conn = _get_queue_conn()
+    try:
+        cursor = conn.execute(
+            f"""UPDATE embed_queue
+                SET status = 'completed', error_message = NULL,
+                    processed_at = CURRENT_TIMESTAMP,
+                    lease_owner = NULL, lease_expires = NULL
+                WHERE id = ?{owner_sql}""",
+            (item_id, *owner_args),
+        )
+        conn.commit()
+        return cursor.rowcount > 0
+    finally:
+        conn.close()
+
+
+def fail_item(
+    item_id: int,
+    error: str,
+    max_retries: Optional[int] = None,
+    worker_id: Optional[str] = None,
+) -> str:
+    """
+    Record a failed attempt and release the lease.
+
+    The item goes back to ``pending`` with an exponential backoff
+    (``backoff_base * 2**retry``, capped at ``backoff_max``) until
+    *max_retries* attempts have failed, then becomes ``failed``. With
+    *worker_id*, nothing changes unless that worker still holds the lease.
+
+    Returns:
+        The item's new status, or ``"lost"`` if the lease had moved on.
+    """
+    max_retries = int(max_retries if max_retries is not None else _queue_setting("max_retries"))
+    base = float(_queue_setting("backoff_base"))
+    cap = float(_queue_setting("backoff_max"))
+    owner_sql, owner_args = _owner_clause(worker_id)
+    conn = _get_queue_conn()
+    try:
+        row = conn.execute(
+            "SELECT retry_count FROM embed_queue WHERE id = ?", (item_id,)
+        ).fetchone()
+        retries = (row["retry_count"] if row else 0) + 1
+        if retries >= max_retries:
+            status, next_attempt = "failed", None
+        else:
+            status = "pending"
+            next_attempt = time.time() + min(cap, base * 2 ** (retries - 1))
+        cursor = conn.execute(
+            f"""UPDATE embed_queue
+                SET status = ?, error_message = ?, retry_count = ?,
+                    next_attempt_at = ?, lease_owner = NULL, lease_expires = NULL,
+                    processed_at = CASE WHEN ? = 'failed' THEN CURRENT_TIMESTAMP END
+                WHERE id = ?{owner_sql}""",
+            (status, error, retries, next_attempt, status, item_id, *owner_args),
         )
         conn.commit()
+        return status if cursor.rowcount else "lost"
     finally:
         conn.close()
 
@@ -243,22 +488,35 @@ def clear_completed(days_old: int = 7) -> int:
 # ---------------------------------------------------------------------------
 
 def _process_collection_reindex(item: Dict[str, Any]) -> bool:
-    """Run a collection reindex task."""
+    """
+    Run a collection reindex task.
+
+    A full rebuild by default; ``{"incremental": true}`` in the item metadata
+    re-embeds only new and changed rows and drops deleted ones.
+    """
     from qms.vectordb.indexer import (
         index_qm_content,
         index_ref_clauses,
         index_specifications,
         index_drawings,
+        index_quality_issues,
     )
 
     collection_name = item["target"]
-    logger.info("Reindexing collection: %s", collection_name)
+    options = json.loads(item["metadata"]) if item.get("metadata") else {}
+    incremental = bool(options.get("incremental"))
+    opts = {"rebuild": not incremental, "incremental": incremental}
+    logger.info(
+        "Reindexing collection: %s (%s)",
+        collection_name, "incremental" if incremental else "rebuild",
+    )
 
     dispatch = {
-        "qm_content": lambda: index_qm_content(rebuild=True),
-        "ref_clauses": lambda: index_ref_clauses(rebuild=True),
-        "specifications": lambda: index_specifications(rebuild=True),
-        "drawings": lambda: index_drawings(rebuild=True),
+        "qm_content": lambda: index_qm_content(**opts),
+        "ref_clauses": lambda: index_ref_clauses(**opts),
+        "specifications": lambda: index_specifications(**opts),
+        "drawings": lambda: index_drawings(**opts),
+        "quality_issues": lambda: index_quality_issues(**opts),
     }
 
     if collection_name == "all":
@@ -275,10 +533,10 @@ def _process_collection_reindex(item: Dict[str, Any]) -> bool:
     return True
 
 
-def _process_file_embedding(item: Dict[str, Any]) -> bool:
-    """Embed a single file (PDF or text) into a ChromaDB collection."""
-    from qms.vectordb.search import get_chromadb_collection, add_documents_to_collection
-
+def _extract_file_chunks(
+    item: Dict[str, Any],
+) -> Tuple[str, List[str], List[Dict[str, Any]], List[str]]:
+    """Read a queued file into (collection, documents, metadatas, ids)."""
     file_path = Path(item["target"])
     collection_name = item["collection"] or "documents"
 
@@ -313,7 +571,7 @@ def _process_file_embedding(item: Dict[str, Any]) -> bool:
 
     if not text_chunks:
         logger.warning("No content extracted from %s", file_path)
-        return True
+        return collection_name, [], [], []
 
     metadata_base = json.loads(item["metadata"]) if item.get("metadata") else {}
     metadata_base["source_file"] = str(file_path)
@@ -330,11 +588,55 @@ def _process_file_embedding(item: Dict[str, Any]) -> bool:
         metadatas.append(meta)
         ids.append(f"file_{file_path.stem}_{i}")
 
-    add_documents_to_collection(collection_name, documents, metadatas, ids)
-    logger.info("Added %d chunks from %s", len(documents), file_path.name)
+    return collection_name, documents, metadatas, ids
+
+
+def _process_file_embedding(item: Dict[str, Any]) -> bool:
+    """Embed a single file (PDF or text) into a ChromaDB collection."""
+    from qms.vectordb.search import add_documents_to_collection
+
+    collection_name, documents, metadatas, ids = _extract_file_chunks(item)
+    if documents:
+        add_documents_to_collection(collection_name, documents, metadatas, ids)
+        logger.info("Added %d chunks from %s", len(documents), Path(item["target"]).name)
     return True
 
 
+def _process_file_batch(items: List[Dict[str, Any]]) -> Dict[int, Optional[str]]:
+    """
+    Embed several queued files with one ``add`` per target collection.
+
+    Returns:
+        Item ID -> error message (``None`` on success).
+    """
+    from qms.vectordb.search import add_documents_to_collection
+
+    outcome: Dict[int, Optional[str]] = {}
+    grouped: Dict[str, List[Tuple[int, List[str], List[Dict[str, Any]], List[str]]]] = {}
+    for item in items:
+        try:
+            name, documents, metadatas, ids = _extract_file_chunks(item)
+        except Exception as exc:
+            outcome[item["id"]] = str(exc)
+            continue
+        grouped.setdefault(name, []).append((item["id"], documents, metadatas, ids))
+
+    for name, parts in grouped.items():
+        documents = [d for part in parts for d in part[1]]
+        metadatas = [m for part in parts for m in part[2]]
+        ids = [i for part in parts for i in part[3]]
+        try:
+            if documents:
+                add_documents_to_collection(name, documents, metadatas, ids)
+                logger.info("Added %d chunks from %d files to %s", len(documents), len(parts), name)
+            error = None
+        except Exception as exc:
+            error = str(exc)
+        for part in parts:
+            outcome[part[0]] = error
+    return outcome
+
+
 def _process_item(item: Dict[str, Any]) -> bool:
     """Route a single queue item to the appropriate processor."""
     task_type = item["task_type"]
@@ -348,12 +650,170 @@ def _process_item(item: Dict[str, Any]) -> bool:
 
 
 # ---------------------------------------------------------------------------
-# Main processing loop
+# Main processing loop / worker pool
 # ---------------------------------------------------------------------------
 
+def _process_claimed(
+    items: List[Dict[str, Any]], max_retries: int, worker_id: Optional[str] = None
+) -> Dict[str, int]:
+    """
+    Run claimed items (files batched together) and settle each one.
+
+    With *worker_id*, the batch's leases are renewed while it runs and an
+    item is only settled if this worker still holds it.
+    """
+    stats = {"processed": 0, "failed": 0, "skipped": 0}
+
+    def _settle(item_id: int, error: Optional[str]) -> None:
+        if error is None:
+            settled = complete_item(item_id, worker_id)
+            key = "processed"
+        else:
+            logger.error("Error processing item %d: %s", item_id, error)
+            settled = fail_item(item_id, error, max_retries=max_retries, worker_id=worker_id) != "lost"
+            key = "failed"
+        if settled:
+            stats[key] += 1
+        else:
+            logger.warning("Lease on item %d lost to another worker; result discarded", item_id)
+            stats["skipped"] += 1
+
+    heartbeat = (
+        _lease_heartbeat(worker_id, [item["id"] for item in items])
+        if worker_id is not None else nullcontext()
+    )
+    with heartbeat:
+        files = []
+        for item in items:
+            if item["retry_count"] >= max_retries:
+                update_item_status(item["id"], "failed", "Max retries exceeded")
+                stats["skipped"] += 1
+            elif item["task_type"] == "file":
+                files.append(item)
+            else:
+                try:
+                    ok = _process_item(item)
+                    _settle(item["id"], None if ok else "Processor reported failure")
+                except Exception as exc:
+                    _settle(item["id"], str(exc))
+
+        if files:
+            for item_id, error in _process_file_batch(files).items():
+                _settle(item_id, error)
+    return stats
+
+
+def _data_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA data_version").fetchone()[0]
+
+
+def run_worker_pool(
+    workers: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    max_items: Optional[int] = None,
+    max_retries: Optional[int] = None,
+    drain: bool = True,
+    idle_timeout: float = 60.0,
+    stop_event: Optional[threading.Event] = None,
+) -> Dict[str, int]:
+    """
+    Process the queue with *workers* threads claiming batches under a lease.
+
+    Each worker claims up to *batch_size* items (``claim_items``), embeds
+    file items in one batch per collection, and completes or fails each item
+    (failures retry with exponential backoff). When the queue is empty a
+    worker sleeps until ``add_to_queue`` is called in this process or
+    another process commits to the queue database (``PRAGMA data_version``),
+    waiting at most *idle_timeout* seconds between checks.
+
+    Args:
+        workers: Worker threads (default ``embeddings.queue.workers``).
+        batch_size: Items claimed per batch (default ``embeddings.queue.batch_size``).
+        max_items: Stop claiming after this many items in total.
+        max_retries: Attempts before an item is marked failed.
+        drain: Return once nothing is claimable instead of waiting for work.
+        idle_timeout: Longest sleep between checks when idle (watch mode).
+        stop_event: Set to stop a non-draining pool.
+
+    Returns:
+        Dict with 'processed', 'failed', 'skipped' counts.
+    """
+    workers = int(workers or _queue_setting("workers"))
+    batch_size = int(batch_size or _queue_setting("batch_size"))
+    max_retries = int(max_retries if max_retries is not None else _queue_setting("max_retries"))
+    stop_event = stop_event or threading.Event()
+
+    totals = {"processed": 0, "failed": 0, "skipped": 0}
+    lock = threading.Lock()
+    budget = [max_items]
+    prefix = f"{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+    def _take(n: int) -> int:
+        with lock:
+            if budget[0] is None:
+                return n
+            n = min(n, budget[0])
+            budget[0] -= n
+            return n
+
+    def _worker(index: int) -> None:
+        worker_id = f"{prefix}-{index}"
+        watch_conn = _get_queue_conn()
+        seen_version = _data_version(watch_conn)
+        try:
+            while not stop_event.is_set():
+                want = _take(batch_size)
+                if want <= 0:
+                    return
+                _wake.clear()
+                items = claim_items(worker_id, want)
+                if len(items) < want:
+                    _take(-(want - len(items)))  # return unused budget
+                if items:
+                    stats = _process_claimed(items, max_retries, worker_id)
+                    with lock:
+                        for key, value in stats.items():
+                            totals[key] += value
+                    continue
+                if drain:
+                    return
+                # Idle: wait for an in-process wake or a commit from elsewhere
+                deadline = time.monotonic() + idle_timeout
+                while not stop_event.is_set() and time.monotonic() < deadline:
+                    if _wake.wait(timeout=1.0):
+                        break
+                    version = _data_version(watch_conn)
+                    if version != seen_version:
+                        seen_version = version
+                        break
+        finally:
+            watch_conn.close()
+
+    threads = [
+        threading.Thread(target=_worker, args=(i,), name=f"embed-worker-{i}", daemon=True)
+        for i in range(max(1, workers))
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(timeout=0.5)
+    except KeyboardInterrupt:
+        stop_event.set()
+        for thread in threads:
+            thread.join()
+        raise
+
+    logger.info("Queue processing complete: %s", totals)
+    return totals
+
+
 def process_queue(
     max_items: int = 50,
     max_retries: int = 3,
+    workers: Optional[int] = None,
+    batch_size: Optional[int] = None,
 ) -> Dict[str, int]:
     """
     Process pending items in the embedding queue.
@@ -361,6 +821,8 @@ def process_queue(
     Args:
         max_items: Maximum items to process in one run.
         max_retries: Maximum retry attempts per item.
+        workers: Worker threads (default ``embeddings.queue.workers``).
+        batch_size: Items claimed per worker batch.
 
     Returns:
         Dict with 'processed', 'failed', 'skipped' counts.
@@ -374,66 +836,39 @@ def process_queue(
         )
         return {"processed": 0, "failed": 0, "skipped": 0}
 
-    stats = {"processed": 0, "failed": 0, "skipped": 0}
-    items = get_pending_items(limit=max_items)
-
-    if not items:
-        logger.info("No pending items in queue")
-        return stats
-
-    logger.info("Processing %d queue items...", len(items))
-
-    for item in items:
-        item_id = item["id"]
-
-        if item["retry_count"] >= max_retries:
-            update_item_status(item_id, "failed", "Max retries exceeded")
-            stats["skipped"] += 1
-            continue
-
-        update_item_status(item_id, "processing")
-
-        try:
-            success = _process_item(item)
-            if success:
-                update_item_status(item_id, "completed")
-                stats["processed"] += 1
-            else:
-                _increment_retry(item_id)
-                stats["failed"] += 1
-        except Exception as exc:
-            logger.error("Error processing item %d: %s", item_id, exc)
-            update_item_status(item_id, "failed", str(exc))
-            _increment_retry(item_id)
-            stats["failed"] += 1
-
-    logger.info("Queue processing complete: %s", stats)
-    return stats
+    return run_worker_pool(
+        workers=workers,
+        batch_size=batch_size,
+        max_items=max_items,
+        max_retries=max_retries,
+        drain=True,
+    )
 
 
-def watch_queue(interval: int = 60) -> None:
+def watch_queue(interval: int = 60, workers: Optional[int] = None) -> None:
     """
-    Continuously process the queue at *interval* second intervals.
+    Continuously process the queue with a worker pool.
 
+    Workers wake as soon as items are queued (in this process or another);
+    *interval* only bounds how long an idle worker sleeps between checks.
     Runs until interrupted (KeyboardInterrupt).
 
     Args:
-        interval: Seconds between processing runs.
+        interval: Maximum idle sleep in seconds.
+        workers: Worker threads (default ``embeddings.queue.workers``).
     """
     from qms.vectordb.search import test_connection
 
-    logger.info("Starting watch mode (interval: %ds)", interval)
+    logger.info("Starting watch mode (max idle: %ds)", interval)
 
     while True:
         try:
             conn_result = test_connection()
             if conn_result["success"]:
-                stats = process_queue()
-                if stats["processed"] > 0:
-                    logger.info("Processed %d items", stats["processed"])
+                run_worker_pool(workers=workers, drain=False, idle_timeout=interval)
             else:
                 logger.debug("Embedding system not available, waiting...")
-            time.sleep(interval)
+                time.sleep(interval)
         except KeyboardInterrupt:
             logger.info("Watch mode stopped")
             break
@@ -576,10 +1011,10 @@ def sync_queue(dry_run: bool = False) -> Dict[str, int]:
     for name, info in report["collections"].items():
         if info["gap"] > 0:
             if dry_run:
-                logger.info("Would queue reindex: %s (%d documents)", name, info["gap"])
+                logger.info("Would queue incremental reindex: %s (%d documents)", name, info["gap"])
             else:
-                add_to_queue("collection", name, priority=3)
-                logger.info("Queued reindex: %s (%d documents)", name, info["gap"])
+                add_to_queue("collection", name, metadata={"incremental": True}, priority=3)
+                logger.info("Queued incremental reindex: %s (%d documents)", name, info["gap"])
             queued["collections"] += 1
 
     for file_info in report["files"]:
@@ -0,0 +1,217 @@
+"""
+VectorDB Hybrid Search
+
+Combines lexical (SQLite FTS5 / BM25) and semantic (ChromaDB) retrieval
+over the same content and fuses the two rankings with reciprocal-rank
+fusion (RRF): ``score = sum(1 / (rrf_k + rank))`` over the lists a hit
+appears in.
+
+Both searches run in parallel. Vector search is skipped outright while
+``embedding_available()`` is False (the provider failed recently), and a
+vector search that overruns ``embeddings.hybrid.vector_timeout`` is
+abandoned, so results degrade to FTS-only rather than waiting.
+
+Sources (FTS table -> collection, joined on a shared key):
+    quality_issues   quality_issues_fts -> quality_issues   (issue id)
+    qm_content       qm_content_fts     -> qm_content       (content block id)
+    ref_clauses      ref_content_fts    -> ref_clauses      (standard, clause)
+"""
+
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from qms.core import get_config_value, get_db, get_logger
+
+logger = get_logger("qms.vectordb.hybrid")
+
+_DEFAULT_RRF_K = 60
+_DEFAULT_VECTOR_TIMEOUT = 2.0
+
+# Shared pool: an abandoned (timed-out) vector search must not block the caller
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="qms-hybrid")
+    return _executor
+
+
+def fts_match_expression(text: str) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 expression (quoted terms joined by OR).
+
+    Returns None when the text has no searchable terms.
+    """
+    terms = re.findall(r"\w+", text)
+    if not terms:
+        return None
+    return " OR ".join(f'"{t}"' for t in dict.fromkeys(terms))
+
+
+# ---------------------------------------------------------------------------
+# Lexical retrievers: (match, limit) -> [(key, hit)] best first
+# ---------------------------------------------------------------------------
+
+Hit = Tuple[Hashable, Dict[str, Any]]
+
+
+def _fts_quality_issues(match: str, limit: int) -> List[Hit]:
+    from qms.quality.db import search_issues_fts
+
+    with get_db(readonly=True) as conn:
+        rows = search_issues_fts(conn, match, limit=limit)
+    return [(r["id"], {"document": r["title"]}) for r in rows]
+
+
+def _fts_qm_content(match: str, limit: int) -> List[Hit]:
+    with get_db(readonly=True) as conn:
+        rows = conn.execute(
+            """SELECT rowid AS id, module_number, subsection_ref, content
+               FROM qm_content_fts WHERE qm_content_fts MATCH ?
+               ORDER BY bm25(qm_content_fts) LIMIT ?""",
+            (match, limit),
+        ).fetchall()
+    return [
+        (r["id"], {
+            "document": r["content"],
+            "metadata": {"module": r["module_number"], "subsection": r["subsection_ref"]},
+        })
+        for r in rows
+    ]
+
+
+def _fts_ref_clauses(match: str, limit: int) -> List[Hit]:
+    with get_db(readonly=True) as conn:
+        rows = conn.execute(
+            """SELECT standard_id, clause_number, clause_title, content
+               FROM ref_content_fts WHERE ref_content_fts MATCH ?
+               ORDER BY bm25(ref_content_fts) LIMIT ?""",
+            (match, limit),
+        ).fetchall()
+    return [
+        ((r["standard_id"], r["clause_number"]), {
+            "document": r["content"],
+            "metadata": {
+                "standard_id": r["standard_id"],
+                "clause_number": r["clause_number"],
+                "clause_title": r["clause_title"],
+            },
+        })
+        for r in rows
+    ]
+
+
+# Source name -> (FTS retriever, collection, metadata -> key)
+SOURCES: Dict[str, Tuple[Callable[[str, int], List[Hit]], str, Callable[[dict], Hashable]]] = {
+    "quality_issues": (_fts_quality_issues, "quality_issues", lambda m: m.get("db_id")),
+    "qm_content": (_fts_qm_content, "qm_content", lambda m: m.get("db_id")),
+    "ref_clauses": (
+        _fts_ref_clauses,
+        "ref_clauses",
+        lambda m: (m.get("standard_id"), m.get("clause_number")),
+    ),
+}
+
+
+def _vector_hits(collection: str, key_fn, query: str, limit: int) -> List[Hit]:
+    from qms.vectordb.search import embed_query, search_collection
+
+    results = search_collection(
+        collection, query, n_results=limit, query_embedding=embed_query(query)
+    )
+    return [(key_fn(r.get("metadata") or {}), r) for r in results]
+
+
+def reciprocal_rank_fusion(
+    rankings: Dict[str, List[Hit]], rrf_k: int = _DEFAULT_RRF_K
+) -> List[Dict[str, Any]]:
+    """
+    Fuse ranked hit lists by key.
+
+    Args:
+        rankings: Retriever name -> ``[(key, hit)]`` best first. Repeated
+            keys within one list keep their best rank.
+        rrf_k: RRF damping constant.
+
+    Returns:
+        Dicts with ``key``, ``score``, ``ranks`` (retriever -> 1-based rank)
+        and the first retriever's ``document``/``metadata``, best first.
+    """
+    fused: Dict[Hashable, Dict[str, Any]] = {}
+    for name, hits in rankings.items():
+        rank = 0
+        seen = set()
+        for key, hit in hits:
+            if key is None or key in seen:
+                continue
+            seen.add(key)
+            rank += 1
+            entry = fused.setdefault(key, {
+                "key": key,
+                "score": 0.0,
+                "ranks": {},
+                "document": hit.get("document"),
+                "metadata": hit.get("metadata") or {},
+            })
+            entry["score"] += 1.0 / (rrf_k + rank)
+            entry["ranks"][name] = rank
+    return sorted(fused.values(), key=lambda e: e["score"], reverse=True)
+
+
+def hybrid_search(source: str, query: str, limit: int = 20) -> Dict[str, Any]:
+    """
+    BM25 + vector search over one source, fused with RRF.
+
+    Args:
+        source: One of ``SOURCES``.
+        query: Free-text query.
+        limit: Results wanted (each retriever fetches twice this).
+
+    Returns:
+        Dict with ``results`` (see ``reciprocal_rank_fusion``) and ``mode``:
+        ``hybrid``, ``fts`` (vector unavailable/slow/failed) or ``vector``
+        (no searchable terms for FTS).
+    """
+    from qms.vectordb.search import embedding_available, mark_embedding_down
+
+    if source not in SOURCES:
+        raise ValueError(f"Unknown hybrid source: {source}")
+    fts_fn, collection, key_fn = SOURCES[source]
+    depth = limit * 2
+    rrf_k = int(get_config_value("embeddings", "hybrid", "rrf_k", default=_DEFAULT_RRF_K))
+    timeout = float(
+        get_config_value("embeddings", "hybrid", "vector_timeout", default=_DEFAULT_VECTOR_TIMEOUT)
+    )
+
+    vector_future = None
+    if embedding_available():
+        vector_future = _get_executor().submit(_vector_hits, collection, key_fn, query, depth)
+
+    rankings: Dict[str, List[Hit]] = {}
+    match = fts_match_expression(query)
+    if match:
+        try:
+            rankings["fts"] = fts_fn(match, depth)
+        except Exception as exc:
+            logger.warning("FTS search on %s failed: %s", source, exc)
+
+    if vector_future is not None:
+        try:
+            rankings["vector"] = vector_future.result(timeout=timeout)
+        except FutureTimeout:
+            mark_embedding_down(f"vector search exceeded {timeout:.1f}s")
+        except Exception as exc:
+            logger.warning("Vector search on %s failed: %s", collection, exc)
+
+    mode = "hybrid" if len(rankings) == 2 else next(iter(rankings), "fts")
+    return {
+        "mode": mode,
+        "results": reciprocal_rank_fusion(rankings, rrf_k=rrf_k)[:limit],
+    }
@@ -6,9 +6,16 @@ specifications, drawing extractions) and indexes it into ChromaDB
 collections for semantic search.
 
 Run after loading new content into the SQLite database.
+
+Indexing streams: source rows are read from a SQLite cursor, turned into
+documents one at a time, and embedded/written ``_BATCH_SIZE`` at a time, so
+memory stays bounded whatever the corpus size.
 """
 
-from typing import Any, Dict, List
+import hashlib
+import itertools
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from qms.core import get_db, get_logger
 
@@ -17,6 +24,17 @@ logger = get_logger("qms.vectordb.indexer")
 # Batch size for ChromaDB upserts
 _BATCH_SIZE = 100
 
+# Page size when listing existing IDs for the incremental diff
+_ID_PAGE_SIZE = 5000
+
+_MISSING = object()
+
+# (doc_id, document text, metadata) produced by the source readers
+Document = Tuple[str, str, Dict[str, Any]]
+
+# progress(collection, rows_read, documents_embedded), called once per batch
+ProgressCallback = Callable[[str, int, int], None]
+
 # Standard collection descriptions
 COLLECTIONS: Dict[str, str] = {
     "qm_content": "Quality Manual content blocks from XML modules",
@@ -32,14 +50,11 @@ COLLECTIONS: Dict[str, str] = {
 # Internal helpers
 # ---------------------------------------------------------------------------
 
-def _require_chromadb():
-    """Raise a clear error if chromadb is not installed."""
-    try:
-        import chromadb  # noqa: F401
-    except ImportError:
-        raise ImportError(
-            "chromadb is required for indexing. Install: pip install chromadb"
-        )
+def _require_vector_store():
+    """Raise a clear error if the configured vector store backend is missing."""
+    from qms.vectordb.search import _require_vector_store as _require
+
+    _require()
 
 
 def _get_collection(name: str):
@@ -50,94 +65,214 @@ def _get_collection(name: str):
 
 
 def _clear_collection(collection) -> None:
-    """Delete all documents from a collection."""
+    """
+    Delete all documents from a collection.
+
+    Deletes page by page (``_ID_PAGE_SIZE`` IDs at a time, always from the
+    start of the collection) so the full ID list is never held in memory.
+    """
     existing = collection.count()
     if existing > 0:
         logger.info("Clearing %d existing documents from %s...", existing, collection.name)
-        all_docs = collection.get()
-        if all_docs["ids"]:
-            collection.delete(ids=all_docs["ids"])
+        while True:
+            page_ids = collection.get(include=[], limit=_ID_PAGE_SIZE)["ids"]
+            if page_ids:
+                _delete_ids(collection, page_ids)
+            if len(page_ids) < _ID_PAGE_SIZE:
+                return
+
+
+def _existing_ids(collection) -> Set[str]:
+    """
+    Return every document ID in a collection.
+
+    IDs are listed in pages of ``_ID_PAGE_SIZE`` without documents, metadata
+    or embeddings, so an incremental run costs a handful of round trips
+    rather than one ``get`` per candidate row.
+    """
+    found: Set[str] = set()
+    offset = 0
+    while True:
+        page = collection.get(include=[], limit=_ID_PAGE_SIZE, offset=offset)
+        page_ids = page["ids"]
+        found.update(page_ids)
+        if len(page_ids) < _ID_PAGE_SIZE:
+            return found
+        offset += len(page_ids)
+
+
+def _delete_ids(collection, ids: List[str]) -> None:
+    """Delete documents from a collection in batches."""
+    from qms.vectordb.result_cache import bump_collection_version
+
+    for i in range(0, len(ids), _BATCH_SIZE):
+        collection.delete(ids=ids[i : i + _BATCH_SIZE])
+    bump_collection_version(collection.name)
+
+
+def _content_hash(document: str, metadata: Dict[str, Any]) -> str:
+    """SHA-256 over the document text and its metadata (``content_hash`` excluded)."""
+    meta = {k: v for k, v in metadata.items() if k != "content_hash"}
+    payload = document + "\0" + json.dumps(meta, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _existing_hashes(collection) -> Dict[str, Optional[str]]:
+    """
+    Return ``{id: content_hash}`` for every document in a collection.
+
+    Paged like ``_existing_ids``; documents indexed before hashes were
+    recorded map to ``None`` and count as changed.
+    """
+    found: Dict[str, Optional[str]] = {}
+    offset = 0
+    while True:
+        page = collection.get(include=["metadatas"], limit=_ID_PAGE_SIZE, offset=offset)
+        page_ids = page["ids"]
+        for doc_id, meta in zip(page_ids, page["metadatas"] or [None] * len(page_ids)):
+            found[doc_id] = (meta or {}).get("content_hash")
+        if len(page_ids) < _ID_PAGE_SIZE:
+            return found
+        offset += len(page_ids)
 
 
 def _index_batch(collection, documents: List[str], metadatas: List[dict], ids: List[str]) -> None:
     """Add documents to a collection in batches."""
-    from qms.vectordb.search import add_documents_to_collection
+    from qms.vectordb.result_cache import bump_collection_version
 
     for i in range(0, len(documents), _BATCH_SIZE):
-        batch_docs = documents[i : i + _BATCH_SIZE]
-        batch_meta = metadatas[i : i + _BATCH_SIZE]
-        batch_ids = ids[i : i + _BATCH_SIZE]
-
-        collection.add(documents=batch_docs, metadatas=batch_meta, ids=batch_ids)
-        logger.info(
-            "Indexed %s batch %d: %d documents",
-            collection.name,
-            i // _BATCH_SIZE + 1,
-            len(batch_docs),
+        collection.add(
+            documents=documents[i : i + _BATCH_SIZE],
+            metadatas=metadatas[i : i + _BATCH_SIZE],
+            ids=ids[i : i + _BATCH_SIZE],
         )
+    bump_collection_version(collection.name)
 
 
-# ---------------------------------------------------------------------------
-# Quality Manual
-# ---------------------------------------------------------------------------
+def _upsert_batch(collection, documents: List[str], metadatas: List[dict], ids: List[str]) -> None:
+    """Re-embed changed documents in batches."""
+    from qms.vectordb.result_cache import bump_collection_version
 
-def index_qm_content(rebuild: bool = False) -> int:
+    for i in range(0, len(documents), _BATCH_SIZE):
+        collection.upsert(
+            documents=documents[i : i + _BATCH_SIZE],
+            metadatas=metadatas[i : i + _BATCH_SIZE],
+            ids=ids[i : i + _BATCH_SIZE],
+        )
+    bump_collection_version(collection.name)
+
+
+def _peek(documents: Iterable[Document]) -> Optional[Iterator[Document]]:
+    """Return an iterator over *documents*, or None if there are none."""
+    it = iter(documents)
+    first = next(it, None)
+    if first is None:
+        return None
+    return itertools.chain([first], it)
+
+
+def _sync_documents(
+    collection,
+    documents: Iterable[Document],
+    prefixes: Tuple[str, ...],
+    rebuild: bool = False,
+    incremental: bool = False,
+    progress: Optional[ProgressCallback] = None,
+) -> int:
     """
-    Index Quality Manual content blocks into the ``qm_content`` collection.
+    Stream candidate documents built from quality.db into a collection.
 
-    Args:
-        rebuild: Delete existing documents and rebuild from scratch.
+    *documents* is consumed ``_BATCH_SIZE`` at a time; each document gets a
+    ``content_hash`` in its metadata. With *rebuild* (collection already
+    cleared) every batch is added. Otherwise each batch is diffed against
+    the collection's existing IDs: new IDs are added, and once the stream is
+    exhausted, existing IDs never seen that start with one of *prefixes*
+    are deleted. With *incremental*, existing IDs whose hash differs are
+    re-embedded as well. Only the existing ID (and hash) map is held for
+    the whole run, never the documents.
 
     Returns:
-        Number of new documents indexed.
+        Number of documents embedded.
     """
-    _require_chromadb()
-    collection = _get_collection("qm_content")
-
-    if rebuild:
-        _clear_collection(collection)
+    existing: Dict[str, Optional[str]] = {}
+    if not rebuild:
+        if incremental:
+            existing = _existing_hashes(collection)
+        else:
+            existing = dict.fromkeys(_existing_ids(collection))
+
+    added = changed = read = 0
+    it = iter(documents)
+    while True:
+        batch = list(itertools.islice(it, _BATCH_SIZE))
+        if not batch:
+            break
+        read += len(batch)
+
+        new: List[Document] = []
+        edited: List[Document] = []
+        for doc_id, doc, meta in batch:
+            meta["content_hash"] = _content_hash(doc, meta)
+            if rebuild:
+                new.append((doc_id, doc, meta))
+                continue
+            # Pop as we go: whatever is left at the end had no source row
+            previous = existing.pop(doc_id, _MISSING)
+            if previous is _MISSING:
+                new.append((doc_id, doc, meta))
+            elif incremental and previous != meta["content_hash"]:
+                edited.append((doc_id, doc, meta))
+
+        if new:
+            ids, docs, metas = (list(col) for col in zip(*new))
+            _index_batch(collection, docs, metas, ids)
+            added += len(new)
+        if edited:
+            ids, docs, metas = (list(col) for col in zip(*edited))
+            _upsert_batch(collection, docs, metas, ids)
+            changed += len(edited)
+        if progress is not None:
+            progress(collection.name, read, added + changed)
+
+    stale = sorted(i for i in existing if i.startswith(prefixes))
+    if stale:
+        _delete_ids(collection, stale)
+
+    logger.info(
+        "%s: %d added, %d changed, %d unchanged, %d removed",
+        collection.name, added, changed, read - added - changed, len(stale),
+    )
+    return added + changed
 
-    with get_db(readonly=True) as conn:
-        cursor = conn.execute("""
-            SELECT
-                cb.id,
-                m.module_number,
-                s.section_number,
-                sub.full_ref,
-                sub.title as subsection_title,
-                sub.subsection_type,
-                cb.block_type,
-                cb.content
-            FROM qm_content_blocks cb
-            JOIN qm_subsections sub ON cb.subsection_id = sub.id
-            JOIN qm_sections s ON sub.section_id = s.id
-            JOIN qm_modules m ON s.module_id = m.id
-            WHERE cb.content IS NOT NULL
-              AND cb.content != ''
-              AND length(cb.content) > 20
-            ORDER BY m.module_number, s.section_number, sub.letter, cb.display_order
-        """)
-        rows = cursor.fetchall()
-
-    if not rows:
-        logger.warning("No QM content found to index")
-        return 0
-
-    documents: List[str] = []
-    metadatas: List[dict] = []
-    ids: List[str] = []
-
-    for row in rows:
-        doc_id = f"qm_{row['module_number']}_{row['full_ref']}_{row['id']}"
 
-        if not rebuild:
-            existing = collection.get(ids=[doc_id])
-            if existing["ids"]:
-                continue
+# ---------------------------------------------------------------------------
+# Quality Manual
+# ---------------------------------------------------------------------------
 
+def _qm_documents(conn) -> Iterator[Document]:
+    cursor = conn.execute("""
+        SELECT
+            cb.id,
+            m.module_number,
+            s.section_number,
+            sub.full_ref,
+            sub.title as subsection_title,
+            sub.subsection_type,
+            cb.block_type,
+            cb.content
+        FROM qm_content_blocks cb
+        JOIN qm_subsections sub ON cb.subsection_id = sub.id
+        JOIN qm_sections s ON sub.section_id = s.id
+        JOIN qm_modules m ON s.module_id = m.id
+        WHERE cb.content IS NOT NULL
+          AND cb.content != ''
+          AND length(cb.content) > 20
+        ORDER BY m.module_number, s.section_number, sub.letter, cb.display_order
+    """)
+    for row in cursor:
+        doc_id = f"qm_{row['module_number']}_{row['full_ref']}_{row['id']}"
         doc_text = f"{row['subsection_title']}\n{row['content']}"
-        documents.append(doc_text)
-        metadatas.append({
+        yield doc_id, doc_text, {
             "source": "quality_manual",
             "module": row["module_number"],
             "section": row["section_number"],
@@ -145,85 +280,77 @@ def index_qm_content(rebuild: bool = False) -> int:
             "subsection_type": row["subsection_type"] or "General",
             "block_type": row["block_type"],
             "db_id": row["id"],
-        })
-        ids.append(doc_id)
-
-    if documents:
-        _index_batch(collection, documents, metadatas, ids)
-
-    total = collection.count()
-    logger.info("QM content indexed: %d total documents", total)
-    return len(documents)
-
+        }
 
-# ---------------------------------------------------------------------------
-# Reference Standards
-# ---------------------------------------------------------------------------
 
-def index_ref_clauses(rebuild: bool = False) -> int:
+def index_qm_content(
+    rebuild: bool = False,
+    incremental: bool = False,
+    progress: Optional[ProgressCallback] = None,
+) -> int:
     """
-    Index reference standard clauses into the ``ref_clauses`` collection.
+    Index Quality Manual content blocks into the ``qm_content`` collection.
 
     Args:
         rebuild: Delete existing documents and rebuild from scratch.
+        incremental: Re-embed rows whose content hash changed (not just
+            new rows).
+        progress: Called after each batch (see ``ProgressCallback``).
 
     Returns:
-        Number of new documents indexed.
+        Number of documents embedded (new, plus changed when incremental).
     """
-    _require_chromadb()
-    collection = _get_collection("ref_clauses")
+    _require_vector_store()
+    collection = _get_collection("qm_content")
 
     if rebuild:
         _clear_collection(collection)
 
     with get_db(readonly=True) as conn:
-        # Check table exists
-        if not conn.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name='ref_clauses'"
-        ).fetchone():
-            logger.warning("ref_clauses table not found - skipping")
-            return 0
+        documents = _peek(_qm_documents(conn))
+        if documents is None:
+            # Still sync: an emptied source table must drop its old embeddings
+            logger.warning("No QM content found to index")
+            documents = iter(())
+
+        indexed = _sync_documents(
+            collection, documents, ("qm_",),
+            rebuild=rebuild, incremental=incremental, progress=progress,
+        )
 
-        cursor = conn.execute("""
-            SELECT
-                c.id,
-                r.standard_id,
-                r.title as standard_title,
-                COALESCE(rs.section_title, 'General') as section_name,
-                c.clause_number,
-                c.clause_title,
-                cb.block_type,
-                cb.content
-            FROM ref_clauses c
-            JOIN ref_content_blocks cb ON cb.clause_id = c.id
-            LEFT JOIN ref_sections rs ON c.section_id = rs.id
-            JOIN qm_references r ON c.reference_id = r.id
-            WHERE cb.content IS NOT NULL
-              AND cb.content != ''
-              AND length(cb.content) > 20
-            ORDER BY r.standard_id, c.clause_number, cb.display_order
-        """)
-        rows = cursor.fetchall()
-
-    if not rows:
-        logger.warning("No reference clauses found to index")
-        return 0
-
-    documents: List[str] = []
-    metadatas: List[dict] = []
-    ids: List[str] = []
-
-    for idx, row in enumerate(rows):
-        doc_id = f"ref_{row['standard_id']}_{row['clause_number']}_{idx}"
+    total = collection.count()
+    logger.info("QM content indexed: %d total documents", total)
+    return indexed
 
-        if not rebuild:
-            existing = collection.get(ids=[doc_id])
-            if existing["ids"]:
-                continue
 
+# ---------------------------------------------------------------------------
+# Reference Standards
+# ---------------------------------------------------------------------------
+
+def _ref_documents(conn) -> Iterator[Document]:
+    cursor = conn.execute("""
+        SELECT
+            c.id,
+            r.standard_id,
+            r.title as standard_title,
+            COALESCE(rs.section_title, 'General') as section_name,
+            c.clause_number,
+            c.clause_title,
+            cb.block_type,
+            cb.content
+        FROM ref_clauses c
+        JOIN ref_content_blocks cb ON cb.clause_id = c.id
+        LEFT JOIN ref_sections rs ON c.section_id = rs.id
+        JOIN qm_references r ON c.reference_id = r.id
+        WHERE cb.content IS NOT NULL
+          AND cb.content != ''
+          AND length(cb.content) > 20
+        ORDER BY r.standard_id, c.clause_number, cb.display_order
+    """)
+    for idx, row in enumerate(cursor):
+        doc_id = f"ref_{row['standard_id']}_{row['clause_number']}_{idx}"
         doc_text = f"{row['clause_number']} {row['clause_title']}\n{row['content']}"
-        documents.append(doc_text)
-        metadatas.append({
+        yield doc_id, doc_text, {
             "source": "reference_standard",
             "standard_id": row["standard_id"],
             "standard_title": row["standard_title"],
@@ -232,81 +359,83 @@ def index_ref_clauses(rebuild: bool = False) -> int:
             "clause_title": row["clause_title"],
             "block_type": row["block_type"],
             "db_id": row["id"],
-        })
-        ids.append(doc_id)
-
-    if documents:
-        _index_batch(collection, documents, metadatas, ids)
-
-    total = collection.count()
-    logger.info("Reference clauses indexed: %d total documents", total)
-    return len(documents)
-
+        }
 
-# ---------------------------------------------------------------------------
-# Specifications
-# ---------------------------------------------------------------------------
 
-def index_specifications(rebuild: bool = False) -> int:
+def index_ref_clauses(
+    rebuild: bool = False,
+    incremental: bool = False,
+    progress: Optional[ProgressCallback] = None,
+) -> int:
     """
-    Index specification items into the ``specifications`` collection.
+    Index reference standard clauses into the ``ref_clauses`` collection.
 
     Args:
         rebuild: Delete existing documents and rebuild from scratch.
+        incremental: Re-embed rows whose content hash changed (not just
+            new rows).
+        progress: Called after each batch (see ``ProgressCallback``).
 
     Returns:
-        Number of new documents indexed.
+        Number of documents embedded (new, plus changed when incremental).
     """
-    _require_chromadb()
-    collection = _get_collection("specifications")
+    _require_vector_store()
+    collection = _get_collection("ref_clauses")
 
     if rebuild:
         _clear_collection(collection)
 
     with get_db(readonly=True) as conn:
+        # Check table exists
         if not conn.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name='spec_items'"
+            "SELECT name FROM sqlite_master WHERE type='table' AND name='ref_clauses'"
         ).fetchone():
-            logger.warning("spec_items table not found - skipping")
+            logger.warning("ref_clauses table not found - skipping")
             return 0
 
-        cursor = conn.execute("""
-            SELECT
-                si.id,
-                s.spec_number,
-                s.title as spec_title,
-                COALESCE(ss.section_number, 'General') as section_number,
-                COALESCE(ss.section_title, 'General') as section_title,
-                si.item_key,
-                si.raw_text,
-                si.details,
-                si.item_type,
-                si.material,
-                si.size_range
-            FROM spec_items si
-            LEFT JOIN spec_sections ss ON si.section_id = ss.id
-            JOIN specifications s ON si.spec_id = s.id
-            WHERE (si.raw_text IS NOT NULL AND si.raw_text != '' AND length(si.raw_text) > 10)
-               OR (si.details IS NOT NULL AND si.details != '' AND length(si.details) > 10)
-            ORDER BY s.spec_number, COALESCE(ss.section_number, 'ZZZ'), si.item_key
-        """)
-        rows = cursor.fetchall()
-
-    if not rows:
-        logger.warning("No specification items found to index")
-        return 0
-
-    documents: List[str] = []
-    metadatas: List[dict] = []
-    ids: List[str] = []
-
-    for row in rows:
-        doc_id = f"spec_{row['spec_number']}_{row['section_number']}_{row['id']}"
+        documents = _peek(_ref_documents(conn))
+        if documents is None:
+            # Still sync: an emptied source table must drop its old embeddings
+            logger.warning("No reference clauses found to index")
+            documents = iter(())
 
-        if not rebuild:
-            existing = collection.get(ids=[doc_id])
-            if existing["ids"]:
-                continue
+        indexed = _sync_documents(
+            collection, documents, ("ref_",),
+            rebuild=rebuild, incremental=incremental, progress=progress,
+        )
+
+    total = collection.count()
+    logger.info("Reference clauses indexed: %d total documents", total)
+    return indexed
+
+
+# ---------------------------------------------------------------------------
+# Specifications
+# ---------------------------------------------------------------------------
+
+def _spec_documents(conn) -> Iterator[Document]:
+    cursor = conn.execute("""
+        SELECT
+            si.id,
+            s.spec_number,
+            s.title as spec_title,
+            COALESCE(ss.section_number, 'General') as section_number,
+            COALESCE(ss.section_title, 'General') as section_title,
+            si.item_key,
+            si.raw_text,
+            si.details,
+            si.item_type,
+            si.material,
+            si.size_range
+        FROM spec_items si
+        LEFT JOIN spec_sections ss ON si.section_id = ss.id
+        JOIN specifications s ON si.spec_id = s.id
+        WHERE (si.raw_text IS NOT NULL AND si.raw_text != '' AND length(si.raw_text) > 10)
+           OR (si.details IS NOT NULL AND si.details != '' AND length(si.details) > 10)
+        ORDER BY s.spec_number, COALESCE(ss.section_number, 'ZZZ'), si.item_key
+    """)
+    for row in cursor:
+        doc_id = f"spec_{row['spec_number']}_{row['section_number']}_{row['id']}"
 
         content_parts: List[str] = []
         if row["section_title"]:
@@ -322,9 +451,6 @@ def index_specifications(rebuild: bool = False) -> int:
         if row["details"]:
             content_parts.append(row["details"])
 
-        doc_text = "\n".join(content_parts)
-        documents.append(doc_text)
-
         meta: Dict[str, Any] = {"source": "specification", "db_id": row["id"]}
         for key in (
             "spec_number", "spec_title", "section_number",
@@ -332,42 +458,222 @@ def index_specifications(rebuild: bool = False) -> int:
         ):
             if row[key] is not None:
                 meta[key] = row[key]
-        metadatas.append(meta)
-        ids.append(doc_id)
+        yield doc_id, "\n".join(content_parts), meta
+
+
+def index_specifications(
+    rebuild: bool = False,
+    incremental: bool = False,
+    progress: Optional[ProgressCallback] = None,
+) -> int:
+    """
+    Index specification items into the ``specifications`` collection.
+
+    Args:
+        rebuild: Delete existing documents and rebuild from scratch.
+        incremental: Re-embed rows whose content hash changed (not just
+            new rows).
+        progress: Called after each batch (see ``ProgressCallback``).
+
+    Returns:
+        Number of documents embedded (new, plus changed when incremental).
+    """
+    _require_vector_store()
+    collection = _get_collection("specifications")
+
+    if rebuild:
+        _clear_collection(collection)
 
-    if documents:
-        _index_batch(collection, documents, metadatas, ids)
+    with get_db(readonly=True) as conn:
+        if not conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name='spec_items'"
+        ).fetchone():
+            logger.warning("spec_items table not found - skipping")
+            return 0
+
+        documents = _peek(_spec_documents(conn))
+        if documents is None:
+            # Still sync: an emptied source table must drop its old embeddings
+            logger.warning("No specification items found to index")
+            documents = iter(())
+
+        indexed = _sync_documents(
+            collection, documents, ("spec_",),
+            rebuild=rebuild, incremental=incremental, progress=progress,
+        )
 
     total = collection.count()
     logger.info("Specifications indexed: %d total documents", total)
-    return len(documents)
+    return indexed
 
 
 # ---------------------------------------------------------------------------
 # Drawings (P&ID extracted data)
 # ---------------------------------------------------------------------------
 
-def index_drawings(rebuild: bool = False) -> int:
+def _drawing_meta(row, item_type: str, keys: Tuple[str, ...]) -> Dict[str, Any]:
+    meta: Dict[str, Any] = {
+        "source": "drawing", "item_type": item_type,
+        "drawing_number": row["drawing_number"], "db_id": row["id"],
+    }
+    for key in keys:
+        if row[key]:
+            meta[key] = row[key]
+    return meta
+
+
+def _line_documents(conn) -> Iterator[Document]:
+    for row in conn.execute("""
+        SELECT l.id, l.line_number, l.size, l.material, l.spec_class,
+               l.from_location, l.to_location, l.service,
+               s.drawing_number, s.discipline,
+               p.number as project_number
+        FROM lines l
+        JOIN sheets s ON l.sheet_id = s.id
+        LEFT JOIN projects p ON s.project_id = p.id
+        WHERE l.line_number IS NOT NULL AND l.line_number != ''
+    """):
+        parts = [f"Line {row['line_number']}"]
+        if row["size"]:
+            parts.append(f"{row['size']} size")
+        if row["material"]:
+            parts.append(f"{row['material']} material")
+        if row["spec_class"]:
+            parts.append(f"spec class {row['spec_class']}")
+        if row["from_location"] and row["to_location"]:
+            parts.append(f"from {row['from_location']} to {row['to_location']}")
+        elif row["from_location"]:
+            parts.append(f"from {row['from_location']}")
+        elif row["to_location"]:
+            parts.append(f"to {row['to_location']}")
+        if row["service"]:
+            parts.append(f"{row['service']} service")
+
+        yield f"line_{row['drawing_number']}_{row['id']}", ", ".join(parts), _drawing_meta(
+            row, "line",
+            ("discipline", "project_number", "line_number", "size", "material", "service"),
+        )
+
+
+def _equipment_documents(conn) -> Iterator[Document]:
+    for row in conn.execute("""
+        SELECT e.id, e.tag, e.description, e.equipment_type,
+               s.drawing_number, s.discipline,
+               p.number as project_number
+        FROM equipment e
+        JOIN sheets s ON e.sheet_id = s.id
+        LEFT JOIN projects p ON s.project_id = p.id
+        WHERE e.tag IS NOT NULL AND e.tag != ''
+    """):
+        parts = [f"Equipment {row['tag']}"]
+        if row["equipment_type"]:
+            parts.append(row["equipment_type"])
+        if row["description"]:
+            parts.append(row["description"])
+
+        yield f"equip_{row['drawing_number']}_{row['id']}", ", ".join(parts), _drawing_meta(
+            row, "equipment", ("discipline", "project_number", "tag", "equipment_type"),
+        )
+
+
+def _instrument_documents(conn) -> Iterator[Document]:
+    for row in conn.execute("""
+        SELECT i.id, i.tag, i.instrument_type, i.loop_number,
+               i.service, i.description, i.location,
+               s.drawing_number, s.discipline,
+               p.number as project_number
+        FROM instruments i
+        JOIN sheets s ON i.sheet_id = s.id
+        LEFT JOIN projects p ON s.project_id = p.id
+        WHERE i.tag IS NOT NULL AND i.tag != ''
+    """):
+        parts = [f"Instrument {row['tag']}"]
+        if row["instrument_type"]:
+            parts.append(row["instrument_type"])
+        if row["loop_number"]:
+            parts.append(f"loop {row['loop_number']}")
+        if row["service"]:
+            parts.append(f"{row['service']} service")
+        if row["description"]:
+            parts.append(row["description"])
+        if row["location"]:
+            parts.append(f"at {row['location']}")
+
+        yield f"inst_{row['drawing_number']}_{row['id']}", ", ".join(parts), _drawing_meta(
+            row, "instrument",
+            ("discipline", "project_number", "tag", "instrument_type", "loop_number", "service"),
+        )
+
+
+def _weld_documents(conn) -> Iterator[Document]:
+    for row in conn.execute("""
+        SELECT w.id, w.weld_id, w.weld_type, w.size,
+               w.joint_type, w.nde_required,
+               s.drawing_number, s.discipline,
+               p.number as project_number
+        FROM welds w
+        JOIN sheets s ON w.sheet_id = s.id
+        LEFT JOIN projects p ON s.project_id = p.id
+        WHERE w.weld_id IS NOT NULL AND w.weld_id != ''
+    """):
+        parts = [f"Weld {row['weld_id']}"]
+        if row["weld_type"]:
+            parts.append(row["weld_type"])
+        if row["size"]:
+            parts.append(f"{row['size']} size")
+        if row["joint_type"]:
+            parts.append(f"{row['joint_type']} joint")
+        if row["nde_required"]:
+            parts.append(f"NDE: {row['nde_required']}")
+
+        yield f"weld_{row['drawing_number']}_{row['id']}", ", ".join(parts), _drawing_meta(
+            row, "weld", ("discipline", "project_number", "weld_id", "weld_type", "nde_required"),
+        )
+
+
+# Drawing item table -> document reader (each also needs ``sheets``)
+_DRAWING_SOURCES: Dict[str, Callable[[Any], Iterator[Document]]] = {
+    "lines": _line_documents,
+    "equipment": _equipment_documents,
+    "instruments": _instrument_documents,
+    "welds": _weld_documents,
+}
+
+
+def _drawing_documents(conn, tables: Set[str]) -> Iterator[Document]:
+    for table, reader in _DRAWING_SOURCES.items():
+        if table in tables and "sheets" in tables:
+            count = 0
+            for document in reader(conn):
+                count += 1
+                yield document
+            logger.info("Streamed %d %s documents", count, table)
+
+
+def index_drawings(
+    rebuild: bool = False,
+    incremental: bool = False,
+    progress: Optional[ProgressCallback] = None,
+) -> int:
     """
     Index extracted drawing data (lines, equipment, instruments, welds)
     into the ``drawings`` collection.
 
     Args:
         rebuild: Delete existing documents and rebuild from scratch.
+        incremental: Re-embed rows whose content hash changed (not just
+            new rows).
+        progress: Called after each batch (see ``ProgressCallback``).
 
     Returns:
-        Number of new documents indexed.
+        Number of documents embedded (new, plus changed when incremental).
     """
-    _require_chromadb()
+    _require_vector_store()
     collection = _get_collection("drawings")
 
     if rebuild:
         _clear_collection(collection)
 
-    documents: List[str] = []
-    metadatas: List[dict] = []
-    ids: List[str] = []
-
     with get_db(readonly=True) as conn:
         existing_tables = {
             row[0]
@@ -382,197 +688,76 @@ def index_drawings(rebuild: bool = False) -> int:
             logger.warning("No drawing tables found - skipping")
             return 0
 
-        # --- Lines ---
-        if "lines" in existing_tables and "sheets" in existing_tables:
-            for row in conn.execute("""
-                SELECT l.id, l.line_number, l.size, l.material, l.spec_class,
-                       l.from_location, l.to_location, l.service,
-                       s.drawing_number, s.discipline,
-                       p.number as project_number
-                FROM lines l
-                JOIN sheets s ON l.sheet_id = s.id
-                LEFT JOIN projects p ON s.project_id = p.id
-                WHERE l.line_number IS NOT NULL AND l.line_number != ''
-            """).fetchall():
-                doc_id = f"line_{row['drawing_number']}_{row['id']}"
-                if not rebuild:
-                    ex = collection.get(ids=[doc_id])
-                    if ex["ids"]:
-                        continue
-
-                parts = [f"Line {row['line_number']}"]
-                if row["size"]:
-                    parts.append(f"{row['size']} size")
-                if row["material"]:
-                    parts.append(f"{row['material']} material")
-                if row["spec_class"]:
-                    parts.append(f"spec class {row['spec_class']}")
-                if row["from_location"] and row["to_location"]:
-                    parts.append(f"from {row['from_location']} to {row['to_location']}")
-                elif row["from_location"]:
-                    parts.append(f"from {row['from_location']}")
-                elif row["to_location"]:
-                    parts.append(f"to {row['to_location']}")
-                if row["service"]:
-                    parts.append(f"{row['service']} service")
-
-                documents.append(", ".join(parts))
-                meta: Dict[str, Any] = {
-                    "source": "drawing", "item_type": "line",
-                    "drawing_number": row["drawing_number"], "db_id": row["id"],
-                }
-                for key in ("discipline", "project_number", "line_number", "size", "material", "service"):
-                    if row[key]:
-                        meta[key] = row[key]
-                metadatas.append(meta)
-                ids.append(doc_id)
-
-            logger.info("Prepared %d line documents", sum(1 for m in metadatas if m.get("item_type") == "line"))
-
-        # --- Equipment ---
-        if "equipment" in existing_tables and "sheets" in existing_tables:
-            for row in conn.execute("""
-                SELECT e.id, e.tag, e.description, e.equipment_type,
-                       s.drawing_number, s.discipline,
-                       p.number as project_number
-                FROM equipment e
-                JOIN sheets s ON e.sheet_id = s.id
-                LEFT JOIN projects p ON s.project_id = p.id
-                WHERE e.tag IS NOT NULL AND e.tag != ''
-            """).fetchall():
-                doc_id = f"equip_{row['drawing_number']}_{row['id']}"
-                if not rebuild:
-                    ex = collection.get(ids=[doc_id])
-                    if ex["ids"]:
-                        continue
-
-                parts = [f"Equipment {row['tag']}"]
-                if row["equipment_type"]:
-                    parts.append(row["equipment_type"])
-                if row["description"]:
-                    parts.append(row["description"])
-
-                documents.append(", ".join(parts))
-                meta = {
-                    "source": "drawing", "item_type": "equipment",
-                    "drawing_number": row["drawing_number"], "db_id": row["id"],
-                }
-                for key in ("discipline", "project_number", "tag", "equipment_type"):
-                    if row[key]:
-                        meta[key] = row[key]
-                metadatas.append(meta)
-                ids.append(doc_id)
-
-            logger.info("Prepared %d equipment documents", sum(1 for m in metadatas if m.get("item_type") == "equipment"))
-
-        # --- Instruments ---
-        if "instruments" in existing_tables and "sheets" in existing_tables:
-            for row in conn.execute("""
-                SELECT i.id, i.tag, i.instrument_type, i.loop_number,
-                       i.service, i.description, i.location,
-                       s.drawing_number, s.discipline,
-                       p.number as project_number
-                FROM instruments i
-                JOIN sheets s ON i.sheet_id = s.id
-                LEFT JOIN projects p ON s.project_id = p.id
-                WHERE i.tag IS NOT NULL AND i.tag != ''
-            """).fetchall():
-                doc_id = f"inst_{row['drawing_number']}_{row['id']}"
-                if not rebuild:
-                    ex = collection.get(ids=[doc_id])
-                    if ex["ids"]:
-                        continue
-
-                parts = [f"Instrument {row['tag']}"]
-                if row["instrument_type"]:
-                    parts.append(row["instrument_type"])
-                if row["loop_number"]:
-                    parts.append(f"loop {row['loop_number']}")
-                if row["service"]:
-                    parts.append(f"{row['service']} service")
-                if row["description"]:
-                    parts.append(row["description"])
-                if row["location"]:
-                    parts.append(f"at {row['location']}")
-
-                documents.append(", ".join(parts))
-                meta = {
-                    "source": "drawing", "item_type": "instrument",
-                    "drawing_number": row["drawing_number"], "db_id": row["id"],
-                }
-                for key in ("discipline", "project_number", "tag", "instrument_type", "loop_number", "service"):
-                    if row[key]:
-                        meta[key] = row[key]
-                metadatas.append(meta)
-                ids.append(doc_id)
-
-            logger.info("Prepared %d instrument documents", sum(1 for m in metadatas if m.get("item_type") == "instrument"))
-
-        # --- Welds ---
-        if "welds" in existing_tables and "sheets" in existing_tables:
-            for row in conn.execute("""
-                SELECT w.id, w.weld_id, w.weld_type, w.size,
-                       w.joint_type, w.nde_required,
-                       s.drawing_number, s.discipline,
-                       p.number as project_number
-                FROM welds w
-                JOIN sheets s ON w.sheet_id = s.id
-                LEFT JOIN projects p ON s.project_id = p.id
-                WHERE w.weld_id IS NOT NULL AND w.weld_id != ''
-            """).fetchall():
-                doc_id = f"weld_{row['drawing_number']}_{row['id']}"
-                if not rebuild:
-                    ex = collection.get(ids=[doc_id])
-                    if ex["ids"]:
-                        continue
-
-                parts = [f"Weld {row['weld_id']}"]
-                if row["weld_type"]:
-                    parts.append(row["weld_type"])
-                if row["size"]:
-                    parts.append(f"{row['size']} size")
-                if row["joint_type"]:
-                    parts.append(f"{row['joint_type']} joint")
-                if row["nde_required"]:
-                    parts.append(f"NDE: {row['nde_required']}")
-
-                documents.append(", ".join(parts))
-                meta = {
-                    "source": "drawing", "item_type": "weld",
-                    "drawing_number": row["drawing_number"], "db_id": row["id"],
-                }
-                for key in ("discipline", "project_number", "weld_id", "weld_type", "nde_required"):
-                    if row[key]:
-                        meta[key] = row[key]
-                metadatas.append(meta)
-                ids.append(doc_id)
-
-            logger.info("Prepared %d weld documents", sum(1 for m in metadatas if m.get("item_type") == "weld"))
-
-    if documents:
-        _index_batch(collection, documents, metadatas, ids)
+        indexed = _sync_documents(
+            collection, _drawing_documents(conn, existing_tables),
+            ("line_", "equip_", "inst_", "weld_"),
+            rebuild=rebuild, incremental=incremental, progress=progress,
+        )
 
     total = collection.count()
     logger.info("Drawings indexed: %d total documents", total)
-    return len(documents)
+    return indexed
 
 
 # ---------------------------------------------------------------------------
 # Quality Issues
 # ---------------------------------------------------------------------------
 
-def index_quality_issues(rebuild: bool = False) -> int:
+def _issue_documents(conn) -> Iterator[Document]:
+    cursor = conn.execute("""
+        SELECT
+            qi.id,
+            qi.title,
+            qi.description,
+            qi.location,
+            qi.type,
+            qi.status,
+            qi.severity,
+            qi.trade,
+            qi.priority,
+            p.number as project_number,
+            p.name as project_name
+        FROM quality_issues qi
+        LEFT JOIN projects p ON qi.project_id = p.id
+        WHERE qi.title IS NOT NULL AND qi.title != ''
+    """)
+    for row in cursor:
+        # Build document text from title + description + location
+        parts = [row["title"]]
+        if row["description"]:
+            parts.append(row["description"])
+        if row["location"]:
+            parts.append(row["location"])
+
+        meta: Dict[str, Any] = {"source": "quality_issue", "db_id": row["id"]}
+        for key in (
+            "type", "status", "severity", "trade", "priority",
+            "project_number", "project_name",
+        ):
+            if row[key] is not None:
+                meta[key] = row[key]
+        yield f"qi_{row['id']}", "\n".join(parts), meta
+
+
+def index_quality_issues(
+    rebuild: bool = False,
+    incremental: bool = False,
+    progress: Optional[ProgressCallback] = None,
+) -> int:
     """
     Index quality issue titles and descriptions into the ``quality_issues``
     collection for semantic search.
 
     Args:
         rebuild: Delete existing documents and rebuild from scratch.
+        incremental: Re-embed rows whose content hash changed (not just
+            new rows).
+        progress: Called after each batch (see ``ProgressCallback``).
 
     Returns:
-        Number of new documents indexed.
+        Number of documents embedded (new, plus changed when incremental).
     """
-    _require_chromadb()
+    _require_vector_store()
     collection = _get_collection("quality_issues")
 
     if rebuild:
@@ -585,79 +770,39 @@ def index_quality_issues(rebuild: bool = False) -> int:
             logger.warning("quality_issues table not found - skipping")
             return 0
 
-        cursor = conn.execute("""
-            SELECT
-                qi.id,
-                qi.title,
-                qi.description,
-                qi.location,
-                qi.type,
-                qi.status,
-                qi.severity,
-                qi.trade,
-                qi.priority,
-                p.number as project_number,
-                p.name as project_name
-            FROM quality_issues qi
-            LEFT JOIN projects p ON qi.project_id = p.id
-            WHERE qi.title IS NOT NULL AND qi.title != ''
-        """)
-        rows = cursor.fetchall()
-
-    if not rows:
-        logger.warning("No quality issues found to index")
-        return 0
-
-    documents: List[str] = []
-    metadatas: List[dict] = []
-    ids: List[str] = []
-
-    for row in rows:
-        doc_id = f"qi_{row['id']}"
-
-        if not rebuild:
-            existing = collection.get(ids=[doc_id])
-            if existing["ids"]:
-                continue
+        documents = _peek(_issue_documents(conn))
+        if documents is None:
+            # Still sync: an emptied source table must drop its old embeddings
+            logger.warning("No quality issues found to index")
+            documents = iter(())
 
-        # Build document text from title + description + location
-        parts = [row["title"]]
-        if row["description"]:
-            parts.append(row["description"])
-        if row["location"]:
-            parts.append(row["location"])
-        doc_text = "\n".join(parts)
-
-        documents.append(doc_text)
-
-        meta: Dict[str, Any] = {"source": "quality_issue", "db_id": row["id"]}
-        for key in (
-            "type", "status", "severity", "trade", "priority",
-            "project_number", "project_name",
-        ):
-            if row[key] is not None:
-                meta[key] = row[key]
-        metadatas.append(meta)
-        ids.append(doc_id)
-
-    if documents:
-        _index_batch(collection, documents, metadatas, ids)
+        indexed = _sync_documents(
+            collection, documents, ("qi_",),
+            rebuild=rebuild, incremental=incremental, progress=progress,
+        )
 
     total = collection.count()
     logger.info("Quality issues indexed: %d total documents", total)
-    return len(documents)
+    return indexed
 
 
 # ---------------------------------------------------------------------------
 # Index all
 # ---------------------------------------------------------------------------
 
-def index_all(rebuild: bool = False) -> Dict[str, int]:
+def index_all(
+    rebuild: bool = False,
+    incremental: bool = False,
+    progress: Optional[ProgressCallback] = None,
+) -> Dict[str, int]:
     """
     Index all content types (QM, refs, specs, drawings).
 
     Args:
         rebuild: Delete existing and rebuild from scratch.
+        incremental: Re-embed rows whose content hash changed (not just
+            new rows).
+        progress: Called after each batch (see ``ProgressCallback``).
 
     Returns:
         Dict mapping collection name to number of documents indexed.
@@ -666,12 +811,13 @@ def index_all(rebuild: bool = False) -> Dict[str, int]:
     logger.info("Starting full index...")
     logger.info("=" * 50)
 
+    opts = {"rebuild": rebuild, "incremental": incremental, "progress": progress}
     results = {
-        "qm_content": index_qm_content(rebuild=rebuild),
-        "ref_clauses": index_ref_clauses(rebuild=rebuild),
-        "specifications": index_specifications(rebuild=rebuild),
-        "drawings": index_drawings(rebuild=rebuild),
-        "quality_issues": index_quality_issues(rebuild=rebuild),
+        "qm_content": index_qm_content(**opts),
+        "ref_clauses": index_ref_clauses(**opts),
+        "specifications": index_specifications(**opts),
+        "drawings": index_drawings(**opts),
+        "quality_issues": index_quality_issues(**opts),
     }
 
     logger.info("=" * 50)
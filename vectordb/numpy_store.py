@@ -0,0 +1,487 @@
+"""
+VectorDB NumPy Store
+
+Lightweight in-process vector store used when ``vectordb.backend`` is
+``numpy`` (or ``auto`` without chromadb installed). Each collection lives in
+its own directory under ``<vector_database>/numpy/<name>/``:
+
+    vectors.f32   memory-mapped float32 matrix, one L2-normalised row per slot
+    items.db      SQLite: slot -> id, document, metadata (JSON)
+
+Several processes (web server, ``qms vectordb index``, the embed queue
+worker) may open the same collection. Writers serialise on the SQLite write
+lock (``BEGIN IMMEDIATE``) and allocate new slots from ``MAX(slot) + 1``
+inside that transaction; every handle reloads its in-memory index when
+``PRAGMA data_version`` shows another connection has committed.
+
+Search is brute-force cosine similarity (one matmul over the memmap), with
+optional metadata pre-filtering using the Chroma ``where`` operators
+(``$eq $ne $gt $gte $lt $lte $in $nin $and $or``). Collections expose the
+subset of the ``chromadb.Collection`` API the rest of the package uses, so
+``search.get_chromadb_collection`` can return either.
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from qms.core import get_logger, QMS_PATHS
+
+logger = get_logger("qms.vectordb.numpy_store")
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+    np = None  # type: ignore[assignment]
+
+_INITIAL_CAPACITY = 1024
+
+_DEFAULT_GET_INCLUDE = ("documents", "metadatas")
+_DEFAULT_QUERY_INCLUDE = ("documents", "metadatas", "distances")
+
+
+def _require_numpy() -> None:
+    if not HAS_NUMPY:
+        raise ImportError("numpy is required for the numpy vector store. Install: pip install numpy")
+
+
+# ---------------------------------------------------------------------------
+# Metadata filters (Chroma ``where`` syntax)
+# ---------------------------------------------------------------------------
+
+_COMPARATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "$eq": lambda a, b: a == b,
+    "$ne": lambda a, b: a != b,
+    "$gt": lambda a, b: a is not None and a > b,
+    "$gte": lambda a, b: a is not None and a >= b,
+    "$lt": lambda a, b: a is not None and a < b,
+    "$lte": lambda a, b: a is not None and a <= b,
+    "$in": lambda a, b: a in b,
+    "$nin": lambda a, b: a not in b,
+}
+
+
+def matches_where(metadata: Optional[Dict[str, Any]], where: Dict[str, Any]) -> bool:
+    """Evaluate a Chroma-style ``where`` filter against one metadata dict."""
+    metadata = metadata or {}
+    for key, cond in where.items():
+        if key == "$and":
+            if not all(matches_where(metadata, c) for c in cond):
+                return False
+        elif key == "$or":
+            if not any(matches_where(metadata, c) for c in cond):
+                return False
+        elif isinstance(cond, dict):
+            value = metadata.get(key)
+            for op, operand in cond.items():
+                if op not in _COMPARATORS:
+                    raise ValueError(f"Unsupported where operator: {op}")
+                if not _COMPARATORS[op](value, operand):
+                    return False
+        elif metadata.get(key) != cond:
+            return False
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Collection
+# ---------------------------------------------------------------------------
+
+class NumpyCollection:
+    """A persistent collection backed by a float32 memmap and SQLite."""
+
+    def __init__(
+        self,
+        name: str,
+        path: Path,
+        embedding_function: Optional[Callable[[List[str]], List[List[float]]]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        _require_numpy()
+        self.name = name
+        self.path = Path(path)
+        self._embedding_function = embedding_function
+        self._lock = threading.RLock()
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(
+            str(self.path / "items.db"), timeout=30, check_same_thread=False
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS items (
+                slot INTEGER PRIMARY KEY,
+                id TEXT NOT NULL UNIQUE,
+                document TEXT,
+                metadata TEXT
+            );
+            CREATE TABLE IF NOT EXISTS info (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+        self._vectors = None
+        self._capacity = 0
+        self._data_version: Optional[int] = None
+        self._load()
+        if metadata and metadata != self.metadata:
+            self.metadata = dict(metadata)
+            self._set_info("metadata", json.dumps(self.metadata))
+
+    # -- storage helpers ----------------------------------------------------
+
+    def _set_info(self, key: str, value: str, commit: bool = True) -> None:
+        self._db.execute("INSERT OR REPLACE INTO info (key, value) VALUES (?, ?)", (key, value))
+        if commit:
+            self._db.commit()
+
+    def _load(self) -> None:
+        """(Re)build the in-memory index from ``items.db``."""
+        self._data_version = self._db.execute("PRAGMA data_version").fetchone()[0]
+        info = dict(self._db.execute("SELECT key, value FROM info").fetchall())
+        self.metadata = json.loads(info["metadata"]) if info.get("metadata") else {}
+        self._dims = int(info["dims"]) if info.get("dims") else None
+
+        self._slot_of = {}
+        self._ids = []
+        self._docs = []
+        self._metas = []
+        for slot, doc_id, doc, meta in self._db.execute(
+            "SELECT slot, id, document, metadata FROM items ORDER BY slot"
+        ):
+            self._ensure_lists(slot + 1)
+            self._slot_of[doc_id] = slot
+            self._ids[slot] = doc_id
+            self._docs[slot] = doc
+            self._metas[slot] = json.loads(meta) if meta else {}
+        self._high = len(self._ids)
+
+        if self._dims and (self._vectors is None or self._high > self._capacity):
+            # Map what the writers have sized; never resize from a reader
+            self._open_vectors(self._high, grow=False)
+
+    def _refresh(self) -> None:
+        """Reload if another connection committed since the last look."""
+        if self._db.execute("PRAGMA data_version").fetchone()[0] != self._data_version:
+            self._load()
+
+    def _begin_write(self) -> None:
+        """Take the collection's write lock (shared by all processes) and catch up."""
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            self._refresh()
+        except BaseException:
+            self._db.rollback()
+            raise
+
+    def _ensure_lists(self, size: int) -> None:
+        grow = size - len(self._ids)
+        if grow > 0:
+            self._ids.extend([None] * grow)
+            self._docs.extend([None] * grow)
+            self._metas.extend([None] * grow)
+
+    def _open_vectors(self, capacity: int, grow: bool = True) -> None:
+        """
+        (Re)map ``vectors.f32`` with room for at least *capacity* rows.
+
+        Only writers (holding the write lock) may *grow* the file; readers
+        map its current size.
+        """
+        vec_path = self.path / "vectors.f32"
+        row_bytes = self._dims * 4
+        current = vec_path.stat().st_size // row_bytes if vec_path.exists() else 0
+        capacity = max(capacity, current) if grow else current
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._vectors = None
+        self._capacity = 0
+        if grow:
+            with open(vec_path, "ab") as fh:
+                fh.truncate(capacity * row_bytes)
+        if capacity:
+            self._vectors = np.memmap(
+                vec_path, dtype=np.float32, mode="r+", shape=(capacity, self._dims)
+            )
+            self._capacity = capacity
+
+    def _reserve(self, rows: int, dims: int) -> None:
+        if self._dims is None:
+            self._dims = dims
+            self._set_info("dims", str(dims), commit=False)
+        elif dims != self._dims:
+            raise ValueError(
+                f"Embedding dimension {dims} does not match collection {self.name} ({self._dims})"
+            )
+        if self._vectors is None or rows > self._capacity:
+            self._open_vectors(max(rows, self._capacity * 2, _INITIAL_CAPACITY))
+
+    def _embed(self, documents: Sequence[str]):
+        if self._embedding_function is None:
+            raise ValueError(f"Collection {self.name} has no embedding function")
+        return self._embedding_function(list(documents))
+
+    @staticmethod
+    def _normalise(vectors):
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def _live_slots(self, where: Optional[Dict[str, Any]] = None) -> List[int]:
+        return [
+            slot for slot in range(self._high)
+            if self._ids[slot] is not None
+            and (where is None or matches_where(self._metas[slot], where))
+        ]
+
+    # -- chromadb.Collection API subset ---------------------------------------
+
+    def count(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._slot_of)
+
+    def add(self, ids, documents=None, metadatas=None, embeddings=None) -> None:
+        """Add new documents; IDs that already exist are ignored (as in Chroma)."""
+        self._write(ids, documents, metadatas, embeddings, replace=False)
+
+    def upsert(self, ids, documents=None, metadatas=None, embeddings=None) -> None:
+        """Add documents, replacing any that already exist."""
+        self._write(ids, documents, metadatas, embeddings, replace=True)
+
+    def _write(self, ids, documents, metadatas, embeddings, replace: bool) -> None:
+        ids = list(ids)
+        documents = list(documents) if documents is not None else [None] * len(ids)
+        metadatas = list(metadatas) if metadatas is not None else [None] * len(ids)
+
+        with self._lock:
+            # Embed outside the write lock; the model call can be slow
+            self._refresh()
+            keep = [i for i, doc_id in enumerate(ids) if replace or doc_id not in self._slot_of]
+            if not keep:
+                return
+            if embeddings is None:
+                vectors = self._embed([documents[i] for i in keep])
+            else:
+                vectors = [embeddings[i] for i in keep]
+            matrix = self._normalise(vectors)
+
+            self._begin_write()
+            try:
+                if not replace:
+                    # Another process may have added some of these meanwhile
+                    fresh = [n for n, i in enumerate(keep) if ids[i] not in self._slot_of]
+                    keep = [keep[n] for n in fresh]
+                    matrix = matrix[fresh]
+                    if not keep:
+                        self._db.rollback()
+                        return
+
+                slots: List[int] = []
+                next_slot = self._db.execute(
+                    "SELECT COALESCE(MAX(slot) + 1, 0) FROM items"
+                ).fetchone()[0]
+                for i in keep:
+                    slot = self._slot_of.get(ids[i])
+                    if slot is None:
+                        slot = next_slot
+                        next_slot += 1
+                    slots.append(slot)
+                high = max(next_slot, self._high)
+                self._reserve(high, matrix.shape[1])
+                self._ensure_lists(high)
+
+                self._vectors[slots] = matrix
+                self._vectors.flush()
+                rows = [
+                    (slot, ids[i], documents[i], json.dumps(metadatas[i] or {}, default=str))
+                    for slot, i in zip(slots, keep)
+                ]
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO items (slot, id, document, metadata) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                self._db.commit()
+            except BaseException:
+                self._db.rollback()
+                raise
+
+            for slot, i in zip(slots, keep):
+                self._slot_of[ids[i]] = slot
+                self._ids[slot] = ids[i]
+                self._docs[slot] = documents[i]
+                self._metas[slot] = dict(metadatas[i] or {})
+            self._high = high
+
+    def delete(self, ids=None, where: Optional[Dict[str, Any]] = None) -> None:
+        with self._lock:
+            self._begin_write()
+            try:
+                if ids is not None:
+                    slots = [self._slot_of[i] for i in ids if i in self._slot_of]
+                else:
+                    slots = self._live_slots(where)
+                self._db.executemany("DELETE FROM items WHERE slot = ?", [(s,) for s in slots])
+                # Zero while still holding the lock: a freed trailing slot can
+                # be handed out again as soon as the transaction commits
+                for slot in slots:
+                    self._vectors[slot] = 0.0
+                self._db.commit()
+            except BaseException:
+                self._db.rollback()
+                raise
+            for slot in slots:
+                del self._slot_of[self._ids[slot]]
+                self._ids[slot] = self._docs[slot] = self._metas[slot] = None
+            if not self._slot_of:
+                # Empty collection: reuse slots from the start
+                self._high = 0
+                self._ids, self._docs, self._metas = [], [], []
+
+    def get(
+        self,
+        ids=None,
+        where: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        include: Sequence[str] = _DEFAULT_GET_INCLUDE,
+    ) -> Dict[str, Any]:
+        with self._lock:
+            self._refresh()
+            if ids is not None:
+                slots = [self._slot_of[i] for i in ids if i in self._slot_of]
+                if where is not None:
+                    slots = [s for s in slots if matches_where(self._metas[s], where)]
+            else:
+                slots = self._live_slots(where)
+            slots = slots[offset:] if limit is None else slots[offset : offset + limit]
+            result: Dict[str, Any] = {"ids": [self._ids[s] for s in slots]}
+            if "documents" in include:
+                result["documents"] = [self._docs[s] for s in slots]
+            if "metadatas" in include:
+                result["metadatas"] = [self._metas[s] for s in slots]
+            if "embeddings" in include:
+                result["embeddings"] = [self._vectors[s].tolist() for s in slots]
+            return result
+
+    def query(
+        self,
+        query_texts=None,
+        query_embeddings=None,
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+        include: Sequence[str] = _DEFAULT_QUERY_INCLUDE,
+    ) -> Dict[str, Any]:
+        """
+        Cosine-similarity search. Distances are ``1 - cosine`` (Chroma's
+        cosine space), smallest first.
+        """
+        if query_embeddings is None:
+            query_embeddings = self._embed(query_texts)
+        queries = self._normalise(query_embeddings)
+
+        out: Dict[str, List[Any]] = {"ids": []}
+        for field in ("documents", "metadatas", "distances"):
+            if field in include:
+                out[field] = []
+
+        with self._lock:
+            self._refresh()
+            if self._vectors is None or not self._slot_of:
+                for key in out:
+                    out[key] = [[] for _ in range(len(queries))]
+                return out
+
+            valid = np.zeros(self._high, dtype=bool)
+            valid[self._live_slots(where)] = True
+            candidates = int(valid.sum())
+            k = min(n_results, candidates)
+
+            # One matmul over the memmap; excluded rows are masked, not copied out
+            scores = self._vectors[: self._high] @ queries.T
+            scores[~valid] = -np.inf
+            for col in range(queries.shape[0]):
+                column = scores[:, col]
+                if k == 0:
+                    top = np.array([], dtype=int)
+                else:
+                    top = np.argpartition(-column, k - 1)[:k]
+                    top = top[np.argsort(-column[top])]
+                out["ids"].append([self._ids[s] for s in top])
+                if "documents" in out:
+                    out["documents"].append([self._docs[s] for s in top])
+                if "metadatas" in out:
+                    out["metadatas"].append([self._metas[s] for s in top])
+                if "distances" in out:
+                    out["distances"].append([float(1.0 - column[s]) for s in top])
+        return out
+
+    def close(self) -> None:
+        with self._lock:
+            if self._vectors is not None:
+                self._vectors.flush()
+                self._vectors = None
+            self._db.close()
+
+
+# ---------------------------------------------------------------------------
+# Collection registry
+# ---------------------------------------------------------------------------
+
+_collections: Dict[str, NumpyCollection] = {}
+_registry_lock = threading.Lock()
+
+
+def store_root() -> Path:
+    """Directory holding one sub-directory per numpy collection."""
+    return QMS_PATHS.vector_database / "numpy"
+
+
+def get_collection(
+    name: str,
+    embedding_function=None,
+    metadata: Optional[Dict[str, Any]] = None,
+    create_if_missing: bool = True,
+) -> NumpyCollection:
+    """
+    Open (or create) a numpy collection; instances are cached per process.
+
+    Raises:
+        ValueError: *create_if_missing* is False and the collection does not exist.
+    """
+    _require_numpy()
+    with _registry_lock:
+        collection = _collections.get(name)
+        if collection is None:
+            path = store_root() / name
+            if not create_if_missing and not (path / "items.db").exists():
+                raise ValueError(f"Collection {name} does not exist.")
+            collection = NumpyCollection(name, path, embedding_function, metadata)
+            _collections[name] = collection
+        elif embedding_function is not None:
+            collection._embedding_function = embedding_function
+    return collection
+
+
+def list_collection_names() -> List[str]:
+    """Names of the numpy collections on disk."""
+    root = store_root()
+    if not root.exists():
+        return []
+    return sorted(p.name for p in root.iterdir() if (p / "items.db").exists())
+
+
+def reset_collections() -> None:
+    """Close and forget cached collection handles (e.g. after changing paths)."""
+    with _registry_lock:
+        for collection in _collections.values():
+            collection.close()
+        _collections.clear()
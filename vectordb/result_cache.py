@@ -0,0 +1,223 @@
+"""
+VectorDB Search Result Cache
+
+In-memory LRU + TTL cache of ``search_collection`` results keyed on
+``(collection, query, n_results, where, include)``.
+
+Every collection carries a version counter (``collection_versions.db`` next
+to ``embed_queue.db``) that the indexers, the embedding queue and
+``add_documents_to_collection`` bump on each write. Cached entries record
+the version they were computed at and are discarded as soon as it changes,
+so results go stale exactly when the collection does - including writes
+made by another process (e.g. ``qms vectordb queue watch``).
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from qms.core import get_config_value, get_logger, QMS_PATHS
+
+logger = get_logger("qms.vectordb.result_cache")
+
+_DEFAULT_MAX_ENTRIES = 1024
+_DEFAULT_TTL_SECONDS = 300
+
+
+# ---------------------------------------------------------------------------
+# Collection versions
+# ---------------------------------------------------------------------------
+
+class CollectionVersions:
+    """Persistent per-collection write counters shared across processes."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS collection_versions (
+                name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, name: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version FROM collection_versions WHERE name = ?", (name,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def bump(self, name: str) -> int:
+        with self._lock:
+            self._conn.execute(
+                """INSERT INTO collection_versions (name, version) VALUES (?, 1)
+                   ON CONFLICT(name) DO UPDATE SET version = version + 1""",
+                (name,),
+            )
+            self._conn.commit()
+            return self._conn.execute(
+                "SELECT version FROM collection_versions WHERE name = ?", (name,)
+            ).fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_versions: Optional[CollectionVersions] = None
+_versions_lock = threading.Lock()
+
+
+def get_collection_versions() -> CollectionVersions:
+    """Return the shared version store (``collection_versions.db``)."""
+    global _versions
+    if _versions is None:
+        with _versions_lock:
+            if _versions is None:
+                _versions = CollectionVersions(QMS_PATHS.vector_database / "collection_versions.db")
+    return _versions
+
+
+def collection_version(name: str) -> int:
+    """Current write version of collection *name* (0 if never written)."""
+    return get_collection_versions().get(name)
+
+
+def bump_collection_version(name: str) -> None:
+    """
+    Record a write to collection *name*, invalidating its cached results.
+
+    Never raises: a failure here must not fail the write it follows.
+    """
+    try:
+        get_collection_versions().bump(name)
+    except Exception as exc:
+        logger.warning("Could not bump version of %s: %s", name, exc)
+
+
+# ---------------------------------------------------------------------------
+# Result cache
+# ---------------------------------------------------------------------------
+
+CacheKey = Tuple[str, str, int, str, Tuple[str, ...]]
+
+
+def make_key(
+    collection: str,
+    query: str,
+    n_results: int,
+    where: Optional[Dict[str, Any]],
+    include: Optional[List[str]],
+) -> CacheKey:
+    """Build a hashable cache key (``where`` is canonicalised as sorted JSON)."""
+    return (
+        collection,
+        query,
+        n_results,
+        json.dumps(where, sort_keys=True, default=str) if where else "",
+        tuple(include or ()),
+    )
+
+
+class SearchResultCache:
+    """
+    Thread-safe LRU of search results with a TTL and version check.
+
+    Args:
+        max_entries: Least recently used entries beyond this are dropped.
+        ttl_seconds: Entries older than this are treated as misses.
+    """
+
+    def __init__(self, max_entries: int = _DEFAULT_MAX_ENTRIES, ttl_seconds: float = _DEFAULT_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[CacheKey, Tuple[int, float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: CacheKey, version: int) -> Optional[List[Dict[str, Any]]]:
+        """Return cached results for *key* at *version*, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                cached_version, stored_at, results = entry
+                if cached_version == version and time.monotonic() - stored_at < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return [dict(r) for r in results]
+                del self._entries[key]
+                if cached_version != version:
+                    self.invalidations += 1
+            self.misses += 1
+            return None
+
+    def peek(self, key: CacheKey, version: int) -> bool:
+        """True if *key* has a live entry at *version* (stats and LRU order untouched)."""
+        with self._lock:
+            entry = self._entries.get(key)
+        return (
+            entry is not None
+            and entry[0] == version
+            and time.monotonic() - entry[1] < self.ttl_seconds
+        )
+
+    def put(self, key: CacheKey, version: int, results: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._entries[key] = (version, time.monotonic(), [dict(r) for r in results])
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+_cache: Optional[SearchResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> Optional[SearchResultCache]:
+    """
+    Return the shared result cache, or ``None`` when
+    ``vectordb.result_cache.enabled`` is false.
+    """
+    global _cache
+    if not get_config_value("vectordb", "result_cache", "enabled", default=True):
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SearchResultCache(
+                    max_entries=int(get_config_value(
+                        "vectordb", "result_cache", "max_entries", default=_DEFAULT_MAX_ENTRIES
+                    )),
+                    ttl_seconds=float(get_config_value(
+                        "vectordb", "result_cache", "ttl_seconds", default=_DEFAULT_TTL_SECONDS
+                    )),
+                )
+    return _cache
@@ -4,18 +4,41 @@ VectorDB Semantic Search Interface
 Provides query embedding, similarity search, result formatting,
 and multi-collection search over ChromaDB collections.
 
-ChromaDB and sentence-transformers are optional dependencies.
+ChromaDB and sentence-transformers are optional dependencies. The vector
+store backend is chosen by ``vectordb.backend`` in config.yaml: ``chromadb``,
+``numpy`` (in-process memmap store, see ``numpy_store``) or ``auto``.
 """
 
+import time
 import urllib.request
 import urllib.error
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from qms.core import get_config, get_logger, QMS_PATHS
+from qms.core import get_config, get_config_value, get_logger, QMS_PATHS
+from qms.vectordb.cache import cached_embed, get_embedding_cache
+from qms.vectordb.result_cache import (
+    bump_collection_version,
+    collection_version,
+    get_result_cache,
+    make_key,
+)
 
 logger = get_logger("qms.vectordb.search")
 
+# Thread pool size for fanning a query out across collections
+_DEFAULT_SEARCH_WORKERS = 6
+
+# LM Studio request shaping: batches are packed up to a token budget (estimated
+# at ~4 characters per token) and several requests are kept in flight
+_DEFAULT_MAX_BATCH_TOKENS = 8192
+_DEFAULT_MAX_IN_FLIGHT = 4
+_CHARS_PER_TOKEN = 4
+
+# HTTP statuses LM Studio / OpenAI-compatible servers use for oversized input
+_OVERSIZED_STATUS = (400, 413)
+
 # ---------------------------------------------------------------------------
 # Optional dependency guards
 # ---------------------------------------------------------------------------
@@ -28,6 +51,8 @@ try:
 except ImportError:
     HAS_CHROMADB = False
     chromadb = None  # type: ignore[assignment]
+    # Embedding functions still work (numpy backend) without chromadb
+    EmbeddingFunction = object  # type: ignore[assignment,misc]
 
 try:
     from sentence_transformers import SentenceTransformer
@@ -45,70 +70,184 @@ def _require_chromadb() -> None:
         )
 
 
+def get_backend() -> str:
+    """
+    Return the active vector store backend: ``chromadb`` or ``numpy``.
+
+    ``vectordb.backend: auto`` (default) picks chromadb when installed and
+    the in-process numpy store otherwise.
+    """
+    backend = str(get_config_value("vectordb", "backend", default="auto")).lower()
+    if backend == "auto":
+        return "chromadb" if HAS_CHROMADB else "numpy"
+    if backend not in ("chromadb", "numpy"):
+        raise ValueError(f"Unknown vectordb backend: {backend}")
+    return backend
+
+
+def backend_available() -> bool:
+    """True if the configured backend's dependency is installed."""
+    from qms.vectordb.numpy_store import HAS_NUMPY
+
+    try:
+        return HAS_CHROMADB if get_backend() == "chromadb" else HAS_NUMPY
+    except ValueError:
+        return False
+
+
+def _require_vector_store() -> None:
+    """Raise a clear ImportError if the configured backend is unusable."""
+    if get_backend() == "chromadb":
+        _require_chromadb()
+    else:
+        from qms.vectordb.numpy_store import _require_numpy
+
+        _require_numpy()
+
+
 # ---------------------------------------------------------------------------
 # Embedding functions
 # ---------------------------------------------------------------------------
 
-if HAS_CHROMADB:
-
-    class LMStudioEmbeddings(EmbeddingFunction):
-        """Embedding function using LM Studio's OpenAI-compatible API."""
-
-        def __init__(
-            self,
-            base_url: str = "http://127.0.0.1:1234/v1",
-            model: str = "text-embedding-nomic-embed-text-v1.5@q8_0",
-            batch_size: int = 32,
-        ):
-            try:
-                from openai import OpenAI
-            except ImportError:
-                raise ImportError(
-                    "openai package required for LM Studio embeddings. "
-                    "Install: pip install openai"
-                )
-            self.client = OpenAI(base_url=base_url, api_key="lm-studio")
-            self.model = model
-            self.batch_size = batch_size
-            self.provider = "lm_studio"
-
-        def __call__(self, input: "Documents") -> "Embeddings":
-            embeddings: list = []
-            for i in range(0, len(input), self.batch_size):
-                batch = input[i : i + self.batch_size]
-                response = self.client.embeddings.create(model=self.model, input=batch)
-                embeddings.extend(item.embedding for item in response.data)
-            return embeddings
-
-    class LocalEmbeddings(EmbeddingFunction):
-        """Embedding function using sentence-transformers (no server needed)."""
-
-        def __init__(
-            self,
-            model: str = "nomic-ai/nomic-embed-text-v1.5",
-            batch_size: int = 32,
-            device: Optional[str] = None,
-        ):
-            if not HAS_SENTENCE_TRANSFORMERS:
-                raise ImportError(
-                    "sentence-transformers required. "
-                    "Install: pip install sentence-transformers"
+def estimate_tokens(text: str) -> int:
+    """Rough token count for batch packing (no tokenizer dependency)."""
+    return max(1, -(-len(text) // _CHARS_PER_TOKEN))
+
+
+def plan_batches(texts: List[str], max_items: int, max_tokens: int) -> List[List[int]]:
+    """
+    Pack text indices into batches bounded by item count and total tokens.
+
+    Order is preserved. A single text over *max_tokens* gets a batch of its
+    own (the server truncates or rejects it; see ``LMStudioEmbeddings``).
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    tokens = 0
+    for i, text in enumerate(texts):
+        cost = estimate_tokens(text)
+        if current and (len(current) >= max_items or tokens + cost > max_tokens):
+            batches.append(current)
+            current, tokens = [], 0
+        current.append(i)
+        tokens += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+class LMStudioEmbeddings(EmbeddingFunction):
+    """
+    Embedding function using LM Studio's OpenAI-compatible API.
+
+    Inputs are packed into batches of at most *batch_size* texts and
+    *max_batch_tokens* estimated tokens, and up to *max_in_flight* requests
+    run concurrently over one pooled HTTP client. A batch the server rejects
+    as too large (HTTP 400/413) is split in half and retried.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "http://127.0.0.1:1234/v1",
+        model: str = "text-embedding-nomic-embed-text-v1.5@q8_0",
+        batch_size: int = 32,
+        dimensions: int = 768,
+        max_batch_tokens: int = _DEFAULT_MAX_BATCH_TOKENS,
+        max_in_flight: int = _DEFAULT_MAX_IN_FLIGHT,
+    ):
+        try:
+            from openai import OpenAI
+        except ImportError:
+            raise ImportError(
+                "openai package required for LM Studio embeddings. "
+                "Install: pip install openai"
+            )
+        # One client for all in-flight requests: its HTTP connection pool
+        # keeps connections alive between batches
+        self.client = OpenAI(base_url=base_url, api_key="lm-studio")
+        self.model = model
+        self.batch_size = batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.max_in_flight = max(1, max_in_flight)
+        self.dimensions = dimensions
+        self.provider = "lm_studio"
+        self.cache_model = model
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def __call__(self, input: "Documents") -> "Embeddings":
+        return cached_embed(self, list(input), self._embed)
+
+    def _embed(self, input: List[str]) -> list:
+        batches = [
+            [input[i] for i in batch]
+            for batch in plan_batches(input, self.batch_size, self.max_batch_tokens)
+        ]
+        if len(batches) <= 1 or self.max_in_flight == 1:
+            results = [self._embed_batch(batch) for batch in batches]
+        else:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_in_flight, thread_name_prefix="qms-embed"
                 )
-            self.model_name = model
-            self.batch_size = batch_size
-            self.provider = "local"
-            logger.info("Loading local embedding model: %s", model)
-            self.model = SentenceTransformer(model, trust_remote_code=True, device=device)
-            logger.info("Model loaded on device: %s", self.model.device)
-
-        def __call__(self, input: "Documents") -> "Embeddings":
-            embeddings = self.model.encode(
-                input,
-                batch_size=self.batch_size,
-                show_progress_bar=len(input) > 100,
-                convert_to_numpy=True,
+            results = list(self._executor.map(self._embed_batch, batches))
+        return [vector for batch in results for vector in batch]
+
+    def _embed_batch(self, batch: List[str]) -> list:
+        """Embed one batch, halving it while the server rejects it as oversized."""
+        try:
+            response = self.client.embeddings.create(model=self.model, input=batch)
+        except Exception as exc:
+            if len(batch) < 2 or getattr(exc, "status_code", None) not in _OVERSIZED_STATUS:
+                raise
+            mid = len(batch) // 2
+            logger.debug("Batch of %d rejected (%s); splitting", len(batch), exc)
+            return self._embed_batch(batch[:mid]) + self._embed_batch(batch[mid:])
+        data = sorted(response.data, key=lambda item: getattr(item, "index", 0))
+        return [item.embedding for item in data]
+
+    def close(self) -> None:
+        """Release the request thread pool and HTTP connections."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self.client.close()
+
+
+class LocalEmbeddings(EmbeddingFunction):
+    """Embedding function using sentence-transformers (no server needed)."""
+
+    def __init__(
+        self,
+        model: str = "nomic-ai/nomic-embed-text-v1.5",
+        batch_size: int = 32,
+        device: Optional[str] = None,
+        dimensions: int = 768,
+    ):
+        if not HAS_SENTENCE_TRANSFORMERS:
+            raise ImportError(
+                "sentence-transformers required. "
+                "Install: pip install sentence-transformers"
             )
-            return embeddings.tolist()
+        self.model_name = model
+        self.batch_size = batch_size
+        self.dimensions = dimensions
+        self.provider = "local"
+        self.cache_model = model
+        logger.info("Loading local embedding model: %s", model)
+        self.model = SentenceTransformer(model, trust_remote_code=True, device=device)
+        logger.info("Model loaded on device: %s", self.model.device)
+
+    def __call__(self, input: "Documents") -> "Embeddings":
+        return cached_embed(self, list(input), self._embed)
+
+    def _embed(self, input: List[str]) -> list:
+        embeddings = self.model.encode(
+            input,
+            batch_size=self.batch_size,
+            show_progress_bar=len(input) > 100,
+            convert_to_numpy=True,
+        )
+        return embeddings.tolist()
 
 
 # ---------------------------------------------------------------------------
@@ -145,7 +284,6 @@ def get_embedding_function(force_provider: Optional[str] = None):
     Returns:
         An EmbeddingFunction instance.
     """
-    _require_chromadb()
 
     global _embedding_fn
     if _embedding_fn is not None and force_provider is None:
@@ -170,6 +308,9 @@ def get_embedding_function(force_provider: Optional[str] = None):
             base_url=base_url,
             model=embed_config.get("model", "text-embedding-nomic-embed-text-v1.5@q8_0"),
             batch_size=embed_config.get("batch_size", 32),
+            dimensions=embed_config.get("dimensions", 768),
+            max_batch_tokens=embed_config.get("max_batch_tokens", _DEFAULT_MAX_BATCH_TOKENS),
+            max_in_flight=embed_config.get("max_in_flight", _DEFAULT_MAX_IN_FLIGHT),
         )
         logger.info("Initialized LM Studio embeddings: %s", _embedding_fn.model)
     elif provider == "local":
@@ -177,6 +318,7 @@ def get_embedding_function(force_provider: Optional[str] = None):
             model=embed_config.get("local_model", "nomic-ai/nomic-embed-text-v1.5"),
             batch_size=embed_config.get("batch_size", 32),
             device=embed_config.get("device", None),
+            dimensions=embed_config.get("dimensions", 768),
         )
         logger.info("Initialized local embeddings: %s", _embedding_fn.model_name)
     else:
@@ -214,7 +356,7 @@ def get_chromadb_collection(
     create_if_missing: bool = True,
 ):
     """
-    Get or create a ChromaDB collection.
+    Get or create a collection on the configured backend.
 
     Args:
         name: Collection name.
@@ -222,17 +364,28 @@ def get_chromadb_collection(
         create_if_missing: When False, raises if the collection does not exist.
 
     Returns:
-        chromadb.Collection with the configured embedding function.
+        chromadb.Collection (or ``NumpyCollection`` on the numpy backend)
+        with the configured embedding function.
     """
-    _require_chromadb()
+    _require_vector_store()
 
-    client = _get_client()
     embedding_fn = get_embedding_function()
 
     metadata = {}
     if description:
         metadata["description"] = description
 
+    if get_backend() == "numpy":
+        from qms.vectordb import numpy_store
+
+        return numpy_store.get_collection(
+            name,
+            embedding_function=embedding_fn,
+            metadata=metadata or None,
+            create_if_missing=create_if_missing,
+        )
+
+    client = _get_client()
     if create_if_missing:
         return client.get_or_create_collection(
             name=name,
@@ -265,6 +418,7 @@ def add_documents_to_collection(
         ids = [f"{collection_name}_{base + i}" for i in range(len(documents))]
 
     collection.add(documents=documents, metadatas=metadatas, ids=ids)
+    bump_collection_version(collection_name)
     logger.info("Added %d documents to %s", len(documents), collection_name)
 
 
@@ -275,10 +429,18 @@ def list_collections() -> List[Dict[str, Any]]:
     Returns:
         List of dicts with 'name', 'count', and 'metadata' keys.
     """
-    _require_chromadb()
+    _require_vector_store()
 
-    client = _get_client()
     result: List[Dict[str, Any]] = []
+    if get_backend() == "numpy":
+        from qms.vectordb import numpy_store
+
+        for name in numpy_store.list_collection_names():
+            col = numpy_store.get_collection(name)
+            result.append({"name": name, "count": col.count(), "metadata": col.metadata})
+        return result
+
+    client = _get_client()
 
     for col in client.list_collections():
         try:
@@ -298,12 +460,44 @@ def list_collections() -> List[Dict[str, Any]]:
 # Search
 # ---------------------------------------------------------------------------
 
+# Once embedding fails, skip vector search for this long (seconds) so callers
+# fall back to lexical search immediately instead of waiting on a dead server
+_DEFAULT_RETRY_AFTER = 30.0
+_embedding_down_until = 0.0
+
+
+def embedding_available() -> bool:
+    """Return False while a recent embedding failure is cooling down."""
+    return backend_available() and time.monotonic() >= _embedding_down_until
+
+
+def mark_embedding_down(reason: Any = None) -> None:
+    """Record an embedding failure; ``embedding_available()`` is False until retry."""
+    global _embedding_down_until
+    retry_after = float(
+        get_config_value("embeddings", "retry_after_seconds", default=_DEFAULT_RETRY_AFTER)
+    )
+    _embedding_down_until = time.monotonic() + retry_after
+    logger.warning("Embedding unavailable (%s); retrying in %.0fs", reason, retry_after)
+
+
+def embed_query(query: str) -> List[float]:
+    """Embed a search query once so it can be reused across collections."""
+    _require_vector_store()
+    try:
+        return list(get_embedding_function()([query])[0])
+    except Exception as exc:
+        mark_embedding_down(exc)
+        raise
+
+
 def search_collection(
     collection_name: str,
     query: str,
     n_results: int = 5,
     where: Optional[Dict[str, Any]] = None,
     include: Optional[List[str]] = None,
+    query_embedding: Optional[List[float]] = None,
 ) -> List[Dict[str, Any]]:
     """
     Search a single collection for semantically similar documents.
@@ -314,22 +508,45 @@ def search_collection(
         n_results: Number of results to return.
         where: Optional ChromaDB metadata filter.
         include: Fields to include (default: documents, metadatas, distances).
+        query_embedding: Precomputed embedding of *query* (see ``embed_query``);
+            skips embedding the query again.
+
+    Results are served from the result cache (``vectordb.result_cache``)
+    until the collection's version changes or the entry expires.
 
     Returns:
         List of result dicts, each with 'id', 'document', 'metadata', 'distance'.
     """
-    _require_chromadb()
+    _require_vector_store()
 
     if include is None:
         include = ["documents", "metadatas", "distances"]
 
+    cache = get_result_cache()
+    if cache is not None:
+        # Read the version before querying: a write racing the query then
+        # leaves the stored entry one version behind, never wrongly fresh
+        key = make_key(collection_name, query, n_results, where, include)
+        version = collection_version(collection_name)
+        cached = cache.get(key, version)
+        if cached is not None:
+            return cached
+
     collection = get_chromadb_collection(collection_name, create_if_missing=False)
-    raw = collection.query(
-        query_texts=[query],
-        n_results=n_results,
-        where=where,
-        include=include,
-    )
+    if query_embedding is not None:
+        raw = collection.query(
+            query_embeddings=[query_embedding],
+            n_results=n_results,
+            where=where,
+            include=include,
+        )
+    else:
+        raw = collection.query(
+            query_texts=[query],
+            n_results=n_results,
+            where=where,
+            include=include,
+        )
 
     results: List[Dict[str, Any]] = []
     if raw["ids"] and raw["ids"][0]:
@@ -343,6 +560,8 @@ def search_collection(
                 entry["distance"] = raw["distances"][0][i]
             results.append(entry)
 
+    if cache is not None:
+        cache.put(key, version, results)
     return results
 
 
@@ -355,6 +574,10 @@ def search_multiple_collections(
     """
     Search across multiple collections and return results keyed by name.
 
+    The query is embedded once (or not at all when every collection's
+    results are cached) and the per-collection queries run on a thread pool
+    (``embeddings.search_workers``, default 6).
+
     Args:
         query: Natural-language search query.
         collections: Collection names to search (default: all existing).
@@ -364,20 +587,113 @@ def search_multiple_collections(
     Returns:
         Dict mapping collection name to list of result dicts.
     """
-    _require_chromadb()
+    _require_vector_store()
 
     if collections is None:
         collections = [c["name"] for c in list_collections()]
+    if not collections:
+        return {}
+
+    embedding = None
+    cache = get_result_cache()
+    include = ["documents", "metadatas", "distances"]
+    if cache is None or not all(
+        cache.peek(make_key(name, query, n_results, where, include), collection_version(name))
+        for name in collections
+    ):
+        try:
+            embedding = embed_query(query)
+        except Exception as exc:
+            logger.warning("Could not embed query: %s", exc)
+            return {name: [] for name in collections}
 
-    output: Dict[str, List[Dict[str, Any]]] = {}
-    for name in collections:
+    def _one(name: str) -> List[Dict[str, Any]]:
         try:
-            output[name] = search_collection(name, query, n_results=n_results, where=where)
+            return search_collection(
+                name, query, n_results=n_results, where=where, query_embedding=embedding
+            )
         except Exception as exc:
             logger.warning("Error searching %s: %s", name, exc)
-            output[name] = []
+            return []
 
-    return output
+    workers = int(get_config_value("embeddings", "search_workers", default=_DEFAULT_SEARCH_WORKERS))
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(collections)))) as pool:
+        found = list(pool.map(_one, collections))
+
+    return dict(zip(collections, found))
+
+
+def merge_results(
+    results: Dict[str, List[Dict[str, Any]]],
+    top_k: int = 10,
+    per_collection: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Merge per-collection results into one ranked list.
+
+    Distances are min-max normalised over all returned hits (all collections
+    share one embedding model, so raw distances are comparable) and each
+    result gains ``collection`` and ``normalized_distance`` keys.
+
+    Args:
+        results: Output of ``search_multiple_collections``.
+        top_k: Length of the merged list.
+        per_collection: Maximum hits taken from any one collection.
+
+    Returns:
+        Up to *top_k* result dicts, best (lowest distance) first.
+    """
+    hits = [
+        dict(r, collection=name)
+        for name, rows in results.items()
+        for r in rows
+        if r.get("distance") is not None
+    ]
+    if not hits:
+        return []
+
+    low = min(h["distance"] for h in hits)
+    span = max(h["distance"] for h in hits) - low
+    for h in hits:
+        h["normalized_distance"] = (h["distance"] - low) / span if span else 0.0
+    hits.sort(key=lambda h: h["distance"])
+
+    merged: List[Dict[str, Any]] = []
+    taken: Dict[str, int] = {}
+    for h in hits:
+        if per_collection is not None and taken.get(h["collection"], 0) >= per_collection:
+            continue
+        taken[h["collection"]] = taken.get(h["collection"], 0) + 1
+        merged.append(h)
+        if len(merged) >= top_k:
+            break
+    return merged
+
+
+def search_merged(
+    query: str,
+    collections: Optional[List[str]] = None,
+    top_k: int = 10,
+    per_collection: Optional[int] = None,
+    where: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Search several collections in parallel and return one merged top-K list.
+
+    Args:
+        query: Natural-language search query.
+        collections: Collection names to search (default: all existing).
+        top_k: Length of the merged list.
+        per_collection: Maximum hits taken from any one collection.
+        where: Optional metadata filter applied to each collection.
+
+    Returns:
+        Result dicts as from ``merge_results``.
+    """
+    results = search_multiple_collections(
+        query, collections=collections, n_results=top_k, where=where
+    )
+    return merge_results(results, top_k=top_k, per_collection=per_collection)
 
 
 # ---------------------------------------------------------------------------
@@ -397,7 +713,7 @@ def test_connection(provider: Optional[str] = None) -> Dict[str, Any]:
     result: Dict[str, Any] = {"success": False, "provider": None, "error": None}
 
     try:
-        _require_chromadb()
+        _require_vector_store()
 
         if provider:
             reset_embedding_function()
@@ -405,7 +721,8 @@ def test_connection(provider: Optional[str] = None) -> Dict[str, Any]:
         embed_fn = get_embedding_function(force_provider=provider)
         result["provider"] = embed_fn.provider
 
-        test_result = embed_fn(["test embedding"])
+        # Bypass the embedding cache so this actually reaches the model
+        test_result = embed_fn._embed(["test embedding"])
         if len(test_result) == 1 and len(test_result[0]) > 0:
             result["success"] = True
             result["dimensions"] = len(test_result[0])
@@ -424,14 +741,22 @@ def get_stats() -> Dict[str, Any]:
     Get vector database statistics.
 
     Returns:
-        Dict with 'path', 'collections' count, 'total_documents', and 'details'.
+        Dict with 'backend', 'path', 'collections' count, 'total_documents', 'details',
+        'embedding_cache' (entry/byte counts and hits/misses) and
+        'result_cache' (entries, hits/misses, invalidations); each None when
+        that cache is disabled.
     """
-    _require_chromadb()
+    _require_vector_store()
 
     collections = list_collections()
+    cache = get_embedding_cache()
+    result_cache = get_result_cache()
     return {
+        "backend": get_backend(),
         "path": str(QMS_PATHS.vector_database),
         "collections": len(collections),
         "total_documents": sum(c["count"] for c in collections),
         "details": collections,
+        "embedding_cache": cache.stats() if cache else None,
+        "result_cache": result_cache.stats() if result_cache else None,
     }
@@ -751,10 +751,15 @@ def extract_cmd(
     dry_run: bool = typer.Option(False, "--dry-run", help="Validate without writing to DB"),
     batch: bool = typer.Option(False, "--batch", help="Process all PDFs in directory"),
     pattern: str = typer.Option("*.pdf", "--pattern", help="Glob pattern for batch mode"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Call the models even for unchanged forms"),
 ):
     """Extract form data from PDF into the database."""
+    from qms.core import model_cache
     from qms.welding.extraction.pipeline import run_pipeline, run_batch
 
+    if no_cache:
+        model_cache.set_enabled(False)
+
     form_type = form_type.lower()
     valid_types = ("wps", "pqr", "wpq", "bps", "bpq")
     if form_type not in valid_types:
@@ -11,16 +11,19 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from qms.core import get_logger
+from qms.core.pdf_cache import load_pdf
 
 logger = get_logger("qms.welding.extraction.extractor")
 
 
-def extract_pdf_text(pdf_path: Path) -> str:
+def extract_pdf_text(pdf_path: Path, file_hash: Optional[str] = None) -> str:
     """
-    Extract text content from a PDF file using PyMuPDF.
+    Extract text content from a PDF file using PyMuPDF (via the PDF text cache).
 
     Args:
         pdf_path: Path to PDF file.
+        file_hash: The file's MD5 if already known; saves re-hashing the
+            PDF before the cache lookup.
 
     Returns:
         Extracted text as a single string.
@@ -29,27 +32,10 @@ def extract_pdf_text(pdf_path: Path) -> str:
         ImportError: If PyMuPDF is not installed.
         FileNotFoundError: If PDF file doesn't exist.
     """
-    try:
-        import fitz  # PyMuPDF
-    except ImportError:
-        raise ImportError(
-            "PyMuPDF is required for PDF extraction. "
-            "Install with: pip install PyMuPDF>=1.23.0"
-        )
-
     pdf_path = Path(pdf_path)
-    if not pdf_path.exists():
-        raise FileNotFoundError(f"PDF not found: {pdf_path}")
-
-    pages: List[str] = []
-    with fitz.open(str(pdf_path)) as doc:
-        for page_num, page in enumerate(doc):
-            text = page.get_text("text")
-            if text.strip():
-                pages.append(f"--- PAGE {page_num + 1} ---\n{text}")
-
-    full_text = "\n\n".join(pages)
-    logger.info("Extracted %d pages, %d chars from %s", len(pages), len(full_text), pdf_path.name)
+    pdf = load_pdf(pdf_path, file_hash)
+    full_text = pdf.plain_text()
+    logger.info("Extracted %d pages, %d chars from %s", pdf.page_count, len(full_text), pdf_path.name)
     return full_text
 
 
@@ -17,7 +17,8 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from qms.core import get_config_value, get_db, get_logger
+from qms.core import get_config_value, get_db, get_logger, model_gateway
+from qms.core.activity import record_activity
 
 logger = get_logger("qms.welding.extraction.pipeline")
 
@@ -69,31 +70,10 @@ def _call_model(prompt: str, model: str = "sonnet") -> str:
     """
     Call an AI model with the given prompt.
 
-    Uses the Anthropic SDK if available, otherwise raises ImportError.
+    Routed through the shared model gateway (pooled client, rate limits,
+    retry on 429/529); unchanged prompts are served from the response cache.
     """
-    try:
-        import anthropic
-    except ImportError:
-        raise ImportError(
-            "anthropic SDK is required for extraction. "
-            "Install with: pip install anthropic>=0.25.0"
-        )
-
-    model_map = {
-        "haiku": "claude-haiku-4-5-20251001",
-        "sonnet": "claude-sonnet-4-5-20250929",
-        "opus": "claude-opus-4-6",
-    }
-    model_id = model_map.get(model, model)
-
-    client = anthropic.Anthropic()
-    response = client.messages.create(
-        model=model_id,
-        max_tokens=8192,
-        messages=[{"role": "user", "content": prompt}],
-    )
-
-    return response.content[0].text
+    return model_gateway.call(prompt, model, max_tokens=8192, cache=True).text
 
 
 def _cross_check(primary: Dict[str, Any], secondary: Dict[str, Any],
@@ -201,7 +181,7 @@ def _cross_check(primary: Dict[str, Any], secondary: Dict[str, Any],
 
 def _log_extraction(conn, result: PipelineResult):
     """Write extraction result to weld_extraction_log."""
-    conn.execute(
+    cur = conn.execute(
         """INSERT INTO weld_extraction_log (
                form_type, source_file, identifier, status, confidence,
                primary_model, secondary_model, shadow_model,
@@ -224,6 +204,11 @@ def _log_extraction(conn, result: PipelineResult):
             result.processing_time_ms,
         ),
     )
+    record_activity(
+        conn, "extraction", result.status,
+        f"{result.form_type}: {result.identifier or result.source_file}",
+        "weld_extraction_log", cur.lastrowid,
+    )
 
 
 def _resolve_wps_number(conn, wps_number: str) -> str:
@@ -313,7 +313,12 @@ def _resolve_business_unit_id(conn: sqlite3.Connection, bu_text: Optional[str])
     return row["id"] if row else None
 
 
-def upsert_welder(conn: sqlite3.Connection, welder_data: Dict[str, Any], row_hash: str) -> int:
+def upsert_welder(
+    conn: sqlite3.Connection,
+    welder_data: Dict[str, Any],
+    row_hash: str,
+    commit: bool = True,
+) -> int:
     """
     Insert or update welder record.
 
@@ -321,6 +326,7 @@ def upsert_welder(conn: sqlite3.Connection, welder_data: Dict[str, Any], row_has
         conn: Database connection
         welder_data: Dict of welder fields
         row_hash: MD5 hash of source row for change detection
+        commit: Commit immediately (bulk callers pass False and commit once)
 
     Returns:
         Welder registry ID
@@ -363,7 +369,8 @@ def upsert_welder(conn: sqlite3.Connection, welder_data: Dict[str, Any], row_has
                     existing["id"],
                 ),
             )
-            conn.commit()
+            if commit:
+                conn.commit()
         return existing["id"]
 
     emp_num = (
@@ -399,16 +406,23 @@ def upsert_welder(conn: sqlite3.Connection, welder_data: Dict[str, Any], row_has
             row_hash,
         ),
     )
-    conn.commit()
+    if commit:
+        conn.commit()
     return cursor.lastrowid
 
 
 def upsert_wpq(
-    conn: sqlite3.Connection, welder_id: int, wpq_code: str, parsed: Dict[str, Any]
+    conn: sqlite3.Connection,
+    welder_id: int,
+    wpq_code: str,
+    parsed: Dict[str, Any],
+    commit: bool = True,
 ) -> Optional[int]:
     """
     Insert or update WPQ record from parsed code.
 
+    Set *commit* to False to leave the write in the caller's transaction.
+
     Returns:
         WPQ ID or None if no valid data
     """
@@ -459,7 +473,8 @@ def upsert_wpq(
                 existing["id"],
             ),
         )
-        conn.commit()
+        if commit:
+            conn.commit()
         return existing["id"]
 
     cursor = conn.execute(
@@ -488,7 +503,8 @@ def upsert_wpq(
             f"Imported from Excel code: {wpq_code}",
         ),
     )
-    conn.commit()
+    if commit:
+        conn.commit()
     return cursor.lastrowid
 
 
@@ -688,7 +704,7 @@ def import_from_excel(
                 if welder_data["welder_stamp"]:
                     existing = find_welder_by_stamp(conn, welder_data["welder_stamp"])
 
-                welder_id = upsert_welder(conn, welder_data, row_hash)
+                welder_id = upsert_welder(conn, welder_data, row_hash, commit=False)
 
                 if existing:
                     if existing.get("excel_row_hash") != row_hash:
@@ -723,9 +739,13 @@ def import_from_excel(
                         parsed.get("positions", []),
                     )
                 else:
-                    wpq_id = upsert_wpq(conn, welder_id, wpq_code, parsed)
+                    wpq_id = upsert_wpq(conn, welder_id, wpq_code, parsed, commit=False)
                     if wpq_id:
                         stats["wpqs_created"] += 1
+
+        # Whole workbook is one transaction: one fsync instead of one per row
+        if conn:
+            conn.commit()
     finally:
         if conn and not dry_run:
             db_ctx.__exit__(None, None, None)
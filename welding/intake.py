@@ -20,6 +20,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 from qms.core import get_config, get_db, get_logger, QMS_PATHS
+from qms.core.activity import record_activity
 
 logger = get_logger("qms.welding.intake")
 
@@ -213,13 +214,14 @@ def log_intake(
     notes: Optional[str] = None,
 ) -> None:
     """Log an intake action to the audit trail."""
-    conn.execute(
+    cur = conn.execute(
         """INSERT INTO weld_intake_log
            (file_name, source_path, destination_path, document_type,
             document_number, document_id, action, notes)
            VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
         (filename, source_path, dest_path, doc_type, doc_number, doc_id, action, notes),
     )
+    record_activity(conn, "weld-intake", action, filename, "weld_intake_log", cur.lastrowid)
     conn.commit()
 
 
@@ -125,6 +125,7 @@ def bulk_update(
         with get_db() as conn:
             for row in reader:
                 eid = row.pop("id", None)
+                row.pop("commit", None)  # transaction flag, never a column
                 if not eid:
                     skipped += 1
                     continue
@@ -135,9 +136,10 @@ def bulk_update(
                             row[key] = int(row[key])
                         except ValueError:
                             pass
-                if update_employee(conn, eid, **row):
+                if update_employee(conn, eid, commit=False, **row):
                     updated += 1
                 else:
                     skipped += 1
+            conn.commit()
 
     typer.echo(f"Bulk update complete: {updated} updated, {skipped} skipped.")
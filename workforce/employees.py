@@ -113,9 +113,11 @@ def create_employee(
     email: Optional[str] = None,
     phone: Optional[str] = None,
     created_by: str = "SYSTEM",
+    *,
+    commit: bool = True,
     **kwargs,
 ) -> str:
-    """Create new employee. Returns employee UUID."""
+    """Create new employee. Returns employee UUID (commit=False leaves it in the caller's transaction)."""
     employee_id = generate_uuid()
     employee_number = get_next_employee_number(conn) if is_employee else None
     subcontractor_number = get_next_subcontractor_number(conn) if is_subcontractor else None
@@ -146,12 +148,19 @@ def create_employee(
             kwargs.get("status_reason"), kwargs.get("notes"), created_by,
         ),
     )
-    conn.commit()
+    if commit:
+        conn.commit()
     return employee_id
 
 
-def update_employee(conn: sqlite3.Connection, employee_id: str, **updates) -> bool:
-    """Update employee record by UUID."""
+def update_employee(
+    conn: sqlite3.Connection, employee_id: str, *, commit: bool = True, **updates
+) -> bool:
+    """Update employee record by UUID (commit=False leaves it in the caller's transaction).
+
+    ``commit`` is keyword-only; callers splatting request or CSV data into
+    ``**updates`` must drop any ``commit`` key first.
+    """
     allowed = {
         "last_name", "first_name", "middle_initial", "preferred_name",
         "is_employee", "is_subcontractor", "is_active",
@@ -167,7 +176,8 @@ def update_employee(conn: sqlite3.Connection, employee_id: str, **updates) -> bo
     set_clause = ", ".join(f"{k} = ?" for k in fields)
     values = list(fields.values()) + [employee_id]
     conn.execute(f"UPDATE employees SET {set_clause} WHERE id = ?", values)
-    conn.commit()
+    if commit:
+        conn.commit()
     return True
 
 
@@ -176,6 +186,8 @@ def terminate_employee(
     employee_id: str,
     separation_date: Optional[str] = None,
     status_reason: Optional[str] = None,
+    *,
+    commit: bool = True,
 ) -> bool:
     if separation_date is None:
         separation_date = datetime.now().strftime("%Y-%m-%d")
@@ -183,7 +195,8 @@ def terminate_employee(
         "UPDATE employees SET status='terminated', is_active=0, separation_date=?, status_reason=? WHERE id=?",
         (separation_date, status_reason, employee_id),
     )
-    conn.commit()
+    if commit:
+        conn.commit()
     return True
 
 
@@ -230,7 +243,7 @@ def import_weekly_personnel(
                 continue
 
         if existing:
-            update_employee(conn, existing["id"], **{
+            update_employee(conn, existing["id"], commit=False, **{
                 k: record.get(k, existing.get(k))
                 for k in ["last_name", "first_name", "position", "department_id", "job_id", "email", "phone"]
             })
@@ -249,9 +262,11 @@ def import_weekly_personnel(
                 email=record.get("email"),
                 phone=record.get("phone"),
                 created_by=created_by,
+                commit=False,
             )
             log.append({"action": "INSERT", "id": new_id, "match": "new_record"})
 
+    conn.commit()
     return {
         "imported": len(log),
         "updated": sum(1 for x in log if x["action"] == "UPDATE"),
@@ -335,6 +350,8 @@ def rehire_employee(
     employee_id: str,
     new_hire_date: Optional[str] = None,
     reason: Optional[str] = None,
+    *,
+    commit: bool = True,
 ) -> bool:
     """Rehire a former employee and create a new employment_history record.
 
@@ -372,7 +389,8 @@ def rehire_employee(
         (generate_uuid(), employee_id, new_hire_date, employment_type, reason),
     )
 
-    conn.commit()
+    if commit:
+        conn.commit()
     return True
 
 
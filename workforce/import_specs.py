@@ -313,7 +313,11 @@ def detect_separations(
 def execute_employee_action(
     conn: sqlite3.Connection, item: ActionItem, executed_by: str
 ):
-    """Apply a single import action to the employees table."""
+    """Apply a single import action to the employees table.
+
+    Writes stay in the caller's transaction; execute_approved_actions()
+    commits once after the whole plan.
+    """
     from qms.workforce.employees import (
         create_employee,
         rehire_employee,
@@ -341,6 +345,7 @@ def execute_employee_action(
             created_by=executed_by,
             middle_initial=data.get("middle_initial"),
             notes=data.get("notes"),
+            commit=False,
         )
 
     elif action == "update":
@@ -349,23 +354,24 @@ def execute_employee_action(
         for field, (_, new_val) in (item.changes or {}).items():
             updates[field] = new_val
         if updates:
-            update_employee(conn, emp_id, **updates)
+            update_employee(conn, emp_id, commit=False, **updates)
 
     elif action == "reactivate":
         emp_id = item.existing_data["id"]
-        rehire_employee(conn, emp_id, new_hire_date=data.get("current_hire_date"))
+        rehire_employee(conn, emp_id, new_hire_date=data.get("current_hire_date"), commit=False)
         # Also apply any field changes
         updates = {}
         for field, (_, new_val) in (item.changes or {}).items():
             updates[field] = new_val
         if updates:
-            update_employee(conn, emp_id, **updates)
+            update_employee(conn, emp_id, commit=False, **updates)
 
     elif action == "separate":
         emp_id = item.existing_data["id"]
         terminate_employee(
             conn, emp_id,
             status_reason=f"Not in import roster (import by {executed_by})",
+            commit=False,
         )
 
     elif action == "flag":
@@ -376,7 +382,7 @@ def execute_employee_action(
             for field, (_, new_val) in item.changes.items():
                 updates[field] = new_val
             if updates:
-                update_employee(conn, emp_id, **updates)
+                update_employee(conn, emp_id, commit=False, **updates)
 
 
 # ---------------------------------------------------------------------------
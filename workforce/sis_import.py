@@ -218,6 +218,7 @@ def _update_existing(
         phone=record.phone if record.phone else None,
         job_id=job_id,
         notes=record.designation if record.designation else None,
+        commit=False,
     )
 
     # Backfill real SIS employee number if not already set
@@ -315,6 +316,7 @@ def _create_new(
         status="active",
         notes=notes,
         created_by="SIS-IMPORT",
+        commit=False,
     )
 
     # Overwrite the auto-generated number with the real SIS payroll number